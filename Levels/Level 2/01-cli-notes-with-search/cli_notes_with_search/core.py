@@ -2,19 +2,32 @@
 
 from __future__ import annotations
 
+import heapq
 import json
 import logging
 import os
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
 from uuid import uuid4
 
+from .index import SearchIndex
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
 
 LOGGER = logging.getLogger(__name__)
 
+# Journal operations accumulated before they are folded into the snapshot
+DEFAULT_COMPACT_THRESHOLD = 1000
+# Index changes accumulated before the search index is written back to disk
+DEFAULT_INDEX_FLUSH_INTERVAL = 100
+
 
 @dataclass
 class Note:
@@ -53,15 +66,52 @@ class Note:
 
 
 class NoteManager:
-    """Handles CRUD operations, persistence, and searching of notes."""
-
-    def __init__(self, storage_path: Path | str, logger: Optional[logging.Logger] = None) -> None:
+    """Handles CRUD operations, persistence, and searching of notes.
+
+    Two storage modes are supported:
+
+    * ``"snapshot"`` (default): every change rewrites the JSON store.
+    * ``"journal"``: changes are appended to a JSON-lines journal next to the
+      store and folded into the JSON snapshot once ``compact_threshold``
+      operations have accumulated. Loading replays the journal on top of the
+      snapshot, so both modes read the same files.
+
+    The search index is saved lazily: every ``index_flush_interval`` changes,
+    on compaction, and on ``flush()`` or ``close()``. Use the manager as a
+    context manager, or call ``close()``, so the last changes reach the
+    saved index. An index that falls behind the notes is caught up from the
+    journal or rebuilt on the next load.
+    """
+
+    STORAGE_MODES = ("snapshot", "journal")
+
+    def __init__(
+        self,
+        storage_path: Path | str,
+        logger: Optional[logging.Logger] = None,
+        storage_mode: str = "snapshot",
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+        index_flush_interval: int = DEFAULT_INDEX_FLUSH_INTERVAL,
+    ) -> None:
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(f"Unknown storage mode: {storage_mode}")
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         self._logger = logger or LOGGER
+        self.storage_mode = storage_mode
+        self.compact_threshold = compact_threshold
+        self.index_flush_interval = index_flush_interval
+        self.index_path = self.storage_path.with_suffix(".index.json")
+        self.journal_path = self.storage_path.with_suffix(".journal")
+        self.lock_path = self.storage_path.with_suffix(".lock")
         self._notes: Dict[str, Note] = {}
         self._last_modified: Optional[int] = None
+        self._journal_offset = 0
+        self._journal_ops = 0
+        self._index_pending = 0
+        self._index = SearchIndex()
         self._load()
+        self._init_index()
 
     @staticmethod
     def _timestamp() -> str:
@@ -70,14 +120,26 @@ class NoteManager:
 
     @staticmethod
     def _normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
-        """Normalize tags by lowering case and removing duplicates."""
+        """Normalize tags by lowering case and removing duplicates.
+
+        A plain string is treated as comma-separated tags.
+        """
         if not tags:
             return []
+        if isinstance(tags, str):
+            tags = tags.split(",")
         normalized = {tag.strip().lower() for tag in tags if tag.strip()}
         return sorted(normalized)
 
     def _load(self) -> None:
-        """Load notes from storage into memory."""
+        """Load notes from the snapshot and replay the journal on top."""
+        self._load_snapshot()
+        self._journal_offset = 0
+        self._journal_ops = 0
+        self._replay_journal()
+
+    def _load_snapshot(self) -> None:
+        """Load notes from the JSON snapshot into memory."""
         if not self.storage_path.exists():
             self._notes = {}
             self._last_modified = None
@@ -109,6 +171,103 @@ class NoteManager:
             self._notes[note.id] = note
         self._record_modified_time()
 
+    def _read_journal(self, offset: int) -> Tuple[List[Tuple[str, Note]], int]:
+        """Read journal operations starting at byte ``offset``.
+
+        Returns the operations and the offset just past the last complete
+        record. A torn final record (from a crash mid-append) is ignored.
+        """
+        try:
+            with self.journal_path.open("rb") as handle:
+                handle.seek(offset)
+                data = handle.read()
+        except FileNotFoundError:
+            return [], offset
+
+        operations: List[Tuple[str, Note]] = []
+        position = offset
+        for raw_line in data.splitlines(keepends=True):
+            if not raw_line.endswith(b"\n"):
+                break
+            position += len(raw_line)
+            try:
+                record = json.loads(raw_line)
+                operations.append((record["op"], Note.from_dict(record["note"])))
+            except (KeyError, TypeError, ValueError):
+                self._logger.error("Skipping malformed journal record: %r", raw_line)
+        return operations, position
+
+    def _apply(self, operations: Iterable[Tuple[str, Note]]) -> None:
+        """Apply journal operations to the in-memory notes."""
+        for op, note in operations:
+            if op == "create":
+                self._notes[note.id] = note
+            elif op == "delete":
+                self._notes.pop(note.id, None)
+
+    def _apply_to_index(self, operations: Iterable[Tuple[str, Note]]) -> None:
+        """Apply journal operations to the search index."""
+        for op, note in operations:
+            if op == "create":
+                self._index.add(note)
+            elif op == "delete":
+                self._index.remove(note)
+
+    def _replay_journal(self) -> List[Tuple[str, Note]]:
+        """Apply journal records appended since the last read."""
+        operations, self._journal_offset = self._read_journal(self._journal_offset)
+        self._apply(operations)
+        self._journal_ops += len(operations)
+        return operations
+
+    @contextmanager
+    def _journal_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by every writer of this store.
+
+        Locking is advisory and only available where ``fcntl`` exists; the
+        lock is not re-entrant, so callers must not nest it.
+        """
+        if fcntl is None:
+            yield
+            return
+        with self.lock_path.open("a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _append_journal(self, operations: Sequence[Tuple[str, Note]]) -> None:
+        """Durably append operations to the journal in a single write.
+
+        Complete records other writers appended since the last read are
+        replayed first, so only a torn tail (bytes after the last newline)
+        is ever truncated. A failed append is rolled back and re-raised.
+        """
+        payload = "".join(
+            json.dumps({"op": op, "note": note.to_dict()}) + "\n"
+            for op, note in operations
+        ).encode("utf-8")
+        with self._journal_lock():
+            self._refresh_if_stale()
+            try:
+                with self.journal_path.open("ab") as handle:
+                    if handle.tell() > self._journal_offset:
+                        # Drop a torn record left behind by an interrupted append
+                        handle.truncate(self._journal_offset)
+                    try:
+                        handle.write(payload)
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                    except OSError:
+                        handle.truncate(self._journal_offset)
+                        raise
+            except OSError as exc:
+                self._logger.error("Failed to append to notes journal: %s", exc)
+                raise
+        self._journal_offset += len(payload)
+        self._journal_ops += len(operations)
+
     def _persist(self) -> None:
         """Persist notes to disk using an atomic write."""
         payload = {"notes": [note.to_dict() for note in self._notes.values()]}
@@ -134,6 +293,60 @@ class NoteManager:
         os.replace(temp_path, self.storage_path)
         self._record_modified_time()
 
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and empty the journal."""
+        self._refresh_if_stale()
+        self._compact()
+
+    def _compact(self) -> None:
+        """Write a snapshot of the in-memory notes, then empty the journal.
+
+        Replaying a journal over a snapshot that already contains its
+        operations is harmless, so a crash between the two steps loses
+        nothing. The lock keeps other writers from appending records that
+        the truncation would discard.
+        """
+        with self._journal_lock():
+            self._refresh_if_stale()
+            self._persist()
+            if self._journal_offset or self.journal_path.exists():
+                with self.journal_path.open("wb") as handle:
+                    os.fsync(handle.fileno())
+        self._journal_offset = 0
+        self._journal_ops = 0
+        self._save_index()
+        self._logger.debug("Compacted notes journal into %s", self.storage_path)
+
+    def _commit(self, operations: Sequence[Tuple[str, Note]]) -> None:
+        """Persist operations, then apply them in memory and to the index.
+
+        If the write fails the error is re-raised and the in-memory notes
+        are left as they were.
+        """
+        if self.storage_mode == "journal":
+            self._append_journal(operations)
+            self._apply(operations)
+            self._apply_to_index(operations)
+            if self._journal_ops >= self.compact_threshold:
+                self._compact()
+            else:
+                self._index_changed(len(operations))
+            return
+
+        previous = dict(self._notes)
+        self._apply(operations)
+        try:
+            self._persist()
+        except OSError:
+            self._notes = previous
+            raise
+        self._apply_to_index(operations)
+        if self._journal_offset:
+            # Switching from journal mode: fold the old journal in as well
+            self._compact()
+            return
+        self._index_changed(len(operations))
+
     def _record_modified_time(self) -> None:
         """Track the storage file modification time."""
         try:
@@ -144,20 +357,115 @@ class NoteManager:
             # Ignore transient filesystem errors.
             pass
 
+    def _storage_signature(self) -> Optional[Dict[str, int]]:
+        """Identify the snapshot by mtime/size plus how much journal was applied."""
+        try:
+            stat = self.storage_path.stat()
+        except FileNotFoundError:
+            if not self._journal_offset:
+                return None
+            return {"mtime_ns": 0, "size": 0, "journal_offset": self._journal_offset}
+        except OSError:
+            return None
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "journal_offset": self._journal_offset,
+        }
+
+    def _init_index(self) -> None:
+        """Load the persisted search index, rebuilding it if out of date.
+
+        An index saved before the latest journal records is brought up to
+        date by replaying just those records.
+        """
+        signature = self._storage_signature()
+        index = SearchIndex.load(self.index_path)
+        if (
+            index is not None
+            and index.signature is not None
+            and signature is not None
+            and index.signature.get("mtime_ns") == signature["mtime_ns"]
+            and index.signature.get("size") == signature["size"]
+            and index.signature.get("journal_offset", 0) <= signature["journal_offset"]
+        ):
+            self._index = index
+            operations, _ = self._read_journal(index.signature.get("journal_offset", 0))
+            self._apply_to_index(operations)
+            if len(self._index) == len(self._notes):
+                return
+
+        self._index = SearchIndex()
+        self._index.rebuild(self._notes.values())
+        if signature is not None:
+            self._logger.info("Rebuilt search index for %d notes", len(self._notes))
+            self._save_index()
+
+    def _save_index(self) -> None:
+        """Persist the search index tagged with the current storage signature."""
+        self._index.signature = self._storage_signature()
+        self._index.save(self.index_path)
+        self._index_pending = 0
+
+    def _index_changed(self, count: int) -> None:
+        """Record unsaved index changes, saving once enough have accumulated."""
+        self._index_pending += count
+        if self._index_pending >= self.index_flush_interval:
+            self._save_index()
+
+    def flush(self) -> None:
+        """Write the search index to disk if it has unsaved changes."""
+        if self._index_pending:
+            self._save_index()
+
+    def close(self) -> None:
+        """Flush unsaved index changes; the manager stays usable afterwards."""
+        self.flush()
+
+    def __enter__(self) -> "NoteManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _sync_index(self, previous: Dict[str, Note]) -> None:
+        """Apply the difference between ``previous`` and current notes to the index."""
+        for note_id, note in previous.items():
+            if self._notes.get(note_id) != note:
+                self._index.remove(note)
+        for note_id, note in self._notes.items():
+            if previous.get(note_id) != note:
+                self._index.add(note)
+
+    def _journal_size(self) -> int:
+        """Return the journal size in bytes (0 when absent)."""
+        try:
+            return self.journal_path.stat().st_size
+        except OSError:
+            return 0
+
     def _refresh_if_stale(self) -> None:
-        """Reload notes if the storage file changed on disk."""
+        """Pick up changes other processes made to the snapshot or journal.
+
+        A rewritten snapshot triggers a full reload; records appended to the
+        journal are replayed incrementally.
+        """
         try:
-            current_mtime = self.storage_path.stat().st_mtime_ns
+            current_mtime: Optional[int] = self.storage_path.stat().st_mtime_ns
         except FileNotFoundError:
-            if self._notes:
-                self._notes = {}
-            self._last_modified = None
-            return
+            current_mtime = None
         except OSError:
             return
 
-        if self._last_modified != current_mtime:
+        journal_size = self._journal_size()
+        if self._last_modified != current_mtime or journal_size < self._journal_offset:
+            previous = self._notes
             self._load()
+            self._sync_index(previous)
+            if self.storage_mode == "snapshot":
+                self._index_changed(1)
+        elif journal_size > self._journal_offset:
+            self._apply_to_index(self._replay_journal())
 
     def list_notes(self, tags: Optional[Sequence[str]] = None) -> List[Note]:
         """Return notes optionally filtered by tags."""
@@ -165,38 +473,68 @@ class NoteManager:
         if not tags:
             return sorted(self._notes.values(), key=lambda note: note.created_at)
 
-        tag_set = {tag.lower() for tag in tags}
-        return [
-            note
-            for note in sorted(self._notes.values(), key=lambda note: note.created_at)
-            if tag_set.issubset(set(note.tags))
-        ]
+        matching_ids = self._index.notes_with_tags(tags)
+        return sorted(
+            (self._notes[note_id] for note_id in matching_ids if note_id in self._notes),
+            key=lambda note: note.created_at,
+        )
 
-    def create_note(self, title: str, content: str, tags: Optional[Sequence[str]] = None) -> Note:
-        """Create and persist a new note."""
-        self._refresh_if_stale()
+    def _build_note(
+        self, title: str, content: str, tags: Optional[Sequence[str]] = None
+    ) -> Note:
+        """Validate input and build a new, unsaved note."""
         if not title.strip():
             raise ValueError("Title cannot be empty.")
         if not content.strip():
             raise ValueError("Content cannot be empty.")
 
-        note_id = uuid4().hex
         timestamp = self._timestamp()
-        normalized_tags = self._normalize_tags(tags)
-
-        note = Note(
-            id=note_id,
+        return Note(
+            id=uuid4().hex,
             title=title.strip(),
             content=content.strip(),
-            tags=normalized_tags,
+            tags=self._normalize_tags(tags),
             created_at=timestamp,
             updated_at=timestamp,
         )
-        self._notes[note.id] = note
-        self._persist()
+
+    def create_note(self, title: str, content: str, tags: Optional[Sequence[str]] = None) -> Note:
+        """Create and persist a new note."""
+        self._refresh_if_stale()
+        note = self._build_note(title, content, tags)
+        self._commit([("create", note)])
         self._logger.info("Created note %s", note.id)
         return note
 
+    def create_notes(self, notes: Iterable[Mapping[str, object]]) -> List[Note]:
+        """Create many notes and persist them in a single write.
+
+        Each item is a mapping with ``title``, ``content`` and optional
+        ``tags``. All items are validated before anything is written, so
+        either every note is created or none is.
+        """
+        self._refresh_if_stale()
+        created: List[Note] = []
+        for position, payload in enumerate(notes):
+            try:
+                tags = payload.get("tags")
+                if tags is not None and not isinstance(tags, (str, list, tuple)):
+                    raise ValueError("Tags must be a string or a list of strings.")
+                created.append(
+                    self._build_note(
+                        str(payload.get("title", "")),
+                        str(payload.get("content", "")),
+                        tags,  # type: ignore[arg-type]
+                    )
+                )
+            except ValueError as exc:
+                raise ValueError(f"Note #{position + 1}: {exc}") from exc
+
+        if created:
+            self._commit([("create", note) for note in created])
+            self._logger.info("Created %d notes", len(created))
+        return created
+
     def get_note(self, note_id: str) -> Optional[Note]:
         """Return a single note by its identifier."""
         self._refresh_if_stale()
@@ -205,26 +543,41 @@ class NoteManager:
     def delete_note(self, note_id: str) -> bool:
         """Delete a note with the provided identifier."""
         self._refresh_if_stale()
-        if note_id not in self._notes:
+        note = self._notes.get(note_id)
+        if note is None:
             return False
 
-        del self._notes[note_id]
-        self._persist()
+        self._commit([("delete", note)])
         self._logger.info("Deleted note %s", note_id)
         return True
 
     def search_notes(
-        self, query: str, tags: Optional[Sequence[str]] = None
+        self,
+        query: str,
+        tags: Optional[Sequence[str]] = None,
+        limit: Optional[int] = None,
     ) -> List[Note]:
-        """Return notes matching the search query and optional tags."""
+        """Return notes matching the search query and optional tags.
+
+        All query clauses must match: plain words, ``"exact phrases"``,
+        ``prefix*`` and ``tag:name``. Results are ranked by BM25 relevance,
+        with older notes first among equal scores.
+        """
         self._refresh_if_stale()
-        query_lower = query.lower().strip()
-        if not query_lower:
+        if not query.strip():
             raise ValueError("Search query cannot be empty.")
 
-        candidates = self.list_notes(tags)
-        return [
-            note
-            for note in candidates
-            if query_lower in note.title.lower() or query_lower in note.content.lower()
+        scored = [
+            (-score, self._notes[note_id].created_at, note_id)
+            for note_id, score in self._index.search(query, tags)
+            if note_id in self._notes
         ]
+        ranked = heapq.nsmallest(limit, scored) if limit is not None else sorted(scored)
+        return [self._notes[note_id] for _, _, note_id in ranked]
+
+    def reindex(self) -> int:
+        """Rebuild and persist the search index from the stored notes."""
+        self._refresh_if_stale()
+        self._index.rebuild(self._notes.values())
+        self._save_index()
+        return len(self._index)
@@ -0,0 +1,323 @@
+"""Persisted inverted index with BM25 ranking for note search."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import math
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from .core import Note
+
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+TOKEN_PATTERN = re.compile(r"\w+")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+@dataclass
+class QueryClause:
+    """One AND-ed clause of a parsed search query."""
+
+    kind: str  # "term", "prefix", "phrase" or "tag"
+    tokens: List[str]
+
+
+def parse_query(query: str) -> List[QueryClause]:
+    """Parse a query string into AND-ed clauses.
+
+    Supported syntax: plain terms, ``"quoted phrases"``, ``prefix*`` and
+    ``tag:name``.
+    """
+    clauses: List[QueryClause] = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) == 1:
+                clauses.append(QueryClause("term", tokens))
+            elif tokens:
+                clauses.append(QueryClause("phrase", tokens))
+            continue
+
+        if word.lower().startswith("tag:") and len(word) > 4:
+            clauses.append(QueryClause("tag", [word[4:].strip().lower()]))
+            continue
+
+        is_prefix = word.endswith("*")
+        tokens = tokenize(word)
+        if is_prefix and len(tokens) == 1:
+            clauses.append(QueryClause("prefix", tokens))
+        elif len(tokens) == 1:
+            clauses.append(QueryClause("term", tokens))
+        elif tokens:
+            # Words joined by punctuation (e.g. "v1.2") must appear together
+            clauses.append(QueryClause("phrase", tokens))
+    return clauses
+
+
+class SearchIndex:
+    """Token inverted index over note titles and content, plus tag postings.
+
+    Postings keep token positions so phrase queries can be answered without
+    touching note text. The index is updated incrementally with ``add`` and
+    ``remove`` and can be saved next to the notes store.
+    """
+
+    def __init__(self) -> None:
+        self.postings: Dict[str, Dict[str, List[int]]] = {}
+        self.doc_lengths: Dict[str, int] = {}
+        self.tag_postings: Dict[str, Set[str]] = {}
+        self.signature: Optional[Dict[str, int]] = None
+        self._total_length = 0
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, note_id: object) -> bool:
+        return note_id in self.doc_lengths
+
+    def add(self, note: "Note") -> None:
+        """Index a note. Call ``remove`` first when replacing a note."""
+        title_tokens = tokenize(note.title)
+        # Leave a gap so phrases cannot span the title/content boundary
+        offset = len(title_tokens) + 1
+        positions: Dict[str, List[int]] = {}
+        for position, token in enumerate(title_tokens):
+            positions.setdefault(token, []).append(position)
+        content_tokens = tokenize(note.content)
+        for position, token in enumerate(content_tokens, start=offset):
+            positions.setdefault(token, []).append(position)
+
+        for token, token_positions in positions.items():
+            term_postings = self.postings.get(token)
+            if term_postings is None:
+                term_postings = self.postings[token] = {}
+                self._sorted_terms = None
+            term_postings[note.id] = token_positions
+
+        length = len(title_tokens) + len(content_tokens)
+        self._total_length += length - self.doc_lengths.get(note.id, 0)
+        self.doc_lengths[note.id] = length
+        for tag in note.tags:
+            self.tag_postings.setdefault(tag, set()).add(note.id)
+
+    def remove(self, note: "Note") -> None:
+        """Remove a note from the index.
+
+        The note is re-tokenized to find its postings, so it must be the
+        same version that was indexed.
+        """
+        length = self.doc_lengths.pop(note.id, None)
+        if length is None:
+            return
+        self._total_length -= length
+
+        for token in set(tokenize(note.title)) | set(tokenize(note.content)):
+            term_postings = self.postings.get(token)
+            if term_postings is None:
+                continue
+            term_postings.pop(note.id, None)
+            if not term_postings:
+                del self.postings[token]
+                self._sorted_terms = None
+
+        for tag in note.tags:
+            ids = self.tag_postings.get(tag)
+            if ids is not None:
+                ids.discard(note.id)
+                if not ids:
+                    del self.tag_postings[tag]
+
+    def rebuild(self, notes: Iterable["Note"]) -> None:
+        """Replace the index contents with the given notes."""
+        self.__init__()
+        for note in notes:
+            self.add(note)
+
+    def notes_with_tags(self, tags: Iterable[str]) -> Set[str]:
+        """Return ids of notes carrying every one of ``tags``."""
+        result: Optional[Set[str]] = None
+        for tag in tags:
+            ids = self.tag_postings.get(tag.lower(), set())
+            result = set(ids) if result is None else result & ids
+            if not result:
+                return set()
+        return result if result is not None else set(self.doc_lengths)
+
+    def _expand_prefix(self, prefix: str) -> List[str]:
+        """Return indexed terms starting with ``prefix``."""
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self.postings)
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        terms = []
+        for term in self._sorted_terms[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _phrase_matches(self, tokens: List[str]) -> Set[str]:
+        """Return ids of notes containing ``tokens`` as consecutive words."""
+        term_postings = [self.postings.get(token) for token in tokens]
+        if not all(term_postings):
+            return set()
+        candidates = set.intersection(*(set(p) for p in term_postings))
+        matches = set()
+        for note_id in candidates:
+            following = [set(p[note_id]) for p in term_postings[1:]]
+            for start in term_postings[0][note_id]:
+                if all(
+                    start + offset in positions
+                    for offset, positions in enumerate(following, start=1)
+                ):
+                    matches.add(note_id)
+                    break
+        return matches
+
+    def _bm25(self, term: str, note_ids: Set[str], scores: Dict[str, float]) -> None:
+        """Add the BM25 contribution of ``term`` to ``scores`` for ``note_ids``."""
+        term_postings = self.postings.get(term)
+        if not term_postings:
+            return
+        doc_count = len(self.doc_lengths)
+        avg_length = self._total_length / doc_count if doc_count else 0.0
+        df = len(term_postings)
+        idf = math.log(1 + (doc_count - df + 0.5) / (df + 0.5))
+        # Walk whichever side is smaller
+        if len(term_postings) < len(note_ids):
+            pairs = ((i, p) for i, p in term_postings.items() if i in note_ids)
+        else:
+            pairs = ((i, term_postings[i]) for i in note_ids if i in term_postings)
+        for note_id, positions in pairs:
+            tf = len(positions)
+            norm = 1 - BM25_B + BM25_B * (
+                self.doc_lengths[note_id] / avg_length if avg_length else 0.0
+            )
+            scores[note_id] = scores.get(note_id, 0.0) + idf * (
+                tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+            )
+
+    def search(
+        self,
+        query: str,
+        tags: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """Return ``(note_id, score)`` pairs matching every query clause.
+
+        Results are ordered by descending BM25 score.
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        candidate_sets: List[Set[str]] = []
+        scoring_terms: List[str] = []
+        if tags:
+            candidate_sets.append(self.notes_with_tags(tags))
+        for clause in clauses:
+            if clause.kind == "tag":
+                candidate_sets.append(self.notes_with_tags(clause.tokens))
+            elif clause.kind == "term":
+                candidate_sets.append(set(self.postings.get(clause.tokens[0], ())))
+                scoring_terms.append(clause.tokens[0])
+            elif clause.kind == "prefix":
+                expanded = self._expand_prefix(clause.tokens[0])
+                ids: Set[str] = set()
+                for term in expanded:
+                    ids.update(self.postings[term])
+                candidate_sets.append(ids)
+                scoring_terms.extend(expanded)
+            else:
+                candidate_sets.append(self._phrase_matches(clause.tokens))
+                scoring_terms.extend(clause.tokens)
+
+        candidate_sets.sort(key=len)
+        matches = candidate_sets[0]
+        for ids in candidate_sets[1:]:
+            if not matches:
+                break
+            matches = matches & ids
+        if not matches:
+            return []
+
+        scores = {note_id: 0.0 for note_id in matches}
+        for term in dict.fromkeys(scoring_terms):
+            self._bm25(term, matches, scores)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit] if limit is not None else ranked
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize the index to a JSON-compatible dictionary."""
+        return {
+            "version": INDEX_VERSION,
+            "signature": self.signature,
+            "postings": self.postings,
+            "doc_lengths": self.doc_lengths,
+            "tags": {tag: sorted(ids) for tag, ids in self.tag_postings.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, object]) -> "SearchIndex":
+        """Create an index from serialized data."""
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError("Unsupported index version.")
+        index = cls()
+        index.postings = dict(payload["postings"])  # type: ignore[arg-type]
+        index.doc_lengths = dict(payload["doc_lengths"])  # type: ignore[arg-type]
+        index.tag_postings = {
+            tag: set(ids) for tag, ids in dict(payload["tags"]).items()  # type: ignore[arg-type]
+        }
+        index.signature = payload.get("signature")  # type: ignore[assignment]
+        index._total_length = sum(index.doc_lengths.values())
+        return index
+
+    def save(self, path: Path) -> None:
+        """Persist the index using an atomic write."""
+        temp_path: Optional[Path] = None
+        try:
+            with NamedTemporaryFile(
+                mode="w",
+                encoding="utf-8",
+                delete=False,
+                dir=str(path.parent),
+            ) as temp_file:
+                temp_path = Path(temp_file.name)
+                json.dump(self.to_dict(), temp_file, separators=(",", ":"))
+        except OSError as exc:
+            LOGGER.error("Failed to persist search index: %s", exc)
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+            return
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SearchIndex"]:
+        """Load an index from disk, returning None if missing or invalid."""
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                return cls.from_dict(json.load(handle))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            LOGGER.warning("Ignoring unreadable search index %s: %s", path, exc)
+            return None
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 import argparse
+import json
 import logging
 import sys
 from pathlib import Path
-from typing import Iterable, Optional, Sequence
+from typing import Iterable, List, Optional, Sequence
 
 from .core import NoteManager
 from .utils import format_note_detail, format_note_summary
@@ -26,6 +27,13 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_STORE,
         help=f"Path to notes storage file (default: {DEFAULT_STORE})",
     )
+    parser.add_argument(
+        "--storage-mode",
+        choices=NoteManager.STORAGE_MODES,
+        default="snapshot",
+        help="snapshot rewrites the store on every change; journal appends "
+        "changes to a log that is compacted periodically (default: snapshot).",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -74,7 +82,16 @@ def build_parser() -> argparse.ArgumentParser:
     )
 
     search_parser = subparsers.add_parser("search", help="Search notes by text.")
-    search_parser.add_argument("query", help="Text to search for in notes.")
+    search_parser.add_argument(
+        "query",
+        help='Words to search for; supports "exact phrases", prefix* and tag:name.',
+    )
+    search_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of ranked results to show.",
+    )
     search_parser.add_argument(
         "--tag",
         action="append",
@@ -83,6 +100,19 @@ def build_parser() -> argparse.ArgumentParser:
         help="Filter search results by tags.",
     )
 
+    import_parser = subparsers.add_parser(
+        "import", help="Bulk-create notes from a JSON or JSON-lines file."
+    )
+    import_parser.add_argument(
+        "path",
+        type=Path,
+        help="File holding a JSON list of {title, content, tags} objects, "
+        "or one such object per line.",
+    )
+
+    subparsers.add_parser("compact", help="Fold the journal into the notes store.")
+    subparsers.add_parser("reindex", help="Rebuild the search index.")
+
     return parser
 
 
@@ -108,6 +138,31 @@ def resolve_content(args: argparse.Namespace) -> str:
     raise ValueError("Content is required (pass --content, --content-file, or pipe stdin).")
 
 
+def load_import_file(path: Path) -> List[dict]:
+    """Read notes to import from a JSON list or JSON-lines file."""
+    text = path.read_text(encoding="utf-8")
+    stripped = text.lstrip()
+    if stripped.startswith("["):
+        payload = json.loads(stripped)
+    else:
+        payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if not all(isinstance(item, dict) for item in payload):
+        raise ValueError("Import file must contain note objects.")
+    return payload
+
+
+def handle_import(manager: NoteManager, path: Path) -> int:
+    """Handle the import command."""
+    try:
+        notes = manager.create_notes(load_import_file(path))
+    except (OSError, ValueError) as exc:
+        print(f"Import failed: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Imported {len(notes)} notes.")
+    return 0
+
+
 def handle_list(manager: NoteManager, tags: Iterable[str]) -> int:
     """Handle the list command."""
     notes = manager.list_notes(tags=list(tags))
@@ -148,10 +203,15 @@ def handle_delete(manager: NoteManager, note_id: str, confirmed: bool) -> int:
     return 0
 
 
-def handle_search(manager: NoteManager, query: str, tags: Iterable[str]) -> int:
+def handle_search(
+    manager: NoteManager,
+    query: str,
+    tags: Iterable[str],
+    limit: Optional[int] = None,
+) -> int:
     """Handle the search command."""
     try:
-        results = manager.search_notes(query, tags=list(tags))
+        results = manager.search_notes(query, tags=list(tags), limit=limit)
     except ValueError as exc:
         print(str(exc), file=sys.stderr)
         return 1
@@ -171,8 +231,14 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     args = parser.parse_args(argv)
 
     configure_logging(args.log_level)
-    manager = NoteManager(args.store)
+    with NoteManager(args.store, storage_mode=args.storage_mode) as manager:
+        return run_command(parser, args, manager)
 
+
+def run_command(
+    parser: argparse.ArgumentParser, args: argparse.Namespace, manager: NoteManager
+) -> int:
+    """Dispatch the parsed command to its handler."""
     if args.command == "create":
         try:
             content = resolve_content(args)
@@ -201,7 +267,20 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         return handle_delete(manager, args.note_id, args.yes)
 
     if args.command == "search":
-        return handle_search(manager, args.query, args.tags)
+        return handle_search(manager, args.query, args.tags, args.limit)
+
+    if args.command == "import":
+        return handle_import(manager, args.path)
+
+    if args.command == "compact":
+        manager.compact()
+        print("Compacted notes journal.")
+        return 0
+
+    if args.command == "reindex":
+        count = manager.reindex()
+        print(f"Indexed {count} notes.")
+        return 0
 
     parser.error("Unknown command.")
     return 2
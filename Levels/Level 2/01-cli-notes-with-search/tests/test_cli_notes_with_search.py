@@ -8,6 +8,7 @@ from pathlib import Path
 import pytest
 
 from cli_notes_with_search.core import NoteManager
+from cli_notes_with_search.index import SearchIndex
 from cli_notes_with_search.main import main as cli_main
 
 
@@ -65,6 +66,209 @@ def test_search_notes_matches_title_and_content(tmp_path: Path) -> None:
     assert results[0].title == "Shopping list"
 
 
+def test_search_supports_phrase_prefix_and_tag_queries(tmp_path: Path) -> None:
+    """Search should AND clauses and support phrases, prefixes and tags."""
+    manager = NoteManager(tmp_path / "notes.json")
+    plan = manager.create_note("Release plan", "Ship the release candidate", tags=["work"])
+    manager.create_note("Candidate list", "release notes draft", tags=["hiring"])
+
+    assert manager.search_notes('"release candidate"') == [plan]
+    assert {note.id for note in manager.search_notes("cand*")} == {
+        note.id for note in manager.list_notes()
+    }
+    assert manager.search_notes("release tag:work") == [plan]
+    assert manager.search_notes("release", tags=["hiring"])[0].title == "Candidate list"
+    assert manager.search_notes("release missingword") == []
+
+
+def test_search_ranks_results_by_relevance(tmp_path: Path) -> None:
+    """Notes mentioning the query more often should rank first."""
+    manager = NoteManager(tmp_path / "notes.json")
+    manager.create_note("Groceries", "milk and bread and eggs and butter")
+    best = manager.create_note("Milk", "milk milk milk")
+
+    results = manager.search_notes("milk")
+    assert results[0].id == best.id
+    assert len(manager.search_notes("milk", limit=1)) == 1
+
+
+def test_search_index_is_persisted_and_updated(tmp_path: Path) -> None:
+    """The index should be saved next to the store and kept in sync."""
+    storage = tmp_path / "notes.json"
+    manager = NoteManager(storage)
+    note = manager.create_note("Indexed", "persisted words")
+    manager.flush()
+    assert (tmp_path / "notes.index.json").exists()
+
+    other = NoteManager(storage)
+    assert other.search_notes("persisted")[0].id == note.id
+
+    other.delete_note(note.id)
+    other.create_note("Fresh", "brand new words")
+    # The first manager notices the external change and syncs its index
+    assert manager.search_notes("persisted") == []
+    assert manager.search_notes("brand")[0].title == "Fresh"
+
+
+def test_search_index_is_saved_in_batches(tmp_path: Path) -> None:
+    """Writes should not reserialize the index until the flush interval."""
+    storage = tmp_path / "notes.json"
+    index_path = tmp_path / "notes.index.json"
+    manager = NoteManager(storage, index_flush_interval=3)
+    manager.create_note("One", "alpha")
+    manager.create_note("Two", "beta")
+    assert not index_path.exists()
+
+    # A stale or missing index is rebuilt on load
+    assert NoteManager(storage).search_notes("beta")[0].title == "Two"
+    manager.create_note("Three", "gamma")
+    saved = json.loads(index_path.read_text())
+    assert len(saved["doc_lengths"]) == 3
+
+
+def test_closing_manager_saves_index(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Leaving the context manager should save the index without flush()."""
+    storage = tmp_path / "notes.json"
+    with NoteManager(storage) as manager:
+        manager.create_note("Kept", "closing words")
+
+    def fail_rebuild(self, notes):
+        raise AssertionError("index was rebuilt")
+
+    monkeypatch.setattr(SearchIndex, "rebuild", fail_rebuild)
+    assert NoteManager(storage).search_notes("closing")[0].title == "Kept"
+
+
+def test_journal_mode_appends_without_rewriting_store(tmp_path: Path) -> None:
+    """Journal mode should append operations and replay them on load."""
+    storage = tmp_path / "notes.json"
+    manager = NoteManager(storage, storage_mode="journal")
+    first = manager.create_note("First", "alpha words")
+    second = manager.create_note("Second", "beta words")
+    manager.delete_note(first.id)
+
+    assert not storage.exists()
+    journal_lines = (tmp_path / "notes.journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in journal_lines] == [
+        "create",
+        "create",
+        "delete",
+    ]
+
+    reloaded = NoteManager(storage, storage_mode="journal")
+    assert [note.id for note in reloaded.list_notes()] == [second.id]
+    assert reloaded.search_notes("beta")[0].id == second.id
+    assert reloaded.search_notes("alpha") == []
+
+
+def test_journal_compacts_into_snapshot(tmp_path: Path) -> None:
+    """Reaching the compaction threshold should fold the journal into the store."""
+    storage = tmp_path / "notes.json"
+    manager = NoteManager(storage, storage_mode="journal", compact_threshold=3)
+    for number in range(4):
+        manager.create_note(f"Note {number}", "body")
+
+    assert len(read_storage(storage)["notes"]) == 3
+    assert len((tmp_path / "notes.journal").read_text().splitlines()) == 1
+    assert len(NoteManager(storage).list_notes()) == 4
+
+
+def test_journal_ignores_torn_record(tmp_path: Path) -> None:
+    """A partially written journal record should be skipped and overwritten."""
+    storage = tmp_path / "notes.json"
+    manager = NoteManager(storage, storage_mode="journal")
+    manager.create_note("Kept", "body")
+    with (tmp_path / "notes.journal").open("a", encoding="utf-8") as handle:
+        handle.write('{"op": "create", "note": {"id": "x"')
+
+    reloaded = NoteManager(storage, storage_mode="journal")
+    assert [note.title for note in reloaded.list_notes()] == ["Kept"]
+    reloaded.create_note("After", "body")
+    assert len(NoteManager(storage, storage_mode="journal").list_notes()) == 2
+
+
+def test_journal_keeps_records_from_other_writers(tmp_path: Path, monkeypatch) -> None:
+    """Appending must replay, not truncate, records another writer added."""
+    storage = tmp_path / "notes.json"
+    first = NoteManager(storage, storage_mode="journal")
+    second = NoteManager(storage, storage_mode="journal")
+    first.create_note("From first", "body")
+    second.create_note("From second", "body")
+
+    # Simulate the other append landing after first's pre-write refresh
+    refresh = first._refresh_if_stale
+    calls = []
+
+    def skip_first_refresh() -> None:
+        calls.append(1)
+        if len(calls) > 1:
+            refresh()
+
+    monkeypatch.setattr(first, "_refresh_if_stale", skip_first_refresh)
+    first.create_note("First again", "body")
+
+    titles = {note.title for note in NoteManager(storage, storage_mode="journal").list_notes()}
+    assert titles == {"From first", "From second", "First again"}
+    assert len(first.search_notes("body")) == 3
+
+
+def test_failed_write_leaves_memory_unchanged(tmp_path: Path, monkeypatch) -> None:
+    """A write error should propagate without applying the change in memory."""
+    import cli_notes_with_search.core as core
+
+    def fail(*_args: object) -> None:
+        raise OSError("disk full")
+
+    journal = NoteManager(tmp_path / "journal.json", storage_mode="journal")
+    snapshot = NoteManager(tmp_path / "snapshot.json")
+    monkeypatch.setattr(core.os, "fsync", fail)
+    with pytest.raises(OSError):
+        journal.create_note("Lost", "body")
+    with pytest.raises(OSError):
+        snapshot.create_note("Lost", "body")
+    monkeypatch.undo()
+
+    assert journal.list_notes() == []
+    assert snapshot.list_notes() == []
+    assert journal.search_notes("lost") == []
+
+
+def test_create_notes_bulk_is_atomic(tmp_path: Path) -> None:
+    """Bulk creation writes all notes at once or none when one is invalid."""
+    storage = tmp_path / "notes.json"
+    manager = NoteManager(storage, storage_mode="journal")
+    created = manager.create_notes(
+        {"title": f"Bulk {n}", "content": "imported", "tags": ["bulk"]}
+        for n in range(50)
+    )
+    assert len(created) == 50
+    assert len((tmp_path / "notes.journal").read_text().splitlines()) == 50
+    assert len(manager.search_notes("imported tag:bulk")) == 50
+
+    with pytest.raises(ValueError, match="#2"):
+        manager.create_notes([{"title": "ok", "content": "x"}, {"title": "bad"}])
+    assert len(manager.list_notes()) == 50
+
+    (note,) = manager.create_notes([{"title": "Str", "content": "x", "tags": "work, Urgent"}])
+    assert note.tags == ["urgent", "work"]
+
+
+def test_cli_import_command(tmp_path: Path) -> None:
+    """The import command should bulk-create notes from JSON lines."""
+    storage = tmp_path / "notes.json"
+    source = tmp_path / "import.jsonl"
+    source.write_text(
+        '{"title": "One", "content": "first"}\n{"title": "Two", "content": "second"}\n',
+        encoding="utf-8",
+    )
+
+    exit_code = cli_main(
+        ["--store", str(storage), "--storage-mode", "journal", "import", str(source)]
+    )
+    assert exit_code == 0
+    assert len(NoteManager(storage).list_notes()) == 2
+
+
 def test_delete_note_removes_entry(tmp_path: Path) -> None:
     """Deleting a note removes it from storage."""
     manager = NoteManager(tmp_path / "notes.json")
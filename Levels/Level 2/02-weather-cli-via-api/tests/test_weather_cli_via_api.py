@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import requests
 
+from weather_cli_via_api.cache import ResponseCache
 from weather_cli_via_api.core import WeatherClient, WeatherServiceError
 from weather_cli_via_api.main import main as cli_main
 from weather_cli_via_api.rendering import render_report
@@ -201,8 +209,10 @@ def test_get_weather_uses_cache_when_available(tmp_path: Path) -> None:
     assert "Paris, FR" in report
 
 
-def test_cache_entry_expires_when_ttl_elapsed(tmp_path: Path) -> None:
-    cache_file = tmp_path / "cache.json"
+def test_cache_entry_expires_when_ttl_elapsed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_file = tmp_path / "cache.sqlite3"
     prime_responses = {
         "weather": [
             (
@@ -226,10 +236,8 @@ def test_cache_entry_expires_when_ttl_elapsed(tmp_path: Path) -> None:
     )
     client.get_weather("41.9028,12.4964")
 
-    cache_data = json.loads(cache_file.read_text())
-    for item in cache_data.values():
-        item["timestamp"] = 0
-    cache_file.write_text(json.dumps(cache_data))
+    later = time.time() + 3600
+    monkeypatch.setattr("weather_cli_via_api.cache.time.time", lambda: later)
 
     fresh_responses = {
         "weather": [
@@ -258,6 +266,262 @@ def test_cache_entry_expires_when_ttl_elapsed(tmp_path: Path) -> None:
     assert "Rome, IT" in report
 
 
+def test_response_cache_per_key_expiry_and_sharing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache_file = tmp_path / "cache.sqlite3"
+    now = [1_700_000_000.0]
+    monkeypatch.setattr("weather_cli_via_api.cache.time.time", lambda: now[0])
+
+    cache = ResponseCache(cache_file)
+    cache.set("short", {"value": 1}, ttl=5)
+    cache.set("long", {"value": 2})
+
+    # A second instance for the same file shares the in-memory front
+    other = ResponseCache(cache_file)
+    assert other.get("short", max_age=600) == {"value": 1}
+
+    now[0] += 10
+    assert cache.get("short", max_age=600) is None
+    assert cache.get("long", max_age=600) == {"value": 2}
+    assert cache.get("long", max_age=5) is None
+
+    with sqlite3.connect(cache_file) as conn:
+        indexes = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        }
+    assert {"idx_entries_stored_at", "idx_entries_expires_at"} <= indexes
+
+
+def test_response_cache_evicts_oldest_beyond_max_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = [1_700_000_000.0]
+    monkeypatch.setattr("weather_cli_via_api.cache.time.time", lambda: now[0])
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_entries=10, memory_entries=4)
+
+    for index in range(25):
+        now[0] += 1
+        cache.set(f"key-{index}", index)
+    cache.evict()
+
+    assert cache.count() == 10
+    assert cache.get("key-0", max_age=3600) is None
+    assert cache.get("key-24", max_age=3600) == 24
+
+
+def test_response_cache_imports_legacy_json_file(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.json"
+    cache_file.write_text(
+        json.dumps({"geo::paris": {"timestamp": int(time.time()), "value": {"a": 1}}})
+    )
+
+    cache = ResponseCache(cache_file)
+
+    assert cache.get("geo::paris", max_age=600) == {"a": 1}
+    assert cache_file.read_bytes().startswith(b"SQLite format 3")
+
+
+def test_response_cache_migrates_legacy_default_name(tmp_path: Path) -> None:
+    legacy_file = tmp_path / "weather_cli_cache.json"
+    legacy_file.write_text(
+        json.dumps({"geo::oslo": {"timestamp": int(time.time()), "value": [1, 2]}})
+    )
+
+    cache = ResponseCache(tmp_path / "weather_cli_cache.sqlite3")
+
+    assert cache.get("geo::oslo", max_age=600) == [1, 2]
+    assert not legacy_file.exists()
+
+
+def test_response_cache_leaves_foreign_file_alone(tmp_path: Path) -> None:
+    notes = tmp_path / "notes.txt"
+    notes.write_text("not a cache")
+
+    cache = ResponseCache(notes)
+    cache.set("key", 1)
+
+    assert notes.read_text() == "not a cache"
+
+
+def _write_cache_entries(cache_file: str, worker: int) -> None:
+    cache = ResponseCache(Path(cache_file))
+    for index in range(50):
+        cache.set(f"worker-{worker}-{index}", {"worker": worker, "index": index})
+
+
+def test_response_cache_concurrent_processes(tmp_path: Path) -> None:
+    cache_file = tmp_path / "cache.sqlite3"
+    processes = [
+        multiprocessing.Process(target=_write_cache_entries, args=(str(cache_file), n))
+        for n in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    with sqlite3.connect(cache_file) as conn:
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+    assert count == 200
+
+
+class StubWeatherServer:
+    """Local HTTP server imitating the geocoding and weather endpoints."""
+
+    CITIES = {
+        "london": (51.5074, -0.1278, "GB"),
+        "paris": (48.8566, 2.3522, "FR"),
+        "rome": (41.9028, 12.4964, "IT"),
+    }
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: Counter[str] = Counter()
+        self.lock = threading.Lock()
+        self.max_concurrent = 0
+        self._active = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                url = urlparse(self.path)
+                params = {k: v[0] for k, v in parse_qs(url.query).items()}
+                status, payload = stub.handle(url.path, params)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def handle(self, path: str, params: dict[str, str]) -> tuple[int, Any]:
+        with self.lock:
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+        try:
+            time.sleep(self.delay)
+            if path.endswith("/direct"):
+                query = params["q"].lower()
+                with self.lock:
+                    self.calls[f"geo:{query}"] += 1
+                city = self.CITIES.get(query)
+                if city is None:
+                    return 200, []
+                return 200, make_geocode_payload(
+                    query.title(), lat=city[0], lon=city[1], country=city[2]
+                )
+            key = f"{path.rsplit('/', 1)[-1]}:{params['lat']},{params['lon']}"
+            with self.lock:
+                self.calls[key] += 1
+            return 200, make_current_payload({"name": f"Stub {params['lat']}"})
+        finally:
+            with self.lock:
+                self._active -= 1
+
+
+@pytest.fixture
+def stub_server() -> Iterator[StubWeatherServer]:
+    stub = StubWeatherServer(delay=0.2)
+    stub.thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def build_stub_client(stub: StubWeatherServer, **kwargs: Any) -> WeatherClient:
+    return WeatherClient(
+        api_key="token",
+        use_cache=False,
+        api_base_url=f"{stub.base_url}/data/2.5",
+        geocode_url=f"{stub.base_url}/geo/1.0/direct",
+        **kwargs,
+    )
+
+
+def test_get_weather_many_fetches_concurrently_in_order(
+    stub_server: StubWeatherServer,
+) -> None:
+    client = build_stub_client(stub_server, max_workers=4)
+
+    start = time.perf_counter()
+    results = client.get_weather_many(["London", "Paris", "Rome", "Atlantis"])
+    elapsed = time.perf_counter() - start
+
+    assert "Stub 51.5074" in results[0]
+    assert "Stub 48.8566" in results[1]
+    assert "Stub 41.9028" in results[2]
+    assert isinstance(results[3], WeatherServiceError)
+    # Sequential fetching would take at least 7 x 0.2s
+    assert elapsed < 1.0
+    assert stub_server.max_concurrent > 1
+
+
+def test_get_weather_many_coalesces_duplicate_requests(
+    stub_server: StubWeatherServer,
+) -> None:
+    client = build_stub_client(stub_server, max_workers=8)
+
+    results = client.get_weather_many(
+        ["London", "london", "London", "48.8566,2.3522", "48.85660, 2.35220"]
+    )
+
+    assert all(isinstance(result, str) for result in results)
+    assert stub_server.calls["geo:london"] == 1
+    assert stub_server.calls["weather:51.5074,-0.1278"] == 1
+    assert stub_server.calls["weather:48.8566,2.3522"] == 1
+
+    # Geocoding results are memoized for later calls
+    client.get_weather("LONDON")
+    assert stub_server.calls["geo:london"] == 1
+
+
+def test_main_fetches_locations_file_concurrently(
+    stub_server: StubWeatherServer,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    locations_file = tmp_path / "cities.txt"
+    locations_file.write_text("# dashboard\nLondon\nParis\n\nRome\n")
+    monkeypatch.setenv("WEATHER_API_KEY", "token")
+    monkeypatch.setattr(
+        "weather_cli_via_api.core.API_BASE_URL", f"{stub_server.base_url}/data/2.5"
+    )
+    monkeypatch.setattr(
+        "weather_cli_via_api.core.GEOCODE_URL", f"{stub_server.base_url}/geo/1.0/direct"
+    )
+
+    exit_code = cli_main(
+        [
+            "--locations-file",
+            str(locations_file),
+            "--workers",
+            "3",
+            "--no-use-cache",
+            "--format",
+            "json",
+        ]
+    )
+
+    assert exit_code == 0
+    output = json.loads(capsys.readouterr().out)
+    assert [item["location"] for item in output] == [
+        "Stub 51.5074, GB",
+        "Stub 48.8566, GB",
+        "Stub 41.9028, GB",
+    ]
+    assert stub_server.max_concurrent > 1
+
+
 def test_get_weather_raises_on_api_error(tmp_path: Path) -> None:
     responses = {
         "weather": [({"cod": 401, "message": "Invalid API key"}, 401)],
@@ -1,14 +1,24 @@
-"""Simple JSON file-based cache for API responses."""
+"""Response cache: shared in-memory LRU in front of an indexed SQLite store."""
 
 from __future__ import annotations
 
 import json
 import logging
+import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-DEFAULT_CACHE_NAME = "weather_cli_cache.json"
+DEFAULT_CACHE_NAME = "weather_cli_cache.sqlite3"
+# Older versions kept a JSON cache under the same name with this suffix
+LEGACY_CACHE_SUFFIX = ".json"
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MEMORY_ENTRIES = 256
+
+# SQLite files start with this header; anything else is a legacy JSON cache
+_SQLITE_HEADER = b"SQLite format 3\x00"
 
 
 def _default_cache_path() -> Path:
@@ -23,42 +33,269 @@ def _default_cache_path() -> Path:
     return base / DEFAULT_CACHE_NAME
 
 
-class ResponseCache:
-    """JSON-backed cache for storing API responses."""
+def _parse_legacy_json(path: Path) -> list[tuple[str, int, str]] | None:
+    """Return ``(key, stored_at, value)`` rows from a legacy JSON cache.
+
+    Returns None when ``path`` cannot be read or is not in that format.
+    """
+    try:
+        raw = path.read_text(encoding="utf-8")
+        data = json.loads(raw) if raw else {}
+        if not isinstance(data, dict):
+            return None
+        return [
+            (str(key), int(entry.get("timestamp", 0)), json.dumps(entry["value"]))
+            for key, entry in data.items()
+        ]
+    except (OSError, ValueError, AttributeError, KeyError, TypeError):
+        return None
 
-    def __init__(self, cache_path: Path | None = None) -> None:
-        self.cache_path = cache_path or _default_cache_path()
 
-    def _read_cache(self) -> dict[str, Any]:
-        if not self.cache_path.exists():
-            return {}
+class _CacheStore:
+    """One SQLite cache file plus its in-memory LRU, shared per process.
+
+    Rows hold the JSON value, when it was stored and an optional absolute
+    expiry. Both timestamps are indexed so expiry purges and size-bounded
+    eviction never scan the table. The database runs in WAL mode with a
+    busy timeout, so concurrent CLI processes can read while one writes and
+    each write replaces a single row instead of rewriting the whole cache.
+    """
+
+    def __init__(self, path: Path, max_entries: int, memory_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: OrderedDict[str, tuple[int, int | None, Any]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._writes_since_evict = 0
+
+    def _connect(self) -> sqlite3.Connection | None:
+        """Open the database on first use; None if it cannot be opened."""
+        if self._conn is not None:
+            return self._conn
         try:
-            raw = self.cache_path.read_text(encoding="utf-8")
-            return json.loads(raw) if raw else {}
-        except (OSError, json.JSONDecodeError):
-            logging.debug("Cache file is unreadable; starting with empty cache")
-            return {}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            legacy, legacy_path = self._find_legacy_json()
+            if legacy_path == self.path:
+                # The database is created in place of the old JSON file
+                self.path.unlink()
+            conn = sqlite3.connect(
+                str(self.path), timeout=5.0, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    stored_at INTEGER NOT NULL,
+                    expires_at INTEGER,
+                    value TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_stored_at
+                    ON entries (stored_at);
+                CREATE INDEX IF NOT EXISTS idx_entries_expires_at
+                    ON entries (expires_at) WHERE expires_at IS NOT NULL;
+                """
+            )
+            if legacy:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO entries (key, stored_at, value) "
+                        "VALUES (?, ?, ?)",
+                        legacy,
+                    )
+                logging.debug("Imported %d entries from JSON cache", len(legacy))
+            if legacy_path is not None and legacy_path != self.path:
+                legacy_path.unlink(missing_ok=True)
+        except (OSError, sqlite3.Error) as exc:
+            logging.debug("Cache database is unavailable: %s", exc)
+            return None
+        self._conn = conn
+        return conn
 
-    def _write_cache(self, data: dict[str, Any]) -> None:
+    def _find_legacy_json(self) -> tuple[list[tuple[str, int, str]], Path | None]:
+        """Find a JSON cache left by older versions.
+
+        Older versions wrote JSON either at ``path`` itself (an explicit
+        cache path) or, by default, under the same name with a ``.json``
+        suffix. Returns its entries and the file to remove once they are
+        imported. A file that does not parse as the legacy format is never
+        returned, so it is left alone.
+        """
         try:
-            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            self.cache_path.write_text(json.dumps(data), encoding="utf-8")
-        except OSError as exc:
-            logging.debug("Unable to persist cache: %s", exc)
+            with self.path.open("rb") as handle:
+                header = handle.read(len(_SQLITE_HEADER))
+        except FileNotFoundError:
+            header = None
+        if header:
+            if header == _SQLITE_HEADER:
+                return [], None
+            rows = _parse_legacy_json(self.path)
+            if rows is None:
+                logging.warning(
+                    "Cache path %s is not a cache file; leaving it untouched", self.path
+                )
+                return [], None
+            return rows, self.path
 
-    def get(self, key: str, max_age: int) -> Any | None:
-        """Retrieve cached data if it is still fresh."""
-        cache = self._read_cache()
-        entry = cache.get(key)
-        if not entry:
-            return None
-        if int(time.time()) - int(entry.get("timestamp", 0)) > max_age:
+        legacy_path = self.path.with_suffix(LEGACY_CACHE_SUFFIX)
+        if header is not None or legacy_path == self.path or not legacy_path.exists():
+            return [], None
+        rows = _parse_legacy_json(legacy_path)
+        if rows is None:
+            return [], None
+        return rows, legacy_path
+
+    def get(self, key: str, max_age: int, now: int) -> Any | None:
+        """Return a value stored within ``max_age`` seconds and not expired."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                conn = self._connect()
+                if conn is None:
+                    return None
+                try:
+                    row = conn.execute(
+                        "SELECT stored_at, expires_at, value FROM entries WHERE key = ?",
+                        (key,),
+                    ).fetchone()
+                except sqlite3.Error as exc:
+                    logging.debug("Cache read failed: %s", exc)
+                    return None
+                if row is None:
+                    return None
+                try:
+                    entry = (row[0], row[1], json.loads(row[2]))
+                except ValueError:
+                    return None
+                self._remember(key, entry)
+            else:
+                self._memory.move_to_end(key)
+
+        stored_at, expires_at, value = entry
+        if now - stored_at > max_age or (expires_at is not None and now >= expires_at):
             logging.debug("Cache entry for %s expired", key)
             return None
-        return entry.get("value")
+        return value
+
+    def set(self, key: str, value: Any, now: int, ttl: int | None) -> None:
+        """Store ``value`` under ``key``, optionally expiring after ``ttl``."""
+        expires_at = now + ttl if ttl is not None else None
+        with self._lock:
+            self._remember(key, (now, expires_at, value))
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key, stored_at, expires_at, value) VALUES (?, ?, ?, ?)",
+                        (key, now, expires_at, json.dumps(value)),
+                    )
+                self._writes_since_evict += 1
+                # Counting rows on every write is wasted work for a
+                # bound that is rarely reached
+                if self._writes_since_evict >= max(1, self.max_entries // 10):
+                    self._evict(conn, now)
+            except (sqlite3.Error, TypeError, ValueError) as exc:
+                logging.debug("Unable to persist cache: %s", exc)
+
+    def _remember(self, key: str, entry: tuple[int, int | None, Any]) -> None:
+        """Put an entry in the in-memory LRU, dropping the oldest if full."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, conn: sqlite3.Connection, now: int) -> None:
+        """Drop expired rows, then the oldest rows beyond ``max_entries``."""
+        self._writes_since_evict = 0
+        with conn:
+            conn.execute(
+                "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (now,),
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+            excess = count - self.max_entries
+            if excess > 0:
+                conn.execute(
+                    "DELETE FROM entries WHERE key IN ("
+                    "SELECT key FROM entries ORDER BY stored_at LIMIT ?)",
+                    (excess,),
+                )
+                logging.debug("Evicted %d old cache entries", excess)
+        self._memory.clear()
+
+    def evict(self, now: int) -> None:
+        """Run expiry and size-bound eviction now."""
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    self._evict(conn, now)
+                except sqlite3.Error as exc:
+                    logging.debug("Cache eviction failed: %s", exc)
+
+    def count(self) -> int:
+        """Return the number of rows in the database."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return 0
+            return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+_STORES: dict[Path, _CacheStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def _shared_store(path: Path, max_entries: int, memory_entries: int) -> _CacheStore:
+    """Return the process-wide store for ``path``, creating it on first use."""
+    key = path.expanduser().resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(key)
+        if store is None:
+            store = _STORES[key] = _CacheStore(key, max_entries, memory_entries)
+        else:
+            store.max_entries = max_entries
+            store.memory_entries = memory_entries
+        return store
+
+
+class ResponseCache:
+    """Cache for storing API responses.
+
+    Every ``ResponseCache`` for the same file shares one in-memory LRU of
+    recently used entries and one SQLite connection, so repeated lookups in
+    a process never touch the disk. Values must be JSON-serializable and
+    are returned without copying, so callers must not modify them.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path | None = None,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        self.cache_path = cache_path or _default_cache_path()
+        self._store = _shared_store(self.cache_path, max_entries, memory_entries)
+
+    def get(self, key: str, max_age: int) -> Any | None:
+        """Retrieve cached data if it is still fresh."""
+        return self._store.get(key, max_age, int(time.time()))
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        """Store a value in the cache, optionally expiring after ``ttl`` seconds."""
+        self._store.set(key, value, int(time.time()), ttl)
+
+    def evict(self) -> None:
+        """Remove expired entries and trim the cache to its size bound."""
+        self._store.evict(int(time.time()))
 
-    def set(self, key: str, value: Any) -> None:
-        """Store a value in the cache."""
-        cache = self._read_cache()
-        cache[key] = {"timestamp": int(time.time()), "value": value}
-        self._write_cache(cache)
+    def count(self) -> int:
+        """Return the number of entries stored on disk."""
+        return self._store.count()
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import logging
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .cache import ResponseCache
 from .utils import (
@@ -22,6 +25,9 @@ from .utils import (
 API_BASE_URL = "https://api.openweathermap.org/data/2.5"
 GEOCODE_URL = "https://api.openweathermap.org/geo/1.0/direct"
 VALID_UNITS = {"metric", "imperial", "standard"}
+DEFAULT_MAX_WORKERS = 8
+
+T = TypeVar("T")
 
 
 class WeatherServiceError(RuntimeError):
@@ -165,16 +171,98 @@ class WeatherClient:
         cache_ttl: int = 600,
         cache_path: str | None = None,
         session: requests.Session | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        api_base_url: str | None = None,
+        geocode_url: str | None = None,
     ) -> None:
         self._api_key = api_key
         self.use_cache = use_cache
         self.cache_ttl = cache_ttl
-        self._session = session or requests.Session()
+        self.max_workers = max(1, max_workers)
+        self._api_base_url = (api_base_url or API_BASE_URL).rstrip("/")
+        self._geocode_url = geocode_url or GEOCODE_URL
+        self._session = session or self._build_session(self.max_workers)
         self._cache = (
             ResponseCache(Path(cache_path))
             if cache_path and use_cache
             else (ResponseCache() if use_cache else None)
         )
+        self._resolved: dict[str, ResolvedLocation] = {}
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(pool_size: int) -> requests.Session:
+        """Create a session keeping up to ``pool_size`` connections per host."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _coalesce(self, key: str, func: Callable[[], T]) -> T:
+        """Run ``func`` once for concurrent callers sharing ``key``.
+
+        The first caller does the work; callers arriving while it is in
+        flight wait for and share its result (or exception).
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def get_weather_many(
+        self,
+        locations: Iterable[str],
+        *,
+        units: str = "metric",
+        include_forecast: bool = False,
+        display_units: Iterable[str] | None = None,
+        format_mode: str = "simple",
+        max_workers: int | None = None,
+    ) -> list[str | WeatherReport | WeatherServiceError]:
+        """Fetch weather for many locations concurrently.
+
+        Results are returned in input order. A location that fails yields
+        its ``WeatherServiceError`` instead of aborting the whole batch.
+        Repeated locations are fetched once, and concurrent requests that
+        resolve to the same coordinates share one API call.
+        """
+        queries = list(locations)
+        display = list(display_units) if display_units else None
+        unique = list(dict.fromkeys(query.strip() for query in queries))
+        workers = min(max_workers or self.max_workers, len(unique)) or 1
+
+        def fetch(query: str) -> str | WeatherReport | WeatherServiceError:
+            try:
+                return self.get_weather(
+                    query,
+                    units=units,
+                    include_forecast=include_forecast,
+                    display_units=display,
+                    format_mode=format_mode,
+                )
+            except WeatherServiceError as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(unique, executor.map(fetch, unique)))
+        return [results[query.strip()] for query in queries]
 
     def get_weather(
         self,
@@ -211,15 +299,20 @@ class WeatherClient:
                 )
 
         if not payload:
-            logging.info(
-                "Fetching weather data for %s from API",
-                resolved_location.display_name,
-            )
-            payload = self._fetch_payload(
-                resolved_location, normalized_units, include_forecast
-            )
-            if self.use_cache and self._cache:
-                self._cache.set(cache_key, payload)
+
+            def fetch_and_store() -> dict[str, Any]:
+                logging.info(
+                    "Fetching weather data for %s from API",
+                    resolved_location.display_name,
+                )
+                fetched = self._fetch_payload(
+                    resolved_location, normalized_units, include_forecast
+                )
+                if self.use_cache and self._cache:
+                    self._cache.set(cache_key, fetched)
+                return fetched
+
+            payload = self._coalesce(cache_key, fetch_and_store)
 
         report = self._build_report(
             location_query,
@@ -246,7 +339,7 @@ class WeatherClient:
         return {"current": current, "forecast": forecast}
 
     def _fetch(self, endpoint: str, params: dict[str, Any]) -> dict[str, Any]:
-        url = f"{API_BASE_URL}/{endpoint}"
+        url = f"{self._api_base_url}/{endpoint}"
         safe_params = {k: v for k, v in params.items() if k != "appid"}
         logging.debug("GET %s params=%s", url, safe_params)
         try:
@@ -402,6 +495,16 @@ class WeatherClient:
         if coordinate_candidate:
             return coordinate_candidate
 
+        memo_key = location.lower()
+        resolved = self._resolved.get(memo_key)
+        if resolved is None:
+            resolved = self._coalesce(
+                f"geo::{memo_key}", lambda: self._geocode(location)
+            )
+            self._resolved[memo_key] = resolved
+        return resolved
+
+    def _geocode(self, location: str) -> ResolvedLocation:
         cache_key = f"geo::{location.lower()}"
         if self.use_cache and self._cache:
             cached = self._cache.get(cache_key, max(self.cache_ttl, 3600))
@@ -413,9 +516,11 @@ class WeatherClient:
             "limit": 1,
             "appid": self._resolve_api_key(),
         }
-        logging.debug("GEOCODE %s params=%s", GEOCODE_URL, {**params, "appid": "***"})
+        logging.debug(
+            "GEOCODE %s params=%s", self._geocode_url, {**params, "appid": "***"}
+        )
         try:
-            response = self._session.get(GEOCODE_URL, params=params, timeout=10)
+            response = self._session.get(self._geocode_url, params=params, timeout=10)
             response.raise_for_status()
             payload = response.json()
         except requests.RequestException as exc:
@@ -17,10 +17,22 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "locations",
-        nargs="+",
+        nargs="*",
         metavar="location",
         help="One or more location queries (e.g. 'London,UK' or ZIP code).",
     )
+    parser.add_argument(
+        "--locations-file",
+        dest="locations_file",
+        help="Read additional locations from a file, one per line.",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="Fetch up to this many locations concurrently (default: 1).",
+    )
     parser.add_argument(
         "-u",
         "--units",
@@ -86,6 +98,16 @@ def _configure_logging(verbosity: int) -> None:
     logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
 
 
+def _read_locations_file(path: str) -> list[str]:
+    """Read one location per line, skipping blanks and ``#`` comments."""
+    with open(path, encoding="utf-8") as handle:
+        return [
+            line.strip()
+            for line in handle
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
 def main(argv: list[str] | None = None) -> int:
     """Run the CLI."""
     parser = _build_parser()
@@ -93,25 +115,56 @@ def main(argv: list[str] | None = None) -> int:
 
     _configure_logging(args.verbose)
 
+    locations = list(args.locations)
+    if args.locations_file:
+        try:
+            locations.extend(_read_locations_file(args.locations_file))
+        except OSError as exc:
+            parser.error(f"cannot read locations file: {exc}")
+    if not locations:
+        parser.error("at least one location is required")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
     try:
         client = WeatherClient(
             api_key=args.api_key,
             use_cache=args.use_cache,
             cache_ttl=args.cache_ttl,
             cache_path=args.cache_path,
+            max_workers=args.workers,
         )
 
+        if args.workers > 1 and len(locations) > 1:
+            outcomes = client.get_weather_many(
+                locations,
+                units=args.units,
+                include_forecast=args.forecast,
+                display_units=args.display_units,
+                format_mode=args.format_mode,
+            )
+        else:
+            outcomes = []
+            for location in locations:
+                try:
+                    outcomes.append(
+                        client.get_weather(
+                            location,
+                            units=args.units,
+                            include_forecast=args.forecast,
+                            display_units=args.display_units,
+                            format_mode=args.format_mode,
+                        )
+                    )
+                except WeatherServiceError as exc:
+                    outcomes.append(exc)
+
         reports = []
         has_errors = False
-        for location in args.locations:
+        for location, report_data in zip(locations, outcomes):
             try:
-                report_data = client.get_weather(
-                    location,
-                    units=args.units,
-                    include_forecast=args.forecast,
-                    display_units=args.display_units,
-                    format_mode=args.format_mode,
-                )
+                if isinstance(report_data, WeatherServiceError):
+                    raise report_data
 
                 if args.format_mode == "simple":
                     reports.append(str(report_data))
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from .history import RateStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,12 +35,13 @@ class RateAlert:
         self.triggered = False
         self.triggered_at: Optional[datetime] = None
 
-    def check_rate(self, new_rate: float) -> bool:
+    def check_rate(self, new_rate: float, at: Optional[datetime] = None) -> bool:
         """
         Check if the alert should be triggered.
 
         Args:
             new_rate: New exchange rate to check
+            at: When the rate was quoted (default: now)
 
         Returns:
             True if alert should be triggered
@@ -59,7 +62,7 @@ class RateAlert:
 
         if should_trigger:
             self.triggered = True
-            self.triggered_at = datetime.now()
+            self.triggered_at = at or datetime.now()
             logger.info(f"Alert triggered for {self.currency_pair}: {rate_change:.2f}% change")
 
         return should_trigger
@@ -149,6 +152,15 @@ class AlertManager:
         logger.info(f"Added alert for {currency_pair} with {threshold_percent}% threshold")
         return f"alert_{len(self.alerts) - 1}"
 
+    @staticmethod
+    def _pair_rate(rates: Dict[str, float], from_curr: str, to_curr: str) -> float:
+        """Rate of a currency pair from USD-based rates."""
+        if from_curr == "USD":
+            return rates.get(to_curr, 1.0)
+        if to_curr == "USD":
+            return 1.0 / rates.get(from_curr, 1.0)
+        return rates.get(to_curr, 1.0) / rates.get(from_curr, 1.0)
+
     def check_alerts(self, rates: Dict[str, float]) -> List[Tuple[RateAlert, float]]:
         """
         Check all alerts against current rates.
@@ -168,16 +180,7 @@ class AlertManager:
             # Parse currency pair
             from_curr, to_curr = alert.currency_pair.split('/')
 
-            # Calculate current rate
-            if from_curr == "USD":
-                current_rate = rates.get(to_curr, 1.0)
-            elif to_curr == "USD":
-                current_rate = 1.0 / rates.get(from_curr, 1.0)
-            else:
-                from_rate = rates.get(from_curr, 1.0)
-                to_rate = rates.get(to_curr, 1.0)
-                current_rate = to_rate / from_rate
-
+            current_rate = self._pair_rate(rates, from_curr, to_curr)
             if alert.check_rate(current_rate):
                 triggered_alerts.append((alert, current_rate))
 
@@ -186,6 +189,45 @@ class AlertManager:
 
         return triggered_alerts
 
+    def check_alerts_history(self, history: RateStore,
+                             rates: Optional[Dict[str, float]] = None) -> List[Tuple[RateAlert, float]]:
+        """
+        Check all alerts against the stored rate history.
+
+        Each active alert is evaluated against every stored rate of its
+        pair since the alert was created, oldest first, so a threshold
+        crossed between checks still triggers without refetching anything.
+
+        Args:
+            history: Historical rate store
+            rates: Current exchange rates, checked after the stored series
+
+        Returns:
+            List of triggered alerts with the rate that triggered them
+        """
+        triggered_alerts = []
+
+        for alert in self.alerts:
+            if alert.triggered:
+                continue
+
+            from_curr, to_curr = alert.currency_pair.split('/')
+            series = history.pair_series(from_curr, to_curr, alert.created_at.date().isoformat())
+            for date, rate in series:
+                if alert.check_rate(rate, at=datetime.fromisoformat(date)):
+                    triggered_alerts.append((alert, rate))
+                    break
+            else:
+                if rates is not None:
+                    current_rate = self._pair_rate(rates, from_curr, to_curr)
+                    if alert.check_rate(current_rate):
+                        triggered_alerts.append((alert, current_rate))
+
+        if triggered_alerts:
+            self._save_alerts()
+
+        return triggered_alerts
+
     def list_alerts(self) -> List[Dict]:
         """
         List all alerts.
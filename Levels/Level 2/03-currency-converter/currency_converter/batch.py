@@ -0,0 +1,236 @@
+"""
+Vectorized batch conversion for large CSV files.
+
+The rates are turned into a currency-pair matrix once per batch, every
+currency code in a chunk is mapped to its matrix index, and amounts and
+rates are computed with array operations. Rows that cannot be converted
+get an error code instead of raising, and the CSV is read and written in
+chunks so memory stays bounded whatever the file size.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Per-row error codes and the message written for each
+OK = 0
+INVALID_AMOUNT = 1
+NEGATIVE_AMOUNT = 2
+UNSUPPORTED_FROM = 3
+UNSUPPORTED_TO = 4
+ERROR_MESSAGES = {
+    INVALID_AMOUNT: "Invalid amount",
+    NEGATIVE_AMOUNT: "Amount must be non-negative",
+    UNSUPPORTED_FROM: "Unsupported source currency",
+    UNSUPPORTED_TO: "Unsupported target currency",
+}
+
+
+def round_like_python(values: np.ndarray, digits: int) -> np.ndarray:
+    """
+    Round an array the way the built-in ``round`` rounds each value.
+
+    ``np.round`` scales by a power of ten first, so it can round a value
+    near a tie (like 3339.675) the other way from ``round``; the few values
+    that close to a tie are rounded one at a time.
+
+    Args:
+        values: Values to round
+        digits: Decimal places to keep
+
+    Returns:
+        Rounded values
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0 ** digits
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in near_tie:
+        rounded[i] = round(float(values[i]), digits)
+    return rounded
+
+
+class RateMatrix:
+    """Exchange rates between every pair of supported currencies."""
+
+    def __init__(self, rates: Dict[str, float], base_currency: str = "USD"):
+        """
+        Build the matrix from rates quoted against ``base_currency``.
+
+        Args:
+            rates: Units of each currency per one unit of the base currency
+            base_currency: Currency the rates are quoted against
+        """
+        usd_rates = {code.upper(): float(rate) for code, rate in rates.items()}
+        usd_rates.setdefault(base_currency, 1.0)
+        self.codes = pd.Index(sorted(usd_rates))
+        # Units of each currency per base unit, in ``codes`` order
+        self.usd_rates = np.array([usd_rates[code] for code in self.codes])
+        # matrix[i, j] converts one unit of codes[i] into codes[j]
+        self.matrix = self.usd_rates[np.newaxis, :] / self.usd_rates[:, np.newaxis]
+
+    def indices(self, codes: pd.Series) -> np.ndarray:
+        """
+        Map currency codes to matrix indices.
+
+        Args:
+            codes: Currency codes (any case)
+
+        Returns:
+            Array of indices, -1 where a code is not supported
+        """
+        return self.codes.get_indexer(codes.astype(str).str.upper())
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch conversion."""
+
+    rows: int = 0
+    errors: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows converted per second of wall time."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def convert_frame(df: pd.DataFrame, matrix: RateMatrix, timestamp: str,
+                  amount_col: str, from_col: str, to_col: str) -> np.ndarray:
+    """
+    Add conversion columns to one chunk of rows.
+
+    Adds ``converted_amount``, ``conversion_timestamp`` and
+    ``conversion_rate`` like ``CurrencyConverter.batch_convert_csv`` always
+    has; rows that fail get empty values and ``Error: <reason>`` as the
+    timestamp.
+
+    Args:
+        df: Chunk to convert (modified in place)
+        matrix: Rate matrix for the batch
+        timestamp: Timestamp written for converted rows
+        amount_col: Name of column containing amounts
+        from_col: Name of column containing source currencies
+        to_col: Name of column containing target currencies
+
+    Returns:
+        Array of per-row error codes (``OK`` for converted rows)
+    """
+    amounts = pd.to_numeric(df[amount_col], errors='coerce').to_numpy(dtype=float)
+    from_codes = df[from_col].astype(str).str.upper()
+    to_codes = df[to_col].astype(str).str.upper()
+    from_idx = matrix.indices(from_codes)
+    to_idx = matrix.indices(to_codes)
+    same = (from_codes == to_codes).to_numpy()
+
+    # Later checks take precedence, so the first failing check wins
+    errors = np.zeros(len(df), dtype=np.int8)
+    errors[~same & (to_idx < 0)] = UNSUPPORTED_TO
+    errors[~same & (from_idx < 0)] = UNSUPPORTED_FROM
+    errors[amounts < 0] = NEGATIVE_AMOUNT
+    errors[np.isnan(amounts)] = INVALID_AMOUNT
+    ok = errors == OK
+
+    # Same-currency rows convert at 1.0 even for codes without a rate
+    rates = np.ones(len(df))
+    pair = ok & ~same
+    rates[pair] = matrix.matrix[from_idx[pair], to_idx[pair]]
+
+    # Go through the base currency like ``convert`` so amounts match it
+    converted = amounts.copy()
+    converted[pair] = round_like_python(
+        amounts[pair] / matrix.usd_rates[from_idx[pair]] * matrix.usd_rates[to_idx[pair]], 2
+    )
+    converted[~ok] = np.nan
+    rates = np.where(ok, round_like_python(rates, 6), np.nan)
+
+    stamps = np.full(len(df), timestamp, dtype=object)
+    for code, message in ERROR_MESSAGES.items():
+        stamps[errors == code] = f"Error: {message}"
+
+    df['converted_amount'] = converted
+    df['conversion_timestamp'] = stamps
+    df['conversion_rate'] = rates
+    return errors
+
+
+def read_columns(input_file: str, required: List[str]) -> List[str]:
+    """
+    Read the header of a CSV file and check it has the required columns.
+
+    Args:
+        input_file: Path to CSV file
+        required: Column names that must be present
+
+    Returns:
+        Column names in file order
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is empty or a column is missing
+    """
+    try:
+        columns = list(pd.read_csv(input_file, nrows=0).columns)
+    except pd.errors.EmptyDataError:
+        raise ValueError("Input CSV file is empty")
+    for col in required:
+        if col not in columns:
+            raise ValueError(f"Column '{col}' not found in CSV")
+    return columns
+
+
+def convert_csv(input_file: str, output_file: str, rates: Dict[str, float],
+                timestamp: str, amount_col: str, from_col: str, to_col: str,
+                chunksize: int = DEFAULT_CHUNKSIZE) -> BatchResult:
+    """
+    Convert a CSV file chunk by chunk.
+
+    Args:
+        input_file: Path to input CSV file
+        output_file: Path to output CSV file
+        rates: Exchange rates quoted against USD
+        timestamp: Timestamp written for converted rows
+        amount_col: Name of column containing amounts
+        from_col: Name of column containing source currencies
+        to_col: Name of column containing target currencies
+        chunksize: Rows read, converted and written at a time
+
+    Returns:
+        BatchResult with row and error counts
+
+    Raises:
+        FileNotFoundError: If the input file does not exist
+        ValueError: If the file is empty or a column is missing
+    """
+    start = time.perf_counter()
+    matrix = RateMatrix(rates)
+    result = BatchResult()
+
+    columns = read_columns(input_file, [amount_col, from_col, to_col])
+    with pd.read_csv(input_file, chunksize=chunksize) as reader:
+        for chunk in reader:
+            errors = convert_frame(chunk, matrix, timestamp, amount_col, from_col, to_col)
+            chunk.to_csv(output_file, index=False, header=result.chunks == 0,
+                         mode='w' if result.chunks == 0 else 'a')
+            result.rows += len(chunk)
+            result.errors += int(np.count_nonzero(errors))
+            result.chunks += 1
+
+    if result.chunks == 0:
+        # Header-only input: still write the output header
+        pd.DataFrame(columns=columns + ['converted_amount', 'conversion_timestamp',
+                                        'conversion_rate']).to_csv(output_file, index=False)
+
+    result.seconds = time.perf_counter() - start
+    if result.errors:
+        logger.warning(f"{result.errors} of {result.rows} rows could not be converted")
+    return result
@@ -5,14 +5,19 @@ Core currency conversion logic with API integration and caching.
 import json
 import logging
 import os
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
-import pandas as pd
 import requests
 from dateutil import parser as date_parser
 
+import numpy as np
+
+from .batch import DEFAULT_CHUNKSIZE, BatchResult, convert_csv, read_columns, round_like_python
+from .history import BASE_CURRENCY, RateStore, date_range
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,18 +29,25 @@ class CurrencyConverter:
     - Live exchange rate fetching from API
     - Fallback to cached rates when API fails
     - Batch conversion from CSV files
-    - Historical rate lookups
+    - Historical rate lookups from a local rate store
     - Offline mode with stale data warnings
     """
 
-    def __init__(self, cache_file: str = "exchange_rates.json"):
+    def __init__(self, cache_file: str = "exchange_rates.json",
+                 history_file: Optional[str] = None):
         """
         Initialize the currency converter.
 
         Args:
             cache_file: Path to the cache file for storing exchange rates
+            history_file: Path to the historical rate store (default:
+                ``rate_history.db`` next to the cache file)
         """
         self.cache_file = Path(cache_file)
+        self.history_file = (
+            Path(history_file) if history_file else self.cache_file.with_name("rate_history.db")
+        )
+        self._history: Optional[RateStore] = None
         self.api_url = "https://api.exchangerate-api.com/v4/latest"
         self.rates: Dict[str, float] = {}
         self.last_updated: Optional[datetime] = None
@@ -72,6 +84,26 @@ class CurrencyConverter:
         except Exception as e:
             logger.error(f"Failed to save rates to cache: {e}")
 
+    @property
+    def history(self) -> RateStore:
+        """Historical rate store, opened on first use."""
+        if self._history is None:
+            self._history = RateStore(self.history_file)
+        return self._history
+
+    def close(self) -> None:
+        """Close the historical rate store, if it was opened."""
+        if self._history is not None:
+            self._history.close()
+            self._history = None
+
+    def _record_history(self, date: str, rates: Dict[str, float]) -> None:
+        """Add one day's USD-based rates to the history store."""
+        try:
+            self.history.add_snapshots([(date, rates)])
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record rates for {date}: {e}")
+
     def _is_cache_stale(self) -> bool:
         """Check if cached rates are stale."""
         if not self.last_updated:
@@ -118,6 +150,8 @@ class CurrencyConverter:
 
             # Save to cache
             self._save_rates_to_cache()
+            if base_currency == BASE_CURRENCY:
+                self._record_history(self.last_updated.date().isoformat(), rates)
 
             logger.info(f"Successfully fetched {len(self.rates)} exchange rates")
             return True
@@ -199,6 +233,10 @@ class CurrencyConverter:
         """
         Get historical exchange rates for a specific date.
 
+        USD-based rates come from the local history store when it covers
+        the date (the latest stored rate on or before it, per currency);
+        otherwise they are fetched once and added to the store.
+
         Args:
             date: Date in YYYY-MM-DD format
             base_currency: Base currency for exchange rates
@@ -206,12 +244,23 @@ class CurrencyConverter:
         Returns:
             Dictionary of historical exchange rates
         """
+        # Parse and validate date
+        parsed_date = datetime.strptime(date, "%Y-%m-%d")
+        if parsed_date > datetime.now():
+            raise ValueError("Date cannot be in the future")
+        date = parsed_date.strftime("%Y-%m-%d")
+
+        if base_currency == BASE_CURRENCY and self.history.covers(date):
+            return self.history.rates_as_of(date)
+
+        rates = self._fetch_historical_rates(date, base_currency)
+        if base_currency == BASE_CURRENCY and rates:
+            self._record_history(date, rates)
+        return rates
+
+    def _fetch_historical_rates(self, date: str, base_currency: str = "USD") -> Dict[str, float]:
+        """Fetch one day's rates from the API."""
         try:
-            # Parse and validate date
-            parsed_date = datetime.strptime(date, "%Y-%m-%d")
-            if parsed_date > datetime.now():
-                raise ValueError("Date cannot be in the future")
-
             # Use a different API endpoint for historical data
             historical_url = f"https://api.exchangerate-api.com/v4/history/{base_currency}/{date}"
             logger.info(f"Fetching historical rates for {date}")
@@ -225,13 +274,58 @@ class CurrencyConverter:
         except requests.exceptions.RequestException as e:
             logger.error(f"Failed to fetch historical rates: {e}")
             raise RuntimeError(f"Could not fetch historical rates: {e}")
-        except ValueError as e:
-            logger.error(f"Invalid date format: {e}")
-            raise
         except Exception as e:
             logger.error(f"Unexpected error fetching historical rates: {e}")
             raise RuntimeError(f"Unexpected error: {e}")
 
+    def backfill_history(self, start: str, end: Optional[str] = None) -> int:
+        """
+        Fetch every date in a range the history store does not cover yet.
+
+        All fetched dates are written in one transaction. If every date
+        succeeds the whole range is marked covered, so later lookups inside
+        it never go back to the API.
+
+        Args:
+            start: First date in YYYY-MM-DD format
+            end: Last date in YYYY-MM-DD format (default: today)
+
+        Returns:
+            Number of dates fetched
+
+        Raises:
+            ValueError: If a date is invalid or the range is empty
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        start = datetime.strptime(start, "%Y-%m-%d").strftime("%Y-%m-%d")
+        end = datetime.strptime(end, "%Y-%m-%d").strftime("%Y-%m-%d") if end else today
+        end = min(end, today)
+        if start > end:
+            raise ValueError("Start date must not be after end date (or in the future)")
+
+        missing = self.history.missing_dates(date_range(start, end))
+        if not missing:
+            return 0
+        logger.info(f"Backfilling {len(missing)} dates from {start} to {end}")
+
+        snapshots = []
+        failed = []
+        for date in missing:
+            try:
+                rates = self._fetch_historical_rates(date)
+            except RuntimeError:
+                failed.append(date)
+                continue
+            if rates:
+                snapshots.append((date, rates))
+            else:
+                failed.append(date)
+
+        if failed:
+            logger.warning(f"Could not fetch rates for {len(failed)} dates")
+        self.history.add_snapshots(snapshots, coverage=None if failed else (start, end))
+        return len(snapshots)
+
     def convert_historical(self, amount: float, from_currency: str, to_currency: str, date: str) -> Tuple[float, str]:
         """
         Convert amount using historical exchange rates.
@@ -275,74 +369,105 @@ class CurrencyConverter:
 
         return round(converted_amount, 2), date
 
+    def convert_series(self, amounts: Sequence[float], dates: Sequence[str],
+                       pairs: Sequence[Union[str, Tuple[str, str]]]) -> List[Optional[float]]:
+        """
+        Convert many dated amounts with historical rates.
+
+        Dates the history store does not cover are fetched once each, then
+        every row is resolved from the store with as-of lookups. Rows whose
+        two currencies match keep their amount without any lookup. Rows that
+        cannot be converted (negative amount, bad date, missing rate) give
+        None instead of raising.
+
+        Args:
+            amounts: Amounts to convert
+            dates: Dates in YYYY-MM-DD format, one per amount
+            pairs: Currency pairs as "FROM/TO" strings or (from, to) tuples
+
+        Returns:
+            Converted amounts rounded to cents, None for failed rows
+        """
+        if not len(amounts) == len(dates) == len(pairs):
+            raise ValueError("amounts, dates and pairs must have the same length")
+
+        codes = [pair.split('/') if isinstance(pair, str) else pair for pair in pairs]
+        from_codes = [str(from_curr).upper() for from_curr, _ in codes]
+        to_codes = [str(to_curr).upper() for _, to_curr in codes]
+
+        # Same-currency rows convert at 1.0 and never need rates
+        same = np.array([a == b for a, b in zip(from_codes, to_codes)], dtype=bool)
+        needed = [date for date, skip in zip(dates, same) if not skip]
+        for date in self.history.missing_dates(needed):
+            try:
+                self.get_historical_rates(date)
+            except (ValueError, RuntimeError) as e:
+                logger.warning(f"No historical rates for {date}: {e}")
+
+        # Only look up rows whose date is now covered
+        uncovered = set(self.history.missing_dates(needed))
+        rows = np.array([not skip and date not in uncovered
+                         for date, skip in zip(dates, same)], dtype=bool)
+        from_rates = np.full(len(dates), np.nan)
+        to_rates = np.full(len(dates), np.nan)
+        if rows.any():
+            covered_dates = [date for date, ok in zip(dates, rows) if ok]
+            from_rates[rows] = self.history.lookup(
+                [code for code, ok in zip(from_codes, rows) if ok], covered_dates)
+            to_rates[rows] = self.history.lookup(
+                [code for code, ok in zip(to_codes, rows) if ok], covered_dates)
+
+        values = np.array(amounts, dtype=float)
+        ok = (values >= 0) & (same | (rows & ~(np.isnan(from_rates) | np.isnan(to_rates))))
+        converted = np.where(same, values, np.nan)
+        pair = ok & ~same
+        converted[pair] = round_like_python(values[pair] / from_rates[pair] * to_rates[pair], 2)
+
+        failed = int(np.count_nonzero(~ok))
+        if failed:
+            logger.warning(f"{failed} of {len(dates)} historical conversions failed")
+        return [float(value) if good else None for value, good in zip(converted, ok)]
+
     def batch_convert_csv(self, input_file: str, output_file: str,
-                         amount_col: str, from_col: str, to_col: str) -> None:
+                         amount_col: str, from_col: str, to_col: str,
+                         chunksize: int = DEFAULT_CHUNKSIZE) -> BatchResult:
         """
         Convert currencies in batch from a CSV file.
 
+        Rates are fetched once for the whole file and the CSV is converted
+        ``chunksize`` rows at a time with array operations. Rows that cannot
+        be converted are written with empty results and ``Error: <reason>``
+        as their timestamp.
+
         Args:
             input_file: Path to input CSV file
             output_file: Path to output CSV file
             amount_col: Name of column containing amounts
             from_col: Name of column containing source currencies
             to_col: Name of column containing target currencies
+            chunksize: Rows read, converted and written at a time
+
+        Returns:
+            BatchResult with row and error counts
         """
         try:
             logger.info(f"Starting batch conversion from {input_file}")
 
-            # Read input CSV
-            df = pd.read_csv(input_file)
+            # Check the header before fetching rates for the whole file
+            read_columns(input_file, [amount_col, from_col, to_col])
+            rates = self.get_rates()
+            timestamp = self.last_updated.isoformat() if self.last_updated else "N/A"
+            result = convert_csv(input_file, output_file, rates, timestamp,
+                                 amount_col, from_col, to_col, chunksize=chunksize)
 
-            if amount_col not in df.columns:
-                raise ValueError(f"Column '{amount_col}' not found in CSV")
-            if from_col not in df.columns:
-                raise ValueError(f"Column '{from_col}' not found in CSV")
-            if to_col not in df.columns:
-                raise ValueError(f"Column '{to_col}' not found in CSV")
-
-            # Add conversion results
-            df['converted_amount'] = 0.0
-            df['conversion_timestamp'] = ""
-            df['conversion_rate'] = 0.0
-
-            for index, row in df.iterrows():
-                try:
-                    amount = float(row[amount_col])
-                    from_curr = str(row[from_col]).upper()
-                    to_curr = str(row[to_col]).upper()
-
-                    converted, timestamp = self.convert(amount, from_curr, to_curr)
-                    df.at[index, 'converted_amount'] = converted
-                    df.at[index, 'conversion_timestamp'] = timestamp
-
-                    # Calculate conversion rate
-                    if from_curr == to_curr:
-                        rate = 1.0
-                    else:
-                        rates = self.get_rates()
-                        if from_curr == "USD":
-                            rate = rates.get(to_curr, 1.0)
-                        elif to_curr == "USD":
-                            rate = 1.0 / rates.get(from_curr, 1.0)
-                        else:
-                            rate = rates.get(to_curr, 1.0) / rates.get(from_curr, 1.0)
-
-                    df.at[index, 'conversion_rate'] = round(rate, 6)
-
-                except Exception as e:
-                    logger.warning(f"Failed to convert row {index}: {e}")
-                    df.at[index, 'converted_amount'] = None
-                    df.at[index, 'conversion_timestamp'] = f"Error: {str(e)}"
-                    df.at[index, 'conversion_rate'] = None
-
-            # Save output CSV
-            df.to_csv(output_file, index=False)
-            logger.info(f"Batch conversion completed. Results saved to {output_file}")
+            logger.info(
+                f"Batch conversion completed. {result.rows} rows in "
+                f"{result.seconds:.2f}s, results saved to {output_file}"
+            )
+            return result
 
         except FileNotFoundError:
             raise FileNotFoundError(f"Input file '{input_file}' not found")
-        except pd.errors.EmptyDataError:
-            raise ValueError("Input CSV file is empty")
         except Exception as e:
             logger.error(f"Batch conversion failed: {e}")
             raise
@@ -0,0 +1,256 @@
+"""
+Local store of historical exchange rates.
+
+Rates are kept in SQLite as one row per (currency, date), quoted against
+USD, with a primary key that doubles as the per-currency time-series
+index. A separate table records which dates the store covers: single
+dates from live or one-off fetches and whole ranges from a backfill.
+Lookups inside covered dates use as-of semantics: a currency's rate on a
+date is its latest stored rate on or before that date, so gaps such as
+weekends resolve to the previous quote without another fetch.
+"""
+
+import logging
+import sqlite3
+from datetime import date as Date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BASE_CURRENCY = "USD"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    currency TEXT NOT NULL,
+    date TEXT NOT NULL,
+    rate REAL NOT NULL,
+    PRIMARY KEY (currency, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL
+);
+"""
+
+# Stores created before coverage ranges were unique may hold repeats of
+# the same range; they are dropped before the unique index is built.
+COVERAGE_INDEX = """
+DELETE FROM coverage WHERE rowid NOT IN (
+    SELECT MIN(rowid) FROM coverage GROUP BY start_date, end_date
+);
+DROP INDEX IF EXISTS idx_coverage_start;
+CREATE UNIQUE INDEX idx_coverage_range ON coverage(start_date, end_date);
+"""
+
+
+def date_range(start: str, end: str) -> List[str]:
+    """
+    List every date from ``start`` to ``end`` inclusive.
+
+    Args:
+        start: First date in YYYY-MM-DD format
+        end: Last date in YYYY-MM-DD format
+
+    Returns:
+        Dates in YYYY-MM-DD format
+    """
+    first = Date.fromisoformat(start)
+    last = Date.fromisoformat(end)
+    return [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+
+
+class RateStore:
+    """SQLite time series of USD-based exchange rates."""
+
+    def __init__(self, db_file: Union[str, Path] = "rate_history.db"):
+        """
+        Open (or create) the store.
+
+        Args:
+            db_file: Path to the SQLite database file
+        """
+        self.db_file = Path(db_file)
+        self.conn = sqlite3.connect(str(self.db_file))
+        self.conn.executescript(SCHEMA)
+        self._ensure_coverage_index()
+        # currency -> (dates, rates) arrays, dropped whenever rates are added
+        self._series: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _ensure_coverage_index(self) -> None:
+        """Build the unique coverage index if the store does not have it yet."""
+        row = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_coverage_range'"
+        ).fetchone()
+        if row is None:
+            self.conn.executescript("BEGIN;" + COVERAGE_INDEX + "COMMIT;")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def add_snapshots(self, snapshots: Iterable[Tuple[str, Dict[str, float]]],
+                      coverage: Optional[Tuple[str, str]] = None) -> int:
+        """
+        Store rate snapshots in one transaction.
+
+        Args:
+            snapshots: (date, rates) pairs, rates quoted against USD
+            coverage: Date range these snapshots cover completely; when
+                omitted each snapshot covers only its own date
+
+        Returns:
+            Number of snapshots stored
+        """
+        dates = []
+        rows = []
+        for day, rates in snapshots:
+            dates.append(day)
+            rows.extend(
+                (code.upper(), day, float(rate))
+                for code, rate in rates.items()
+                if code.upper() != BASE_CURRENCY
+            )
+        if not dates and not coverage:
+            return 0
+
+        ranges = [coverage] if coverage else [(day, day) for day in dates]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO rates (currency, date, rate) VALUES (?, ?, ?)", rows
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO coverage (start_date, end_date) VALUES (?, ?)", ranges
+            )
+        self._series.clear()
+        logger.info(f"Stored {len(dates)} rate snapshots ({len(rows)} rates)")
+        return len(dates)
+
+    def covers(self, day: str) -> bool:
+        """
+        Check whether the store holds the rates in effect on a date.
+
+        Args:
+            day: Date in YYYY-MM-DD format
+
+        Returns:
+            True if ``day`` falls inside a stored date or backfilled range
+        """
+        row = self.conn.execute(
+            "SELECT 1 FROM coverage WHERE start_date <= ? AND end_date >= ? LIMIT 1", (day, day)
+        ).fetchone()
+        return row is not None
+
+    def missing_dates(self, days: Iterable[str]) -> List[str]:
+        """
+        Filter dates down to those the store does not cover.
+
+        Args:
+            days: Dates in YYYY-MM-DD format
+
+        Returns:
+            Sorted distinct dates that are not covered
+        """
+        days = sorted(set(days))
+        if not days:
+            return []
+        ranges = self.conn.execute(
+            "SELECT start_date, end_date FROM coverage WHERE start_date <= ? AND end_date >= ?",
+            (days[-1], days[0])
+        ).fetchall()
+        return [day for day in days if not any(start <= day <= end for start, end in ranges)]
+
+    def rates_as_of(self, day: str) -> Dict[str, float]:
+        """
+        Get every currency's latest rate on or before a date.
+
+        Args:
+            day: Date in YYYY-MM-DD format
+
+        Returns:
+            Dictionary of exchange rates against USD
+        """
+        # SQLite takes the bare ``rate`` column from the row holding MAX(date)
+        rows = self.conn.execute(
+            "SELECT currency, rate, MAX(date) FROM rates WHERE date <= ? GROUP BY currency",
+            (day,)
+        ).fetchall()
+        return {currency: rate for currency, rate, _ in rows}
+
+    def _load_series(self, currency: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Dates and rates of one currency, oldest first."""
+        if currency not in self._series:
+            rows = self.conn.execute(
+                "SELECT date, rate FROM rates WHERE currency = ? ORDER BY date", (currency,)
+            ).fetchall()
+            self._series[currency] = (
+                np.array([day for day, _ in rows], dtype='datetime64[D]'),
+                np.array([rate for _, rate in rows], dtype=float),
+            )
+        return self._series[currency]
+
+    def lookup(self, currencies: Sequence[str], days: Sequence[str]) -> np.ndarray:
+        """
+        As-of rates for many (currency, date) pairs at once.
+
+        Each currency's series is read once and the dates are resolved with
+        a binary search over it.
+
+        Args:
+            currencies: Currency codes
+            days: Dates in YYYY-MM-DD format, one per currency
+
+        Returns:
+            Array of rates against USD, NaN where the currency has no rate
+            on or before the date
+        """
+        codes = np.array([str(code).upper() for code in currencies], dtype=object)
+        when = np.array(days, dtype='datetime64[D]')
+        result = np.full(len(codes), np.nan)
+        for code in set(codes):
+            mask = codes == code
+            if code == BASE_CURRENCY:
+                result[mask] = 1.0
+                continue
+            series_dates, series_rates = self._load_series(code)
+            if not len(series_dates):
+                continue
+            positions = np.searchsorted(series_dates, when[mask], side='right') - 1
+            found = positions >= 0
+            values = np.full(len(positions), np.nan)
+            values[found] = series_rates[positions[found]]
+            result[mask] = values
+        return result
+
+    def pair_series(self, from_currency: str, to_currency: str, start: str,
+                    end: Optional[str] = None) -> List[Tuple[str, float]]:
+        """
+        Get the stored rate of a currency pair over time.
+
+        Args:
+            from_currency: Source currency code
+            to_currency: Target currency code
+            start: First date in YYYY-MM-DD format; the rate in effect on
+                it is included even if it was stored earlier
+            end: Last date in YYYY-MM-DD format (default: no limit)
+
+        Returns:
+            (date, rate) pairs, oldest first
+        """
+        codes = [from_currency.upper(), to_currency.upper()]
+        query = "SELECT DISTINCT date FROM rates WHERE currency IN (?, ?) AND date > ?"
+        params: list = codes + [start]
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        days = [start] + [day for day, in self.conn.execute(query + " ORDER BY date", params)]
+
+        from_rates = self.lookup([codes[0]] * len(days), days)
+        to_rates = self.lookup([codes[1]] * len(days), days)
+        return [
+            (day, float(to_rate / from_rate))
+            for day, from_rate, to_rate in zip(days, from_rates, to_rates)
+            if not (np.isnan(from_rate) or np.isnan(to_rate))
+        ]
@@ -0,0 +1,146 @@
+"""
+Benchmark for batch CSV conversion.
+
+Writes a synthetic ledger CSV, then reports rows/sec for:
+
+* the row-by-row loop ``batch_convert_csv`` used to run, calling
+  ``convert`` and ``get_rates`` for every row of ``df.iterrows()``
+  (timed on a sample, since it is slow),
+* the vectorized, chunked ``batch_convert_csv`` on the whole file.
+
+It also checks that both paths write the same amounts and rates on the
+sample.
+
+Usage:
+    python -m currency_converter.loadtest --rows 1000000 --sample 20000
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .batch import DEFAULT_CHUNKSIZE
+from .core import CurrencyConverter
+
+RATES = {
+    "EUR": 0.85, "GBP": 0.73, "JPY": 110.0, "CAD": 1.25, "AUD": 1.35,
+    "CHF": 0.92, "CNY": 6.45, "INR": 74.5, "MXN": 20.1, "SEK": 8.6,
+}
+
+
+def write_ledger(path: str, rows: int, rng: random.Random) -> None:
+    """Write ``rows`` random conversions, about 1% of them invalid."""
+    codes = ["USD"] + list(RATES)
+    chunk = 100_000
+    for first in range(0, rows, chunk):
+        count = min(chunk, rows - first)
+        df = pd.DataFrame({
+            'amount': [round(rng.uniform(0, 10000), 2) for _ in range(count)],
+            'from_currency': [rng.choice(codes) for _ in range(count)],
+            'to_currency': [rng.choice(codes) if rng.random() > 0.01 else "XXX"
+                            for _ in range(count)],
+        })
+        df.to_csv(path, index=False, header=first == 0, mode='w' if first == 0 else 'a')
+
+
+def loop_convert(converter: CurrencyConverter, input_file: str, output_file: str) -> None:
+    """The original per-row ``batch_convert_csv`` loop, for comparison."""
+    df = pd.read_csv(input_file)
+    df['converted_amount'] = 0.0
+    df['conversion_timestamp'] = ""
+    df['conversion_rate'] = 0.0
+
+    for index, row in df.iterrows():
+        try:
+            amount = float(row['amount'])
+            from_curr = str(row['from_currency']).upper()
+            to_curr = str(row['to_currency']).upper()
+
+            converted, timestamp = converter.convert(amount, from_curr, to_curr)
+            df.at[index, 'converted_amount'] = converted
+            df.at[index, 'conversion_timestamp'] = timestamp
+
+            if from_curr == to_curr:
+                rate = 1.0
+            else:
+                rates = converter.get_rates()
+                if from_curr == "USD":
+                    rate = rates.get(to_curr, 1.0)
+                elif to_curr == "USD":
+                    rate = 1.0 / rates.get(from_curr, 1.0)
+                else:
+                    rate = rates.get(to_curr, 1.0) / rates.get(from_curr, 1.0)
+
+            df.at[index, 'conversion_rate'] = round(rate, 6)
+
+        except Exception as e:
+            df.at[index, 'converted_amount'] = None
+            df.at[index, 'conversion_timestamp'] = f"Error: {str(e)}"
+            df.at[index, 'conversion_rate'] = None
+
+    df.to_csv(output_file, index=False)
+
+
+def run_benchmark(rows: int, sample: int, chunksize: int) -> None:
+    """Time the row loop against the vectorized path."""
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = random.Random(3)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        converter = CurrencyConverter(cache_file=os.path.join(tmp_dir, 'rates.json'))
+        converter.rates = dict(RATES)
+        converter.last_updated = datetime.now()
+
+        ledger = os.path.join(tmp_dir, 'ledger.csv')
+        sample_file = os.path.join(tmp_dir, 'sample.csv')
+        write_ledger(ledger, rows, rng)
+        pd.read_csv(ledger, nrows=sample).to_csv(sample_file, index=False)
+        print(f"{rows} rows, {os.path.getsize(ledger) / 1e6:.1f} MB, chunks of {chunksize}")
+
+        loop_output = os.path.join(tmp_dir, 'loop.csv')
+        start = time.perf_counter()
+        loop_convert(converter, sample_file, loop_output)
+        loop_rate = sample / (time.perf_counter() - start)
+        print(f"{'iterrows loop (sample)':<26} {loop_rate:>12.0f} rows/sec")
+
+        vector_output = os.path.join(tmp_dir, 'vector.csv')
+        result = converter.batch_convert_csv(ledger, vector_output, 'amount',
+                                             'from_currency', 'to_currency',
+                                             chunksize=chunksize)
+        print(
+            f"{'vectorized, chunked':<26} {result.rows_per_second:>12.0f} rows/sec "
+            f"({result.errors} error rows, {result.rows_per_second / loop_rate:.0f}x)"
+        )
+
+        expected = pd.read_csv(loop_output)
+        actual = pd.read_csv(vector_output, nrows=sample)
+        same = all(
+            np.array_equal(expected[col], actual[col], equal_nan=True)
+            for col in ('converted_amount', 'conversion_rate')
+        )
+        print(f"{'sample results match':<26} {'yes' if same else 'NO':>12}")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure batch conversion throughput")
+    parser.add_argument('--rows', type=int, default=1000000, help='Rows in the ledger (default: 1000000)')
+    parser.add_argument('--sample', type=int, default=20000,
+                        help='Rows timed with the iterrows loop (default: 20000)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f'Rows per chunk (default: {DEFAULT_CHUNKSIZE})')
+    args = parser.parse_args()
+    run_benchmark(args.rows, min(args.sample, args.rows), args.chunksize)
+
+
+if __name__ == '__main__':
+    main()
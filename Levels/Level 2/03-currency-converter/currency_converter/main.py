@@ -8,6 +8,7 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 
+from .batch import DEFAULT_CHUNKSIZE
 from .core import CurrencyConverter
 from .alerts import AlertManager
 
@@ -73,17 +74,21 @@ def batch_convert(args) -> None:
     converter = CurrencyConverter()
 
     try:
-        converter.batch_convert_csv(
+        result = converter.batch_convert_csv(
             args.input_file,
             args.output_file,
             args.amount_column,
             args.from_column,
-            args.to_column
+            args.to_column,
+            chunksize=args.chunk_size
         )
 
         print(f"\n✅ Batch conversion completed!")
         print(f"   Input: {args.input_file}")
         print(f"   Output: {args.output_file}")
+        print(f"   Rows: {result.rows} ({result.rows_per_second:.0f} rows/sec)")
+        if result.errors:
+            print(f"   ⚠️  {result.errors} rows could not be converted (see conversion_timestamp)")
 
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
@@ -125,6 +130,21 @@ def refresh_rates(args) -> None:
         sys.exit(1)
 
 
+def backfill_history(args) -> None:
+    """Backfill the local historical rate store."""
+    converter = CurrencyConverter()
+
+    try:
+        fetched = converter.backfill_history(args.start_date, args.end_date)
+        print(f"✅ Stored rates for {fetched} new dates in {converter.history_file}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        converter.close()
+
+
 def create_sample_csv(args) -> None:
     """Create a sample CSV file for batch conversion."""
     import pandas as pd
@@ -227,8 +247,10 @@ def check_alerts(args) -> None:
     alert_manager = AlertManager()
 
     try:
+        # Rates fetched here (only when the cache is stale) are recorded in
+        # the history store, so alerts see every rate since their creation
         rates = converter.get_rates()
-        triggered_alerts = alert_manager.check_alerts(rates)
+        triggered_alerts = alert_manager.check_alerts_history(converter.history, rates)
 
         if not triggered_alerts:
             print("\n✅ No alerts triggered")
@@ -293,6 +315,9 @@ Examples:
   # Convert with historical rates
   python -m currency_converter historical 100 USD EUR --date 2023-01-01
 
+  # Store historical rates locally for a date range
+  python -m currency_converter backfill 2023-01-01 2023-12-31
+
   # Batch convert from CSV
   python -m currency_converter batch input.csv output.csv
 
@@ -341,6 +366,13 @@ Examples:
     batch_parser.add_argument('--amount-column', default='amount', help='Amount column name')
     batch_parser.add_argument('--from-column', default='from_currency', help='From currency column name')
     batch_parser.add_argument('--to-column', default='to_currency', help='To currency column name')
+    batch_parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNKSIZE,
+                              help=f'Rows converted at a time (default: {DEFAULT_CHUNKSIZE})')
+
+    # Backfill history command
+    backfill_parser = subparsers.add_parser('backfill', help='Store historical rates for a date range')
+    backfill_parser.add_argument('start_date', help='First date in YYYY-MM-DD format')
+    backfill_parser.add_argument('end_date', nargs='?', help='Last date in YYYY-MM-DD format (default: today)')
 
     # List currencies command
     subparsers.add_parser('list', help='List supported currencies')
@@ -387,6 +419,8 @@ Examples:
         convert_historical(args)
     elif args.command == 'batch':
         batch_convert(args)
+    elif args.command == 'backfill':
+        backfill_history(args)
     elif args.command == 'list':
         list_currencies(args)
     elif args.command == 'refresh':
@@ -3,6 +3,7 @@ Comprehensive unit tests for the currency converter.
 """
 
 import json
+import sqlite3
 import tempfile
 import unittest
 from datetime import datetime, timedelta
@@ -12,7 +13,9 @@ from unittest.mock import Mock, patch, mock_open
 import pandas as pd
 import requests
 
+from currency_converter.alerts import AlertManager
 from currency_converter.core import CurrencyConverter
+from currency_converter.history import RateStore
 from currency_converter.utils import (
     validate_currency_code,
     format_currency_amount,
@@ -329,6 +332,80 @@ class TestCurrencyConverter(unittest.TestCase):
             self.converter.batch_convert_csv(str(input_file), str(output_file),
                                            'amount', 'from_currency', 'to_currency')
 
+    def test_batch_convert_csv_matches_convert(self):
+        """Test vectorized batch results match single conversions."""
+        test_data = {
+            'amount': [100, 2671.74, 50, 1000, 7.5],
+            'from_currency': ['USD', 'USD', 'gbp', 'JPY', 'CAD'],
+            'to_currency': ['EUR', 'CAD', 'CAD', 'USD', 'CAD']
+        }
+        input_file = self.temp_dir / "input.csv"
+        output_file = self.temp_dir / "output.csv"
+        pd.DataFrame(test_data).to_csv(input_file, index=False)
+
+        self.converter.rates = self.sample_rates
+        self.converter.last_updated = datetime.now()
+
+        result = self.converter.batch_convert_csv(str(input_file), str(output_file),
+                                                  'amount', 'from_currency', 'to_currency',
+                                                  chunksize=2)
+
+        self.assertEqual(result.rows, 5)
+        self.assertEqual(result.errors, 0)
+        self.assertEqual(result.chunks, 3)
+        result_df = pd.read_csv(output_file)
+        for i, row in result_df.iterrows():
+            expected, timestamp = self.converter.convert(
+                row['amount'], row['from_currency'], row['to_currency'])
+            self.assertEqual(row['converted_amount'], expected)
+            self.assertEqual(row['conversion_timestamp'], timestamp)
+        self.assertEqual(result_df['conversion_rate'].tolist()[:2], [0.85, 1.25])
+        self.assertEqual(result_df['conversion_rate'].iloc[4], 1.0)
+
+    def test_batch_convert_csv_flags_bad_rows(self):
+        """Test rows that cannot be converted are flagged, not raised."""
+        test_data = {
+            'amount': ['100', 'abc', '-5', '10', '20'],
+            'from_currency': ['USD', 'USD', 'USD', 'XYZ', 'EUR'],
+            'to_currency': ['EUR', 'EUR', 'EUR', 'EUR', 'ABC']
+        }
+        input_file = self.temp_dir / "input.csv"
+        output_file = self.temp_dir / "output.csv"
+        pd.DataFrame(test_data).to_csv(input_file, index=False)
+
+        self.converter.rates = self.sample_rates
+        self.converter.last_updated = datetime.now()
+
+        result = self.converter.batch_convert_csv(str(input_file), str(output_file),
+                                                  'amount', 'from_currency', 'to_currency')
+
+        self.assertEqual(result.errors, 4)
+        result_df = pd.read_csv(output_file)
+        self.assertEqual(result_df['converted_amount'].iloc[0], 85.0)
+        self.assertTrue(result_df['converted_amount'].iloc[1:].isna().all())
+        self.assertTrue(result_df['conversion_rate'].iloc[1:].isna().all())
+        self.assertEqual(result_df['conversion_timestamp'].iloc[1:].tolist(), [
+            "Error: Invalid amount",
+            "Error: Amount must be non-negative",
+            "Error: Unsupported source currency",
+            "Error: Unsupported target currency",
+        ])
+
+    def test_batch_convert_csv_header_only(self):
+        """Test batch conversion of a CSV with no data rows."""
+        input_file = self.temp_dir / "input.csv"
+        output_file = self.temp_dir / "output.csv"
+        input_file.write_text("amount,from_currency,to_currency\n")
+
+        self.converter.rates = self.sample_rates
+        self.converter.last_updated = datetime.now()
+
+        result = self.converter.batch_convert_csv(str(input_file), str(output_file),
+                                                  'amount', 'from_currency', 'to_currency')
+
+        self.assertEqual(result.rows, 0)
+        self.assertIn('converted_amount', pd.read_csv(output_file).columns)
+
     def test_get_supported_currencies(self):
         """Test getting supported currencies."""
         self.converter.rates = self.sample_rates
@@ -356,6 +433,161 @@ class TestCurrencyConverter(unittest.TestCase):
         self.assertFalse(self.converter.is_offline_mode())
 
 
+class TestRateHistory(unittest.TestCase):
+    """Test cases for the historical rate store."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.converter = CurrencyConverter(cache_file=str(self.temp_dir / "rates.json"))
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.converter.close()
+
+    @staticmethod
+    def _api_response(url, timeout=None):
+        """Fake historical API: EUR rises by 0.01 a day through January 2023."""
+        day = int(url.rsplit('-', 1)[-1])
+        response = Mock()
+        response.json.return_value = {"rates": {"EUR": 0.80 + day / 100, "JPY": 110.0}}
+        response.raise_for_status.return_value = None
+        return response
+
+    @patch('requests.get')
+    def test_backfill_then_convert_historical_offline(self, mock_get):
+        """Test backfilled dates are answered from the store."""
+        mock_get.side_effect = self._api_response
+
+        fetched = self.converter.backfill_history("2023-01-01", "2023-01-10")
+        self.assertEqual(fetched, 10)
+        self.assertEqual(mock_get.call_count, 10)
+
+        amount, date = self.converter.convert_historical(100, "USD", "EUR", "2023-01-05")
+        self.assertEqual(amount, 85.0)
+        self.assertEqual(date, "2023-01-05")
+        self.assertEqual(self.converter.backfill_history("2023-01-01", "2023-01-10"), 0)
+        self.assertEqual(mock_get.call_count, 10)
+
+    @patch('requests.get')
+    def test_as_of_lookup_fills_gaps(self, mock_get):
+        """Test dates inside a covered range use the latest earlier rate."""
+        self.converter.history.add_snapshots(
+            [("2023-01-02", {"EUR": 0.9}), ("2023-01-06", {"EUR": 0.95})],
+            coverage=("2023-01-01", "2023-01-08"),
+        )
+
+        self.assertEqual(self.converter.history.rates_as_of("2023-01-05"), {"EUR": 0.9})
+        amount, _ = self.converter.convert_historical(100, "USD", "EUR", "2023-01-07")
+        self.assertEqual(amount, 95.0)
+        with self.assertRaises(ValueError):
+            # Covered, but no EUR rate on or before it
+            self.converter.convert_historical(100, "USD", "EUR", "2023-01-01")
+        mock_get.assert_not_called()
+
+    @patch('requests.get')
+    def test_convert_series(self, mock_get):
+        """Test dated conversions fetch each missing date once."""
+        mock_get.side_effect = self._api_response
+
+        result = self.converter.convert_series(
+            [100, 100, 100, 50, -1, 7],
+            ["2023-01-10", "2023-01-20", "2023-01-10", "2023-01-20", "2023-01-10", "bad-date"],
+            ["USD/EUR", ("EUR", "USD"), "EUR/JPY", "jpy/jpy", "USD/EUR", "USD/EUR"],
+        )
+
+        self.assertEqual(result, [
+            90.0,
+            100.0,
+            round(100 / 0.9 * 110.0, 2),
+            50.0,
+            None,
+            None,
+        ])
+        self.assertEqual(mock_get.call_count, 2)
+
+        self.converter.convert_series([1], ["2023-01-20"], ["USD/EUR"])
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.get')
+    def test_convert_series_same_currency_uncovered(self, mock_get):
+        """Test same-currency rows convert without coverage or a fetch."""
+        result = self.converter.convert_series([100, 5], ["2023-02-01", "2023-02-02"],
+                                               ["USD/USD", "eur/EUR"])
+
+        self.assertEqual(result, [100.0, 5.0])
+        mock_get.assert_not_called()
+
+    def test_coverage_rows_are_unique(self):
+        """Test re-covering a date does not add another coverage row."""
+        for _ in range(3):
+            self.converter.history.add_snapshots([("2023-03-01", {"GBP": 0.8})])
+        self.converter.history.add_snapshots([], coverage=("2023-03-01", "2023-03-05"))
+        self.converter.history.add_snapshots([], coverage=("2023-03-01", "2023-03-05"))
+
+        count, = self.converter.history.conn.execute("SELECT COUNT(*) FROM coverage").fetchone()
+        self.assertEqual(count, 2)
+
+    def test_old_store_coverage_deduplicated(self):
+        """Test a store with repeated coverage rows is cleaned up on open."""
+        path = self.temp_dir / "old_history.db"
+        conn = sqlite3.connect(str(path))
+        conn.executescript("""
+            CREATE TABLE coverage (start_date TEXT NOT NULL, end_date TEXT NOT NULL);
+            CREATE INDEX idx_coverage_start ON coverage(start_date);
+            INSERT INTO coverage VALUES ('2023-03-01', '2023-03-01');
+            INSERT INTO coverage VALUES ('2023-03-01', '2023-03-01');
+            INSERT INTO coverage VALUES ('2023-03-02', '2023-03-04');
+        """)
+        conn.close()
+
+        store = RateStore(path)
+        try:
+            rows = store.conn.execute(
+                "SELECT start_date, end_date FROM coverage ORDER BY start_date").fetchall()
+            self.assertEqual(rows, [("2023-03-01", "2023-03-01"), ("2023-03-02", "2023-03-04")])
+            self.assertTrue(store.covers("2023-03-03"))
+        finally:
+            store.close()
+
+    def test_rate_store_persists(self):
+        """Test stored rates survive reopening the store."""
+        self.converter.history.add_snapshots([("2023-03-01", {"GBP": 0.8, "USD": 1.0})])
+        self.converter.close()
+
+        store = RateStore(self.converter.history_file)
+        try:
+            self.assertTrue(store.covers("2023-03-01"))
+            self.assertFalse(store.covers("2023-03-02"))
+            self.assertEqual(store.rates_as_of("2023-03-02"), {"GBP": 0.8})
+            self.assertEqual(store.missing_dates(["2023-03-02", "2023-03-01"]), ["2023-03-02"])
+        finally:
+            store.close()
+
+    def test_check_alerts_history(self):
+        """Test alerts trigger on a crossing anywhere in the stored series."""
+        manager = AlertManager(alerts_file=str(self.temp_dir / "alerts.json"))
+        manager.add_alert("USD/EUR", 5.0, 0.90, "above")
+        manager.add_alert("EUR/USD", 50.0, 1.1, "change")
+        for alert in manager.alerts:
+            alert.created_at = datetime(2023, 1, 1)
+
+        self.converter.history.add_snapshots(
+            [("2023-01-01", {"EUR": 0.90}), ("2023-01-03", {"EUR": 0.96}),
+             ("2023-01-05", {"EUR": 0.91})],
+            coverage=("2023-01-01", "2023-01-05"),
+        )
+
+        triggered = manager.check_alerts_history(self.converter.history, {"EUR": 0.91})
+
+        self.assertEqual(len(triggered), 1)
+        alert, rate = triggered[0]
+        self.assertEqual(alert.currency_pair, "USD/EUR")
+        self.assertEqual(rate, 0.96)
+        self.assertEqual(alert.triggered_at, datetime(2023, 1, 3))
+        self.assertFalse(manager.alerts[1].triggered)
+
+
 class TestUtils(unittest.TestCase):
     """Test cases for utility functions."""
 
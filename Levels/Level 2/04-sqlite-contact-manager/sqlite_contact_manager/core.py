@@ -7,18 +7,126 @@ import json
 import csv
 import logging
 import os
+import re
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
 from datetime import UTC, datetime
 
 logger = logging.getLogger(__name__)
 
+# Rows staged or exported per executemany/fetchmany call
+BULK_BATCH_SIZE = 10000
+
+EXPORT_FIELDS = ['id', 'name', 'email', 'phone', 'address', 'company', 'notes',
+                 'groups', 'custom_fields', 'created_at', 'updated_at']
+
+# Bump when the search or group indexes change; _init_database rebuilds
+# them for databases created with an older version
+SCHEMA_VERSION = 2
+
+# Applied to every connection: WAL lets readers run during writes, and
+# NORMAL sync is safe with WAL while avoiding an fsync per commit
+CONNECTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -16000,  # KiB
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# Prefix indexes make as-you-type queries ("jo*") index lookups
+FTS_TABLE = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+        name, email, phone, address, company, notes,
+        content='contacts',
+        content_rowid='id',
+        prefix='2 3'
+    )
+"""
+
+# BM25 column weights, in FTS column order: name, email, phone, address,
+# company, notes
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 3.0, 1.0)
+
+FTS_INSERT_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts
+    BEGIN
+        INSERT INTO contacts_fts(rowid, name, email, phone, address, company, notes)
+        VALUES (new.id, new.name, new.email, new.phone, new.address, new.company, new.notes);
+    END
+"""
+
+# An external-content FTS table must be given the old values to delete
+FTS_TRIGGERS = [
+    FTS_INSERT_TRIGGER,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts
+    BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone, address, company, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.phone, old.address, old.company, old.notes);
+        INSERT INTO contacts_fts(rowid, name, email, phone, address, company, notes)
+        VALUES (new.id, new.name, new.email, new.phone, new.address, new.company, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts
+    BEGIN
+        INSERT INTO contacts_fts(contacts_fts, rowid, name, email, phone, address, company, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.phone, old.address, old.company, old.notes);
+    END
+    """,
+]
+
+# One row per (group, contact), kept in sync from the JSON groups column
+GROUP_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS contact_groups (
+        group_name TEXT NOT NULL,
+        contact_id INTEGER NOT NULL,
+        PRIMARY KEY (group_name, contact_id)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_contact_groups_contact ON contact_groups(contact_id)",
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_groups_insert AFTER INSERT ON contacts
+    BEGIN
+        INSERT OR IGNORE INTO contact_groups(group_name, contact_id)
+        SELECT value, new.id FROM json_each(new.groups) WHERE type = 'text';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_groups_update AFTER UPDATE OF groups ON contacts
+    BEGIN
+        DELETE FROM contact_groups WHERE contact_id = old.id;
+        INSERT OR IGNORE INTO contact_groups(group_name, contact_id)
+        SELECT value, new.id FROM json_each(new.groups) WHERE type = 'text';
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS contact_groups_delete AFTER DELETE ON contacts
+    BEGIN
+        DELETE FROM contact_groups WHERE contact_id = old.id;
+    END
+    """,
+]
+
 
 def _current_timestamp() -> str:
     """Return current UTC timestamp with microsecond precision."""
     return datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
 
 
+def _prefix_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Args:
+        query: Text typed by the user
+
+    Returns:
+        FTS5 MATCH expression, empty if the text has no words
+    """
+    return ' '.join(f'"{term}"*' for term in re.findall(r'\w+', query))
+
+
 class ContactManager:
     """Manages contacts in SQLite database with full CRUD operations."""
 
@@ -29,11 +137,33 @@ class ContactManager:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        self.conn = self._connect()
         self._init_database()
 
+    def __enter__(self) -> 'ContactManager':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the manager's connection and apply the connection pragmas.
+
+        Returns:
+            Open database connection
+        """
+        conn = sqlite3.connect(self.db_path)
+        for pragma, value in CONNECTION_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
     def _init_database(self) -> None:
         """Initialize database with required tables."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
 
             # Create contacts table
@@ -53,54 +183,47 @@ class ContactManager:
                 )
             """)
 
-            # Create FTS5 virtual table for full-text search (simplified)
-            try:
-                cursor.execute("""
-                    CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
-                        name, email, phone, address, company, notes,
-                        content='contacts',
-                        content_rowid='id'
-                    )
-                """)
-
-                # Create trigger to update FTS5 table
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts
-                    BEGIN
-                        INSERT INTO contacts_fts(rowid, name, email, phone, address, company, notes)
-                        VALUES (new.id, new.name, new.email, new.phone, new.address, new.company, new.notes);
-                    END
-                """)
-
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts
-                    BEGIN
-                        INSERT INTO contacts_fts(contacts_fts, rowid) VALUES('delete', old.id);
-                        INSERT INTO contacts_fts(rowid, name, email, phone, address, company, notes)
-                        VALUES(
-                            new.id,
-                            COALESCE(new.name, ''),
-                            COALESCE(new.email, ''),
-                            COALESCE(new.phone, ''),
-                            COALESCE(new.address, ''),
-                            COALESCE(new.company, ''),
-                            COALESCE(new.notes, '')
-                        );
-                    END
-                """)
+            # Duplicate checks look contacts up by email
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email)")
+            # Listings and exports are ordered by name
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts(name)")
 
-                cursor.execute("""
-                    CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts
-                    BEGIN
-                        INSERT INTO contacts_fts(contacts_fts, rowid) VALUES('delete', old.id);
-                    END
-                """)
-            except sqlite3.OperationalError as e:
-                logger.warning(f"FTS5 not available: {e}. Using LIKE search only.")
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] < SCHEMA_VERSION:
+                self._build_indexes(cursor)
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
             conn.commit()
             logger.info("Database initialized successfully")
 
+    def _build_indexes(self, cursor: sqlite3.Cursor) -> None:
+        """(Re)create the full-text and group indexes from the contacts table.
+
+        Args:
+            cursor: Cursor inside the initialization transaction
+        """
+        for trigger in ('contacts_fts_insert', 'contacts_fts_update', 'contacts_fts_delete'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+        try:
+            cursor.execute("DROP TABLE IF EXISTS contacts_fts")
+            cursor.execute(FTS_TABLE)
+            for trigger in FTS_TRIGGERS:
+                cursor.execute(trigger)
+            cursor.execute("INSERT INTO contacts_fts(contacts_fts) VALUES('rebuild')")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 not available: {e}. Using LIKE search only.")
+
+        for statement in GROUP_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute("DELETE FROM contact_groups")
+        cursor.execute("""
+            INSERT OR IGNORE INTO contact_groups(group_name, contact_id)
+            SELECT g.value, c.id FROM contacts c, json_each(c.groups) g
+            WHERE g.type = 'text'
+        """)
+        logger.info(f"Built search and group indexes (schema version {SCHEMA_VERSION})")
+
     def add_contact(self, name: str, email: str = None, phone: str = None,
                    address: str = None, company: str = None, notes: str = None,
                    groups: List[str] = None, custom_fields: Dict[str, Any] = None) -> int:
@@ -133,7 +256,7 @@ class ContactManager:
         custom_fields = custom_fields or {}
         timestamp = _current_timestamp()
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 INSERT INTO contacts (name, email, phone, address, company, notes, groups, custom_fields, created_at, updated_at)
@@ -155,7 +278,7 @@ class ContactManager:
         Returns:
             Contact data dictionary or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM contacts WHERE id = ?", (contact_id,))
             row = cursor.fetchone()
@@ -164,46 +287,67 @@ class ContactManager:
                 return self._row_to_dict(cursor, row)
             return None
 
-    def get_all_contacts(self) -> List[Dict[str, Any]]:
+    def get_all_contacts(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """Get all contacts from the database.
 
+        Args:
+            limit: Maximum number of contacts to return (default: all)
+            offset: Number of contacts to skip
+
         Returns:
             List of contact dictionaries
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM contacts ORDER BY name")
+            cursor.execute("SELECT * FROM contacts ORDER BY name LIMIT ? OFFSET ?",
+                           (-1 if limit is None else limit, offset))
             rows = cursor.fetchall()
 
             return [self._row_to_dict(cursor, row) for row in rows]
 
-    def search_contacts(self, query: str, use_fts: bool = True) -> List[Dict[str, Any]]:
+    def search_contacts(self, query: str, use_fts: bool = True,
+                        limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """Search contacts by query string.
 
+        With FTS5 every word of the query matches as a prefix, so partial
+        input ("jo sm") already finds "John Smith"; results are ranked by
+        BM25 with name and email weighted highest.
+
         Args:
             query: Search query
             use_fts: Use full-text search (FTS5) if True, otherwise LIKE search
+            limit: Maximum number of contacts to return (default: all)
+            offset: Number of matches to skip, for paging
 
         Returns:
             List of matching contact dictionaries
         """
         if not query or not query.strip():
-            return self.get_all_contacts()
+            return self.get_all_contacts(limit, offset)
 
         query = query.strip()
+        limit = -1 if limit is None else limit
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
 
+            if use_fts:
+                match = _prefix_query(query)
+                if not match:
+                    # Only punctuation: nothing FTS5 could match on
+                    use_fts = False
+
             if use_fts:
                 # Try FTS5 first, fall back to LIKE if not available
                 try:
-                    cursor.execute("""
-                        SELECT c.* FROM contacts c
-                        JOIN contacts_fts fts ON c.id = fts.rowid
+                    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+                    cursor.execute(f"""
+                        SELECT c.* FROM contacts_fts
+                        JOIN contacts c ON c.id = contacts_fts.rowid
                         WHERE contacts_fts MATCH ?
-                        ORDER BY rank
-                    """, (query,))
+                        ORDER BY bm25(contacts_fts, {weights}), c.name
+                        LIMIT ? OFFSET ?
+                    """, (match, limit, offset))
                     rows = cursor.fetchall()
                     return [self._row_to_dict(cursor, row) for row in rows]
                 except sqlite3.OperationalError:
@@ -219,7 +363,9 @@ class ContactManager:
                     WHERE name LIKE ? OR email LIKE ? OR phone LIKE ?
                     OR address LIKE ? OR company LIKE ? OR notes LIKE ?
                     ORDER BY name
-                """, (search_term, search_term, search_term, search_term, search_term, search_term))
+                    LIMIT ? OFFSET ?
+                """, (search_term, search_term, search_term, search_term, search_term, search_term,
+                      limit, offset))
                 rows = cursor.fetchall()
                 return [self._row_to_dict(cursor, row) for row in rows]
 
@@ -270,7 +416,7 @@ class ContactManager:
         values.append(contact_id)
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.conn as conn:
                 cursor = conn.cursor()
                 cursor.execute(f"""
                     UPDATE contacts
@@ -296,7 +442,7 @@ class ContactManager:
         Returns:
             True if contact was deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
             conn.commit()
@@ -306,38 +452,49 @@ class ContactManager:
                 return True
             return False
 
-    def export_to_csv(self, filepath: str) -> None:
+    def export_to_csv(self, filepath: str, batch_size: int = BULK_BATCH_SIZE) -> int:
         """Export all contacts to CSV file.
 
+        Rows are streamed from the cursor ``batch_size`` at a time, so
+        memory use does not grow with the number of contacts.
+
         Args:
             filepath: Path to output CSV file
-        """
-        contacts = self.get_all_contacts()
-
-        if not contacts:
-            logger.warning("No contacts to export")
-            return
-
-        with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['id', 'name', 'email', 'phone', 'address', 'company', 'notes', 'groups', 'custom_fields', 'created_at', 'updated_at']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for contact in contacts:
-                # Convert JSON fields to strings for CSV
-                contact_copy = contact.copy()
-                contact_copy['groups'] = json.dumps(contact['groups'])
-                contact_copy['custom_fields'] = json.dumps(contact['custom_fields'])
-                writer.writerow(contact_copy)
-
-        logger.info(f"Exported {len(contacts)} contacts to {filepath}")
+            batch_size: Rows fetched from the database at a time
 
-    def import_from_csv(self, filepath: str, skip_duplicates: bool = True) -> Tuple[int, int]:
+        Returns:
+            Number of contacts exported
+        """
+        exported = 0
+        with self.conn as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(EXPORT_FIELDS)} FROM contacts ORDER BY name")
+            rows = cursor.fetchmany(batch_size)
+
+            if not rows:
+                logger.warning("No contacts to export")
+                return 0
+
+            with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(EXPORT_FIELDS)
+                # groups and custom_fields are stored as JSON text already
+                while rows:
+                    writer.writerows(rows)
+                    exported += len(rows)
+                    rows = cursor.fetchmany(batch_size)
+
+        logger.info(f"Exported {exported} contacts to {filepath}")
+        return exported
+
+    def import_from_csv(self, filepath: str, skip_duplicates: bool = True,
+                        bulk: bool = False) -> Tuple[int, int]:
         """Import contacts from CSV file.
 
         Args:
             filepath: Path to input CSV file
             skip_duplicates: Skip contacts with duplicate emails
+            bulk: Use ``bulk_import_csv`` (for large files)
 
         Returns:
             Tuple of (imported_count, skipped_count)
@@ -345,6 +502,9 @@ class ContactManager:
         if not Path(filepath).exists():
             raise FileNotFoundError(f"CSV file not found: {filepath}")
 
+        if bulk:
+            return self.bulk_import_csv(filepath)
+
         imported = 0
         skipped = 0
 
@@ -382,23 +542,125 @@ class ContactManager:
         logger.info(f"Import complete: {imported} imported, {skipped} skipped")
         return imported, skipped
 
+    def bulk_import_csv(self, filepath: str, batch_size: int = BULK_BATCH_SIZE) -> Tuple[int, int]:
+        """Import a large CSV file in one transaction.
+
+        Rows are streamed into a temporary staging table with
+        ``executemany``, then copied into ``contacts`` by a single
+        ``INSERT ... SELECT`` that drops emails already in the database
+        and repeats of an email within the file (the first row wins). The
+        per-row FTS trigger is suspended during the copy and
+        ``contacts_fts`` is rebuilt once at the end. Rebuilding indexes
+        every contact, so use ``import_from_csv`` for small files.
+
+        Args:
+            filepath: Path to input CSV file
+            batch_size: Rows staged per ``executemany`` call
+
+        Returns:
+            Tuple of (imported_count, skipped_count)
+        """
+        if not Path(filepath).exists():
+            raise FileNotFoundError(f"CSV file not found: {filepath}")
+
+        staged = 0
+        invalid = 0
+        timestamp = _current_timestamp()
+
+        with self.conn as conn:
+            cursor = conn.cursor()
+            # Left over if an earlier import on this connection failed
+            cursor.execute("DROP TABLE IF EXISTS temp.import_staging")
+            cursor.execute("""
+                CREATE TEMP TABLE import_staging (
+                    seq INTEGER PRIMARY KEY,
+                    name TEXT, email TEXT, phone TEXT, address TEXT,
+                    company TEXT, notes TEXT, groups TEXT, custom_fields TEXT
+                )
+            """)
+            insert_staging = """
+                INSERT INTO import_staging (name, email, phone, address, company, notes, groups, custom_fields)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """
+
+            with open(filepath, 'r', encoding='utf-8') as csvfile:
+                batch = []
+                for row in csv.DictReader(csvfile):
+                    values = self._parse_import_row(row)
+                    if values is None:
+                        invalid += 1
+                        continue
+                    batch.append(values)
+                    if len(batch) >= batch_size:
+                        cursor.executemany(insert_staging, batch)
+                        staged += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(insert_staging, batch)
+                    staged += len(batch)
+
+            cursor.execute("CREATE INDEX temp.idx_import_staging_email ON import_staging(email, seq)")
+
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'contacts_fts'")
+            has_fts = cursor.fetchone() is not None
+            if has_fts:
+                cursor.execute("DROP TRIGGER IF EXISTS contacts_fts_insert")
+
+            cursor.execute("""
+                INSERT INTO contacts (name, email, phone, address, company, notes, groups, custom_fields, created_at, updated_at)
+                SELECT name, email, phone, address, company, notes, groups, custom_fields, ?, ?
+                FROM import_staging s
+                WHERE s.email IS NULL OR s.email = ''
+                   OR (NOT EXISTS (SELECT 1 FROM contacts c WHERE c.email = s.email)
+                       AND s.seq = (SELECT MIN(seq) FROM import_staging t WHERE t.email = s.email))
+                ORDER BY s.seq
+            """, (timestamp, timestamp))
+            imported = cursor.rowcount
+
+            if has_fts:
+                cursor.execute(FTS_INSERT_TRIGGER)
+                cursor.execute("INSERT INTO contacts_fts(contacts_fts) VALUES('rebuild')")
+
+            cursor.execute("DROP TABLE import_staging")
+            conn.commit()
+
+        skipped = invalid + staged - imported
+        logger.info(f"Bulk import complete: {imported} imported, {skipped} skipped")
+        return imported, skipped
+
+    def _parse_import_row(self, row: Dict[str, str]) -> Optional[Tuple]:
+        """Validate one CSV row for bulk import.
+
+        Args:
+            row: Row from ``csv.DictReader``
+
+        Returns:
+            Column values for the staging table, or None if the row is invalid
+        """
+        try:
+            name = row['name']
+            if not name or not name.strip():
+                raise ValueError("Name is required and cannot be empty")
+            groups = json.loads(row.get('groups', '[]'))
+            custom_fields = json.loads(row.get('custom_fields', '{}'))
+        except Exception as e:
+            logger.error(f"Error importing contact {row.get('name', 'Unknown')}: {e}")
+            return None
+
+        return (name.strip(), row.get('email'), row.get('phone'), row.get('address'),
+                row.get('company'), row.get('notes'),
+                json.dumps(groups), json.dumps(custom_fields))
+
     def get_contact_groups(self) -> List[str]:
         """Get all unique contact groups.
 
         Returns:
             List of unique group names
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT groups FROM contacts WHERE groups != '[]'")
-            rows = cursor.fetchall()
-
-            all_groups = set()
-            for row in rows:
-                groups = json.loads(row[0])
-                all_groups.update(groups)
-
-            return sorted(list(all_groups))
+            cursor.execute("SELECT DISTINCT group_name FROM contact_groups ORDER BY group_name")
+            return [row[0] for row in cursor.fetchall()]
 
     def get_contacts_by_group(self, group_name: str) -> List[Dict[str, Any]]:
         """Get all contacts in a specific group.
@@ -409,13 +671,14 @@ class ContactManager:
         Returns:
             List of contact dictionaries in the group
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("""
-                SELECT * FROM contacts
-                WHERE groups LIKE ?
-                ORDER BY name
-            """, (f'%"{group_name}"%',))
+                SELECT c.* FROM contact_groups g
+                JOIN contacts c ON c.id = g.contact_id
+                WHERE g.group_name = ?
+                ORDER BY c.name
+            """, (group_name,))
 
             rows = cursor.fetchall()
             return [self._row_to_dict(cursor, row) for row in rows]
@@ -429,7 +692,7 @@ class ContactManager:
         Returns:
             True if email exists, False otherwise
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id FROM contacts WHERE email = ?", (email,))
             return cursor.fetchone() is not None
@@ -443,7 +706,7 @@ class ContactManager:
         Returns:
             Contact dictionary or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self.conn as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM contacts WHERE email = ?", (email,))
             row = cursor.fetchone()
@@ -455,8 +718,12 @@ class ContactManager:
     def _recreate_database(self) -> None:
         """Recreate database if corrupted."""
         try:
-            if os.path.exists(self.db_path):
-                os.remove(self.db_path)
+            self.conn.close()
+            # WAL mode keeps the write-ahead log and shared memory beside the file
+            for path in (self.db_path, f"{self.db_path}-wal", f"{self.db_path}-shm"):
+                if os.path.exists(path):
+                    os.remove(path)
+            self.conn = self._connect()
             self._init_database()
             logger.info("Database recreated successfully")
         except Exception as e:
@@ -0,0 +1,104 @@
+"""
+Benchmark for CSV import and export.
+
+Writes a synthetic CRM export (with about 2% duplicate emails), then
+reports rows/sec for:
+
+* the row-by-row ``import_from_csv``, on a sample since it is slow,
+* ``bulk_import_csv`` on the whole file,
+* a streaming ``export_to_csv`` of the imported contacts.
+
+Usage:
+    python -m sqlite_contact_manager.loadtest --contacts 200000 --sample 5000
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from .core import ContactManager
+
+FIRST_NAMES = ["Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy"]
+LAST_NAMES = ["Smith", "Jones", "Brown", "Taylor", "Wilson", "Evans", "Thomas", "Roberts"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne"]
+GROUPS = ["work", "friends", "family", "vip", "newsletter"]
+
+
+def write_contacts(path: str, contacts: int, rng: random.Random) -> None:
+    """Write ``contacts`` random contacts in the export format."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['name', 'email', 'phone', 'address', 'company', 'notes',
+                         'groups', 'custom_fields'])
+        for i in range(contacts):
+            # Every fiftieth row repeats an earlier email
+            n = rng.randrange(i) if i and i % 50 == 0 else i
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            writer.writerow([
+                f"{first} {last}",
+                f"contact{n}@example.com",
+                f"555-{rng.randint(0, 9999):04d}",
+                f"{rng.randint(1, 9999)} Main St",
+                rng.choice(COMPANIES),
+                f"met at event {rng.randint(1, 500)}",
+                json.dumps(rng.sample(GROUPS, rng.randint(0, 2))),
+                json.dumps({"score": rng.randint(1, 100)}),
+            ])
+
+
+def run_benchmark(contacts: int, sample: int) -> None:
+    """Time row-by-row and bulk import, then export."""
+    logging.getLogger().setLevel(logging.ERROR)
+    rng = random.Random(5)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        source = os.path.join(tmp_dir, 'contacts.csv')
+        sample_file = os.path.join(tmp_dir, 'sample.csv')
+        write_contacts(source, contacts, rng)
+        with open(source, encoding='utf-8') as f, open(sample_file, 'w', encoding='utf-8') as out:
+            for _, line in zip(range(sample + 1), f):
+                out.write(line)
+        print(f"{contacts} contacts, {os.path.getsize(source) / 1e6:.1f} MB")
+
+        manager = ContactManager(os.path.join(tmp_dir, 'rows.db'))
+        start = time.perf_counter()
+        manager.import_from_csv(sample_file)
+        elapsed = time.perf_counter() - start
+        print(f"{'row-by-row import (sample)':<28} {sample / elapsed:>10.0f} rows/sec")
+
+        manager = ContactManager(os.path.join(tmp_dir, 'bulk.db'))
+        start = time.perf_counter()
+        imported, skipped = manager.bulk_import_csv(source)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'bulk import':<28} {contacts / elapsed:>10.0f} rows/sec "
+            f"({imported} imported, {skipped} skipped, {elapsed:.1f} s)"
+        )
+
+        start = time.perf_counter()
+        exported = manager.export_to_csv(os.path.join(tmp_dir, 'export.csv'))
+        elapsed = time.perf_counter() - start
+        print(f"{'streaming export':<28} {exported / elapsed:>10.0f} rows/sec")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure contact import and export speed")
+    parser.add_argument('--contacts', type=int, default=200000,
+                        help='Contacts in the CSV (default: 200000)')
+    parser.add_argument('--sample', type=int, default=5000,
+                        help='Rows imported one at a time (default: 5000)')
+    args = parser.parse_args()
+    run_benchmark(args.contacts, min(args.sample, args.contacts))
+
+
+if __name__ == '__main__':
+    main()
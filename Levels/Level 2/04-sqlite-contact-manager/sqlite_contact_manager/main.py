@@ -133,7 +133,8 @@ def search_contacts(args, manager: ContactManager) -> None:
         args: Parsed command line arguments
         manager: ContactManager instance
     """
-    contacts = manager.search_contacts(args.query, use_fts=not args.no_fts)
+    contacts = manager.search_contacts(args.query, use_fts=not args.no_fts,
+                                       limit=args.limit, offset=args.offset)
     print_contacts(contacts, args.details)
 
 
@@ -198,8 +199,8 @@ def export_contacts(args, manager: ContactManager) -> None:
         manager: ContactManager instance
     """
     try:
-        manager.export_to_csv(args.file)
-        print(f"Contacts exported to {args.file}")
+        exported = manager.export_to_csv(args.file)
+        print(f"{exported} contacts exported to {args.file}")
     except Exception as e:
         print(f"Error exporting contacts: {e}")
         sys.exit(1)
@@ -213,7 +214,9 @@ def import_contacts(args, manager: ContactManager) -> None:
         manager: ContactManager instance
     """
     try:
-        imported, skipped = manager.import_from_csv(args.file, skip_duplicates=not args.overwrite)
+        imported, skipped = manager.import_from_csv(
+            args.file, skip_duplicates=not args.overwrite, bulk=args.bulk
+        )
         print(f"Import complete: {imported} imported, {skipped} skipped")
     except Exception as e:
         print(f"Error importing contacts: {e}")
@@ -262,6 +265,7 @@ Examples:
   %(prog)s get --id 1
   %(prog)s list --details
   %(prog)s search "john" --details
+  %(prog)s search "jo sm" --limit 10
   %(prog)s update --id 1 --phone "555-5678"
   %(prog)s delete --id 1
   %(prog)s export --file contacts.csv
@@ -300,6 +304,8 @@ Examples:
     search_parser.add_argument('query', help='Search query')
     search_parser.add_argument('--details', action='store_true', help='Show detailed information')
     search_parser.add_argument('--no-fts', action='store_true', help='Use LIKE search instead of FTS5')
+    search_parser.add_argument('--limit', type=int, help='Show at most this many matches')
+    search_parser.add_argument('--offset', type=int, default=0, help='Skip this many matches (for paging)')
 
     # Update contact command
     update_parser = subparsers.add_parser('update', help='Update a contact')
@@ -325,6 +331,8 @@ Examples:
     import_parser = subparsers.add_parser('import', help='Import contacts from CSV')
     import_parser.add_argument('--file', required=True, help='Input CSV file path')
     import_parser.add_argument('--overwrite', action='store_true', help='Overwrite duplicate contacts')
+    import_parser.add_argument('--bulk', action='store_true',
+                               help='Import in one transaction and rebuild the search index once (for large files)')
 
     # List groups command
     groups_parser = subparsers.add_parser('groups', help='List all contact groups')
@@ -367,7 +375,8 @@ def main() -> None:
 
         handler = command_handlers.get(args.command)
         if handler:
-            handler(args, manager)
+            with manager:
+                handler(args, manager)
         else:
             print(f"Unknown command: {args.command}")
             sys.exit(1)
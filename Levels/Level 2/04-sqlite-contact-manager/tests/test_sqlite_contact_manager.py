@@ -22,9 +22,10 @@ class TestContactManager:
         with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
             db_path = tmp.name
         yield db_path
-        # Cleanup
-        if os.path.exists(db_path):
-            os.unlink(db_path)
+        # Cleanup, including the WAL files of connections left open
+        for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+            if os.path.exists(path):
+                os.unlink(path)
 
     @pytest.fixture
     def manager(self, temp_db):
@@ -32,7 +33,9 @@ class TestContactManager:
         # Ensure clean database for each test
         if os.path.exists(temp_db):
             os.unlink(temp_db)
-        return ContactManager(temp_db)
+        manager = ContactManager(temp_db)
+        yield manager
+        manager.close()
 
     def test_database_initialization(self, temp_db):
         """Test database initialization creates required tables."""
@@ -304,6 +307,61 @@ class TestContactManager:
         contacts = manager.get_all_contacts()
         assert len(contacts) == 2  # Original + 1 new
 
+    def test_bulk_import_csv(self, manager, temp_dir):
+        """Test bulk import dedupes, skips invalid rows and indexes for search."""
+        manager.add_contact(name="Existing User", email="existing@example.com")
+
+        csv_path = os.path.join(temp_dir, "bulk.csv")
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'email', 'notes', 'groups', 'custom_fields'])
+            writer.writerow(['Bulk One', 'one@example.com', 'astronaut', '["work"]', '{}'])
+            writer.writerow(['Duplicate User', 'existing@example.com', '', '[]', '{}'])
+            writer.writerow(['Bulk Two', 'two@example.com', '', '[]', '{"dept": "IT"}'])
+            writer.writerow(['Bulk One Again', 'one@example.com', '', '[]', '{}'])
+            writer.writerow(['  ', 'blank@example.com', '', '[]', '{}'])
+            writer.writerow(['Bad Json', 'bad@example.com', '', 'not json', '{}'])
+            writer.writerow(['No Email A', '', '', '[]', '{}'])
+            writer.writerow(['No Email B', '', '', '[]', '{}'])
+
+        imported, skipped = manager.import_from_csv(csv_path, bulk=True)
+        assert imported == 4
+        assert skipped == 4
+
+        names = [c['name'] for c in manager.get_all_contacts()]
+        assert names == ["Bulk One", "Bulk Two", "Existing User", "No Email A", "No Email B"]
+        assert manager.get_contacts_by_group("work")[0]['name'] == "Bulk One"
+
+        # contacts_fts was rebuilt, and the insert trigger is back afterwards
+        assert [c['name'] for c in manager.search_contacts("astronaut")] == ["Bulk One"]
+        manager.add_contact(name="After Bulk", email="after@example.com", notes="astronaut")
+        assert len(manager.search_contacts("astronaut")) == 2
+
+    def test_export_streams_in_batches(self, manager, temp_dir):
+        """Test export writes every contact when fetching in small batches."""
+        for i in range(5):
+            manager.add_contact(name=f"Contact {i}", email=f"c{i}@example.com",
+                                groups=["g"], custom_fields={"n": i})
+
+        csv_path = os.path.join(temp_dir, "export.csv")
+        assert manager.export_to_csv(csv_path, batch_size=2) == 5
+
+        with open(csv_path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['name'] for row in rows] == [f"Contact {i}" for i in range(5)]
+        assert json.loads(rows[3]['custom_fields']) == {"n": 3}
+
+        # The export round-trips through a bulk import into a fresh database
+        other = ContactManager(os.path.join(temp_dir, "other.db"))
+        assert other.bulk_import_csv(csv_path) == (5, 0)
+        assert other.get_contacts_by_group("g")[4]['custom_fields'] == {"n": 4}
+
+    def test_export_empty_database(self, manager, temp_dir):
+        """Test exporting with no contacts writes nothing."""
+        csv_path = os.path.join(temp_dir, "empty.csv")
+        assert manager.export_to_csv(csv_path) == 0
+        assert not os.path.exists(csv_path)
+
     def test_contact_groups(self, manager):
         """Test contact group functionality."""
         # Add contacts with groups
@@ -323,6 +381,87 @@ class TestContactManager:
         important_contacts = manager.get_contacts_by_group("important")
         assert len(important_contacts) == 2
 
+    def test_prefix_search_ranking_and_paging(self, manager):
+        """Test as-you-type prefix search, BM25 ordering and LIMIT/OFFSET."""
+        manager.add_contact(name="Notes Mention", email="n@example.com", notes="ask about johnson")
+        manager.add_contact(name="Johnson Smith", email="js@example.com")
+        manager.add_contact(name="Johanna Smythe", email="jsm@example.com")
+        manager.add_contact(name="Other Person", email="o@example.com")
+
+        results = manager.search_contacts("jo sm")
+        assert [c['name'] for c in results] == ["Johanna Smythe", "Johnson Smith"]
+
+        # A name match outranks a notes match
+        results = manager.search_contacts("johns")
+        assert [c['name'] for c in results] == ["Johnson Smith", "Notes Mention"]
+
+        page = manager.search_contacts("jo", limit=2, offset=1)
+        assert len(page) == 2
+        assert manager.search_contacts("jo", limit=2, offset=3) == []
+        assert len(manager.search_contacts("", limit=3)) == 3
+        assert len(manager.search_contacts("son", use_fts=False, limit=1)) == 1
+
+        # Punctuation-only input has no words to match
+        assert manager.search_contacts("@@") == []
+
+    def test_fts_index_follows_updates_and_deletes(self, manager):
+        """Test the FTS index stays consistent through updates and deletes."""
+        contact_id = manager.add_contact(name="Alpha Person", email="first@example.com")
+        other_id = manager.add_contact(name="Beta Person", email="second@example.com")
+
+        assert manager.update_contact(contact_id, name="Gamma Person")
+        assert manager.search_contacts("alpha") == []
+        assert [c['id'] for c in manager.search_contacts("gamma")] == [contact_id]
+
+        assert manager.delete_contact(other_id)
+        assert manager.search_contacts("beta") == []
+        manager.conn.execute("INSERT INTO contacts_fts(contacts_fts) VALUES('integrity-check')")
+
+    def test_group_index(self, manager):
+        """Test group lookups use exact names and follow updates and deletes."""
+        work_id = manager.add_contact(name="Worker", groups=["work", "work"])
+        net_id = manager.add_contact(name="Networker", groups=["network"])
+
+        assert [c['id'] for c in manager.get_contacts_by_group("work")] == [work_id]
+        assert manager.get_contact_groups() == ["network", "work"]
+
+        manager.update_contact(net_id, groups=["work"])
+        assert [c['name'] for c in manager.get_contacts_by_group("work")] == ["Networker", "Worker"]
+        assert manager.get_contacts_by_group("network") == []
+
+        manager.delete_contact(work_id)
+        assert [c['id'] for c in manager.get_contacts_by_group("work")] == [net_id]
+
+    def test_upgrades_existing_database(self, temp_db):
+        """Test a database from before the search indexes gets them on open."""
+        import sqlite3
+        if os.path.exists(temp_db):
+            os.unlink(temp_db)
+        conn = sqlite3.connect(temp_db)
+        conn.execute("""
+            CREATE TABLE contacts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, email TEXT,
+                phone TEXT, address TEXT, company TEXT, notes TEXT,
+                groups TEXT DEFAULT '[]', custom_fields TEXT DEFAULT '{}',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE VIRTUAL TABLE contacts_fts USING fts5(
+                name, email, phone, address, company, notes,
+                content='contacts', content_rowid='id'
+            )
+        """)
+        conn.execute("INSERT INTO contacts (name, groups) VALUES ('Legacy Contact', '[\"old\"]')")
+        conn.commit()
+        conn.close()
+
+        with ContactManager(temp_db) as manager:
+            assert manager.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert [c['name'] for c in manager.search_contacts("leg")] == ["Legacy Contact"]
+            assert [c['name'] for c in manager.get_contacts_by_group("old")] == ["Legacy Contact"]
+
     def test_empty_search_query(self, manager):
         """Test search with empty query returns all contacts."""
         manager.add_contact(name="Contact 1", email="contact1@example.com")
@@ -2,10 +2,18 @@
 
 import pytest
 import tempfile
+import gzip
+import json
 import os
 from datetime import datetime
 
-from web_log_analyzer.core import LogParser, LogAnalyzer, LogEntry
+from web_log_analyzer.core import (
+    PERCENTILES,
+    LogParser,
+    LogAnalyzer,
+    LogEntry,
+    percentile,
+)
 from web_log_analyzer.utils import (
     format_bytes,
     format_duration,
@@ -16,6 +24,13 @@ from web_log_analyzer.utils import (
     write_json_report,
 )
 from web_log_analyzer.main import analyze_logs, read_log_file
+from web_log_analyzer.incremental import LogTailer, follow, load_checkpoint
+from web_log_analyzer.streaming import (
+    LatencySketch,
+    LogAggregate,
+    analyze_log_file,
+    compute_chunk_ranges,
+)
 
 
 class TestLogParser:
@@ -101,6 +116,56 @@ class TestLogParser:
         entry = parser.parse_line(log_line)
         assert entry.size == 0
 
+    @pytest.mark.parametrize("log_format", ["combined", "nginx", "nginx_time"])
+    def test_fast_path_matches_regex(self, log_format):
+        """Test that the split-based fast path agrees with the regex path."""
+        lines = [
+            '127.0.0.1 - - [25/Dec/2023:10:00:00 +0000] "GET /index.html HTTP/1.1" 200 1234 "http://example.com" "Mozilla/5.0" 1500',
+            '10.0.0.1 - user [25/Dec/2023:10:00:01 +0000] "GET /a b c HTTP/1.1" 404 - "-" "curl/7.68.0" -',
+            '10.0.0.2 - - [25/Dec/2023:10:00:02 +0000] "POST /api HTTP/1.1" 500 12 "-" "agent" 12 extra',
+            '10.0.0.3 - - [25/Dec/2023:10:00:03 +0000] "GET /q?x=\\"y\\" HTTP/1.1" 200 1 "-" "-"',
+            '10.0.0.4 - - [25/Dec/2023:10:00:04 +0000] "GET / HTTP/1.1" 200 1 "-" "-"  7',
+            '10.0.0.5 - - [bad-date] "GET / HTTP/1.1" 200 1 "-" "-" 1',
+            '10.0.0.6 - - [25/Dec/2023:10:00:06 +0000] "GET  HTTP/1.1" 200 1 "-" "-" 1',
+            '10.0.0.7\t - - [25/Dec/2023:10:00:07 +0000] "GET / HTTP/1.1" 200 1 "-" "-" 1',
+            '10.0.0.8 - - [25/Dec/2023:10:00:08 +0000] "GET\t/ HTTP/1.1" 200 1 "-" "-" 1',
+            '10.0.0.9 - - [25/Dec/2023:10:00:09 +0000] "GET /tab\tpath HTTP/1.1" 200 1 "-" "-" 1',
+            "not a log line",
+        ]
+        fast = LogParser(log_format)
+        slow = LogParser(log_format)
+        slow._fast_path = False
+
+        for line in lines:
+            assert fast.parse_row(line) == slow.parse_row(line), line
+
+    def test_parse_lines_yields_rows(self):
+        """Test batch parsing into compact rows."""
+        parser = LogParser("combined")
+        lines = [
+            '127.0.0.1 - - [25/Dec/2023:10:00:00 +0000] "GET /a HTTP/1.1" 200 10 "-" "UA"',
+            "garbage",
+            '127.0.0.2 - - [25/Dec/2023:10:00:00 +0000] "GET /b HTTP/1.1" 301 - "-" "UA"',
+        ]
+
+        rows = list(parser.parse_lines(lines))
+
+        assert len(rows) == 2
+        assert rows[0] == (
+            "127.0.0.1",
+            datetime(2023, 12, 25, 10, 0, 0),
+            "GET",
+            "/a",
+            200,
+            10,
+            "UA",
+            "-",
+            None,
+        )
+        assert LogEntry(*rows[1]).size == 0
+        # Both lines share one memoized timestamp
+        assert rows[0][1] is rows[1][1]
+
 
 class TestLogAnalyzer:
     """Test cases for LogAnalyzer class."""
@@ -298,6 +363,12 @@ class TestUtils:
                 "error_rate": 20.0,
                 "not_found_analysis": {"total_404s": 20},
             },
+            # Results built without percentiles still get a performance section
+            "performance_analysis": {
+                "avg_response_time": 0.2,
+                "min_response_time": 0.1,
+                "max_response_time": 0.4,
+            },
         }
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -305,6 +376,8 @@ class TestUtils:
             text_file = os.path.join(temp_dir, "report.txt")
             write_text_report(sample_results, text_file)
             assert os.path.exists(text_file)
+            with open(text_file) as f:
+                assert "Max Response Time: 0.400s" in f.read()
 
             # Test CSV report
             csv_file = os.path.join(temp_dir, "report.csv")
@@ -429,5 +502,319 @@ class TestEdgeCases:
         }
 
 
+class TestStreaming:
+    """Test cases for the streaming, chunked analysis engine."""
+
+    def setup_method(self):
+        """Write a varied nginx_time log to a temporary file."""
+        paths = ["/", "/index.html", "/api/data", "/missing", "/slow"]
+        statuses = [200, 200, 301, 404, 500]
+        agents = ["Mozilla/5.0 Chrome/90", "Googlebot/2.1", "curl/7.68.0", "-"]
+        self.lines = []
+        for i in range(500):
+            self.lines.append(
+                f"10.0.{i % 7}.{i % 13} - - [25/Dec/2023:{i % 24:02d}:{i % 60:02d}:00 +0000] "
+                f'"GET {paths[i % 5]} HTTP/1.1" {statuses[i % 5]} {i * 10} '
+                f'"-" "{agents[i % 4]}" {(i % 3) * 700000}'
+            )
+        self.lines.insert(250, "garbage line")
+        fd, self.log_path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(self.lines) + "\n")
+
+    def teardown_method(self):
+        """Remove the temporary log file."""
+        os.unlink(self.log_path)
+
+    def test_chunk_ranges_cover_file_on_line_boundaries(self):
+        """Test that chunk ranges are contiguous and line aligned."""
+        ranges = compute_chunk_ranges(self.log_path, chunk_size=1000)
+
+        assert len(ranges) > 1
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == os.path.getsize(self.log_path)
+        with open(self.log_path, "rb") as f:
+            data = f.read()
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert data[end - 1 : end] == b"\n"
+
+    def test_streaming_matches_in_memory_analysis(self):
+        """Test that chunked results equal the in-memory results."""
+        expected = analyze_logs(self.lines, "nginx_time", 5, True)
+
+        streamed = analyze_log_file(
+            self.log_path, "nginx_time", 5, True, workers=1, chunk_size=2048
+        )
+
+        assert streamed["basic_stats"] == expected["basic_stats"]
+        assert streamed["top_endpoints"] == expected["top_endpoints"]
+        assert streamed["top_ips"] == expected["top_ips"]
+        assert streamed["error_analysis"] == expected["error_analysis"]
+        assert streamed["traffic_patterns"] == expected["traffic_patterns"]
+        assert streamed["user_agent_analysis"] == expected["user_agent_analysis"]
+        assert streamed["performance_analysis"]["avg_response_time"] == pytest.approx(
+            expected["performance_analysis"]["avg_response_time"]
+        )
+        assert (
+            streamed["performance_analysis"]["slow_requests"]
+            == expected["performance_analysis"]["slow_requests"]
+        )
+        streamed_pcts = streamed["performance_analysis"]["percentiles"]
+        expected_pcts = expected["performance_analysis"]["percentiles"]
+        assert set(streamed_pcts) == set(expected_pcts)
+        for name, value in expected_pcts.items():
+            assert streamed_pcts[name] == pytest.approx(value, rel=0.02)
+
+    def test_latency_sketch_merges_and_round_trips(self):
+        """Test sketch percentiles stay within the accuracy bound."""
+        values = [0.001 * (n % 997 + 1) * (1 + n % 7) for n in range(5000)]
+        first, second = LatencySketch(), LatencySketch()
+        for value in values[:2000]:
+            first.add(value)
+        for value in values[2000:]:
+            second.add(value)
+        first.merge(second)
+        restored = LatencySketch.from_dict(json.loads(json.dumps(first.to_dict())))
+
+        exact = sorted(values)
+        for pct, value in restored.percentiles(PERCENTILES).items():
+            assert value == pytest.approx(percentile(exact, pct), rel=0.02)
+        assert restored.count == len(values)
+
+    def test_streaming_with_process_pool(self):
+        """Test that the process pool path merges chunks correctly."""
+        sequential = analyze_log_file(
+            self.log_path, "auto", 10, workers=1, chunk_size=4096
+        )
+        parallel = analyze_log_file(
+            self.log_path, "auto", 10, workers=2, chunk_size=4096
+        )
+
+        assert parallel == sequential
+        assert parallel["basic_stats"]["total_requests"] == 500
+
+    def test_empty_aggregate(self):
+        """Test that an empty aggregate produces no results."""
+        aggregate = LogAggregate()
+
+        assert aggregate.build_results() == {}
+        assert aggregate.get_error_analysis() == {"total_errors": 0}
+        assert aggregate.get_performance_analysis() == {
+            "message": "No response time data available"
+        }
+
+
+class TestColumnarBackend:
+    """Test cases for the NumPy-backed columnar analyzer."""
+
+    def setup_method(self):
+        """Build matching python and columnar analyzers."""
+        pytest.importorskip("numpy")
+        paths = ["/", "/index.html", "/api/data", "/missing", "/slow", "/admin"]
+        statuses = [200, 404, 301, 404, 500, 200, 403]
+        agents = ["Mozilla/5.0 Chrome/90", "Googlebot/2.1", "", "Firefox/1", "curl"]
+        self.entries = [
+            LogEntry(
+                ip=f"10.0.0.{i % 11}",
+                timestamp=datetime(2023, 12, 20 + i % 5, i % 24, i % 60, 0),
+                method=["GET", "POST", "PUT"][i % 3],
+                path=paths[(i * 7) % len(paths)],
+                status_code=statuses[i % len(statuses)],
+                size=i * 3,
+                user_agent=agents[i % len(agents)],
+                referer="-",
+                response_time=None if i % 4 == 0 else (i % 9) * 0.3,
+            )
+            for i in range(300)
+        ]
+        self.python = LogAnalyzer()
+        self.python.add_entries(self.entries)
+        self.columnar = LogAnalyzer(backend="columnar")
+        self.columnar.add_entries(self.entries)
+
+    def test_results_match_python_backend(self):
+        """Test that every statistic matches the python backend exactly."""
+        assert self.columnar.get_basic_stats() == self.python.get_basic_stats()
+        assert self.columnar.get_top_endpoints(4) == self.python.get_top_endpoints(4)
+        assert self.columnar.get_top_ips(20) == self.python.get_top_ips(20)
+        assert self.columnar.get_error_analysis() == self.python.get_error_analysis()
+        assert (
+            self.columnar.get_traffic_patterns() == self.python.get_traffic_patterns()
+        )
+        assert (
+            self.columnar.get_user_agent_analysis()
+            == self.python.get_user_agent_analysis()
+        )
+
+    def test_performance_percentiles(self):
+        """Test vectorized performance analysis and percentiles."""
+        expected = self.python.get_performance_analysis()
+        actual = self.columnar.get_performance_analysis()
+
+        assert actual["slow_requests"] == expected["slow_requests"]
+        assert actual["total_requests_with_time"] == expected["total_requests_with_time"]
+        assert actual["avg_response_time"] == pytest.approx(
+            expected["avg_response_time"]
+        )
+        assert actual["percentiles"] == pytest.approx(expected["percentiles"])
+        assert set(actual["percentiles"]) == {"p50", "p90", "p95", "p99"}
+
+    def test_empty_columnar_analyzer(self):
+        """Test the columnar backend with no entries."""
+        analyzer = LogAnalyzer(backend="columnar")
+
+        assert len(analyzer) == 0
+        assert analyzer.get_basic_stats() == {}
+        assert analyzer.get_top_endpoints() == []
+        assert analyzer.get_error_analysis() == {"total_errors": 0}
+        assert analyzer.get_traffic_patterns() == {}
+        assert analyzer.get_performance_analysis() == {
+            "message": "No response time data available"
+        }
+
+    def test_analyze_logs_with_columnar_backend(self):
+        """Test that analyze_logs accepts the columnar backend."""
+        sample_logs = [
+            '127.0.0.1 - - [25/Dec/2023:10:00:00 +0000] "GET /a HTTP/1.1" 200 5 "-" "UA"',
+            '127.0.0.2 - - [25/Dec/2023:11:00:00 +0000] "GET /b HTTP/1.1" 404 7 "-" "UA"',
+        ]
+
+        assert analyze_logs(sample_logs, "combined", 10, backend="columnar") == (
+            analyze_logs(sample_logs, "combined", 10)
+        )
+
+
+class TestIncremental:
+    """Test cases for checkpointed incremental analysis."""
+
+    LINE = (
+        '127.0.0.1 - - [25/Dec/2023:10:{minute:02d}:00 +0000] "GET /page{n} HTTP/1.1" '
+        '{status} 100 "-" "Mozilla/5.0"\n'
+    )
+
+    def setup_method(self):
+        """Create a temporary directory for logs and checkpoints."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.temp_dir.name, "access.log")
+        self.checkpoint_path = os.path.join(self.temp_dir.name, "access.ckpt")
+
+    def teardown_method(self):
+        """Remove temporary files."""
+        self.temp_dir.cleanup()
+
+    def _lines(self, start, count, status=200):
+        return "".join(
+            self.LINE.format(minute=n % 60, n=n, status=status)
+            for n in range(start, start + count)
+        )
+
+    def _run(self):
+        tailer = LogTailer(self.log_path, "combined", self.checkpoint_path, workers=1)
+        delta = tailer.poll()
+        tailer.save()
+        return tailer, delta
+
+    def test_only_appended_lines_are_parsed(self):
+        """Test that a second run only parses newly appended bytes."""
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(0, 10))
+        _, delta = self._run()
+        assert delta.total_requests == 10
+
+        with open(self.log_path, "a") as f:
+            f.write(self._lines(10, 5, status=500))
+            f.write('127.0.0.1 - - [25/Dec/2023:10:00:00 +0000] "GET /partial')
+        tailer, delta = self._run()
+
+        assert delta.total_requests == 5
+        assert tailer.checkpoint.aggregate.total_requests == 15
+        assert tailer.checkpoint.aggregate.get_error_analysis()["total_errors"] == 5
+        # The unfinished last line is left for the next run
+        assert load_checkpoint(self.checkpoint_path).offset < os.path.getsize(
+            self.log_path
+        )
+
+    def test_gzip_rotation_finishes_old_file(self):
+        """Test that lines written before a gzip rotation are not lost."""
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(0, 10))
+        self._run()
+
+        with open(self.log_path, "a") as f:
+            f.write(self._lines(10, 3))
+        with open(self.log_path, "rb") as src, gzip.open(
+            self.log_path + ".1.gz", "wb"
+        ) as dst:
+            dst.write(src.read())
+        os.unlink(self.log_path)
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(100, 4))
+
+        tailer, delta = self._run()
+
+        assert delta.total_requests == 7
+        assert tailer.checkpoint.aggregate.total_requests == 17
+
+    def test_two_rotations_read_every_rotated_file(self):
+        """Test that a file rotated between the tracked one and now is read."""
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(0, 10))
+        self._run()
+
+        with open(self.log_path, "a") as f:
+            f.write(self._lines(10, 3))
+        os.rename(self.log_path, self.log_path + ".1")
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(200, 5))
+        # Second rotation: .1 becomes .2, the newer file becomes .1
+        os.rename(self.log_path + ".1", self.log_path + ".2")
+        os.utime(self.log_path + ".2", (1_000_000, 1_000_000))
+        os.rename(self.log_path, self.log_path + ".1")
+        os.utime(self.log_path + ".1", (2_000_000, 2_000_000))
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(100, 4))
+
+        tailer, delta = self._run()
+
+        assert delta.total_requests == 3 + 5 + 4
+        assert tailer.checkpoint.aggregate.total_requests == 22
+
+    def test_truncation_restarts_from_beginning(self):
+        """Test that a truncated log is re-read from byte zero."""
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(0, 10))
+        self._run()
+
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(50, 2))
+        tailer, delta = self._run()
+
+        assert delta.total_requests == 2
+        assert tailer.checkpoint.aggregate.total_requests == 12
+
+    def test_follow_publishes_window_summaries(self):
+        """Test that follow mode publishes one summary per poll."""
+        with open(self.log_path, "w") as f:
+            f.write(self._lines(0, 4, status=404))
+        tailer = LogTailer(self.log_path, "auto", workers=1)
+        published = []
+        ticks = iter([0.0, 100.0])
+
+        follow(
+            tailer,
+            interval=0,
+            window_seconds=10,
+            publish=published.append,
+            max_polls=2,
+            clock=lambda: next(ticks),
+        )
+
+        assert len(published) == 2
+        assert "4 requests" in published[0]
+        assert "error rate 100.0%" in published[0]
+        assert "0 requests" in published[1]
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,131 @@
+"""Parser throughput benchmark.
+
+Compares lines/sec of the original per-line parser (uncompiled regex,
+``strptime`` on every line, one ``LogEntry`` per line) against
+``LogParser.parse_line`` and the batch ``LogParser.parse_lines`` API.
+
+Usage:
+    python -m web_log_analyzer.benchmark --lines 1000000
+"""
+
+import argparse
+import os
+import re
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from .core import LogEntry, LogParser
+from .utils import create_sample_log
+
+
+def write_benchmark_log(path: str, line_count: int) -> None:
+    """Write a log of ``line_count`` lines derived from ``create_sample_log``."""
+    template = create_sample_log()
+    paths = ["/index.html", "/api/data", "/about.html", "/missing", "/login"]
+    statuses = ["200", "200", "200", "404", "500"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(line_count):
+            seconds = i // 20  # ~20 requests per second of log time
+            line = (
+                template.replace("127.0.0.1", f"10.0.{i % 256}.{i % 97}")
+                .replace(
+                    "10:00:00",
+                    f"{(seconds // 3600) % 24:02d}:{(seconds // 60) % 60:02d}:"
+                    f"{seconds % 60:02d}",
+                )
+                .replace("/index.html", paths[i % len(paths)])
+                .replace('" 200 ', f'" {statuses[i % len(statuses)]} ')
+            )
+            f.write(line + "\n")
+
+
+def legacy_parse_line(line: str, pattern: str = LogParser.APACHE_COMBINED):
+    """Reproduce the original ``parse_line`` for the combined format."""
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    match = re.match(pattern, line)
+    if not match:
+        return None
+    ip, timestamp, method, path, protocol, status, size, referer, user_agent = (
+        match.groups()
+    )
+    return LogEntry(
+        ip=ip,
+        timestamp=datetime.strptime(timestamp.split()[0], "%d/%b/%Y:%H:%M:%S"),
+        method=method,
+        path=path,
+        status_code=int(status),
+        size=int(size) if size != "-" else 0,
+        user_agent=user_agent,
+        referer=referer,
+    )
+
+
+def _time(label: str, run: Callable[[], int], line_count: int) -> float:
+    """Time ``run`` and print lines/sec."""
+    start = time.perf_counter()
+    parsed = run()
+    elapsed = time.perf_counter() - start
+    rate = line_count / elapsed if elapsed else float("inf")
+    print(
+        f"{label:<28} {parsed:>10,} parsed  {elapsed:8.2f}s  "
+        f"{rate:>12,.0f} lines/sec"
+    )
+    return rate
+
+
+def run_benchmark(line_count: int, log_path: Optional[str] = None) -> None:
+    """Generate a log (unless given) and benchmark each parser tier."""
+    cleanup = log_path is None
+    if log_path is None:
+        fd, log_path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        print(f"Generating {line_count:,} lines...")
+        write_benchmark_log(log_path, line_count)
+
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            lines: List[str] = f.readlines()
+        line_count = len(lines)
+
+        def count(results: Iterable) -> int:
+            return sum(1 for result in results if result is not None)
+
+        baseline = _time(
+            "legacy parse_line",
+            lambda: count(legacy_parse_line(line) for line in lines),
+            line_count,
+        )
+        parser = LogParser("combined")
+        _time(
+            "LogParser.parse_line",
+            lambda: count(parser.parse_line(line) for line in lines),
+            line_count,
+        )
+        batch = _time(
+            "LogParser.parse_lines",
+            lambda: count(LogParser("combined").parse_lines(lines)),
+            line_count,
+        )
+        print(f"Batch speed-up over legacy: {batch / baseline:.1f}x")
+    finally:
+        if cleanup:
+            os.unlink(log_path)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark log parser throughput")
+    parser.add_argument(
+        "--lines", type=int, default=1000000, help="Lines to generate (default: 1M)"
+    )
+    parser.add_argument("--log-file", help="Benchmark an existing log file instead")
+    args = parser.parse_args()
+    run_benchmark(args.lines, args.log_file)
+
+
+if __name__ == "__main__":
+    main()
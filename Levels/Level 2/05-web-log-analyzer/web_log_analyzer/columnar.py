@@ -0,0 +1,346 @@
+"""Columnar (NumPy) storage and statistics for parsed log entries.
+
+Entries are stored as typed columns instead of ``LogEntry`` objects: status
+codes, sizes, response times and epoch seconds as numeric arrays, and
+paths/IPs/user agents/methods as integer ids into interned vocabularies.
+All statistics are then computed with array operations, producing exactly
+the same result shapes as ``LogAnalyzer``.
+
+Interned ids are assigned in order of first appearance, so ranking ties are
+broken the same way ``Counter.most_common`` breaks them.
+"""
+
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+from .core import (
+    PERCENTILES,
+    SLOW_THRESHOLD,
+    LogEntry,
+    LogRow,
+    summarize_user_agents,
+)
+
+_EPOCH = datetime(1970, 1, 1)
+# Weekday names with Monday first (2024-01-01 was a Monday), using strftime
+# so they match LogAnalyzer in the active locale
+_DAY_NAMES = [
+    (datetime(2024, 1, 1) + timedelta(days=i)).strftime("%A") for i in range(7)
+]
+
+
+class _Vocabulary:
+    """Interns strings (or other hashables) to dense integer ids."""
+
+    def __init__(self):
+        """Initialize empty vocabulary."""
+        self.ids: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def intern(self, value: Any) -> int:
+        """Return the id for ``value``, assigning the next id if unseen."""
+        value_id = self.ids.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            self.ids[value] = value_id
+            self.values.append(value)
+        return value_id
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class ColumnarLogStore:
+    """Append-only columnar store with vectorized statistics."""
+
+    def __init__(self):
+        """Initialize empty store."""
+        if not NUMPY_AVAILABLE:
+            raise ImportError(
+                "The columnar backend requires numpy. Install with: pip install numpy"
+            )
+        self.paths = _Vocabulary()
+        self.ips = _Vocabulary()
+        self.user_agents = _Vocabulary()
+        self.methods = _Vocabulary()
+        self.statuses = _Vocabulary()
+
+        # Compact append buffers, converted to NumPy arrays on demand
+        self._path_ids = array("i")
+        self._ip_ids = array("i")
+        self._ua_ids = array("i")
+        self._method_ids = array("i")
+        self._status_ids = array("i")
+        self._sizes = array("q")
+        self._epochs = array("q")
+        self._response_times = array("d")
+
+        self._last_timestamp: Optional[datetime] = None
+        self._last_epoch = 0
+        self._columns: Optional[Dict[str, Any]] = None
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add_row(self, row: LogRow) -> None:
+        """Append a compact row from ``LogParser.parse_lines``."""
+        ip, timestamp, method, path, status_code, size, user_agent, _, response_time = (
+            row
+        )
+        if timestamp is not self._last_timestamp:
+            self._last_timestamp = timestamp
+            self._last_epoch = int((timestamp - _EPOCH).total_seconds())
+
+        self._path_ids.append(self.paths.intern(path))
+        self._ip_ids.append(self.ips.intern(ip))
+        self._ua_ids.append(self.user_agents.intern(user_agent))
+        self._method_ids.append(self.methods.intern(method))
+        self._status_ids.append(self.statuses.intern(status_code))
+        self._sizes.append(size)
+        self._epochs.append(self._last_epoch)
+        self._response_times.append(
+            float("nan") if response_time is None else response_time
+        )
+        self._columns = None
+
+    def add_rows(self, rows: Iterable[LogRow]) -> None:
+        """Append many rows."""
+        for row in rows:
+            self.add_row(row)
+
+    def add_entries(self, entries: Iterable[LogEntry]) -> None:
+        """Append ``LogEntry`` objects."""
+        for entry in entries:
+            self.add_row(
+                (
+                    entry.ip,
+                    entry.timestamp,
+                    entry.method,
+                    entry.path,
+                    entry.status_code,
+                    entry.size,
+                    entry.user_agent,
+                    entry.referer,
+                    entry.response_time,
+                )
+            )
+
+    def _get_columns(self) -> Dict[str, Any]:
+        """Materialize the append buffers as NumPy arrays (cached)."""
+        if self._columns is None:
+
+            def column(buffer: array, dtype: Any) -> "np.ndarray":
+                # Copy so the append buffers stay resizable
+                return np.frombuffer(buffer, dtype=dtype).copy()
+
+            status_values = np.array(self.statuses.values, dtype=np.int64)
+            status_ids = column(self._status_ids, np.intc)
+            epochs = column(self._epochs, np.int64)
+            self._columns = {
+                "path": column(self._path_ids, np.intc),
+                "ip": column(self._ip_ids, np.intc),
+                "ua": column(self._ua_ids, np.intc),
+                "method": column(self._method_ids, np.intc),
+                "status_id": status_ids,
+                "status": status_values[status_ids],
+                "size": column(self._sizes, np.int64),
+                "epoch": epochs,
+                "response_time": column(self._response_times, np.float64),
+                "hour": (epochs // 3600) % 24,
+                # 1970-01-01 was a Thursday, so +3 makes Monday == 0
+                "weekday": (epochs // 86400 + 3) % 7,
+            }
+        return self._columns
+
+    @staticmethod
+    def _counts_in_first_seen_order(
+        ids: "np.ndarray", vocab_size: Optional[int] = None
+    ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Count ids, returning (ids, counts) ordered by first appearance.
+
+        Pass ``vocab_size`` when ``ids`` is a full column: interned ids are
+        already in first-seen order, so a ``bincount`` suffices. For subsets
+        the first-seen order has to be recovered from first indices.
+        """
+        if vocab_size is not None:
+            counts = np.bincount(ids, minlength=vocab_size)
+            present = np.nonzero(counts)[0]
+            return present, counts[present]
+        unique, first_index, counts = np.unique(
+            ids, return_index=True, return_counts=True
+        )
+        order = np.argsort(first_index, kind="stable")
+        return unique[order], counts[order]
+
+    @classmethod
+    def _most_common(
+        cls,
+        ids: "np.ndarray",
+        values: List[Any],
+        limit: Optional[int] = None,
+        vocab_size: Optional[int] = None,
+    ) -> List[Tuple[Any, int]]:
+        """Equivalent of ``Counter(values[i] for i in ids).most_common(limit)``."""
+        if len(ids) == 0:
+            return []
+        keys, counts = cls._counts_in_first_seen_order(ids, vocab_size)
+        # Stable sort keeps first-seen order among equal counts
+        order = np.argsort(-counts, kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        return [(values[keys[i]], int(counts[i])) for i in order]
+
+    def get_basic_stats(self) -> Dict[str, Any]:
+        """Get basic statistics about the stored entries."""
+        total_requests = len(self)
+        if not total_requests:
+            return {}
+
+        columns = self._get_columns()
+        total_bytes = int(columns["size"].sum())
+        start_time = _EPOCH + timedelta(seconds=int(columns["epoch"].min()))
+        end_time = _EPOCH + timedelta(seconds=int(columns["epoch"].max()))
+
+        return {
+            "total_requests": total_requests,
+            "unique_ips": len(self.ips),
+            "time_range": {
+                "start": start_time.isoformat(),
+                "end": end_time.isoformat(),
+                "duration_hours": (end_time - start_time).total_seconds() / 3600,
+            },
+            "status_distribution": dict(
+                self._most_common(
+                    columns["status_id"], self.statuses.values, None, len(self.statuses)
+                )
+            ),
+            "method_distribution": dict(
+                self._most_common(
+                    columns["method"], self.methods.values, None, len(self.methods)
+                )
+            ),
+            "total_bytes_served": total_bytes,
+            "avg_bytes_per_request": total_bytes / total_requests,
+        }
+
+    def get_top_endpoints(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get most frequently accessed endpoints."""
+        if not len(self):
+            return []
+        return self._most_common(
+            self._get_columns()["path"], self.paths.values, limit, len(self.paths)
+        )
+
+    def get_top_ips(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get IPs with most requests."""
+        if not len(self):
+            return []
+        return self._most_common(
+            self._get_columns()["ip"], self.ips.values, limit, len(self.ips)
+        )
+
+    def get_error_analysis(self) -> Dict[str, Any]:
+        """Analyze error patterns (4xx and 5xx status codes)."""
+        if not len(self):
+            return {"total_errors": 0}
+
+        columns = self._get_columns()
+        error_mask = columns["status"] >= 400
+        total_errors = int(error_mask.sum())
+        if not total_errors:
+            return {"total_errors": 0}
+
+        not_found_mask = columns["status"] == 404
+        return {
+            "total_errors": total_errors,
+            "error_rate": total_errors / len(self) * 100,
+            "status_distribution": dict(
+                self._most_common(
+                    columns["status_id"][error_mask], self.statuses.values
+                )
+            ),
+            "top_error_endpoints": self._most_common(
+                columns["path"][error_mask], self.paths.values, 10
+            ),
+            "top_error_ips": self._most_common(
+                columns["ip"][error_mask], self.ips.values, 10
+            ),
+            "not_found_analysis": {
+                "total_404s": int(not_found_mask.sum()),
+                "top_missing_paths": self._most_common(
+                    columns["path"][not_found_mask], self.paths.values, 10
+                ),
+            },
+        }
+
+    def get_traffic_patterns(self) -> Dict[str, Any]:
+        """Analyze traffic patterns over time."""
+        if not len(self):
+            return {}
+
+        columns = self._get_columns()
+        hours, hour_counts = self._counts_in_first_seen_order(columns["hour"])
+        days, day_counts = self._counts_in_first_seen_order(columns["weekday"])
+        hourly_requests = {int(h): int(c) for h, c in zip(hours, hour_counts)}
+        daily_requests = {_DAY_NAMES[d]: int(c) for d, c in zip(days, day_counts)}
+
+        return {
+            "hourly_distribution": hourly_requests,
+            "daily_distribution": daily_requests,
+            "peak_hour": max(hourly_requests.items(), key=lambda x: x[1]),
+            "peak_day": max(daily_requests.items(), key=lambda x: x[1]),
+        }
+
+    def get_performance_analysis(self) -> Dict[str, Any]:
+        """Analyze performance metrics if response times are available."""
+        columns = self._get_columns()
+        timed_mask = ~np.isnan(columns["response_time"])
+        response_times = columns["response_time"][timed_mask]
+        if not len(response_times):
+            return {"message": "No response time data available"}
+
+        slow_mask = timed_mask & (columns["response_time"] > SLOW_THRESHOLD)
+        slow_count = int(slow_mask.sum())
+        percentile_values = np.percentile(response_times, PERCENTILES)
+
+        return {
+            "total_requests_with_time": len(response_times),
+            "avg_response_time": float(response_times.mean()),
+            "min_response_time": float(response_times.min()),
+            "max_response_time": float(response_times.max()),
+            "percentiles": {
+                f"p{p}": float(value) for p, value in zip(PERCENTILES, percentile_values)
+            },
+            "slow_requests": {
+                "threshold_seconds": SLOW_THRESHOLD,
+                "count": slow_count,
+                "percentage": slow_count / len(response_times) * 100,
+                "slowest_endpoints": self._most_common(
+                    columns["path"][slow_mask], self.paths.values, 10
+                ),
+            },
+        }
+
+    def get_user_agent_analysis(self) -> Dict[str, Any]:
+        """Analyze user agent patterns."""
+        user_agents = {}
+        if len(self):
+            ids, counts = self._counts_in_first_seen_order(
+                self._get_columns()["ua"], len(self.user_agents)
+            )
+            user_agents = {
+                self.user_agents.values[i]: int(c)
+                for i, c in zip(ids, counts)
+                if self.user_agents.values[i]
+            }
+        return summarize_user_agents(Counter(user_agents), len(self))
@@ -3,7 +3,7 @@
 import re
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from collections import defaultdict, Counter
 from dataclasses import dataclass
 
@@ -23,6 +23,19 @@ class LogEntry:
     response_time: Optional[float] = None
 
 
+# Compact row produced by LogParser.parse_lines, in LogEntry field order:
+# (ip, timestamp, method, path, status_code, size, user_agent, referer,
+#  response_time)
+LogRow = Tuple[str, datetime, str, str, int, int, str, str, Optional[float]]
+
+TIMESTAMP_CACHE_SIZE = 4096
+
+# Requests slower than this many seconds count as slow
+SLOW_THRESHOLD = 1.0
+# Latency percentiles reported by get_performance_analysis
+PERCENTILES = (50, 90, 95, 99)
+
+
 class LogParser:
     """Parses Apache/Nginx access logs into structured data."""
 
@@ -33,6 +46,11 @@ class LogParser:
     # Pattern with response time (microseconds)
     NGINX_WITH_TIME = r'(\S+) - \S+ \[([^\]]+)\] "(\S+) ([^"]+) (\S+)" (\d+) (\S+) "([^"]*)" "([^"]*)" (\S+)'
 
+    # Formats whose lines can be tokenized with str.split before trying regex
+    FAST_PATH_FORMATS = ("combined", "nginx", "nginx_time")
+
+    _compiled: Dict[str, "re.Pattern[str]"] = {}
+
     def __init__(self, log_format: str = "combined"):
         """Initialize parser with specified log format."""
         self.log_format = log_format
@@ -43,16 +61,45 @@ class LogParser:
             "nginx_time": self.NGINX_WITH_TIME,
         }
         self.pattern = self.patterns.get(log_format, self.APACHE_COMBINED)
+        if self.pattern not in self._compiled:
+            self._compiled[self.pattern] = re.compile(self.pattern)
+        self.regex = self._compiled[self.pattern]
         self.logger = logging.getLogger(__name__)
 
+        # Formats other than the four known ones fall back to combined
+        fast_format = log_format if log_format in self.patterns else "combined"
+        self._fast_path = fast_format in self.FAST_PATH_FORMATS
+        self._require_dash_ident = fast_format in ("nginx", "nginx_time")
+        self._has_response_time = fast_format == "nginx_time"
+        if log_format == "common":
+            self._groups_to_row = self._common_groups_to_row
+        elif log_format == "nginx_time":
+            self._groups_to_row = self._timed_groups_to_row
+        else:
+            self._groups_to_row = self._combined_groups_to_row
+        self._timestamp_cache: Dict[str, datetime] = {}
+
     def parse_timestamp(self, timestamp_str: str) -> datetime:
-        """Parse timestamp string to datetime object."""
+        """Parse timestamp string to datetime object.
+
+        Results are memoized because consecutive lines usually share the
+        same second.
+        """
+        cached = self._timestamp_cache.get(timestamp_str)
+        if cached is not None:
+            return cached
         try:
             # Common timestamp format: dd/MMM/yyyy:HH:mm:ss +0000
-            return datetime.strptime(timestamp_str.split()[0], "%d/%b/%Y:%H:%M:%S")
-        except ValueError as e:
+            parsed = datetime.strptime(
+                timestamp_str.split()[0], "%d/%b/%Y:%H:%M:%S"
+            )
+        except (ValueError, IndexError) as e:
             self.logger.warning(f"Failed to parse timestamp '{timestamp_str}': {e}")
             raise ValueError(f"Invalid timestamp: {timestamp_str}")
+        if len(self._timestamp_cache) >= TIMESTAMP_CACHE_SIZE:
+            self._timestamp_cache.clear()
+        self._timestamp_cache[timestamp_str] = parsed
+        return parsed
 
     def parse_size(self, size_str: str) -> int:
         """Parse size string to integer."""
@@ -63,86 +110,203 @@ class LogParser:
         except ValueError:
             return 0
 
-    def parse_line(self, line: str) -> Optional[LogEntry]:
-        """Parse a single log line into a LogEntry object."""
-        line = line.strip()
-        if not line or line.startswith("#"):
+    def _split_fields(self, line: str) -> Optional[Tuple[str, ...]]:
+        """Tokenize a combined/nginx line with str operations.
+
+        Returns the same groups the format's regex would capture, or None
+        when the line is not in the simple shape this handles, in which
+        case the caller falls back to the regex.
+        """
+        parts = line.split('"')
+        if len(parts) != 7 or parts[4] != " ":
+            return None
+        # The regex's \S+ fields end at any whitespace, not just a space, so
+        # leave lines with tabs or other separators to the regex
+        if not (
+            parts[0].isprintable() and parts[1].isprintable() and parts[2].isprintable()
+        ):
             return None
 
-        match = re.match(self.pattern, line)
-        if not match:
-            self.logger.warning(f"Failed to parse line: {line[:100]}...")
+        head = parts[0]
+        bracket = head.find(" [")
+        if bracket == -1 or not head.endswith("] "):
+            return None
+        prefix = head[:bracket].split(" ")
+        timestamp = head[bracket + 2 : -2]
+        if len(prefix) != 3 or not all(prefix) or not timestamp or "]" in timestamp:
+            return None
+        if self._require_dash_ident and prefix[1] != "-":
             return None
 
-        try:
+        method, _, rest = parts[1].partition(" ")
+        path, _, protocol = rest.rpartition(" ")
+        if not method or not path or not protocol:
+            return None
+
+        middle = parts[2]
+        if middle[:1] != " " or middle[-1:] != " ":
+            return None
+        status_size = middle[1:-1].split(" ")
+        if len(status_size) != 2 or not status_size[0].isdecimal() or not status_size[1]:
+            return None
+
+        groups = (
+            prefix[0],
+            timestamp,
+            method,
+            path,
+            protocol,
+            status_size[0],
+            status_size[1],
+            parts[3],
+            parts[5],
+        )
+        if not self._has_response_time:
+            return groups
+
+        tail = parts[6]
+        if tail[:1] != " " or tail[1:2].isspace() or len(tail) < 2:
+            return None
+        return groups + (tail[1:].split(None, 1)[0],)
+
+    def _common_groups_to_row(self, groups: Tuple[str, ...]) -> LogRow:
+        """Build a row from common-format regex groups."""
+        ip, timestamp, method, path, protocol, status, size = groups
+        return (
+            ip,
+            self.parse_timestamp(timestamp),
+            method,
+            path,
+            int(status),
+            self.parse_size(size),
+            "",
+            "",
+            None,
+        )
+
+    def _combined_groups_to_row(self, groups: Tuple[str, ...]) -> LogRow:
+        """Build a row from combined/nginx regex groups."""
+        ip, timestamp, method, path, protocol, status, size, referer, user_agent = (
+            groups[:9]
+        )
+        return (
+            ip,
+            self.parse_timestamp(timestamp),
+            method,
+            path,
+            int(status),
+            self.parse_size(size),
+            user_agent,
+            referer,
+            None,
+        )
+
+    def _timed_groups_to_row(self, groups: Tuple[str, ...]) -> LogRow:
+        """Build a row from nginx_time regex groups."""
+        time_str = groups[9]
+        # Convert from microseconds
+        response_time = float(time_str) / 1000000 if time_str != "-" else None
+        return self._combined_groups_to_row(groups)[:8] + (response_time,)
+
+    def parse_row(self, line: str) -> Optional[LogRow]:
+        """Parse a single log line into a compact ``LogRow`` tuple."""
+        line = line.strip()
+        if not line or line.startswith("#"):
+            return None
+
+        groups = self._split_fields(line) if self._fast_path else None
+        if groups is None:
+            match = self.regex.match(line)
+            if not match:
+                self.logger.warning(f"Failed to parse line: {line[:100]}...")
+                return None
             groups = match.groups()
 
-            if self.log_format == "common":
-                ip, timestamp, method, path, protocol, status, size = groups
-                user_agent = ""
-                referer = ""
-                response_time = None
-            elif self.log_format == "nginx_time":
-                (
-                    ip,
-                    timestamp,
-                    method,
-                    path,
-                    protocol,
-                    status,
-                    size,
-                    referer,
-                    user_agent,
-                    time_str,
-                ) = groups
-                response_time = (
-                    float(time_str) / 1000000 if time_str != "-" else None
-                )  # Convert from microseconds
-            else:
-                (
-                    ip,
-                    timestamp,
-                    method,
-                    path,
-                    protocol,
-                    status,
-                    size,
-                    referer,
-                    user_agent,
-                ) = groups
-                response_time = None
-
-            return LogEntry(
-                ip=ip,
-                timestamp=self.parse_timestamp(timestamp),
-                method=method,
-                path=path,
-                status_code=int(status),
-                size=self.parse_size(size),
-                user_agent=user_agent,
-                referer=referer,
-                response_time=response_time,
-            )
+        try:
+            return self._groups_to_row(groups)
         except (ValueError, IndexError) as e:
             self.logger.warning(f"Error parsing line: {e}")
             return None
 
+    def parse_line(self, line: str) -> Optional[LogEntry]:
+        """Parse a single log line into a LogEntry object."""
+        row = self.parse_row(line)
+        if row is None:
+            return None
+        return LogEntry(*row)
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[LogRow]:
+        """Parse many lines, yielding compact rows for the valid ones.
+
+        Cheaper than ``parse_line`` per line because no ``LogEntry`` object
+        is built; use ``LogEntry(*row)`` where a dataclass is needed.
+        """
+        parse_row = self.parse_row
+        for line in lines:
+            row = parse_row(line)
+            if row is not None:
+                yield row
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Linearly interpolated percentile of pre-sorted values (NumPy's default)."""
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (
+        rank - lower
+    )
+
 
 class LogAnalyzer:
-    """Analyzes parsed log entries and generates statistics."""
+    """Analyzes parsed log entries and generates statistics.
+
+    With ``backend="columnar"`` entries are kept in a NumPy-backed
+    ``ColumnarLogStore`` instead of ``self.entries`` and every ``get_*``
+    method is computed with array operations; results have the same shape.
+    """
+
+    BACKENDS = ("python", "columnar")
 
-    def __init__(self):
+    def __init__(self, backend: str = "python"):
         """Initialize analyzer."""
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
         self.logger = logging.getLogger(__name__)
         self.entries: List[LogEntry] = []
+        self.store = None
+        if backend == "columnar":
+            from .columnar import ColumnarLogStore
+
+            self.store = ColumnarLogStore()
+
+    def __len__(self) -> int:
+        """Number of entries added so far."""
+        if self.store is not None:
+            return len(self.store)
+        return len(self.entries)
 
     def add_entries(self, entries: List[LogEntry]) -> None:
         """Add log entries for analysis."""
-        self.entries.extend(entries)
+        if self.store is not None:
+            self.store.add_entries(entries)
+        else:
+            self.entries.extend(entries)
         self.logger.info(f"Added {len(entries)} log entries")
 
+    def add_rows(self, rows: Iterable[LogRow]) -> None:
+        """Add compact rows from ``LogParser.parse_lines`` for analysis."""
+        before = len(self)
+        if self.store is not None:
+            self.store.add_rows(rows)
+        else:
+            self.entries.extend(LogEntry(*row) for row in rows)
+        self.logger.info(f"Added {len(self) - before} log entries")
+
     def get_basic_stats(self) -> Dict[str, Any]:
         """Get basic statistics about the log entries."""
+        if self.store is not None:
+            return self.store.get_basic_stats()
         if not self.entries:
             return {}
 
@@ -174,16 +338,22 @@ class LogAnalyzer:
 
     def get_top_endpoints(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get most frequently accessed endpoints."""
+        if self.store is not None:
+            return self.store.get_top_endpoints(limit)
         endpoint_counts = Counter(entry.path for entry in self.entries)
         return endpoint_counts.most_common(limit)
 
     def get_top_ips(self, limit: int = 10) -> List[Tuple[str, int]]:
         """Get IPs with most requests."""
+        if self.store is not None:
+            return self.store.get_top_ips(limit)
         ip_counts = Counter(entry.ip for entry in self.entries)
         return ip_counts.most_common(limit)
 
     def get_error_analysis(self) -> Dict[str, Any]:
         """Analyze error patterns (4xx and 5xx status codes)."""
+        if self.store is not None:
+            return self.store.get_error_analysis()
         error_entries = [entry for entry in self.entries if entry.status_code >= 400]
 
         if not error_entries:
@@ -213,6 +383,8 @@ class LogAnalyzer:
 
     def get_traffic_patterns(self) -> Dict[str, Any]:
         """Analyze traffic patterns over time."""
+        if self.store is not None:
+            return self.store.get_traffic_patterns()
         if not self.entries:
             return {}
 
@@ -245,6 +417,8 @@ class LogAnalyzer:
 
     def get_performance_analysis(self) -> Dict[str, Any]:
         """Analyze performance metrics if response times are available."""
+        if self.store is not None:
+            return self.store.get_performance_analysis()
         entries_with_time = [
             entry for entry in self.entries if entry.response_time is not None
         ]
@@ -253,9 +427,10 @@ class LogAnalyzer:
             return {"message": "No response time data available"}
 
         response_times = [entry.response_time for entry in entries_with_time]
+        sorted_times = sorted(response_times)
 
         # Find slow requests
-        slow_threshold = 1.0  # 1 second
+        slow_threshold = SLOW_THRESHOLD
         slow_requests = [
             entry for entry in entries_with_time if entry.response_time > slow_threshold
         ]
@@ -265,6 +440,9 @@ class LogAnalyzer:
             "avg_response_time": sum(response_times) / len(response_times),
             "min_response_time": min(response_times),
             "max_response_time": max(response_times),
+            "percentiles": {
+                f"p{pct}": percentile(sorted_times, pct) for pct in PERCENTILES
+            },
             "slow_requests": {
                 "threshold_seconds": slow_threshold,
                 "count": len(slow_requests),
@@ -277,38 +455,46 @@ class LogAnalyzer:
 
     def get_user_agent_analysis(self) -> Dict[str, Any]:
         """Analyze user agent patterns."""
+        if self.store is not None:
+            return self.store.get_user_agent_analysis()
         user_agents = Counter(
             entry.user_agent for entry in self.entries if entry.user_agent
         )
-
-        # Simple browser detection
-        browsers = defaultdict(int)
-        bots = defaultdict(int)
-
-        for ua, count in user_agents.items():
-            ua_lower = ua.lower()
-            if any(bot in ua_lower for bot in ["bot", "crawler", "spider", "scraper"]):
-                bots[ua] += count
-            elif "chrome" in ua_lower:
-                browsers["Chrome"] += count
-            elif "firefox" in ua_lower:
-                browsers["Firefox"] += count
-            elif "safari" in ua_lower and "chrome" not in ua_lower:
-                browsers["Safari"] += count
-            elif "edge" in ua_lower:
-                browsers["Edge"] += count
-            else:
-                browsers["Other"] += count
-
-        return {
-            "total_unique_user_agents": len(user_agents),
-            "top_user_agents": user_agents.most_common(10),
-            "browser_distribution": dict(browsers),
-            "bot_traffic": {
-                "total_bot_requests": sum(bots.values()),
-                "bot_percentage": (
-                    sum(bots.values()) / len(self.entries) * 100 if self.entries else 0
-                ),
-                "top_bots": dict(Counter(bots).most_common(5)),
-            },
-        }
+        return summarize_user_agents(user_agents, len(self.entries))
+
+
+def summarize_user_agents(
+    user_agents: Counter, total_requests: int
+) -> Dict[str, Any]:
+    """Summarize user agent counts into browser and bot distributions."""
+    # Simple browser detection
+    browsers = defaultdict(int)
+    bots = defaultdict(int)
+
+    for ua, count in user_agents.items():
+        ua_lower = ua.lower()
+        if any(bot in ua_lower for bot in ["bot", "crawler", "spider", "scraper"]):
+            bots[ua] += count
+        elif "chrome" in ua_lower:
+            browsers["Chrome"] += count
+        elif "firefox" in ua_lower:
+            browsers["Firefox"] += count
+        elif "safari" in ua_lower and "chrome" not in ua_lower:
+            browsers["Safari"] += count
+        elif "edge" in ua_lower:
+            browsers["Edge"] += count
+        else:
+            browsers["Other"] += count
+
+    return {
+        "total_unique_user_agents": len(user_agents),
+        "top_user_agents": user_agents.most_common(10),
+        "browser_distribution": dict(browsers),
+        "bot_traffic": {
+            "total_bot_requests": sum(bots.values()),
+            "bot_percentage": (
+                sum(bots.values()) / total_requests * 100 if total_requests else 0
+            ),
+            "top_bots": dict(Counter(bots).most_common(5)),
+        },
+    }
@@ -0,0 +1,350 @@
+"""Incremental (checkpointed) and live-follow analysis of growing log files.
+
+A checkpoint records which file was read (inode plus a fingerprint of its
+first bytes), how far it was read, and the serialized ``LogAggregate`` built
+so far. Each run only parses bytes appended since the last checkpoint. When
+logrotate has moved the file away (optionally gzip-compressing it) or
+truncated it, the rest of the old file is located by fingerprint and
+finished, along with any copies rotated after it, before the new file is
+read from the beginning.
+"""
+
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    LogAggregate,
+    aggregate_lines,
+    aggregate_log_file,
+    read_sample_lines,
+)
+from .utils import detect_log_format
+
+# Version 2 added the latency sketch to the stored aggregate
+CHECKPOINT_VERSION = 2
+FINGERPRINT_BYTES = 1024
+
+
+@dataclass
+class Checkpoint:
+    """Persisted read position and aggregate state for one log file."""
+
+    log_path: str
+    log_format: str
+    inode: Optional[int] = None
+    offset: int = 0
+    fingerprint: Optional[Dict[str, Any]] = None
+    aggregate: LogAggregate = field(default_factory=LogAggregate)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize checkpoint to a JSON-compatible dict."""
+        return {
+            "version": CHECKPOINT_VERSION,
+            "log_path": self.log_path,
+            "log_format": self.log_format,
+            "inode": self.inode,
+            "offset": self.offset,
+            "fingerprint": self.fingerprint,
+            "updated_at": datetime.now().isoformat(),
+            "aggregate": self.aggregate.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Checkpoint":
+        """Rebuild a checkpoint from ``to_dict`` output."""
+        return cls(
+            log_path=data["log_path"],
+            log_format=data["log_format"],
+            inode=data.get("inode"),
+            offset=data.get("offset", 0),
+            fingerprint=data.get("fingerprint"),
+            aggregate=LogAggregate.from_dict(data.get("aggregate", {})),
+        )
+
+
+def load_checkpoint(checkpoint_path: str) -> Optional[Checkpoint]:
+    """Load a checkpoint file, returning None if it is missing or unreadable."""
+    if not os.path.exists(checkpoint_path):
+        return None
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            logging.warning(
+                f"Ignoring checkpoint with unknown version: {checkpoint_path}"
+            )
+            return None
+        return Checkpoint.from_dict(data)
+    except (OSError, ValueError, KeyError) as e:
+        logging.warning(f"Ignoring unreadable checkpoint {checkpoint_path}: {e}")
+        return None
+
+
+def save_checkpoint(checkpoint: Checkpoint, checkpoint_path: str) -> None:
+    """Atomically write a checkpoint file."""
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint.to_dict(), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, checkpoint_path)
+
+
+def _open_log(path: str):
+    """Open a plain or gzip-compressed log file in binary mode."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def compute_fingerprint(path: str, max_bytes: int) -> Optional[Dict[str, Any]]:
+    """Hash the first bytes of a file so it can be recognised after rotation."""
+    length = min(max_bytes, FINGERPRINT_BYTES)
+    if length <= 0:
+        return None
+    with _open_log(path) as f:
+        head = f.read(length)
+    return {"length": len(head), "sha1": hashlib.sha1(head).hexdigest()}
+
+
+def matches_fingerprint(path: str, fingerprint: Optional[Dict[str, Any]]) -> bool:
+    """Check whether a (possibly gzipped) file starts with the fingerprinted bytes."""
+    if not fingerprint:
+        return True
+    try:
+        with _open_log(path) as f:
+            head = f.read(fingerprint["length"])
+    except (OSError, EOFError):
+        return False
+    return (
+        len(head) == fingerprint["length"]
+        and hashlib.sha1(head).hexdigest() == fingerprint["sha1"]
+    )
+
+
+def last_complete_offset(path: str, start: int, size: int) -> int:
+    """Return the offset just past the last newline in ``[start, size)``.
+
+    A trailing partial line is left for the next run, when the writer will
+    have finished it.
+    """
+    block = 64 * 1024
+    with open(path, "rb") as f:
+        position = size
+        while position > start:
+            read_from = max(start, position - block)
+            f.seek(read_from)
+            data = f.read(position - read_from)
+            newline = data.rfind(b"\n")
+            if newline != -1:
+                return read_from + newline + 1
+            position = read_from
+    return start
+
+
+def _iter_from_offset(path: str, offset: int) -> Iterator[str]:
+    """Yield decoded lines of a plain or gzipped file starting at ``offset``."""
+    with _open_log(path) as f:
+        f.seek(offset)
+        for raw in f:
+            yield raw.decode("utf-8", errors="ignore")
+
+
+class LogTailer:
+    """Reads only newly appended log lines, surviving rotation and truncation."""
+
+    def __init__(
+        self,
+        log_path: str,
+        log_format: str = "auto",
+        checkpoint_path: Optional[str] = None,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """Initialize tailer, resuming from ``checkpoint_path`` if it exists."""
+        self.log_path = os.path.abspath(log_path)
+        self.checkpoint_path = (
+            os.path.abspath(checkpoint_path) if checkpoint_path else None
+        )
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.logger = logging.getLogger(__name__)
+
+        checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path else None
+        if checkpoint and checkpoint.log_path != self.log_path:
+            self.logger.warning(
+                f"Checkpoint belongs to {checkpoint.log_path}, starting fresh"
+            )
+            checkpoint = None
+        if checkpoint and log_format not in ("auto", checkpoint.log_format):
+            self.logger.warning(
+                f"Log format changed from {checkpoint.log_format} to {log_format}, "
+                "starting fresh"
+            )
+            checkpoint = None
+        self.checkpoint = checkpoint or Checkpoint(self.log_path, log_format)
+
+    def _resolve_format(self) -> str:
+        """Detect the log format once and remember it in the checkpoint."""
+        if self.checkpoint.log_format == "auto":
+            sample = read_sample_lines(self.log_path)
+            if sample:
+                self.checkpoint.log_format = detect_log_format(sample)
+                self.logger.info(
+                    f"Auto-detected log format: {self.checkpoint.log_format}"
+                )
+        return self.checkpoint.log_format
+
+    def _is_same_file(self, stat: os.stat_result) -> bool:
+        """Check whether the current file is the one the checkpoint refers to."""
+        checkpoint = self.checkpoint
+        return (
+            stat.st_ino == checkpoint.inode
+            and stat.st_size >= checkpoint.offset
+            and matches_fingerprint(self.log_path, checkpoint.fingerprint)
+        )
+
+    def _rotated_candidates(self) -> List[str]:
+        """List likely rotated copies of the log, newest first."""
+        candidates = set(glob.glob(f"{glob.escape(self.log_path)}.*"))
+        candidates.update(glob.glob(f"{glob.escape(self.log_path)}-*"))
+        if self.checkpoint_path:
+            candidates.discard(self.checkpoint_path)
+            candidates.discard(f"{self.checkpoint_path}.tmp")
+        return sorted(candidates, key=os.path.getmtime, reverse=True)
+
+    def _finish_rotated_file(self, log_format: str) -> LogAggregate:
+        """Parse the unread tail of the file the checkpoint was tracking.
+
+        If the log rotated more than once since the checkpoint, the rotated
+        copies newer than the tracked file are read in full, oldest first.
+        """
+        candidates = self._rotated_candidates()
+        for index, candidate in enumerate(candidates):
+            if matches_fingerprint(candidate, self.checkpoint.fingerprint):
+                self.logger.info(
+                    f"Log rotated; finishing {candidate} "
+                    f"from byte {self.checkpoint.offset}"
+                )
+                aggregate = aggregate_lines(
+                    _iter_from_offset(candidate, self.checkpoint.offset), log_format
+                )
+                for newer in reversed(candidates[:index]):
+                    self.logger.info(f"Log rotated again; reading all of {newer}")
+                    aggregate.merge(
+                        aggregate_lines(_iter_from_offset(newer, 0), log_format)
+                    )
+                return aggregate
+
+        self.logger.warning(
+            "Log was rotated or truncated and the previous file could not be "
+            "found; lines written after the last checkpoint may be missed"
+        )
+        return LogAggregate()
+
+    def poll(self) -> LogAggregate:
+        """Parse lines appended since the last poll.
+
+        Returns an aggregate of just the new lines; the cumulative aggregate
+        in ``self.checkpoint.aggregate`` is updated as well.
+        """
+        checkpoint = self.checkpoint
+        log_format = self._resolve_format()
+        delta = LogAggregate()
+
+        stat = os.stat(self.log_path)
+        if checkpoint.offset and not self._is_same_file(stat):
+            delta.merge(self._finish_rotated_file(log_format))
+            checkpoint.offset = 0
+            checkpoint.fingerprint = None
+
+        end = last_complete_offset(self.log_path, checkpoint.offset, stat.st_size)
+        if end > checkpoint.offset:
+            delta.merge(
+                aggregate_log_file(
+                    self.log_path,
+                    log_format,
+                    self.workers,
+                    self.chunk_size,
+                    start=checkpoint.offset,
+                    end=end,
+                )
+            )
+            self.logger.info(
+                f"Parsed {end - checkpoint.offset} new bytes "
+                f"({delta.total_requests} entries)"
+            )
+
+        checkpoint.inode = stat.st_ino
+        checkpoint.offset = end
+        if checkpoint.fingerprint is None or (
+            checkpoint.fingerprint["length"] < FINGERPRINT_BYTES
+        ):
+            checkpoint.fingerprint = compute_fingerprint(self.log_path, end)
+        checkpoint.aggregate.merge(delta)
+        return delta
+
+    def save(self) -> None:
+        """Persist the checkpoint, if a checkpoint path was configured."""
+        if self.checkpoint_path:
+            save_checkpoint(self.checkpoint, self.checkpoint_path)
+
+
+def format_window_summary(
+    window: LogAggregate, window_seconds: float, top_count: int = 5
+) -> str:
+    """Format a one-line live summary of a rolling window."""
+    errors = window.get_error_analysis()
+    top = ", ".join(
+        f"{path} ({count})" for path, count in window.get_top_endpoints(top_count)
+    )
+    return (
+        f"[{datetime.now().strftime('%H:%M:%S')}] last {window_seconds:.0f}s: "
+        f"{window.total_requests:,} requests, "
+        f"error rate {errors.get('error_rate', 0):.1f}% | top: {top or '-'}"
+    )
+
+
+def follow(
+    tailer: LogTailer,
+    interval: float = 5.0,
+    window_seconds: float = 300.0,
+    top_count: int = 5,
+    publish: Callable[[str], None] = print,
+    max_polls: Optional[int] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll the log forever, publishing rolling top-N and error-rate windows.
+
+    Each poll's new lines form one bucket; buckets older than
+    ``window_seconds`` are dropped and the rest merged for the summary.
+    """
+    buckets = deque()
+    polls = 0
+    while max_polls is None or polls < max_polls:
+        delta = tailer.poll()
+        tailer.save()
+        now = clock()
+        buckets.append((now, delta))
+        while buckets and now - buckets[0][0] > window_seconds:
+            buckets.popleft()
+
+        window = LogAggregate()
+        for _, bucket in buckets:
+            window.merge(bucket)
+        publish(format_window_summary(window, window_seconds, top_count))
+
+        polls += 1
+        if max_polls is None or polls < max_polls:
+            sleep(interval)
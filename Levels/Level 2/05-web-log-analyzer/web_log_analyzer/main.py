@@ -6,7 +6,10 @@ import sys
 from pathlib import Path
 from typing import List, Optional
 
+from .columnar import NUMPY_AVAILABLE
 from .core import LogParser, LogAnalyzer
+from .incremental import LogTailer, follow
+from .streaming import DEFAULT_CHUNK_SIZE, analyze_log_file
 from .utils import (
     setup_logging,
     validate_log_file,
@@ -28,6 +31,9 @@ Examples:
   %(prog)s access.log
   %(prog)s access.log --format nginx --output report.txt
   %(prog)s access.log --output-dir reports/ --format combined
+  %(prog)s access.log --stream --workers 8  # Constant-memory, multi-process
+  %(prog)s access.log --checkpoint access.ckpt  # Only parse appended lines
+  %(prog)s access.log --follow --window 300  # Live rolling summaries
   %(prog)s --sample  # Generate sample log for testing
         """,
     )
@@ -81,6 +87,58 @@ Examples:
         help="Include performance analysis (requires response time data)",
     )
 
+    parser.add_argument(
+        "--backend",
+        choices=list(LogAnalyzer.BACKENDS),
+        default="python",
+        help="Statistics backend; columnar needs numpy (default: python)",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream the file in chunks across worker processes (constant memory)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --stream (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE // (1024 * 1024),
+        help="Chunk size in MB for --stream (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file; only bytes appended since the last run are parsed",
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep watching the log and print rolling window summaries",
+    )
+
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=300.0,
+        help="Rolling window in seconds for --follow (default: %(default)s)",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="Poll interval in seconds for --follow (default: %(default)s)",
+    )
+
     return parser.parse_args()
 
 
@@ -101,6 +159,7 @@ def analyze_logs(
     log_format: str,
     top_count: int,
     include_performance: bool = False,
+    backend: str = "python",
 ) -> dict:
     """Analyze log lines and return results."""
     # Detect format if needed
@@ -110,23 +169,13 @@ def analyze_logs(
 
     # Parse logs
     parser = LogParser(log_format)
-    analyzer = LogAnalyzer()
-
-    entries = []
-    for i, line in enumerate(log_lines):
-        entry = parser.parse_line(line)
-        if entry:
-            entries.append(entry)
+    analyzer = LogAnalyzer(backend)
+    analyzer.add_rows(parser.parse_lines(log_lines))
 
-        if i > 0 and i % 10000 == 0:
-            logging.info(f"Parsed {i} lines...")
-
-    if not entries:
+    if len(analyzer) == 0:
         logging.warning("No valid log entries found")
         return {}
 
-    analyzer.add_entries(entries)
-
     # Generate analysis
     results = {
         "basic_stats": analyzer.get_basic_stats(),
@@ -218,17 +267,55 @@ def main() -> int:
     if not validate_log_file(args.log_file):
         return 1
 
-    try:
-        # Read log file
-        logging.info(f"Reading log file: {args.log_file}")
-        log_lines = read_log_file(args.log_file)
-        logging.info(f"Read {len(log_lines)} lines from log file")
-
-        # Analyze logs
-        logging.info("Analyzing log entries...")
-        results = analyze_logs(
-            log_lines, args.format, args.top, args.include_performance
+    if args.backend == "columnar" and not NUMPY_AVAILABLE:
+        print(
+            "Error: numpy not installed. Install with: pip install numpy",
+            file=sys.stderr,
         )
+        return 1
+
+    try:
+        if args.follow or args.checkpoint:
+            tailer = LogTailer(
+                args.log_file,
+                args.format,
+                args.checkpoint,
+                workers=args.workers,
+                chunk_size=args.chunk_size * 1024 * 1024,
+            )
+            if args.follow:
+                follow(tailer, args.interval, args.window, min(args.top, 5))
+                return 0
+            tailer.poll()
+            tailer.save()
+            results = tailer.checkpoint.aggregate.build_results(
+                args.top, args.include_performance
+            )
+        elif args.stream:
+            logging.info(f"Streaming log file: {args.log_file}")
+            results = analyze_log_file(
+                args.log_file,
+                args.format,
+                args.top,
+                args.include_performance,
+                workers=args.workers,
+                chunk_size=args.chunk_size * 1024 * 1024,
+            )
+        else:
+            # Read log file
+            logging.info(f"Reading log file: {args.log_file}")
+            log_lines = read_log_file(args.log_file)
+            logging.info(f"Read {len(log_lines)} lines from log file")
+
+            # Analyze logs
+            logging.info("Analyzing log entries...")
+            results = analyze_logs(
+                log_lines,
+                args.format,
+                args.top,
+                args.include_performance,
+                args.backend,
+            )
 
         if not results:
             print("No valid log entries found in the file", file=sys.stderr)
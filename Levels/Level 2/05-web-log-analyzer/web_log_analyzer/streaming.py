@@ -0,0 +1,543 @@
+"""Streaming, multi-process analysis of large web server logs.
+
+Instead of loading every line and every parsed entry into memory, the log
+file is split into newline-aligned byte ranges. Each range is parsed in a
+worker process and reduced to a ``LogAggregate`` holding only counters and
+running totals, and the partial aggregates are merged in file order. Memory
+use therefore depends on the number of distinct IPs/paths/user agents, not
+on the number of lines.
+"""
+
+import logging
+import math
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .core import (
+    PERCENTILES,
+    SLOW_THRESHOLD,
+    LogEntry,
+    LogParser,
+    LogRow,
+    summarize_user_agents,
+)
+from .utils import detect_log_format
+
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024  # 64 MB per worker task
+
+# Relative error of streamed latency percentiles
+PERCENTILE_ACCURACY = 0.01
+
+COUNTER_FIELDS = (
+    "status_counts",
+    "method_counts",
+    "path_counts",
+    "ip_counts",
+    "error_paths",
+    "error_ips",
+    "not_found_paths",
+    "hourly_requests",
+    "daily_requests",
+    "user_agents",
+    "slow_paths",
+)
+
+
+class LatencySketch:
+    """Bounded, mergeable histogram of response times.
+
+    Values are counted in logarithmic buckets so each bucket's midpoint is
+    within ``PERCENTILE_ACCURACY`` (relative) of every value in it. Memory
+    grows with the log of the latency range rather than with the number of
+    requests, and merging two sketches is exact.
+    """
+
+    def __init__(self, accuracy: float = PERCENTILE_ACCURACY):
+        """Initialize an empty sketch."""
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Counter = Counter()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Count a single observation."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self._log_gamma)] += 1
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add the observations of another sketch."""
+        self.buckets.update(other.buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def value_at(self, rank: int) -> float:
+        """Approximate the ``rank``-th smallest observation (0-based)."""
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                break
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+    def percentiles(self, pcts: Iterable[float]) -> Dict[float, float]:
+        """Approximate linearly interpolated percentiles (see ``core.percentile``)."""
+        results = {}
+        for pct in pcts:
+            rank = (self.count - 1) * pct / 100
+            lower = int(rank)
+            low = self.value_at(lower)
+            high = self.value_at(min(lower + 1, self.count - 1))
+            results[pct] = low + (high - low) * (rank - lower)
+        return results
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the sketch to a JSON-compatible dict."""
+        return {
+            "zero_count": self.zero_count,
+            "buckets": [[index, count] for index, count in self.buckets.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LatencySketch":
+        """Rebuild a sketch from ``to_dict`` output."""
+        sketch = cls()
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.buckets = Counter({index: count for index, count in data.get("buckets", [])})
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class LogAggregate:
+    """Mergeable partial statistics for a slice of a log file.
+
+    Exposes the same ``get_*`` methods as ``LogAnalyzer`` so results built
+    from an aggregate have exactly the same shape.
+    """
+
+    def __init__(self):
+        """Initialize empty aggregate."""
+        self.total_requests = 0
+        self.total_bytes = 0
+        self.start_time: Optional[datetime] = None
+        self.end_time: Optional[datetime] = None
+        self.status_counts: Counter = Counter()
+        self.method_counts: Counter = Counter()
+        self.path_counts: Counter = Counter()
+        self.ip_counts: Counter = Counter()
+        self.error_paths: Counter = Counter()
+        self.error_ips: Counter = Counter()
+        self.not_found_paths: Counter = Counter()
+        self.hourly_requests: Counter = Counter()
+        self.daily_requests: Counter = Counter()
+        self.user_agents: Counter = Counter()
+        self.timed_requests = 0
+        self.response_time_total = 0.0
+        self.min_response_time: Optional[float] = None
+        self.max_response_time: Optional[float] = None
+        self.slow_paths: Counter = Counter()
+        self.latency_sketch = LatencySketch()
+
+    def add(self, entry: LogEntry) -> None:
+        """Fold a single parsed entry into the aggregate."""
+        self.add_row(
+            (
+                entry.ip,
+                entry.timestamp,
+                entry.method,
+                entry.path,
+                entry.status_code,
+                entry.size,
+                entry.user_agent,
+                entry.referer,
+                entry.response_time,
+            )
+        )
+
+    def add_row(self, row: LogRow) -> None:
+        """Fold a compact row from ``LogParser.parse_lines`` into the aggregate."""
+        ip, timestamp, method, path, status_code, size, user_agent, _, response_time = (
+            row
+        )
+        self.total_requests += 1
+        self.total_bytes += size
+
+        if self.start_time is None or timestamp < self.start_time:
+            self.start_time = timestamp
+        if self.end_time is None or timestamp > self.end_time:
+            self.end_time = timestamp
+
+        self.status_counts[status_code] += 1
+        self.method_counts[method] += 1
+        self.path_counts[path] += 1
+        self.ip_counts[ip] += 1
+
+        if status_code >= 400:
+            self.error_paths[path] += 1
+            self.error_ips[ip] += 1
+            if status_code == 404:
+                self.not_found_paths[path] += 1
+
+        self.hourly_requests[timestamp.hour] += 1
+        self.daily_requests[timestamp.strftime("%A")] += 1
+
+        if user_agent:
+            self.user_agents[user_agent] += 1
+
+        if response_time is not None:
+            self._add_response_time(path, response_time)
+
+    def _add_response_time(self, path: str, response_time: float) -> None:
+        """Track a single response time observation."""
+        self.timed_requests += 1
+        self.response_time_total += response_time
+        self.latency_sketch.add(response_time)
+        if self.min_response_time is None or response_time < self.min_response_time:
+            self.min_response_time = response_time
+        if self.max_response_time is None or response_time > self.max_response_time:
+            self.max_response_time = response_time
+        if response_time > SLOW_THRESHOLD:
+            self.slow_paths[path] += 1
+
+    def merge(self, other: "LogAggregate") -> "LogAggregate":
+        """Merge another aggregate into this one.
+
+        Aggregates must be merged in file order so ties in ``most_common``
+        resolve the same way as a sequential pass would.
+        """
+        self.total_requests += other.total_requests
+        self.total_bytes += other.total_bytes
+
+        if other.start_time is not None and (
+            self.start_time is None or other.start_time < self.start_time
+        ):
+            self.start_time = other.start_time
+        if other.end_time is not None and (
+            self.end_time is None or other.end_time > self.end_time
+        ):
+            self.end_time = other.end_time
+
+        for name in COUNTER_FIELDS:
+            getattr(self, name).update(getattr(other, name))
+
+        self.timed_requests += other.timed_requests
+        self.response_time_total += other.response_time_total
+        self.latency_sketch.merge(other.latency_sketch)
+        if other.min_response_time is not None and (
+            self.min_response_time is None
+            or other.min_response_time < self.min_response_time
+        ):
+            self.min_response_time = other.min_response_time
+        if other.max_response_time is not None and (
+            self.max_response_time is None
+            or other.max_response_time > self.max_response_time
+        ):
+            self.max_response_time = other.max_response_time
+        return self
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the aggregate to a JSON-compatible dict.
+
+        Counters are stored as ``[key, count]`` pairs so integer keys and
+        insertion order survive the round trip.
+        """
+        data: Dict[str, Any] = {
+            "total_requests": self.total_requests,
+            "total_bytes": self.total_bytes,
+            "start_time": self.start_time.isoformat() if self.start_time else None,
+            "end_time": self.end_time.isoformat() if self.end_time else None,
+            "timed_requests": self.timed_requests,
+            "response_time_total": self.response_time_total,
+            "min_response_time": self.min_response_time,
+            "max_response_time": self.max_response_time,
+            "latency_sketch": self.latency_sketch.to_dict(),
+        }
+        for name in COUNTER_FIELDS:
+            data[name] = [[key, count] for key, count in getattr(self, name).items()]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LogAggregate":
+        """Rebuild an aggregate from ``to_dict`` output."""
+        aggregate = cls()
+        aggregate.total_requests = data.get("total_requests", 0)
+        aggregate.total_bytes = data.get("total_bytes", 0)
+        if data.get("start_time"):
+            aggregate.start_time = datetime.fromisoformat(data["start_time"])
+        if data.get("end_time"):
+            aggregate.end_time = datetime.fromisoformat(data["end_time"])
+        aggregate.timed_requests = data.get("timed_requests", 0)
+        aggregate.response_time_total = data.get("response_time_total", 0.0)
+        aggregate.min_response_time = data.get("min_response_time")
+        aggregate.max_response_time = data.get("max_response_time")
+        aggregate.latency_sketch = LatencySketch.from_dict(
+            data.get("latency_sketch", {})
+        )
+        for name in COUNTER_FIELDS:
+            setattr(
+                aggregate,
+                name,
+                Counter({key: count for key, count in data.get(name, [])}),
+            )
+        return aggregate
+
+    def get_basic_stats(self) -> Dict[str, Any]:
+        """Get basic statistics about the aggregated entries."""
+        if not self.total_requests:
+            return {}
+
+        return {
+            "total_requests": self.total_requests,
+            "unique_ips": len(self.ip_counts),
+            "time_range": {
+                "start": self.start_time.isoformat(),
+                "end": self.end_time.isoformat(),
+                "duration_hours": (self.end_time - self.start_time).total_seconds()
+                / 3600,
+            },
+            "status_distribution": dict(self.status_counts.most_common()),
+            "method_distribution": dict(self.method_counts.most_common()),
+            "total_bytes_served": self.total_bytes,
+            "avg_bytes_per_request": self.total_bytes / self.total_requests,
+        }
+
+    def get_top_endpoints(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get most frequently accessed endpoints."""
+        return self.path_counts.most_common(limit)
+
+    def get_top_ips(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get IPs with most requests."""
+        return self.ip_counts.most_common(limit)
+
+    def get_error_analysis(self) -> Dict[str, Any]:
+        """Analyze error patterns (4xx and 5xx status codes)."""
+        error_statuses = Counter(
+            {
+                status: count
+                for status, count in self.status_counts.items()
+                if status >= 400
+            }
+        )
+        total_errors = sum(error_statuses.values())
+
+        if not total_errors:
+            return {"total_errors": 0}
+
+        return {
+            "total_errors": total_errors,
+            "error_rate": total_errors / self.total_requests * 100,
+            "status_distribution": dict(error_statuses.most_common()),
+            "top_error_endpoints": self.error_paths.most_common(10),
+            "top_error_ips": self.error_ips.most_common(10),
+            "not_found_analysis": {
+                "total_404s": self.status_counts.get(404, 0),
+                "top_missing_paths": self.not_found_paths.most_common(10),
+            },
+        }
+
+    def get_traffic_patterns(self) -> Dict[str, Any]:
+        """Analyze traffic patterns over time."""
+        if not self.total_requests:
+            return {}
+
+        return {
+            "hourly_distribution": dict(self.hourly_requests),
+            "daily_distribution": dict(self.daily_requests),
+            "peak_hour": max(self.hourly_requests.items(), key=lambda x: x[1]),
+            "peak_day": max(self.daily_requests.items(), key=lambda x: x[1]),
+        }
+
+    def get_performance_analysis(self) -> Dict[str, Any]:
+        """Analyze performance metrics if response times are available."""
+        if not self.timed_requests:
+            return {"message": "No response time data available"}
+
+        slow_count = sum(self.slow_paths.values())
+        sketch_values = self.latency_sketch.percentiles(PERCENTILES)
+        return {
+            "total_requests_with_time": self.timed_requests,
+            "avg_response_time": self.response_time_total / self.timed_requests,
+            "min_response_time": self.min_response_time,
+            "max_response_time": self.max_response_time,
+            "percentiles": {
+                # Bucket midpoints can overshoot the observed extremes
+                f"p{pct}": min(
+                    max(sketch_values[pct], self.min_response_time),
+                    self.max_response_time,
+                )
+                for pct in PERCENTILES
+            },
+            "slow_requests": {
+                "threshold_seconds": SLOW_THRESHOLD,
+                "count": slow_count,
+                "percentage": slow_count / self.timed_requests * 100,
+                "slowest_endpoints": self.slow_paths.most_common(10),
+            },
+        }
+
+    def get_user_agent_analysis(self) -> Dict[str, Any]:
+        """Analyze user agent patterns."""
+        return summarize_user_agents(self.user_agents, self.total_requests)
+
+    def build_results(
+        self, top_count: int = 10, include_performance: bool = False
+    ) -> Dict[str, Any]:
+        """Build the same result dict that ``analyze_logs`` returns."""
+        if not self.total_requests:
+            return {}
+
+        results = {
+            "basic_stats": self.get_basic_stats(),
+            "top_endpoints": self.get_top_endpoints(top_count),
+            "top_ips": self.get_top_ips(top_count),
+            "error_analysis": self.get_error_analysis(),
+            "traffic_patterns": self.get_traffic_patterns(),
+            "user_agent_analysis": self.get_user_agent_analysis(),
+        }
+
+        if include_performance:
+            results["performance_analysis"] = self.get_performance_analysis()
+
+        return results
+
+
+def read_sample_lines(file_path: str, count: int = 10) -> List[str]:
+    """Read the first ``count`` lines of a file for format detection."""
+    lines = []
+    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            lines.append(line.rstrip("\n"))
+            if len(lines) >= count:
+                break
+    return lines
+
+
+def compute_chunk_ranges(
+    file_path: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """Split a file into ``(start, end)`` byte ranges aligned to line breaks.
+
+    ``start`` and ``end`` restrict the split to part of the file; ``start``
+    must itself be at the beginning of a line.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    file_size = os.path.getsize(file_path) if end is None else end
+    ranges = []
+    with open(file_path, "rb") as f:
+        while start < file_size:
+            end = start + chunk_size
+            if end >= file_size:
+                end = file_size
+            else:
+                # Extend to the end of the line the boundary falls in
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def iter_byte_range(file_path: str, start: int, end: int) -> Iterator[str]:
+    """Yield decoded lines from ``file_path`` between byte offsets."""
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        position = start
+        while position < end:
+            raw = f.readline()
+            if not raw:
+                break
+            position += len(raw)
+            yield raw.decode("utf-8", errors="ignore")
+
+
+def aggregate_lines(lines: Iterable[str], log_format: str) -> LogAggregate:
+    """Parse an iterable of raw lines into a ``LogAggregate``."""
+    aggregate = LogAggregate()
+    add_row = aggregate.add_row
+    for row in LogParser(log_format).parse_lines(lines):
+        add_row(row)
+    return aggregate
+
+
+def aggregate_chunk(task: Tuple[str, int, int, str]) -> LogAggregate:
+    """Parse one byte range of a log file into a ``LogAggregate``.
+
+    Top-level so it can be pickled for ``ProcessPoolExecutor``.
+    """
+    file_path, start, end, log_format = task
+    return aggregate_lines(iter_byte_range(file_path, start, end), log_format)
+
+
+def aggregate_log_file(
+    file_path: str,
+    log_format: str = "auto",
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    start: int = 0,
+    end: Optional[int] = None,
+) -> LogAggregate:
+    """Aggregate a log file (or a byte range of it) across a process pool."""
+    if log_format == "auto":
+        log_format = detect_log_format(read_sample_lines(file_path))
+        logging.info(f"Auto-detected log format: {log_format}")
+
+    tasks = [
+        (file_path, chunk_start, chunk_end, log_format)
+        for chunk_start, chunk_end in compute_chunk_ranges(
+            file_path, chunk_size, start, end
+        )
+    ]
+    workers = workers or os.cpu_count() or 1
+    total = LogAggregate()
+
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            total.merge(aggregate_chunk(task))
+        return total
+
+    # Keep a bounded window of in-flight chunks and merge them in file order
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        task_iter = iter(tasks)
+        for task in task_iter:
+            pending.append(executor.submit(aggregate_chunk, task))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            total.merge(pending.popleft().result())
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                pending.append(executor.submit(aggregate_chunk, next_task))
+            logging.debug(f"Merged chunk, {total.total_requests} entries so far")
+
+    return total
+
+
+def analyze_log_file(
+    file_path: str,
+    log_format: str = "auto",
+    top_count: int = 10,
+    include_performance: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """Analyze a log file in streaming mode and return ``analyze_logs`` results."""
+    aggregate = aggregate_log_file(file_path, log_format, workers, chunk_size)
+    if not aggregate.total_requests:
+        logging.warning("No valid log entries found")
+        return {}
+    return aggregate.build_results(top_count, include_performance)
@@ -167,6 +167,8 @@ def write_text_report(analysis_results: Dict[str, Any], output_file: str) -> Non
                     f.write(
                         f"Max Response Time: {perf.get('max_response_time', 0):.3f}s\n"
                     )
+                    for name, value in perf.get("percentiles", {}).items():
+                        f.write(f"{name.upper()} Response Time: {value:.3f}s\n")
 
                     if "slow_requests" in perf:
                         slow = perf["slow_requests"]
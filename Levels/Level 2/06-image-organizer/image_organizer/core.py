@@ -8,8 +8,18 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
-from PIL import Image, ExifTags
-import imagehash
+from PIL import Image
+
+from .pipeline import (
+    CACHE_NAME,
+    AnalysisCache,
+    ImageInfo,
+    analyze_image,
+    analyze_images,
+    exif_date,
+    mtime_date,
+    perceptual_hash,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -23,7 +33,8 @@ class ImageOrganizer:
 
     def __init__(self, source_dir: str, target_dir: str, dry_run: bool = False,
                  create_thumbnails: bool = False, thumbnail_size: tuple = (150, 150),
-                 custom_naming: str = None):
+                 custom_naming: str = None, workers: Optional[int] = None,
+                 use_cache: bool = True, cache_file: Optional[str] = None):
         """
         Initialize the image organizer.
 
@@ -34,6 +45,11 @@ class ImageOrganizer:
             create_thumbnails: If True, create thumbnails for organized images
             thumbnail_size: Size for thumbnails as (width, height) tuple
             custom_naming: Custom naming template (e.g., "{date}_{original_name}")
+            workers: Processes used to read dates and hashes (default: CPU count)
+            use_cache: If True, reuse dates and hashes from earlier runs for
+                files whose size and modification time are unchanged
+            cache_file: Path of the analysis cache (default: a hidden file in
+                the target directory)
         """
         self.source_dir = Path(source_dir)
         self.target_dir = Path(target_dir)
@@ -41,13 +57,18 @@ class ImageOrganizer:
         self.create_thumbnails = create_thumbnails
         self.thumbnail_size = thumbnail_size
         self.custom_naming = custom_naming
+        self.workers = workers
+        self.use_cache = use_cache
+        self.cache_file = Path(cache_file) if cache_file else self.target_dir / CACHE_NAME
+        self.cache: Optional[AnalysisCache] = None
         self.stats = {
             'processed': 0,
             'moved': 0,
             'skipped': 0,
             'errors': 0,
             'duplicates_found': 0,
-            'thumbnails_created': 0
+            'thumbnails_created': 0,
+            'cached': 0
         }
         self.duplicate_hashes = {}
 
@@ -88,39 +109,23 @@ class ImageOrganizer:
         """
         try:
             with Image.open(image_path) as img:
-                exif = img._getexif()
-
-                if exif is not None:
-                    # Look for DateTime or DateTimeOriginal in EXIF
-                    for tag_id, value in exif.items():
-                        tag = ExifTags.TAGS.get(tag_id, tag_id)
-                        if tag in ['DateTime', 'DateTimeOriginal']:
-                            try:
-                                # Parse EXIF date format: "YYYY:MM:DD HH:MM:SS"
-                                date_str = str(value)
-                                return datetime.strptime(date_str, "%Y:%m:%d %H:%M:%S")
-                            except ValueError:
-                                continue
-
-                # Fallback to file modification time
-                logger.debug(f"No EXIF date found for {image_path}, using modification time")
-                mtime = image_path.stat().st_mtime
-                return datetime.fromtimestamp(mtime)
-
+                image_date = exif_date(img)
+                if image_date is not None:
+                    return image_date
         except Exception as e:
             logger.error(f"Error reading date from {image_path}: {e}")
-            # Final fallback to file modification time
-            try:
-                mtime = image_path.stat().st_mtime
-                return datetime.fromtimestamp(mtime)
-            except Exception as fallback_error:
-                logger.error(f"Error reading modification time for {image_path}: {fallback_error}")
-                return None
+            return mtime_date(image_path)
+
+        # Fallback to file modification time
+        logger.debug(f"No EXIF date found for {image_path}, using modification time")
+        return mtime_date(image_path)
 
     def get_image_hash(self, image_path: Path) -> Optional[str]:
         """
         Generate perceptual hash for duplicate detection.
 
+        The image is decoded at reduced size where the format allows it.
+
         Args:
             image_path: Path to the image file
 
@@ -129,11 +134,7 @@ class ImageOrganizer:
         """
         try:
             with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                hash_value = imagehash.average_hash(img)
-                return str(hash_value)
+                return perceptual_hash(img)
         except Exception as e:
             logger.error(f"Error generating hash for {image_path}: {e}")
             return None
@@ -196,18 +197,21 @@ class ImageOrganizer:
             logger.warning(f"Invalid template variable {e} in custom naming, using original name")
             return image_path.name
 
-    def handle_duplicate(self, image_path: Path, target_path: Path) -> bool:
+    def handle_duplicate(self, image_path: Path, target_path: Path,
+                         image_hash: Optional[str] = None) -> bool:
         """
         Handle duplicate images by checking perceptual hash.
 
         Args:
             image_path: Source image path
             target_path: Target image path
+            image_hash: Precomputed hash of the image (default: compute it)
 
         Returns:
             True if this is a duplicate, False otherwise
         """
-        image_hash = self.get_image_hash(image_path)
+        if image_hash is None:
+            image_hash = self.get_image_hash(image_path)
         if not image_hash:
             return False
 
@@ -219,12 +223,14 @@ class ImageOrganizer:
         self.duplicate_hashes[image_hash] = image_path
         return False
 
-    def organize_image(self, image_path: Path) -> bool:
+    def organize_image(self, image_path: Path, info: Optional[ImageInfo] = None) -> bool:
         """
         Organize a single image file.
 
         Args:
             image_path: Path to the image file
+            info: Date and hash from ``analyze_images`` (default: read them
+                from the file)
 
         Returns:
             True if successful, False otherwise
@@ -232,8 +238,10 @@ class ImageOrganizer:
         try:
             self.stats['processed'] += 1
 
-            # Get image date
-            image_date = self.get_image_date(image_path)
+            # Get image date and hash from a single open
+            if info is None:
+                info = analyze_image(image_path)
+            image_date = info.date
             if not image_date:
                 logger.warning(f"Could not determine date for {image_path}, skipping")
                 self.stats['skipped'] += 1
@@ -243,7 +251,8 @@ class ImageOrganizer:
             target_path = self.get_organization_path(image_date, image_path)
 
             # Check for duplicates
-            if self.handle_duplicate(image_path, target_path):
+            if info.hash is not None and self.handle_duplicate(image_path, target_path,
+                                                               info.hash):
                 self.stats['skipped'] += 1
                 return False
 
@@ -267,6 +276,8 @@ class ImageOrganizer:
             else:
                 shutil.move(str(image_path), str(target_path))
                 logger.info(f"Moved: {image_path} -> {target_path}")
+                if self.cache is not None:
+                    self.cache.move(image_path, target_path)
 
                 # Create thumbnail if requested
                 if self.create_thumbnails:
@@ -284,6 +295,11 @@ class ImageOrganizer:
         """
         Organize all images in the source directory.
 
+        Dates and hashes are read up front on a process pool, reusing the
+        analysis cache for files unchanged since an earlier run; images are
+        then moved one at a time so duplicates and name conflicts resolve
+        in scan order.
+
         Returns:
             Dictionary with statistics about the operation
         """
@@ -294,8 +310,18 @@ class ImageOrganizer:
             logger.warning("No images found to organize")
             return self.stats
 
+        if self.use_cache:
+            self.cache = AnalysisCache(self.cache_file)
+        infos = analyze_images(images, self.cache, self.workers)
+        if self.cache is not None:
+            self.stats['cached'] = self.cache.hits
+
         for image_path in images:
-            self.organize_image(image_path)
+            self.organize_image(image_path, infos[image_path])
+
+        # Dry runs never create the target directory, so there may be nowhere to save
+        if self.cache is not None and self.cache_file.parent.is_dir():
+            self.cache.save()
 
         logger.info("Image organization completed")
         return self.stats
@@ -351,6 +377,7 @@ class ImageOrganizer:
             f"  Errors: {self.stats['errors']}",
             f"  Duplicates Found: {self.stats['duplicates_found']}",
             f"  Thumbnails Created: {self.stats['thumbnails_created']}",
+            f"  Cache Hits: {self.stats.get('cached', 0)}",
             "=" * 50
         ]
 
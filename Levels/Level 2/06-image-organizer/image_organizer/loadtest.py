@@ -0,0 +1,104 @@
+"""
+Benchmark for reading image dates and hashes.
+
+Writes a directory of synthetic JPEG photos with EXIF dates, then reports
+images/sec for:
+
+* the sequential path ``organize_images`` used to take: one open for the
+  EXIF date and a second, full-resolution decode for the hash,
+* a cold ``organize_images`` dry run: single open, reduced-size decode,
+  spread over the process pool,
+* a warm dry run over the same tree, where the analysis cache lets every
+  image be skipped.
+
+Usage:
+    python -m image_organizer.loadtest --images 200 --width 3000 --height 2000
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, ExifTags
+import imagehash
+
+from .core import ImageOrganizer
+
+
+def build_images(source_dir: Path, images: int, width: int, height: int) -> None:
+    """Write ``images`` noisy gradient JPEGs with EXIF dates, a few per subdirectory."""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    for i in range(images):
+        noise = Image.effect_noise((width, height), 40 + i % 20)
+        photo = Image.merge('RGB', (gradient, noise, gradient.rotate(180)))
+        exif = photo.getexif()
+        exif[306] = datetime(2020 + i % 4, 1 + i % 12, 1 + i % 28).strftime("%Y:%m:%d %H:%M:%S")
+        path = source_dir / f"album{i % 5}" / f"photo{i}.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        photo.save(path, 'JPEG', quality=90, exif=exif)
+
+
+def two_open_analyze(image_path: Path) -> Optional[str]:
+    """The original date-then-hash reads, for comparison."""
+    with Image.open(image_path) as img:
+        exif = img._getexif()
+        if exif is not None:
+            for tag_id, value in exif.items():
+                if ExifTags.TAGS.get(tag_id, tag_id) in ['DateTime', 'DateTimeOriginal']:
+                    break
+    with Image.open(image_path) as img:
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        return str(imagehash.average_hash(img))
+
+
+def run_benchmark(images: int, width: int, height: int, workers: int) -> None:
+    """Time the two-open sequential path against cold and warm pipeline runs."""
+    logging.getLogger('image_organizer').setLevel(logging.WARNING)
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        source_dir = tmp_dir / 'source'
+        build_images(source_dir, images, width, height)
+        print(f"{images} JPEGs of {width}x{height}, {workers} workers")
+
+        organizer = ImageOrganizer(str(source_dir), str(tmp_dir / 'target'), dry_run=True)
+        start = time.perf_counter()
+        for image_path in organizer.scan_images():
+            two_open_analyze(image_path)
+        elapsed = time.perf_counter() - start
+        print(f"{'two opens, full decode':<26} {images / elapsed:>8.1f} images/sec")
+
+        for label in ('pipeline cold', 'pipeline warm'):
+            organizer = ImageOrganizer(str(source_dir), str(tmp_dir / 'target'), dry_run=True,
+                                       workers=workers, cache_file=str(tmp_dir / 'cache.json'))
+            start = time.perf_counter()
+            stats = organizer.organize_images()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:<26} {images / elapsed:>8.1f} images/sec "
+                f"({stats['cached']} from cache)"
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure image analysis throughput")
+    parser.add_argument('--images', type=int, default=200, help='Source images (default: 200)')
+    parser.add_argument('--width', type=int, default=3000, help='Source width (default: 3000)')
+    parser.add_argument('--height', type=int, default=2000, help='Source height (default: 2000)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Analysis processes (default: CPU count)')
+    args = parser.parse_args()
+    run_benchmark(args.images, args.width, args.height, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -32,9 +32,15 @@ def setup_logging(verbose: bool = False) -> None:
 @click.option('--thumbnails', is_flag=True, help='Create thumbnails for organized images')
 @click.option('--thumbnail-size', default='150x150', help='Thumbnail size (e.g., 150x150)')
 @click.option('--naming', help='Custom naming template (e.g., "{date}_{original_name}")')
+@click.option('--workers', '-j', type=click.IntRange(min=1),
+              help='Processes used to read dates and hashes (default: CPU count)')
+@click.option('--no-cache', is_flag=True, help='Re-read every image instead of reusing earlier results')
+@click.option('--cache-file', type=click.Path(dir_okay=False, path_type=Path),
+              help='Analysis cache location (default: hidden file in TARGET_DIR)')
 @click.version_option(version='1.0.0')
 def main(source_dir: Path, target_dir: Path, dry_run: bool, verbose: bool,
-         thumbnails: bool, thumbnail_size: str, naming: str) -> None:
+         thumbnails: bool, thumbnail_size: str, naming: str, workers: Optional[int],
+         no_cache: bool, cache_file: Optional[Path]) -> None:
     """
     Organize images by date using EXIF data.
 
@@ -60,7 +66,10 @@ def main(source_dir: Path, target_dir: Path, dry_run: bool, verbose: bool,
             dry_run=dry_run,
             create_thumbnails=thumbnails,
             thumbnail_size=thumbnail_size_tuple,
-            custom_naming=naming
+            custom_naming=naming,
+            workers=workers,
+            use_cache=not no_cache,
+            cache_file=str(cache_file) if cache_file else None
         )
 
         # Organize images
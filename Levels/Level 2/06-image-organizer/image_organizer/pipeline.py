@@ -0,0 +1,286 @@
+"""
+Parallel, cached image analysis.
+
+Organizing an image needs its date and its perceptual hash. This module
+gets both from one open of the file:
+
+* the EXIF date comes from the header, which ``Image.open`` parses
+  without decoding any pixels,
+* the hash comes from a reduced-size decode: JPEGs are decoded at 1/2,
+  1/4 or 1/8 scale with ``Image.draft``, which is plenty for an 8x8
+  average hash.
+
+``analyze_images`` runs this over a process pool and keeps an
+``AnalysisCache`` of (path, size, mtime) -> (date, hash), so re-runs over
+a large library only open new or changed files.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from PIL import Image
+import imagehash
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_NAME = ".image_organizer_cache.json"
+# Bump when the date or hash computation changes, so old entries are dropped
+CACHE_VERSION = 1
+# EXIF tags holding the capture date, in order of preference
+EXIF_IFD = 0x8769
+DATE_TIME_ORIGINAL = 36867
+DATE_TIME = 306
+# Smallest edge a reduced decode may have; average_hash shrinks to 8x8
+HASH_DECODE_SIZE = 64
+# Images handed to a worker at a time
+POOL_CHUNKSIZE = 32
+
+
+@dataclass(frozen=True)
+class ImageInfo:
+    """What organizing needs to know about one image."""
+
+    date: Optional[datetime]
+    hash: Optional[str]
+
+
+def exif_date(img: Image.Image) -> Optional[datetime]:
+    """
+    Read the capture date from an open image's EXIF header.
+
+    Args:
+        img: Opened (not necessarily loaded) image
+
+    Returns:
+        DateTimeOriginal, else DateTime, or None if neither parses
+    """
+    exif = img.getexif()
+    candidates = [exif.get_ifd(EXIF_IFD).get(DATE_TIME_ORIGINAL), exif.get(DATE_TIME)]
+    for value in candidates:
+        if value is None:
+            continue
+        try:
+            # Parse EXIF date format: "YYYY:MM:DD HH:MM:SS"
+            return datetime.strptime(str(value).strip('\x00 '), "%Y:%m:%d %H:%M:%S")
+        except ValueError:
+            continue
+    return None
+
+
+def perceptual_hash(img: Image.Image) -> str:
+    """
+    Average hash of an open image, decoded at reduced size where possible.
+
+    Args:
+        img: Opened image that has not been loaded yet
+
+    Returns:
+        Hash as a hex string
+    """
+    # JPEG decodes straight to grayscale at a reduced scale; other formats ignore this
+    img.draft('L', (HASH_DECODE_SIZE, HASH_DECODE_SIZE))
+    if img.mode != 'L':
+        img = img.convert('L')
+    return str(imagehash.average_hash(img))
+
+
+def mtime_date(image_path: Path) -> Optional[datetime]:
+    """File modification time of an image, or None if it cannot be read."""
+    try:
+        return datetime.fromtimestamp(image_path.stat().st_mtime)
+    except Exception as e:
+        logger.error(f"Error reading modification time for {image_path}: {e}")
+        return None
+
+
+def analyze_image(image_path: Path) -> ImageInfo:
+    """
+    Get the date and perceptual hash of an image from a single open.
+
+    Falls back to the file modification time when there is no EXIF date,
+    and to no hash when the image cannot be decoded.
+
+    Args:
+        image_path: Path to the image file
+
+    Returns:
+        ImageInfo for the image
+    """
+    date = None
+    image_hash = None
+    try:
+        with Image.open(image_path) as img:
+            try:
+                date = exif_date(img)
+            except Exception as e:
+                logger.debug(f"Unreadable EXIF in {image_path}: {e}")
+            image_hash = perceptual_hash(img)
+    except Exception as e:
+        logger.error(f"Error analyzing {image_path}: {e}")
+
+    if date is None:
+        logger.debug(f"No EXIF date found for {image_path}, using modification time")
+        date = mtime_date(image_path)
+    return ImageInfo(date, image_hash)
+
+
+def _analyze_task(task: Tuple[int, str]) -> Tuple[int, ImageInfo]:
+    """Analyze one image; runs in a worker process."""
+    index, path = task
+    return index, analyze_image(Path(path))
+
+
+class AnalysisCache:
+    """Persisted (path, size, mtime) -> (date, hash) results of ``analyze_image``."""
+
+    def __init__(self, cache_file: Path):
+        """
+        Load the cache, starting empty if it is missing, unreadable or old.
+
+        Args:
+            cache_file: Path to the JSON cache file
+        """
+        self.cache_file = Path(cache_file)
+        # abspath -> [size, mtime_ns, date isoformat or None, hash or None]
+        self.entries: Dict[str, list] = {}
+        self.hits = 0
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == CACHE_VERSION:
+                self.entries = data.get('images', {})
+        except (OSError, ValueError):
+            pass
+        self._touched = set()
+
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(path)
+
+    def get(self, path: Path, stat: os.stat_result) -> Optional[ImageInfo]:
+        """
+        Look up an image, if it is unchanged since it was analyzed.
+
+        Args:
+            path: Image path
+            stat: Current ``os.stat`` of the image
+
+        Returns:
+            Cached ImageInfo, or None on a miss
+        """
+        key = self._key(path)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+            return None
+        self._touched.add(key)
+        self.hits += 1
+        date = datetime.fromisoformat(entry[2]) if entry[2] else None
+        return ImageInfo(date, entry[3])
+
+    def put(self, path: Path, stat: os.stat_result, info: ImageInfo) -> None:
+        """Record the analysis of an image as of ``stat``."""
+        key = self._key(path)
+        self.entries[key] = [
+            stat.st_size,
+            stat.st_mtime_ns,
+            info.date.isoformat() if info.date else None,
+            info.hash,
+        ]
+        self._touched.add(key)
+
+    def move(self, old_path: Path, new_path: Path) -> None:
+        """Carry an entry over to the path an image was moved to."""
+        entry = self.entries.pop(self._key(old_path), None)
+        self._touched.discard(self._key(old_path))
+        if entry is None:
+            return
+        try:
+            stat = new_path.stat()
+        except OSError:
+            return
+        key = self._key(new_path)
+        self.entries[key] = [stat.st_size, stat.st_mtime_ns, entry[2], entry[3]]
+        self._touched.add(key)
+
+    def save(self) -> None:
+        """
+        Write the cache atomically.
+
+        Entries for files that no longer exist are dropped.
+        """
+        images = {
+            key: entry for key, entry in self.entries.items()
+            if key in self._touched or os.path.isfile(key)
+        }
+        tmp_path = self.cache_file.with_suffix('.json.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'images': images}, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.error(f"Error saving analysis cache {self.cache_file}: {e}")
+            return
+        self.entries = images
+        logger.debug(f"Saved {len(images)} entries to {self.cache_file}")
+
+
+def analyze_images(images: Sequence[Path], cache: Optional[AnalysisCache] = None,
+                   workers: Optional[int] = None) -> Dict[Path, ImageInfo]:
+    """
+    Analyze many images, reusing cached results and spreading the rest
+    over a process pool.
+
+    Args:
+        images: Image paths
+        cache: Cache to read and update (default: analyze everything)
+        workers: Analysis processes (default: CPU count)
+
+    Returns:
+        ImageInfo for each image
+    """
+    workers = workers or os.cpu_count() or 1
+    results: Dict[Path, ImageInfo] = {}
+    pending: List[Tuple[Path, Optional[os.stat_result]]] = []
+    for image_path in images:
+        stat = None
+        if cache is not None:
+            try:
+                stat = image_path.stat()
+            except OSError:
+                pass
+            else:
+                info = cache.get(image_path, stat)
+                if info is not None:
+                    results[image_path] = info
+                    continue
+        pending.append((image_path, stat))
+
+    tasks = [(index, str(image_path)) for index, (image_path, _) in enumerate(pending)]
+    if workers <= 1 or len(tasks) <= 1:
+        outcomes = map(_analyze_task, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        outcomes = pool.map(_analyze_task, tasks, chunksize=POOL_CHUNKSIZE)
+    try:
+        for index, info in outcomes:
+            image_path, stat = pending[index]
+            results[image_path] = info
+            if cache is not None and stat is not None:
+                cache.put(image_path, stat, info)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    logger.info(
+        f"Analyzed {len(pending)} images "
+        f"({len(results) - len(pending)} unchanged since the last run)"
+    )
+    return results
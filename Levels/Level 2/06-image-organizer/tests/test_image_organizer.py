@@ -13,6 +13,7 @@ import pytest
 from PIL import Image
 
 from image_organizer.core import ImageOrganizer
+from image_organizer.pipeline import AnalysisCache, analyze_image
 from image_organizer.utils import (
     create_thumbnail,
     get_image_info,
@@ -206,6 +207,68 @@ class TestImageOrganizer:
         assert organizer.stats['duplicates_found'] == 1
         assert organizer.stats['skipped'] == 1
 
+    def create_pattern_image(self, filename: str, angle: int) -> Path:
+        """Create a JPEG whose perceptual hash depends on ``angle``."""
+        image_path = self.source_dir / filename
+        gradient = Image.linear_gradient('L').resize((400, 300)).rotate(angle)
+        gradient.convert('RGB').save(image_path, 'JPEG')
+        return image_path
+
+    def test_analyze_image_single_open(self):
+        """Test that date and hash come from one open of the file."""
+        test_date = datetime(2023, 5, 15, 14, 30, 0)
+        image_path = self.create_test_image("test.jpg", test_date)
+        organizer = ImageOrganizer(str(self.source_dir), str(self.target_dir))
+
+        with patch('image_organizer.pipeline.Image.open', wraps=Image.open) as opened:
+            info = analyze_image(image_path)
+
+        assert opened.call_count == 1
+        assert info.date == test_date
+        assert info.hash == organizer.get_image_hash(image_path)
+
+    def test_organize_images_reuses_cache(self):
+        """Test that unchanged images are not re-read on a later run."""
+        for i, angle in enumerate((0, 90, 180)):
+            self.create_pattern_image(f"photo{i}.jpg", angle)
+        cache_file = Path(self.temp_dir) / "cache.json"
+
+        first = ImageOrganizer(str(self.source_dir), str(self.target_dir), dry_run=True,
+                               workers=1, cache_file=str(cache_file))
+        assert first.organize_images()['moved'] == 3
+        assert cache_file.exists()
+
+        changed = self.source_dir / "photo2.jpg"
+        os.utime(changed, (0, 0))
+        second = ImageOrganizer(str(self.source_dir), str(self.target_dir), dry_run=True,
+                                workers=1, cache_file=str(cache_file))
+        with patch('image_organizer.pipeline.analyze_image', wraps=analyze_image) as analyzed:
+            stats = second.organize_images()
+
+        assert stats['moved'] == 3
+        assert stats['cached'] == 2
+        analyzed.assert_called_once_with(changed)
+
+    def test_organize_images_process_pool(self):
+        """Test organizing with several workers, keeping the cache in step with moves."""
+        test_date = datetime(2023, 5, 15, 14, 30, 0)
+        self.create_test_image("dated.jpg", test_date)
+        self.create_pattern_image("a.jpg", 0)
+        self.create_pattern_image("b.jpg", 90)
+        shutil.copy(self.source_dir / "b.jpg", self.source_dir / "b_copy.jpg")
+
+        organizer = ImageOrganizer(str(self.source_dir), str(self.target_dir), workers=2)
+        stats = organizer.organize_images()
+
+        assert stats['processed'] == 4
+        assert stats['moved'] == 3
+        assert stats['duplicates_found'] == 1
+        assert (self.target_dir / "2023" / "05" / "dated.jpg").exists()
+
+        cache = AnalysisCache(self.target_dir / ".image_organizer_cache.json")
+        moved = self.target_dir / "2023" / "05" / "dated.jpg"
+        assert cache.get(moved, moved.stat()).date == test_date
+
     def test_generate_report(self):
         """Test report generation."""
         organizer = ImageOrganizer(str(self.source_dir), str(self.target_dir))
@@ -12,7 +12,7 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
 from email import encoders
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 from pathlib import Path
 import time
 
@@ -52,6 +52,11 @@ class EmailSender:
         self.use_tls = use_tls
         self._connection: Optional[smtplib.SMTP] = None
 
+    @property
+    def connected(self) -> bool:
+        """Whether an SMTP connection is currently open."""
+        return self._connection is not None
+
     def connect(self) -> None:
         """Establish SMTP connection."""
         try:
@@ -104,7 +109,7 @@ class EmailSender:
         subject: str,
         body: str,
         html_body: Optional[str] = None,
-        attachments: Optional[List[str]] = None,
+        attachments: Optional[List[Union[str, MIMEBase]]] = None,
         from_email: Optional[str] = None,
         campaign_id: Optional[int] = None,
         recipient_id: Optional[int] = None,
@@ -118,7 +123,8 @@ class EmailSender:
             subject: Email subject
             body: Plain text body
             html_body: HTML body (optional)
-            attachments: List of file paths to attach
+            attachments: File paths to attach, or parts already encoded by
+                ``build_attachment_part`` (reused as is, e.g. per campaign)
             from_email: Sender email (defaults to username)
             campaign_id: Campaign ID for tracking (optional)
             recipient_id: Recipient ID for tracking (optional)
@@ -135,32 +141,17 @@ class EmailSender:
         if invalid_emails:
             raise EmailError(f"Invalid email addresses: {invalid_emails}")
 
-        from_email = from_email or self.username
-
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["From"] = from_email
-        msg["To"] = ", ".join(to_emails)
-        msg["Subject"] = subject
-
-        # Add text body
-        text_part = MIMEText(body, "plain", "utf-8")
-        msg.attach(text_part)
-
-        # Add HTML body if provided
-        if html_body:
-            # Inject tracking if enabled and IDs provided
-            if enable_tracking and campaign_id is not None and recipient_id is not None:
-                from .tracking import add_tracking_to_email
-
-                html_body = add_tracking_to_email(html_body, campaign_id, recipient_id)
-            html_part = MIMEText(html_body, "html", "utf-8")
-            msg.attach(html_part)
-
-        # Add attachments
-        if attachments:
-            for attachment_path in attachments:
-                self._add_attachment(msg, attachment_path)
+        msg = self.build_message(
+            to_emails,
+            subject,
+            body,
+            html_body=html_body,
+            attachments=attachments,
+            from_email=from_email,
+            campaign_id=campaign_id,
+            recipient_id=recipient_id,
+            enable_tracking=enable_tracking,
+        )
 
         # Send email
         try:
@@ -188,27 +179,56 @@ class EmailSender:
             logger.error(f"Unexpected error sending email: {e}")
             raise EmailError(f"Send error: {e}")
 
-    def _add_attachment(self, msg: MIMEMultipart, file_path: str) -> None:
-        """Add an attachment to the email message."""
-        try:
-            file_path = Path(file_path)
-            if not file_path.exists():
-                raise FileNotFoundError(f"Attachment file not found: {file_path}")
+    def build_message(
+        self,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        attachments: Optional[List[Union[str, MIMEBase]]] = None,
+        from_email: Optional[str] = None,
+        campaign_id: Optional[int] = None,
+        recipient_id: Optional[int] = None,
+        enable_tracking: bool = True,
+    ) -> MIMEMultipart:
+        """Compose the MIME message ``send_email`` sends; see its arguments."""
+        from_email = from_email or self.username
 
-            with open(file_path, "rb") as attachment:
-                part = MIMEBase("application", "octet-stream")
-                part.set_payload(attachment.read())
+        # Create message
+        msg = MIMEMultipart("alternative")
+        msg["From"] = from_email
+        msg["To"] = ", ".join(to_emails)
+        msg["Subject"] = subject
 
-            encoders.encode_base64(part)
-            part.add_header(
-                "Content-Disposition", f"attachment; filename= {file_path.name}"
-            )
-            msg.attach(part)
-            logger.info(f"Added attachment: {file_path.name}")
+        # Add text body
+        text_part = MIMEText(body, "plain", "utf-8")
+        msg.attach(text_part)
 
-        except Exception as e:
-            logger.error(f"Error adding attachment {file_path}: {e}")
-            raise EmailError(f"Attachment error: {e}")
+        # Add HTML body if provided
+        if html_body:
+            # Inject tracking if enabled and IDs provided
+            if enable_tracking and campaign_id is not None and recipient_id is not None:
+                from .tracking import add_tracking_to_email
+
+                html_body = add_tracking_to_email(html_body, campaign_id, recipient_id)
+            html_part = MIMEText(html_body, "html", "utf-8")
+            msg.attach(html_part)
+
+        # Add attachments
+        if attachments:
+            for attachment in attachments:
+                self._add_attachment(msg, attachment)
+
+        return msg
+
+    def _add_attachment(
+        self, msg: MIMEMultipart, attachment: Union[str, MIMEBase]
+    ) -> None:
+        """Add a file, or a part from ``build_attachment_part``, to the message."""
+        if isinstance(attachment, MIMEBase):
+            msg.attach(attachment)
+            return
+        msg.attach(build_attachment_part(attachment))
 
     def send_batch(
         self,
@@ -292,6 +312,40 @@ class EmailSender:
             raise EmailError(f"Batch sending error: {e}")
 
 
+def build_attachment_part(file_path: str) -> MIMEBase:
+    """
+    Read a file and encode it as a base64 attachment part.
+
+    The part can be attached to any number of messages, so a campaign
+    sending the same file to every recipient reads and encodes it once.
+
+    Args:
+        file_path: Path of the file to attach
+
+    Returns:
+        The encoded MIME part
+    """
+    try:
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Attachment file not found: {file_path}")
+
+        with open(file_path, "rb") as attachment:
+            part = MIMEBase("application", "octet-stream")
+            part.set_payload(attachment.read())
+
+        encoders.encode_base64(part)
+        part.add_header(
+            "Content-Disposition", f"attachment; filename= {file_path.name}"
+        )
+        logger.info(f"Added attachment: {file_path.name}")
+        return part
+
+    except Exception as e:
+        logger.error(f"Error adding attachment {file_path}: {e}")
+        raise EmailError(f"Attachment error: {e}")
+
+
 class EmailError(Exception):
     """Custom exception for email sending errors."""
 
@@ -0,0 +1,437 @@
+"""
+Pooled SMTP delivery for campaign sends.
+
+Sending a campaign used to push every message through one SMTP connection,
+commit each recipient's status in its own transaction and sleep a fixed
+``delay_seconds`` between batches. ``DeliveryEngine`` sends the same
+messages with:
+
+* a pool of persistent SMTP connections shared by worker threads; a
+  connection the server drops is reopened and the message retried,
+* a token-bucket rate limiter that allows short bursts while holding the
+  long-run rate, instead of fixed sleeps,
+* recipient status updates buffered and written in one transaction per
+  batch, every ``flush_interval`` seconds or ``flush_threshold`` updates.
+"""
+
+import logging
+import queue
+import smtplib
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.mime.base import MIMEBase
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .core import EmailSender
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECTIONS = 4
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_THRESHOLD = 200
+
+
+def is_connection_error(exc: Optional[BaseException]) -> bool:
+    """Return True if ``exc``, or an error it wraps, means the link is gone."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(
+            exc, (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+        ):
+            return True
+        # 421: the server is closing the transmission channel
+        if isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code == 421:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` sends per second.
+
+    Up to ``capacity`` tokens accumulate while idle, so a burst of that size
+    goes out immediately. Callers that find the bucket empty reserve their
+    token anyway and sleep until it would have been refilled, which keeps
+    concurrent callers in arrival order without holding the lock.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float],
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Create a bucket.
+
+        Args:
+            rate: Tokens added per second, or None/0 for no limit
+            capacity: Largest burst; defaults to one second's worth of tokens
+            clock: Monotonic time source
+            sleep: Function used to wait for tokens
+        """
+        self.rate = rate if rate and rate > 0 else None
+        if capacity is None:
+            capacity = self.rate or 1.0
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens``, waiting until they are available; return the wait."""
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class SMTPConnectionPool:
+    """A fixed number of persistent SMTP connections, leased one at a time."""
+
+    def __init__(
+        self, factory: Callable[[], EmailSender], size: int = DEFAULT_CONNECTIONS
+    ) -> None:
+        """
+        Create the pool; connections open on first use or ``open()``.
+
+        Args:
+            factory: Returns a new, unconnected EmailSender
+            size: Number of connections
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.size = size
+        self._senders = [factory() for _ in range(size)]
+        self._idle: queue.LifoQueue[EmailSender] = queue.LifoQueue()
+        for sender in self._senders:
+            self._idle.put(sender)
+        self._lock = threading.Lock()
+        self.connects = 0
+
+    def _ensure_connected(self, sender: EmailSender) -> None:
+        if not sender.connected:
+            sender.connect()
+            with self._lock:
+                self.connects += 1
+
+    def open(self) -> None:
+        """Connect every idle sender now, raising EmailError on failure."""
+        for sender in self._senders:
+            self._ensure_connected(sender)
+
+    @contextmanager
+    def lease(self) -> Iterator[EmailSender]:
+        """Borrow a connected sender; it is dropped if its connection fails."""
+        sender = self._idle.get()
+        try:
+            self._ensure_connected(sender)
+            yield sender
+        except Exception as e:
+            if is_connection_error(e):
+                # Forget the dead socket so the next lease reconnects
+                sender.disconnect()
+            raise
+        finally:
+            self._idle.put(sender)
+
+    def close(self) -> None:
+        """Close every connection."""
+        for sender in self._senders:
+            sender.disconnect()
+
+
+class StatusBatcher:
+    """Buffers recipient status updates and writes them in batches."""
+
+    def __init__(
+        self,
+        storage,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+    ) -> None:
+        """
+        Create a batcher.
+
+        Args:
+            storage: CampaignStorage receiving the updates
+            flush_interval: Seconds between background flushes, or None to
+                flush only on threshold and ``close()``
+            flush_threshold: Pending updates that trigger an immediate flush
+        """
+        self.storage = storage
+        self.flush_threshold = flush_threshold
+        self._pending: List[Tuple[int, str, Optional[str]]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(flush_interval,),
+                name="status-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def __enter__(self) -> "StatusBatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(
+        self, recipient_id: int, status: str, error_message: Optional[str] = None
+    ) -> None:
+        """Queue a status update, flushing if the threshold is reached."""
+        with self._lock:
+            self._pending.append((recipient_id, status, error_message))
+            pending = len(self._pending)
+        if pending >= self.flush_threshold:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write pending updates in one transaction and return how many.
+
+        On a database error the updates are kept for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                updates, self._pending = self._pending, []
+            if not updates:
+                return 0
+            try:
+                self.storage.update_recipient_statuses(updates)
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush recipient statuses: {e}")
+                with self._lock:
+                    self._pending[:0] = updates
+                return 0
+            logger.debug(f"Flushed {len(updates)} recipient statuses")
+            return len(updates)
+
+    def _flush_loop(self, interval: float) -> None:
+        """Background thread body: flush every ``interval`` seconds."""
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher and write what is left."""
+        self._stop.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+        self._flusher = None
+        self.flush()
+
+
+@dataclass
+class DeliveryJob:
+    """One rendered message for one campaign recipient."""
+
+    recipient_id: int
+    email: str
+    subject: str
+    body: str
+    html_body: Optional[str] = None
+    # File paths or pre-encoded parts shared across the campaign
+    attachments: Optional[List[Union[str, MIMEBase]]] = None
+    # True if html_body already carries open/click tracking
+    tracking_applied: bool = False
+
+
+@dataclass
+class DeliveryReport:
+    """Outcome of ``DeliveryEngine.send``."""
+
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def messages_per_second(self) -> float:
+        """Messages accepted by the server per second of wall time."""
+        return self.sent / self.elapsed if self.elapsed else 0.0
+
+
+class DeliveryEngine:
+    """Sends campaign messages over pooled SMTP connections."""
+
+    def __init__(
+        self,
+        sender_factory: Callable[[], EmailSender],
+        storage,
+        connections: int = DEFAULT_CONNECTIONS,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+    ) -> None:
+        """
+        Create a delivery engine.
+
+        Args:
+            sender_factory: Returns a new, unconnected EmailSender
+            storage: CampaignStorage whose recipient statuses are updated
+            connections: Persistent SMTP connections (and worker threads)
+            rate: Maximum messages per second, or None for no limit
+            burst: Messages that may go out back to back before ``rate``
+                applies; defaults to one second's worth
+            max_retries: Resends after the connection drops mid-message
+            flush_interval: Seconds between status flushes
+            flush_threshold: Pending status updates that trigger a flush
+        """
+        self.storage = storage
+        self.pool = SMTPConnectionPool(sender_factory, connections)
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+    def __enter__(self) -> "DeliveryEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def send(
+        self,
+        jobs: Iterable[DeliveryJob],
+        campaign_id: Optional[int] = None,
+        on_result: Optional[
+            Callable[[DeliveryJob, Optional[Exception]], None]
+        ] = None,
+    ) -> DeliveryReport:
+        """
+        Deliver ``jobs`` and record each recipient as sent or failed.
+
+        Jobs are pulled lazily, so a generator of rendered messages is never
+        held in memory at once. If ``jobs`` raises, the workers stop, the
+        statuses recorded so far are flushed and the error is re-raised.
+
+        Args:
+            jobs: Messages to send
+            campaign_id: Campaign ID used for open/click tracking
+            on_result: Called with each job and its error (None on success);
+                calls are serialized
+
+        Returns:
+            DeliveryReport with counts and throughput
+        """
+        report = DeliveryReport()
+        job_iter = iter(jobs)
+        jobs_lock = threading.Lock()
+        report_lock = threading.Lock()
+
+        job_errors: List[Exception] = []
+
+        def worker(statuses: StatusBatcher) -> None:
+            while True:
+                with jobs_lock:
+                    try:
+                        job = next(job_iter, None)
+                    except Exception as e:
+                        # A generator that raised is finished, so every
+                        # worker stops; send() re-raises once they join
+                        job_errors.append(e)
+                        return
+                if job is None:
+                    return
+                self.limiter.acquire()
+                error, retries = self._deliver(job, campaign_id)
+                if error is None:
+                    statuses.add(job.recipient_id, "sent")
+                else:
+                    statuses.add(job.recipient_id, "failed", str(error))
+                with report_lock:
+                    report.retries += retries
+                    if error is None:
+                        report.sent += 1
+                    else:
+                        report.failed += 1
+                    if on_result is not None:
+                        on_result(job, error)
+
+        start = time.perf_counter()
+        with StatusBatcher(
+            self.storage, self.flush_interval, self.flush_threshold
+        ) as statuses:
+            threads = [
+                threading.Thread(
+                    target=worker, args=(statuses,), name=f"smtp-worker-{i}"
+                )
+                for i in range(self.pool.size)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        report.elapsed = time.perf_counter() - start
+        if job_errors:
+            logger.error(
+                f"Stopped after {report.sent + report.failed} messages: "
+                f"could not prepare the next message: {job_errors[0]}"
+            )
+            raise job_errors[0]
+        logger.info(
+            f"Delivered {report.sent} messages ({report.failed} failed) "
+            f"at {report.messages_per_second:.1f} msgs/sec"
+        )
+        return report
+
+    def _deliver(
+        self, job: DeliveryJob, campaign_id: Optional[int]
+    ) -> Tuple[Optional[Exception], int]:
+        """Send one job, retrying on dropped connections.
+
+        Returns the final error (None on success) and the number of retries.
+        """
+        retries = 0
+        while True:
+            try:
+                with self.pool.lease() as sender:
+                    sender.send_email(
+                        to_emails=[job.email],
+                        subject=job.subject,
+                        body=job.body,
+                        html_body=job.html_body,
+                        attachments=job.attachments,
+                        campaign_id=campaign_id,
+                        recipient_id=job.recipient_id,
+                        enable_tracking=not job.tracking_applied,
+                    )
+                return None, retries
+            except Exception as e:
+                if retries < self.max_retries and is_connection_error(e):
+                    retries += 1
+                    logger.warning(f"Connection lost sending to {job.email}; retrying")
+                    continue
+                return e, retries
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.pool.close()
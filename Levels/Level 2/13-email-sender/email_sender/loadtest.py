@@ -0,0 +1,238 @@
+"""
+Campaign delivery and rendering benchmarks.
+
+The delivery benchmark seeds a temporary campaign, starts
+``LocalSMTPServer`` with a per-message latency that stands in for a remote
+server, and reports messages/sec for the original path (one connection, one
+status commit per message) and for ``DeliveryEngine`` with pooled
+connections and batched status updates. Neither run is rate limited.
+
+The rendering benchmark builds personalized, tracked MIME messages with an
+attachment, first the original way (format each template, run the tracking
+regexes, read and encode the attachment per message) and then with
+``CampaignRenderer``.
+
+Usage:
+    python -m email_sender.loadtest --messages 2000 --connections 8
+    python -m email_sender.loadtest --render --messages 100000
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import List
+
+from .core import EmailSender
+from .delivery import DeliveryEngine, DeliveryJob
+from .render import CampaignRenderer
+from .smtp_sink import LocalSMTPServer
+from .storage import CampaignStorage
+from .utils import format_email_template
+
+NEWSLETTER_HTML = """<html>
+<head><style>body {{ font-family: sans-serif; }}</style></head>
+<body>
+<h1>Hello {name}!</h1>
+<p>Here is what changed at {company} this month.</p>
+<p><a href="https://example.com/news">Read the news</a> or
+<a class="button" href="https://example.com/offer?ref=newsletter">see the offer</a>.</p>
+<p>Your account: <a href="https://example.com/account/{index}">manage settings</a></p>
+<p>Questions? <a href="mailto:support@example.com">Email us</a>.</p>
+</body>
+</html>
+"""
+
+
+def seed_campaign(storage: CampaignStorage, count: int) -> int:
+    """Create a campaign with ``count`` queued recipients and return its ID."""
+    campaign_id = storage.create_campaign(
+        name="Load test",
+        subject="Hello {name}",
+        body_template="Hi {name}, this is message {index}.",
+        html_template=(
+            "<p>Hi {name}, this is <a href='https://example.com'>{index}</a></p>"
+        ),
+    )
+    storage.add_recipients(
+        campaign_id,
+        [
+            {"email": f"user{i}@example.com", "name": f"User {i}", "index": str(i)}
+            for i in range(count)
+        ],
+    )
+    return campaign_id
+
+
+def _jobs(storage: CampaignStorage, campaign_id: int) -> List[DeliveryJob]:
+    """Render one job per queued recipient."""
+    renderer = CampaignRenderer(storage.get_campaign(campaign_id))
+    return [
+        renderer.render(recipient)
+        for recipient in storage.get_recipients(campaign_id, status="queued")
+    ]
+
+
+def run_sequential(
+    storage: CampaignStorage, campaign_id: int, port: int
+) -> float:
+    """Send over one connection, committing each status; return msgs/sec."""
+    jobs = _jobs(storage, campaign_id)
+    sender = EmailSender("127.0.0.1", port, "bench", "bench", use_tls=False)
+    sender.connect()
+    try:
+        start = time.perf_counter()
+        for job in jobs:
+            sender.send_email(
+                to_emails=[job.email],
+                subject=job.subject,
+                body=job.body,
+                html_body=job.html_body,
+                campaign_id=campaign_id,
+                recipient_id=job.recipient_id,
+            )
+            storage.update_recipient_status(job.recipient_id, "sent")
+        elapsed = time.perf_counter() - start
+    finally:
+        sender.disconnect()
+    return len(jobs) / elapsed if elapsed else float("inf")
+
+
+def run_engine(
+    storage: CampaignStorage, campaign_id: int, port: int, connections: int
+) -> float:
+    """Send with ``DeliveryEngine`` and return msgs/sec."""
+    jobs = _jobs(storage, campaign_id)
+    with DeliveryEngine(
+        lambda: EmailSender("127.0.0.1", port, "bench", "bench", use_tls=False),
+        storage,
+        connections=connections,
+    ) as engine:
+        report = engine.send(jobs, campaign_id)
+    if report.failed:
+        print(f"  {report.failed} messages failed")
+    return report.messages_per_second
+
+
+def run_benchmark(messages: int, connections: int, latency: float) -> None:
+    """Compare the sequential send loop with ``DeliveryEngine``."""
+    # Per-message INFO logging from EmailSender would dominate the measurement
+    logging.getLogger("email_sender").setLevel(logging.WARNING)
+    tmp_dir = tempfile.mkdtemp()
+    db_path = os.path.join(tmp_dir, "loadtest.db")
+    try:
+        storage = CampaignStorage(db_path)
+        print(
+            f"{messages:,} messages, {latency * 1000:.1f} ms server latency, "
+            f"{connections} pooled connections"
+        )
+        with LocalSMTPServer(latency=latency) as server:
+            campaign_id = seed_campaign(storage, messages)
+            before = run_sequential(storage, campaign_id, server.port)
+            print(f"{'sequential':<16} {before:>10,.0f} msgs/sec")
+
+            campaign_id = seed_campaign(storage, messages)
+            after = run_engine(storage, campaign_id, server.port, connections)
+            print(f"{'DeliveryEngine':<16} {after:>10,.0f} msgs/sec")
+        print(f"Speed-up: {after / before:.1f}x")
+    finally:
+        for name in os.listdir(tmp_dir):
+            os.unlink(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+
+def run_render_benchmark(messages: int) -> None:
+    """Compare per-message rendering with ``CampaignRenderer``."""
+    logging.getLogger("email_sender").setLevel(logging.WARNING)
+    campaign = {
+        "id": 1,
+        "subject": "{name}, your {company} update",
+        "body_template": "Hi {name},\n\nHere is what changed at {company}.\n",
+        "html_template": NEWSLETTER_HTML,
+    }
+    recipients = [
+        {
+            "id": i,
+            "email": f"user{i}@example.com",
+            "personalization_data": {
+                "name": f"User {i}",
+                "company": f"Company {i % 100}",
+                "index": str(i),
+            },
+        }
+        for i in range(messages)
+    ]
+    sender = EmailSender("127.0.0.1", 25, "bench@example.com", "bench")
+    fd, attachment = tempfile.mkstemp(suffix=".pdf")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(os.urandom(20 * 1024))
+    print(f"{messages:,} personalized messages with a 20 KB attachment")
+
+    try:
+        start = time.perf_counter()
+        for recipient in recipients:
+            data = recipient["personalization_data"]
+            sender.build_message(
+                [recipient["email"]],
+                format_email_template(campaign["subject"], data),
+                format_email_template(campaign["body_template"], data),
+                html_body=format_email_template(campaign["html_template"], data),
+                attachments=[attachment],
+                campaign_id=campaign["id"],
+                recipient_id=recipient["id"],
+            )
+        before = messages / (time.perf_counter() - start)
+        print(f"{'per-message':<18} {before:>10,.0f} msgs/sec")
+
+        start = time.perf_counter()
+        renderer = CampaignRenderer(campaign, [attachment])
+        for recipient in recipients:
+            job = renderer.render(recipient)
+            sender.build_message(
+                [job.email],
+                job.subject,
+                job.body,
+                html_body=job.html_body,
+                attachments=job.attachments,
+                enable_tracking=False,
+            )
+        after = messages / (time.perf_counter() - start)
+        print(f"{'CampaignRenderer':<18} {after:>10,.0f} msgs/sec")
+        print(f"Speed-up: {after / before:.1f}x")
+    finally:
+        os.unlink(attachment)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure campaign msgs/sec")
+    parser.add_argument(
+        "--render",
+        action="store_true",
+        help="Benchmark message rendering instead of delivery",
+    )
+    parser.add_argument(
+        "--messages", type=int, default=2000, help="Messages per run (default: 2000)"
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=8,
+        help="Pooled SMTP connections (default: 8)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.002,
+        help="Seconds the stand-in server waits per message (default: 0.002)",
+    )
+    args = parser.parse_args()
+    if args.render:
+        run_render_benchmark(args.messages)
+    else:
+        run_benchmark(args.messages, args.connections, args.latency)
+
+
+if __name__ == "__main__":
+    main()
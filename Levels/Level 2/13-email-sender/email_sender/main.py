@@ -8,7 +8,6 @@ and command execution.
 import argparse
 import logging
 import sys
-import time
 from pathlib import Path
 from typing import List, Optional
 
@@ -17,10 +16,11 @@ from .utils import (
     validate_email,
     load_recipients_from_csv,
     create_sample_csv,
-    format_email_template,
     load_template_file,
 )
 from .storage import CampaignStorage
+from .delivery import DeliveryEngine, DeliveryJob, StatusBatcher, TokenBucket
+from .render import CampaignRenderer
 from .gmail_api import GmailAPISender
 from .sheets_sync import SheetsSync
 
@@ -335,7 +335,24 @@ Examples:
         "--batch-size", type=int, default=10, help="Emails per batch"
     )
     send_campaign_parser.add_argument(
-        "--delay", type=float, default=1.0, help="Delay between batches (seconds)"
+        "--delay",
+        type=float,
+        default=1.0,
+        help="Seconds per batch; paces sending at batch-size/delay emails/sec",
+    )
+    send_campaign_parser.add_argument(
+        "--rate",
+        type=float,
+        help="Maximum emails per second (overrides --batch-size/--delay pacing)",
+    )
+    send_campaign_parser.add_argument(
+        "--connections",
+        type=int,
+        default=1,
+        help="Persistent SMTP connections to send over (SMTP transport)",
+    )
+    send_campaign_parser.add_argument(
+        "--attach", nargs="*", help="Attachment file paths sent with every email"
     )
     send_campaign_parser.add_argument(
         "--dry-run", action="store_true", help="Preview without sending"
@@ -478,6 +495,9 @@ def handle_campaign_command(args) -> None:
             batch_size=args.batch_size,
             delay_seconds=args.delay,
             dry_run=args.dry_run,
+            connections=args.connections,
+            rate=args.rate,
+            attachments=args.attach,
         )
 
     elif args.campaign_command == "list":
@@ -547,23 +567,49 @@ def send_campaign_emails(
     batch_size: int = 10,
     delay_seconds: float = 1.0,
     dry_run: bool = False,
+    connections: int = 1,
+    rate: Optional[float] = None,
+    attachments: Optional[List[str]] = None,
 ) -> None:
-    """Send emails for a campaign."""
+    """Send emails for a campaign.
+
+    Sending is paced by a token bucket: ``rate`` messages per second (by
+    default ``batch_size`` per ``delay_seconds``) with bursts of up to
+    ``batch_size``. SMTP sends go over ``connections`` persistent
+    connections. Recipient statuses are written in batched transactions.
+    """
     campaign = storage.get_campaign(campaign_id)
     if not campaign:
         print(f"❌ Campaign {campaign_id} not found")
         sys.exit(1)
 
-    recipients = storage.get_recipients(campaign_id, status="queued")
-    if not recipients:
+    queued = storage.get_campaign_stats(campaign_id)["queued"]
+    if not queued:
         print(f"ℹ️  No queued recipients for campaign {campaign_id}")
         return
 
-    print(f"📧 Sending campaign '{campaign['name']}' to {len(recipients)} recipients")
+    print(f"📧 Sending campaign '{campaign['name']}' to {queued} recipients")
 
-    # Load templates
-    body_template = campaign.get("body_template") or ""
-    html_template = campaign.get("html_template") or ""
+    # Compile templates and encode attachments once for the whole campaign
+    try:
+        renderer = CampaignRenderer(campaign, attachments)
+    except EmailError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    # Recipients are streamed page by page rather than loaded up front
+    jobs = (
+        renderer.render(recipient)
+        for recipient in storage.iter_recipients(campaign_id, status="queued")
+    )
+    if rate is None and delay_seconds > 0:
+        rate = batch_size / delay_seconds
+
+    def report_result(job: DeliveryJob, error: Optional[Exception]) -> None:
+        if error is None:
+            print(f"  ✅ Sent to {job.email}")
+        else:
+            print(f"  ❌ Failed to send to {job.email}: {error}")
 
     # Initialize sender
     if transport == "gmail":
@@ -572,85 +618,62 @@ def send_campaign_emails(
         except Exception as e:
             print(f"❌ Gmail API error: {e}")
             sys.exit(1)
-    else:
-        if not all([smtp_server, smtp_port, smtp_user, smtp_password]):
-            print("❌ SMTP transport requires --smtp, --port, --user, and --pass")
-            sys.exit(1)
-        sender = EmailSender(smtp_server, smtp_port, smtp_user, smtp_password)
-        sender.connect()
-
-    try:
-        successful = 0
-        failed = 0
-
-        for i in range(0, len(recipients), batch_size):
-            batch = recipients[i : i + batch_size]
-
-            for recipient in batch:
-                email = recipient["email"]
-                personalization = recipient.get("personalization_data", {})
-
-                # Render templates
-                subject = format_email_template(campaign["subject"], personalization)
-                body = (
-                    format_email_template(body_template, personalization)
-                    if body_template
-                    else ""
-                )
-                html_body = (
-                    format_email_template(html_template, personalization)
-                    if html_template
-                    else None
-                )
-
-                if dry_run:
-                    print(f"  [DRY RUN] Would send to {email}: {subject[:50]}...")
-                    storage.update_recipient_status(recipient["id"], "sent")
-                    successful += 1
-                    continue
+    elif not all([smtp_server, smtp_port, smtp_user, smtp_password]):
+        print("❌ SMTP transport requires --smtp, --port, --user, and --pass")
+        sys.exit(1)
 
+    successful = 0
+    failed = 0
+    if dry_run:
+        with StatusBatcher(storage) as statuses:
+            for job in jobs:
+                print(f"  [DRY RUN] Would send to {job.email}: {job.subject[:50]}...")
+                statuses.add(job.recipient_id, "sent")
+                successful += 1
+
+    elif transport == "gmail":
+        limiter = TokenBucket(rate, batch_size)
+        with StatusBatcher(storage) as statuses:
+            for job in jobs:
+                limiter.acquire()
                 try:
-                    if transport == "gmail":
-                        result = sender.send_email(
-                            to_emails=[email],
-                            subject=subject,
-                            body=body,
-                            html_body=html_body,
-                            campaign_id=campaign_id,
-                            recipient_id=recipient["id"],
-                            enable_tracking=True,
-                        )
-                    else:
-                        result = sender.send_email(
-                            to_emails=[email],
-                            subject=subject,
-                            body=body,
-                            html_body=html_body,
-                            campaign_id=campaign_id,
-                            recipient_id=recipient["id"],
-                            enable_tracking=True,
-                        )
-
-                    storage.update_recipient_status(recipient["id"], "sent")
-                    successful += 1
-                    print(f"  ✅ Sent to {email}")
-
+                    sender.send_email(
+                        to_emails=[job.email],
+                        subject=job.subject,
+                        body=job.body,
+                        html_body=job.html_body,
+                        attachments=attachments,
+                        campaign_id=campaign_id,
+                        recipient_id=job.recipient_id,
+                        enable_tracking=not job.tracking_applied,
+                    )
                 except Exception as e:
-                    storage.update_recipient_status(recipient["id"], "failed", str(e))
+                    statuses.add(job.recipient_id, "failed", str(e))
                     failed += 1
-                    print(f"  ❌ Failed to send to {email}: {e}")
-
-            # Rate limiting delay
-            if i + batch_size < len(recipients):
-                time.sleep(delay_seconds)
-
-        print(f"\n✅ Campaign sending completed!")
-        print(f"   Successful: {successful}")
-        print(f"   Failed: {failed}")
+                    report_result(job, e)
+                else:
+                    statuses.add(job.recipient_id, "sent")
+                    successful += 1
+                    report_result(job, None)
 
-    finally:
-        if transport == "smtp":
-            sender.disconnect()
+    else:
+        engine = DeliveryEngine(
+            lambda: EmailSender(smtp_server, smtp_port, smtp_user, smtp_password),
+            storage,
+            connections=connections,
+            rate=rate,
+            burst=batch_size,
+        )
+        with engine:
+            # Fail fast on bad credentials before any recipient is touched
+            engine.pool.open()
+            report = engine.send(jobs, campaign_id, on_result=report_result)
+        successful, failed = report.sent, report.failed
+        print(f"   Throughput: {report.messages_per_second:.1f} msgs/sec")
+
+    print(f"\n✅ Campaign sending completed!")
+    print(f"   Successful: {successful}")
+    print(f"   Failed: {failed}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,314 @@
+"""
+Compiled mail merge rendering.
+
+Rendering a campaign one recipient at a time re-parses the subject, body
+and HTML templates, re-runs the tracking regexes over the whole HTML and
+re-reads and re-encodes every attachment. ``CampaignRenderer`` does that
+work once per campaign:
+
+* templates are parsed once into literal text and fields,
+* the HTML is split at its links and ``</body>`` tags into static
+  segments, personalization fields and per-recipient tracking slots,
+* attachments are encoded once and the same MIME parts are reused.
+
+Well-formed templates render the same as ``format_email_template``
+followed by ``add_tracking_to_email``. Templates the compiler does not
+handle (malformed ``{tag`` placeholders, positional or nested fields) and
+recipients whose values contain markup or quotes, which could add links
+or change how the template's links parse, are rendered that original way
+rather than compiled.
+"""
+
+import logging
+import string
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .core import build_attachment_part
+from .delivery import DeliveryJob
+from .tracking import (
+    BODY_CLOSE_PATTERN,
+    DEFAULT_BASE_URL,
+    LINK_PATTERN,
+    UNTRACKED_LINK_PREFIXES,
+    add_tracking_to_email,
+)
+from .utils import format_email_template
+
+logger = logging.getLogger(__name__)
+
+_FORMATTER = string.Formatter()
+
+# Values containing these could add or reshape links and </body> tags
+_MARKUP_CHARS = frozenset("<>\"'")
+
+_Part = Tuple[str, Optional[str], str, Optional[str]]
+
+
+class _MarkupInValue(Exception):
+    """A field value needs the original render path."""
+
+
+def _parse(template: str) -> Optional[List[_Part]]:
+    """Split a template into (literal, field, spec, conversion) parts.
+
+    Returns None for templates only ``str.format`` itself can handle
+    (positional or nested fields) or that it rejects.
+    """
+    try:
+        parts = list(_FORMATTER.parse(template))
+    except ValueError:
+        return None
+    for _, field, spec, _ in parts:
+        if field is None:
+            continue
+        if not field or field[0].isdigit() or field[0] in ".[":
+            return None
+        if "{" in spec or not _MARKUP_CHARS.isdisjoint(field + spec):
+            return None
+    return parts
+
+
+class CompiledTemplate:
+    """A ``str.format`` template parsed once and rendered many times.
+
+    ``render`` gives the same result as ``format_email_template``: a
+    missing variable or malformed template yields the template unchanged.
+    """
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self._parts = _parse(template)
+
+    @property
+    def is_static(self) -> bool:
+        """True if the template has no fields."""
+        return self._parts is not None and all(
+            field is None for _, field, _, _ in self._parts
+        )
+
+    def render(self, data: Dict[str, Any]) -> str:
+        """Fill in ``data``, falling back to the template on errors."""
+        if self._parts is None:
+            return format_email_template(self.template, data)
+        try:
+            return self.render_strict(data)
+        except KeyError as e:
+            logger.warning(f"Missing template variable: {e}")
+            return self.template
+        except Exception as e:
+            logger.error(f"Error formatting template: {e}")
+            return self.template
+
+    def render_strict(self, data: Dict[str, Any], check_markup: bool = False) -> str:
+        """Fill in ``data``, raising on missing variables.
+
+        With ``check_markup``, raises ``_MarkupInValue`` if a value contains
+        markup characters.
+        """
+        if self._parts is None:
+            raise ValueError("Template cannot be compiled")
+        out = []
+        for literal, field, spec, conversion in self._parts:
+            if literal:
+                out.append(literal)
+            if field is None:
+                continue
+            if field.isidentifier():
+                value = data[field]
+            else:
+                value, _ = _FORMATTER.get_field(field, (), data)
+            if conversion:
+                value = _FORMATTER.convert_field(value, conversion)
+            text = format(value, spec)
+            if check_markup and not _MARKUP_CHARS.isdisjoint(text):
+                raise _MarkupInValue(field)
+            out.append(text)
+        return "".join(out)
+
+
+class _TextSlot:
+    """Template text between links and tracking pixels."""
+
+    def __init__(self, template: str) -> None:
+        self.template = CompiledTemplate(template)
+
+    def render(self, data: Dict[str, Any], recipient_id: int) -> str:
+        return self.template.render_strict(data, check_markup=True)
+
+
+class _PixelSlot:
+    """The open-tracking pixel, which differs only in the recipient ID."""
+
+    def __init__(self, campaign_id: int, base_url: str, closing: str = "") -> None:
+        self.prefix = f'<img src="{base_url}/track/open/{campaign_id}/'
+        # The original path rewrites every </body> tag in lower case
+        self.suffix = (
+            '" width="1" height="1" style="display:none;" alt="" />' + closing
+        )
+
+    def render(self, data: Dict[str, Any], recipient_id: int) -> str:
+        return f"{self.prefix}{recipient_id}{self.suffix}"
+
+
+class _LinkSlot:
+    """An ``<a href>`` tag, wrapped for click tracking unless exempt."""
+
+    def __init__(self, match, campaign_id: int, base_url: str) -> None:
+        self.before = CompiledTemplate(match.group(1))
+        self.url = CompiledTemplate(match.group(2))
+        self.after = CompiledTemplate(match.group(3))
+        self.tag = CompiledTemplate(match.group(0))
+        self.prefix = f"{base_url}/track/click/{campaign_id}/"
+        self._static_url: Optional[str] = None
+        if self.url.is_static:
+            self._static_url = self.url.render_strict({})
+            self._encoded_url = quote(self._static_url, safe="")
+
+    @staticmethod
+    def _untracked(url: str) -> bool:
+        # An empty href would not have matched the link pattern at all
+        return not url or url.startswith(UNTRACKED_LINK_PREFIXES) or (
+            "/track/click/" in url
+        )
+
+    def render(self, data: Dict[str, Any], recipient_id: int) -> str:
+        if self._static_url is not None:
+            url = self._static_url
+            encoded_url = self._encoded_url
+        else:
+            url = self.url.render_strict(data, check_markup=True)
+            encoded_url = quote(url, safe="")
+        if self._untracked(url):
+            return self.tag.render_strict(data, check_markup=True)
+        before = self.before.render_strict(data, check_markup=True)
+        after = self.after.render_strict(data, check_markup=True)
+        return (
+            f'<a {before}href="{self.prefix}{recipient_id}?url={encoded_url}"{after}>'
+        )
+
+
+class CompiledHTML:
+    """An HTML template with click and open tracking laid out once."""
+
+    def __init__(
+        self,
+        template: str,
+        campaign_id: Optional[int],
+        base_url: str = DEFAULT_BASE_URL,
+    ) -> None:
+        """
+        Compile an HTML template.
+
+        Args:
+            template: HTML with ``{field}`` placeholders
+            campaign_id: Campaign ID for tracking, or None for no tracking
+            base_url: Base URL of the tracking server
+        """
+        self.template = template
+        self.campaign_id = campaign_id
+        self.base_url = base_url
+        parts = _parse(template)
+        self._slots = self._compile() if parts is not None else None
+        # Empty output gets no pixel; only templates made of nothing but
+        # fields can render empty, and those take the original path
+        self._can_render_empty = parts is not None and not any(
+            literal for literal, _, _, _ in parts
+        )
+
+    def _compile(self) -> Optional[list]:
+        """Split the template into text, link and pixel slots."""
+        if self.campaign_id is None:
+            return [_TextSlot(self.template)]
+
+        slots: list = []
+        pixel_before_close = _PixelSlot(self.campaign_id, self.base_url, "</body>")
+
+        def add_text(text: str) -> None:
+            start = 0
+            for match in BODY_CLOSE_PATTERN.finditer(text):
+                slots.append(_TextSlot(text[start : match.start()]))
+                slots.append(pixel_before_close)
+                start = match.end()
+            slots.append(_TextSlot(text[start:]))
+
+        position = 0
+        for match in LINK_PATTERN.finditer(self.template):
+            if BODY_CLOSE_PATTERN.search(match.group(0)):
+                # The original path injects the pixel inside such a tag
+                return None
+            add_text(self.template[position : match.start()])
+            slots.append(_LinkSlot(match, self.campaign_id, self.base_url))
+            position = match.end()
+        add_text(self.template[position:])
+        if not BODY_CLOSE_PATTERN.search(self.template):
+            slots.append(_PixelSlot(self.campaign_id, self.base_url))
+        return slots
+
+    def render(self, data: Dict[str, Any], recipient_id: int) -> str:
+        """Render the HTML for one recipient, tracking included."""
+        if self._slots is not None and not self._can_render_empty:
+            try:
+                return "".join(slot.render(data, recipient_id) for slot in self._slots)
+            except Exception:
+                # Missing variables, markup in values, formatting errors
+                pass
+        html = format_email_template(self.template, data)
+        if self.campaign_id is None:
+            return html
+        return add_tracking_to_email(
+            html, self.campaign_id, recipient_id, self.base_url
+        )
+
+
+class CampaignRenderer:
+    """Renders each recipient of one campaign from templates compiled once."""
+
+    def __init__(
+        self,
+        campaign: Dict[str, Any],
+        attachments: Optional[Sequence[str]] = None,
+        enable_tracking: bool = True,
+        base_url: str = DEFAULT_BASE_URL,
+    ) -> None:
+        """
+        Compile a campaign's templates and encode its attachments.
+
+        Args:
+            campaign: Campaign dict from ``CampaignStorage.get_campaign``
+            attachments: File paths attached to every message
+            enable_tracking: Whether to add open/click tracking to the HTML
+            base_url: Base URL of the tracking server
+
+        Raises:
+            EmailError: If an attachment cannot be read
+        """
+        self.campaign_id = campaign["id"]
+        self.subject = CompiledTemplate(campaign["subject"])
+        body_template = campaign.get("body_template") or ""
+        html_template = campaign.get("html_template") or ""
+        self.body = CompiledTemplate(body_template) if body_template else None
+        self.html = (
+            CompiledHTML(
+                html_template,
+                self.campaign_id if enable_tracking else None,
+                base_url,
+            )
+            if html_template
+            else None
+        )
+        self.attachments = [build_attachment_part(path) for path in attachments or ()]
+
+    def render(self, recipient: Dict[str, Any]) -> DeliveryJob:
+        """Render the message for a recipient dict from ``get_recipients``."""
+        data = recipient.get("personalization_data") or {}
+        recipient_id = recipient["id"]
+        return DeliveryJob(
+            recipient_id=recipient_id,
+            email=recipient["email"],
+            subject=self.subject.render(data),
+            body=self.body.render(data) if self.body else "",
+            html_body=self.html.render(data, recipient_id) if self.html else None,
+            attachments=self.attachments or None,
+            tracking_applied=True,
+        )
@@ -0,0 +1,147 @@
+"""
+Local SMTP stand-in for tests and benchmarks.
+
+``LocalSMTPServer`` speaks just enough SMTP for ``smtplib`` (EHLO, AUTH
+PLAIN/LOGIN, MAIL, RCPT, DATA, RSET, NOOP, QUIT), accepts any credentials
+and keeps received messages in memory. It needs no third-party packages,
+unlike ``aiosmtpd``, and ``smtpd`` is gone from Python 3.12.
+
+Usage:
+    with LocalSMTPServer() as server:
+        sender = EmailSender("127.0.0.1", server.port, "user", "pw", use_tls=False)
+"""
+
+import socketserver
+import threading
+import time
+from typing import List, Optional
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection."""
+
+    server: "LocalSMTPServer._Server"
+
+    def _reply(self, *lines: str) -> None:
+        self.wfile.write("".join(line + "\r\n" for line in lines).encode("ascii"))
+
+    def handle(self) -> None:
+        sink: LocalSMTPServer = self.server.sink
+        sink._connection_opened()
+        self._reply("220 localhost ESMTP sink")
+        data_lines: Optional[List[bytes]] = None
+        delivered = 0
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+
+            if data_lines is not None:
+                if line in (b".\r\n", b".\n"):
+                    sink._store(b"".join(data_lines))
+                    data_lines = None
+                    if sink.latency:
+                        time.sleep(sink.latency)
+                    self._reply("250 OK: queued")
+                    delivered += 1
+                    if sink.drop_after and delivered >= sink.drop_after:
+                        return
+                else:
+                    data_lines.append(line[1:] if line.startswith(b"..") else line)
+                continue
+
+            command = line.decode("ascii", "replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-localhost", "250-AUTH PLAIN LOGIN", "250 8BITMIME")
+            elif verb == "HELO":
+                self._reply("250 localhost")
+            elif verb == "AUTH":
+                if command.upper() == "AUTH LOGIN":
+                    # Username and password prompts; any values are accepted
+                    self._reply("334 VXNlcm5hbWU6")
+                    self.rfile.readline()
+                    self._reply("334 UGFzc3dvcmQ6")
+                    self.rfile.readline()
+                self._reply("235 2.7.0 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "DATA":
+                data_lines = []
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class LocalSMTPServer:
+    """Threaded in-process SMTP server that records what it receives."""
+
+    class _Server(socketserver.ThreadingTCPServer):
+        allow_reuse_address = True
+        daemon_threads = True
+        sink: "LocalSMTPServer"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        drop_after: Optional[int] = None,
+    ) -> None:
+        """
+        Create the server; call ``start()`` or use it as a context manager.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+            latency: Seconds to wait before acknowledging each message,
+                simulating a remote server
+            drop_after: Close each connection after this many messages
+        """
+        self.host = host
+        self.latency = latency
+        self.drop_after = drop_after
+        self.messages: List[bytes] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = self._Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """Port the server is listening on."""
+        return self._server.server_address[1]
+
+    def _connection_opened(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def _store(self, message: bytes) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def start(self) -> "LocalSMTPServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "LocalSMTPServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -3,17 +3,108 @@ Storage module for mail merge campaigns.
 
 This module provides SQLite-based storage for campaigns, recipients,
 and send status tracking.
+
+Each ``CampaignStorage`` keeps one WAL-mode connection, shared by its
+methods under a lock so it can serve several threads (web requests, the
+status flusher). Per-campaign recipient counts are kept up to date by
+triggers in ``campaign_stats``, so statistics never scan recipients.
 """
 
 import sqlite3
 import logging
 import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 1000
+
+# Keeps campaign_stats in step with recipients and email_clicks. A status
+# comparison with IS yields 0 or 1 even for NULL statuses. Counter rows are
+# created with NOT EXISTS rather than INSERT OR IGNORE, because a trigger's
+# conflict clause is overridden by the outer statement's (INSERT OR REPLACE
+# in add_recipients would otherwise reset the row).
+STATS_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS trg_stats_recipient_insert
+    AFTER INSERT ON recipients
+    BEGIN
+        INSERT INTO campaign_stats (campaign_id)
+        SELECT NEW.campaign_id WHERE NOT EXISTS (
+            SELECT 1 FROM campaign_stats WHERE campaign_id = NEW.campaign_id
+        );
+        UPDATE campaign_stats SET
+            total = total + 1,
+            queued = queued + (NEW.status IS 'queued'),
+            sent = sent + (NEW.status IS 'sent'),
+            failed = failed + (NEW.status IS 'failed'),
+            opened = opened + (NEW.opened_at IS NOT NULL)
+        WHERE campaign_id = NEW.campaign_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_recipient_delete
+    AFTER DELETE ON recipients
+    BEGIN
+        UPDATE campaign_stats SET
+            total = total - 1,
+            queued = queued - (OLD.status IS 'queued'),
+            sent = sent - (OLD.status IS 'sent'),
+            failed = failed - (OLD.status IS 'failed'),
+            opened = opened - (OLD.opened_at IS NOT NULL)
+        WHERE campaign_id = OLD.campaign_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_recipient_update
+    AFTER UPDATE OF status, opened_at, campaign_id ON recipients
+    BEGIN
+        UPDATE campaign_stats SET
+            total = total - 1,
+            queued = queued - (OLD.status IS 'queued'),
+            sent = sent - (OLD.status IS 'sent'),
+            failed = failed - (OLD.status IS 'failed'),
+            opened = opened - (OLD.opened_at IS NOT NULL)
+        WHERE campaign_id = OLD.campaign_id;
+        INSERT INTO campaign_stats (campaign_id)
+        SELECT NEW.campaign_id WHERE NOT EXISTS (
+            SELECT 1 FROM campaign_stats WHERE campaign_id = NEW.campaign_id
+        );
+        UPDATE campaign_stats SET
+            total = total + 1,
+            queued = queued + (NEW.status IS 'queued'),
+            sent = sent + (NEW.status IS 'sent'),
+            failed = failed + (NEW.status IS 'failed'),
+            opened = opened + (NEW.opened_at IS NOT NULL)
+        WHERE campaign_id = NEW.campaign_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_click_insert
+    AFTER INSERT ON email_clicks
+    BEGIN
+        INSERT INTO campaign_stats (campaign_id)
+        SELECT NEW.campaign_id WHERE NOT EXISTS (
+            SELECT 1 FROM campaign_stats WHERE campaign_id = NEW.campaign_id
+        );
+        UPDATE campaign_stats SET clicks = clicks + 1
+        WHERE campaign_id = NEW.campaign_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_click_delete
+    AFTER DELETE ON email_clicks
+    BEGIN
+        UPDATE campaign_stats SET clicks = clicks - 1
+        WHERE campaign_id = OLD.campaign_id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_stats_campaign_delete
+    AFTER DELETE ON campaigns
+    BEGIN
+        DELETE FROM campaign_stats WHERE campaign_id = OLD.id;
+    END;
+"""
+
 
 class CampaignStorage:
     """SQLite storage for mail merge campaigns."""
@@ -26,11 +117,49 @@ class CampaignStorage:
             db_path: Path to SQLite database file
         """
         self.db_path = Path(db_path)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
         self._init_db()
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Open the shared connection on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            # Rows replaced by INSERT OR REPLACE must fire the delete triggers
+            conn.execute("PRAGMA recursive_triggers=ON")
+            self._conn = conn
+        return self._conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Hold the shared connection for one transaction.
+
+        Commits on success and rolls back on error, like using a
+        ``sqlite3`` connection as a context manager.
+        """
+        with self._lock:
+            conn = self._get_connection()
+            conn.row_factory = None
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Close the shared connection; it reopens on next use."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Campaigns table
@@ -142,10 +271,17 @@ class CampaignStorage:
                         "ALTER TABLE recipients ADD COLUMN first_opened_at TIMESTAMP"
                     )
 
-            # Create indexes
+            # Create indexes. Recipient listings filter by campaign (and
+            # status) and page in created_at order, so those are composite;
+            # they also cover lookups by campaign_id alone.
+            cursor.execute("DROP INDEX IF EXISTS idx_recipients_campaign")
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_recipients_campaign
-                ON recipients(campaign_id)
+                CREATE INDEX IF NOT EXISTS idx_recipients_campaign_status_created
+                ON recipients(campaign_id, status, created_at)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_recipients_campaign_created
+                ON recipients(campaign_id, created_at)
             """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_recipients_status
@@ -174,6 +310,46 @@ class CampaignStorage:
                 ON email_clicks(clicked_at)
             """)
 
+            # Incrementally maintained per-campaign counters
+            cursor.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type='table' AND name='campaign_stats'
+            """)
+            backfill_stats = cursor.fetchone() is None
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS campaign_stats (
+                    campaign_id INTEGER PRIMARY KEY,
+                    total INTEGER NOT NULL DEFAULT 0,
+                    queued INTEGER NOT NULL DEFAULT 0,
+                    sent INTEGER NOT NULL DEFAULT 0,
+                    failed INTEGER NOT NULL DEFAULT 0,
+                    opened INTEGER NOT NULL DEFAULT 0,
+                    clicks INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            if backfill_stats:
+                # Databases created before the counters existed
+                cursor.execute("""
+                    INSERT INTO campaign_stats
+                        (campaign_id, total, queued, sent, failed, opened)
+                    SELECT campaign_id,
+                           COUNT(*),
+                           SUM(status IS 'queued'),
+                           SUM(status IS 'sent'),
+                           SUM(status IS 'failed'),
+                           SUM(opened_at IS NOT NULL)
+                    FROM recipients
+                    GROUP BY campaign_id
+                """)
+                cursor.execute("""
+                    INSERT INTO campaign_stats (campaign_id, clicks)
+                    SELECT campaign_id, COUNT(*) FROM email_clicks
+                    WHERE true
+                    GROUP BY campaign_id
+                    ON CONFLICT(campaign_id) DO UPDATE SET clicks = excluded.clicks
+                """)
+            cursor.executescript(STATS_TRIGGERS)
+
             conn.commit()
             logger.info(f"Database initialized at {self.db_path}")
 
@@ -196,7 +372,7 @@ class CampaignStorage:
         Returns:
             Campaign ID
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -227,7 +403,7 @@ class CampaignStorage:
 
     def get_campaign(self, campaign_id: int) -> Optional[Dict[str, Any]]:
         """Get campaign by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,))
@@ -238,17 +414,16 @@ class CampaignStorage:
 
     def list_campaigns(self) -> List[Dict[str, Any]]:
         """List all campaigns."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT c.*,
-                       COUNT(r.id) as recipient_count,
-                       SUM(CASE WHEN r.status = 'sent' THEN 1 ELSE 0 END) as sent_count,
-                       SUM(CASE WHEN r.status = 'failed' THEN 1 ELSE 0 END) as failed_count
+                       COALESCE(s.total, 0) as recipient_count,
+                       COALESCE(s.sent, 0) as sent_count,
+                       COALESCE(s.failed, 0) as failed_count
                 FROM campaigns c
-                LEFT JOIN recipients r ON c.id = r.campaign_id
-                GROUP BY c.id
+                LEFT JOIN campaign_stats s ON c.id = s.campaign_id
                 ORDER BY c.created_at DESC
             """)
             return [dict(row) for row in cursor.fetchall()]
@@ -265,7 +440,7 @@ class CampaignStorage:
             Number of recipients added
         """
         added = 0
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             for recipient in recipients:
                 email = recipient.get("email", "").strip()
@@ -304,6 +479,8 @@ class CampaignStorage:
         """
         Get recipients for a campaign.
 
+        Loads every matching row; use ``iter_recipients`` for large campaigns.
+
         Args:
             campaign_id: Campaign ID
             status: Filter by status (queued, sent, failed)
@@ -311,31 +488,58 @@ class CampaignStorage:
         Returns:
             List of recipient dicts
         """
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        return list(self.iter_recipients(campaign_id, status))
 
-            if status:
-                cursor.execute(
-                    """
-                    SELECT * FROM recipients
-                    WHERE campaign_id = ? AND status = ?
-                    ORDER BY created_at
-                """,
-                    (campaign_id, status),
-                )
+    def iter_recipients(
+        self,
+        campaign_id: int,
+        status: Optional[str] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream recipients for a campaign in created_at order.
+
+        Rows are read ``page_size`` at a time with keyset pagination on
+        (created_at, id), so each page is an index range scan and the
+        connection is free between pages. Recipients whose status changes
+        during iteration (e.g. queued to sent) are neither skipped nor
+        repeated.
+
+        Args:
+            campaign_id: Campaign ID
+            status: Filter by status (queued, sent, failed)
+            page_size: Rows fetched per query
+
+        Yields:
+            Recipient dicts with parsed personalization data
+        """
+        where = "campaign_id = ?"
+        params: List[Any] = [campaign_id]
+        if status:
+            where += " AND status = ?"
+            params.append(status)
+
+        after: Optional[Tuple[Any, int]] = None
+        while True:
+            if after is None:
+                query = f"SELECT * FROM recipients WHERE {where}"
+                page_params = params
             else:
-                cursor.execute(
-                    """
-                    SELECT * FROM recipients
-                    WHERE campaign_id = ?
-                    ORDER BY created_at
-                """,
-                    (campaign_id,),
+                # A row-value comparison lets SQLite seek the index to the
+                # last key instead of rescanning earlier pages
+                query = (
+                    f"SELECT * FROM recipients WHERE {where} "
+                    "AND (created_at, id) > (?, ?)"
                 )
-
-            results = []
-            for row in cursor.fetchall():
+                page_params = params + [after[0], after[1]]
+            with self._connect() as conn:
+                conn.row_factory = sqlite3.Row
+                rows = conn.execute(
+                    f"{query} ORDER BY created_at, id LIMIT ?",
+                    page_params + [page_size],
+                ).fetchall()
+
+            for row in rows:
                 recipient = dict(row)
                 # Parse personalization data
                 if recipient.get("personalization_data"):
@@ -347,15 +551,17 @@ class CampaignStorage:
                         recipient["personalization_data"] = {}
                 else:
                     recipient["personalization_data"] = {}
-                results.append(recipient)
+                yield recipient
 
-            return results
+            if len(rows) < page_size:
+                return
+            after = (rows[-1]["created_at"], rows[-1]["id"])
 
     def update_recipient_status(
         self, recipient_id: int, status: str, error_message: Optional[str] = None
     ) -> None:
         """Update recipient send status."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             sent_at = datetime.now().isoformat() if status == "sent" else None
             cursor.execute(
@@ -368,9 +574,39 @@ class CampaignStorage:
             )
             conn.commit()
 
+    def update_recipient_statuses(
+        self, updates: List[Tuple[int, str, Optional[str]]]
+    ) -> int:
+        """
+        Update the send status of many recipients in one transaction.
+
+        Args:
+            updates: (recipient_id, status, error_message) tuples
+
+        Returns:
+            Number of updates applied
+        """
+        if not updates:
+            return 0
+        now = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.executemany(
+                """
+                UPDATE recipients
+                SET status = ?, error_message = ?, sent_at = ?
+                WHERE id = ?
+            """,
+                [
+                    (status, error_message, now if status == "sent" else None, rid)
+                    for rid, status, error_message in updates
+                ],
+            )
+            conn.commit()
+        return len(updates)
+
     def update_campaign_sync_time(self, campaign_id: int) -> None:
         """Update last sync time for a campaign."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -384,62 +620,48 @@ class CampaignStorage:
 
     def get_campaign_stats(self, campaign_id: int) -> Dict[str, Any]:
         """Get statistics for a campaign including open/click metrics."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-
-            # Basic stats
-            cursor.execute(
+        with self._connect() as conn:
+            row = conn.execute(
                 """
-                SELECT
-                    COUNT(*) as total,
-                    SUM(CASE WHEN status = 'queued' THEN 1 ELSE 0 END) as queued,
-                    SUM(CASE WHEN status = 'sent' THEN 1 ELSE 0 END) as sent,
-                    SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END) as failed,
-                    SUM(CASE WHEN opened_at IS NOT NULL THEN 1 ELSE 0 END) as opened_count
-                FROM recipients
+                SELECT total, queued, sent, failed, opened, clicks
+                FROM campaign_stats
                 WHERE campaign_id = ?
             """,
                 (campaign_id,),
-            )
-            row = cursor.fetchone()
-
-            total = row[0] or 0
-            sent = row[2] or 0
-            opened_count = row[4] or 0
-
-            # Get click count
-            cursor.execute(
-                """
-                SELECT COUNT(*) FROM email_clicks
-                WHERE campaign_id = ?
-            """,
-                (campaign_id,),
-            )
-            click_count = cursor.fetchone()[0] or 0
-
-            # Calculate rates
-            open_rate = round((opened_count / sent * 100), 1) if sent > 0 else 0.0
-            click_rate = round((click_count / sent * 100), 1) if sent > 0 else 0.0
-
-            return {
-                "total": total,
-                "queued": row[1] or 0,
-                "sent": sent,
-                "failed": row[3] or 0,
-                "opened_count": opened_count,
-                "click_count": click_count,
-                "open_rate": open_rate,
-                "click_rate": click_rate,
-            }
+            ).fetchone()
+        total, queued, sent, failed, opened_count, click_count = row or (0,) * 6
+
+        # Calculate rates
+        open_rate = round((opened_count / sent * 100), 1) if sent > 0 else 0.0
+        click_rate = round((click_count / sent * 100), 1) if sent > 0 else 0.0
+
+        return {
+            "total": total,
+            "queued": queued,
+            "sent": sent,
+            "failed": failed,
+            "opened_count": opened_count,
+            "click_count": click_count,
+            "open_rate": open_rate,
+            "click_rate": click_rate,
+        }
 
     def export_campaign_results(self, campaign_id: int) -> List[Dict[str, Any]]:
         """Export campaign results for CSV export."""
-        recipients = self.get_recipients(campaign_id)
+        with self._connect() as conn:
+            click_counts = dict(
+                conn.execute(
+                    """
+                    SELECT recipient_id, COUNT(*) FROM email_clicks
+                    WHERE campaign_id = ?
+                    GROUP BY recipient_id
+                """,
+                    (campaign_id,),
+                ).fetchall()
+            )
         results = []
-        for r in recipients:
-            # Get click count for this recipient
-            clicks = self.get_recipient_clicks(r["id"])
-            click_count = len(clicks)
+        for r in self.iter_recipients(campaign_id):
+            click_count = click_counts.get(r["id"], 0)
 
             results.append(
                 {
@@ -458,7 +680,7 @@ class CampaignStorage:
 
     def record_email_open(self, recipient_id: int) -> None:
         """Record an email open event."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             now = datetime.now().isoformat()
 
@@ -480,7 +702,7 @@ class CampaignStorage:
         self, recipient_id: int, campaign_id: int, original_url: str
     ) -> None:
         """Record a link click event."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -494,7 +716,7 @@ class CampaignStorage:
 
     def get_recipient_clicks(self, recipient_id: int) -> List[Dict[str, Any]]:
         """Get all clicks for a recipient."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -509,7 +731,7 @@ class CampaignStorage:
 
     def get_recipient_by_id(self, recipient_id: int) -> Optional[Dict[str, Any]]:
         """Get a recipient by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM recipients WHERE id = ?", (recipient_id,))
@@ -529,7 +751,7 @@ class CampaignStorage:
         Returns:
             True if campaign was deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Check if campaign exists
@@ -570,7 +792,7 @@ class CampaignStorage:
         Returns:
             True if recipient was deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Check if recipient exists
@@ -602,7 +824,7 @@ class CampaignStorage:
         Returns:
             True if recipient was updated, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Check if recipient exists
@@ -639,7 +861,7 @@ class CampaignStorage:
         Returns:
             True if recipient was reset, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -662,7 +884,7 @@ class CampaignStorage:
         Returns:
             Number of recipients reset
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -700,7 +922,7 @@ class CampaignStorage:
         Returns:
             Signature ID
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # If this is default, unset any existing default
@@ -727,7 +949,7 @@ class CampaignStorage:
 
     def get_signature(self, signature_id: int) -> Optional[Dict[str, Any]]:
         """Get a signature by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -740,7 +962,7 @@ class CampaignStorage:
 
     def get_signature_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a signature by name."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM email_signatures WHERE name = ?", (name,))
@@ -751,7 +973,7 @@ class CampaignStorage:
 
     def list_signatures(self) -> List[Dict[str, Any]]:
         """List all signature profiles."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -761,7 +983,7 @@ class CampaignStorage:
 
     def get_default_signature(self) -> Optional[Dict[str, Any]]:
         """Get the default signature profile."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM email_signatures WHERE is_default = 1")
@@ -784,7 +1006,7 @@ class CampaignStorage:
         Returns:
             True if signature was updated, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
 
             # Check if signature exists
@@ -832,7 +1054,7 @@ class CampaignStorage:
         Returns:
             True if signature was deleted, False if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM email_signatures WHERE id = ?", (signature_id,))
             conn.commit()
@@ -872,7 +1094,7 @@ class CampaignStorage:
         Returns:
             Attachment ID
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             cursor.execute(
                 """
@@ -899,7 +1121,7 @@ class CampaignStorage:
 
     def get_attachment(self, attachment_id: int) -> Optional[Dict[str, Any]]:
         """Get an attachment by ID."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -912,7 +1134,7 @@ class CampaignStorage:
 
     def get_campaign_attachments(self, campaign_id: int) -> List[Dict[str, Any]]:
         """Get all attachments for a campaign."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
             cursor.execute(
@@ -932,7 +1154,7 @@ class CampaignStorage:
         Returns:
             File path of deleted attachment (for file cleanup), or None if not found
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -961,7 +1183,7 @@ class CampaignStorage:
         Returns:
             List of file paths for cleanup
         """
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
@@ -12,12 +12,24 @@ from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "http://127.0.0.1:9002"
+
+# Matches <a href="..."> tags, capturing the attributes before the href, the
+# href value and the attributes after it
+LINK_PATTERN = re.compile(
+    r'<a\s+([^>]*?)href=["\']([^"\']+)["\']([^>]*)>', re.IGNORECASE | re.DOTALL
+)
+BODY_CLOSE_PATTERN = re.compile(r"</body>", re.IGNORECASE)
+
+# Links that are never wrapped for click tracking
+UNTRACKED_LINK_PREFIXES = ("mailto:", "tel:", "#", "javascript:")
+
 
 def inject_tracking_pixel(
     html_body: str,
     campaign_id: int,
     recipient_id: int,
-    base_url: str = "http://127.0.0.1:9002",
+    base_url: str = DEFAULT_BASE_URL,
 ) -> str:
     """
     Inject a 1x1 transparent tracking pixel into HTML email body.
@@ -41,9 +53,8 @@ def inject_tracking_pixel(
     )
 
     # Try to inject before </body> tag
-    body_close_pattern = re.compile(r"</body>", re.IGNORECASE)
-    if body_close_pattern.search(html_body):
-        html_body = body_close_pattern.sub(f"{tracking_pixel}</body>", html_body)
+    if BODY_CLOSE_PATTERN.search(html_body):
+        html_body = BODY_CLOSE_PATTERN.sub(f"{tracking_pixel}</body>", html_body)
     else:
         # If no </body> tag, append at the end
         html_body += tracking_pixel
@@ -58,7 +69,7 @@ def wrap_links_with_tracking(
     html_body: str,
     campaign_id: int,
     recipient_id: int,
-    base_url: str = "http://127.0.0.1:9002",
+    base_url: str = DEFAULT_BASE_URL,
 ) -> str:
     """
     Replace all links in HTML with tracking URLs.
@@ -75,19 +86,13 @@ def wrap_links_with_tracking(
     if not html_body:
         return html_body
 
-    # Pattern to match <a href="..."> tags
-    # Captures the href value and preserves other attributes
-    link_pattern = re.compile(
-        r'<a\s+([^>]*?)href=["\']([^"\']+)["\']([^>]*)>', re.IGNORECASE | re.DOTALL
-    )
-
     def replace_link(match):
         before_href = match.group(1)
         original_url = match.group(2)
         after_href = match.group(3)
 
         # Skip mailto:, tel:, and anchor links
-        if original_url.startswith(("mailto:", "tel:", "#", "javascript:")):
+        if original_url.startswith(UNTRACKED_LINK_PREFIXES):
             return match.group(0)
 
         # Skip tracking URLs (avoid double-wrapping)
@@ -102,7 +107,7 @@ def wrap_links_with_tracking(
 
         return f'<a {before_href}href="{tracking_url}"{after_href}>'
 
-    tracked_html = link_pattern.sub(replace_link, html_body)
+    tracked_html = LINK_PATTERN.sub(replace_link, html_body)
     logger.debug(
         f"Wrapped links with tracking for campaign {campaign_id}, recipient {recipient_id}"
     )
@@ -113,7 +118,7 @@ def add_tracking_to_email(
     html_body: str,
     campaign_id: int,
     recipient_id: int,
-    base_url: str = "http://127.0.0.1:9002",
+    base_url: str = DEFAULT_BASE_URL,
 ) -> str:
     """
     Add both tracking pixel and link tracking to an HTML email.
@@ -10,9 +10,19 @@ import tempfile
 import os
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
+from email import message_from_bytes
 from email.mime.multipart import MIMEMultipart
 
 from email_sender.core import EmailSender, EmailError
+from email_sender.delivery import (
+    DeliveryEngine,
+    DeliveryJob,
+    StatusBatcher,
+    TokenBucket,
+)
+from email_sender.render import CampaignRenderer
+from email_sender.smtp_sink import LocalSMTPServer
+from email_sender.storage import CampaignStorage
 from email_sender.utils import (
     validate_email,
     load_recipients_from_csv,
@@ -443,5 +453,167 @@ class TestErrorHandling:
             )
 
 
+
+class TestDelivery:
+    """Test pooled delivery against a local SMTP stand-in."""
+
+    def setup_method(self):
+        """Create a campaign with queued recipients."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.storage = CampaignStorage(os.path.join(self.temp_dir, "test.db"))
+        self.campaign_id = self.storage.create_campaign(
+            name="Delivery", subject="Hi", source_type="csv"
+        )
+        self.storage.add_recipients(
+            self.campaign_id, [{"email": f"user{i}@example.com"} for i in range(20)]
+        )
+        self.jobs = [
+            DeliveryJob(r["id"], r["email"], "Hi", "Body", "<p>Body</p>")
+            for r in self.storage.get_recipients(self.campaign_id)
+        ]
+
+    def teardown_method(self):
+        """Remove the temporary database."""
+        for name in os.listdir(self.temp_dir):
+            os.unlink(os.path.join(self.temp_dir, name))
+        os.rmdir(self.temp_dir)
+
+    def _engine(self, port, **kwargs):
+        return DeliveryEngine(
+            lambda: EmailSender("127.0.0.1", port, "user", "pw", use_tls=False),
+            self.storage,
+            **kwargs,
+        )
+
+    def test_token_bucket_allows_burst_then_paces(self):
+        """Test that the bucket sleeps once the burst is used up."""
+        now = [0.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(10, capacity=3, clock=lambda: now[0], sleep=fake_sleep)
+        waits = [bucket.acquire() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.1)
+        assert waits[4] == pytest.approx(0.1)
+        assert TokenBucket(None).acquire() == 0.0
+
+    def test_status_batcher_flushes_on_threshold_and_close(self):
+        """Test that status updates are written in batches."""
+        ids = [job.recipient_id for job in self.jobs]
+        with patch.object(
+            self.storage,
+            "update_recipient_statuses",
+            wraps=self.storage.update_recipient_statuses,
+        ) as bulk_update:
+            with StatusBatcher(
+                self.storage, flush_interval=None, flush_threshold=5
+            ) as statuses:
+                for rid in ids[:7]:
+                    statuses.add(rid, "sent")
+                assert bulk_update.call_count == 1
+                assert len(statuses) == 2
+
+        assert bulk_update.call_count == 2
+        assert len(self.storage.get_recipients(self.campaign_id, "sent")) == 7
+
+    def test_engine_sends_over_pooled_connections(self):
+        """Test that every job is delivered and recorded as sent."""
+        with LocalSMTPServer() as server:
+            with self._engine(server.port, connections=3) as engine:
+                report = engine.send(self.jobs, self.campaign_id)
+
+            assert report.sent == 20
+            assert report.failed == 0
+            assert report.messages_per_second > 0
+            assert len(server.messages) == 20
+            assert server.connections == 3
+
+        stats = self.storage.get_campaign_stats(self.campaign_id)
+        assert stats["sent"] == 20
+        assert stats["queued"] == 0
+
+    def test_engine_sends_rendered_campaign_with_attachment(self):
+        """Test delivery of compiled, pre-tracked messages with attachments."""
+        attachment = os.path.join(self.temp_dir, "report.txt")
+        with open(attachment, "w") as f:
+            f.write("quarterly numbers")
+        campaign = self.storage.get_campaign(self.campaign_id)
+        campaign["html_template"] = '<a href="https://example.com">Site</a>'
+        renderer = CampaignRenderer(campaign, [attachment])
+        jobs = [
+            renderer.render(r) for r in self.storage.get_recipients(self.campaign_id)
+        ]
+
+        with LocalSMTPServer() as server:
+            with self._engine(server.port, connections=2) as engine:
+                report = engine.send(jobs[:2], self.campaign_id)
+
+            assert report.sent == 2
+            message = message_from_bytes(server.messages[0])
+
+        html = next(
+            part.get_payload(decode=True).decode()
+            for part in message.walk()
+            if part.get_content_type() == "text/html"
+        )
+        # Tracking is applied once, when the campaign is rendered
+        assert html.count("/track/open/") == 1
+        assert html.count("/track/click/") == 1
+        filenames = [part.get_filename() for part in message.walk()]
+        assert "report.txt" in filenames
+
+    def test_engine_reconnects_after_server_drops_connection(self):
+        """Test that dropped connections are reopened and the message retried."""
+        with LocalSMTPServer(drop_after=4) as server:
+            with self._engine(server.port, connections=2) as engine:
+                report = engine.send(self.jobs, self.campaign_id)
+
+            assert report.sent == 20
+            assert report.retries > 0
+            assert len(server.messages) == 20
+            assert server.connections > 2
+
+    def test_engine_records_failures(self):
+        """Test that undeliverable messages are marked failed."""
+        results = []
+        with LocalSMTPServer() as server:
+            port = server.port
+        # Nothing listens on the port any more
+        with self._engine(port, connections=2, max_retries=1) as engine:
+            report = engine.send(
+                self.jobs[:3],
+                self.campaign_id,
+                on_result=lambda job, error: results.append(error),
+            )
+
+        assert report.sent == 0
+        assert report.failed == 3
+        assert all(isinstance(error, EmailError) for error in results)
+        failed = self.storage.get_recipients(self.campaign_id, "failed")
+        assert len(failed) == 3
+        assert "Connection" in failed[0]["error_message"]
+
+    def test_engine_reraises_job_errors(self):
+        """Test that an error preparing a job stops the send and is raised."""
+
+        def jobs():
+            yield from self.jobs[:5]
+            raise KeyError("email")
+
+        with LocalSMTPServer() as server:
+            with self._engine(server.port, connections=3) as engine:
+                with pytest.raises(KeyError):
+                    engine.send(jobs(), self.campaign_id)
+
+            assert len(server.messages) == 5
+
+        # Statuses recorded before the error are still written
+        assert len(self.storage.get_recipients(self.campaign_id, "sent")) == 5
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -21,6 +21,7 @@ class TestCampaignStorage:
 
     def teardown_method(self):
         """Cleanup test fixtures."""
+        self.storage.close()
         if Path(self.temp_db.name).exists():
             os.unlink(self.temp_db.name)
 
@@ -123,6 +124,33 @@ class TestCampaignStorage:
         assert updated['error_message'] == 'Success'
         assert updated['sent_at'] is not None
 
+    def test_update_recipient_statuses(self):
+        """Test updating many recipient statuses at once."""
+        campaign_id = self.storage.create_campaign(
+            name="Test Campaign",
+            subject="Test Subject",
+            source_type="csv"
+        )
+        self.storage.add_recipients(
+            campaign_id, [{'email': f'test{i}@example.com'} for i in range(3)]
+        )
+        ids = [r['id'] for r in self.storage.get_recipients(campaign_id)]
+
+        applied = self.storage.update_recipient_statuses([
+            (ids[0], 'sent', None),
+            (ids[1], 'failed', 'Bounced'),
+        ])
+
+        assert applied == 2
+        by_id = {r['id']: r for r in self.storage.get_recipients(campaign_id)}
+        assert by_id[ids[0]]['status'] == 'sent'
+        assert by_id[ids[0]]['sent_at'] is not None
+        assert by_id[ids[1]]['status'] == 'failed'
+        assert by_id[ids[1]]['error_message'] == 'Bounced'
+        assert by_id[ids[1]]['sent_at'] is None
+        assert by_id[ids[2]]['status'] == 'queued'
+        assert self.storage.update_recipient_statuses([]) == 0
+
     def test_get_campaign_stats(self):
         """Test getting campaign statistics."""
         campaign_id = self.storage.create_campaign(
@@ -148,6 +176,106 @@ class TestCampaignStorage:
         assert stats['sent'] == 1
         assert stats['failed'] == 1
 
+    def test_iter_recipients_pages(self):
+        """Test streaming recipients a page at a time."""
+        campaign_id = self.storage.create_campaign(
+            name="Test Campaign",
+            subject="Test Subject",
+            source_type="csv"
+        )
+        self.storage.add_recipients(
+            campaign_id, [{'email': f'test{i}@example.com'} for i in range(10)]
+        )
+
+        emails = [r['email'] for r in self.storage.iter_recipients(campaign_id, page_size=3)]
+        assert emails == [f'test{i}@example.com' for i in range(10)]
+
+        # Marking rows sent while streaming queued ones neither skips nor repeats
+        seen = []
+        for recipient in self.storage.iter_recipients(
+            campaign_id, status='queued', page_size=3
+        ):
+            seen.append(recipient['id'])
+            self.storage.update_recipient_status(recipient['id'], 'sent')
+        assert len(seen) == len(set(seen)) == 10
+        assert list(self.storage.iter_recipients(campaign_id, status='queued')) == []
+
+    def test_recipient_query_uses_index(self):
+        """Test that status listings are index range scans."""
+        with self.storage._connect() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM recipients "
+                "WHERE campaign_id = ? AND status = ? AND (created_at, id) > (?, ?) "
+                "ORDER BY created_at, id LIMIT 10",
+                (1, 'queued', '', 0),
+            ).fetchall()
+        detail = " ".join(row[-1] for row in plan)
+        assert 'idx_recipients_campaign_status_created' in detail
+        assert 'TEMP B-TREE' not in detail
+
+    def test_campaign_stats_counters(self):
+        """Test that stored counters track every kind of change."""
+        campaign_id = self.storage.create_campaign(
+            name="Test Campaign",
+            subject="Test Subject",
+            source_type="csv"
+        )
+        self.storage.add_recipients(
+            campaign_id, [{'email': f'test{i}@example.com'} for i in range(5)]
+        )
+        ids = [r['id'] for r in self.storage.get_recipients(campaign_id)]
+        self.storage.update_recipient_statuses([
+            (ids[0], 'sent', None), (ids[1], 'sent', None), (ids[2], 'failed', 'x')
+        ])
+        self.storage.record_email_open(ids[0])
+        self.storage.record_email_open(ids[0])
+        self.storage.record_email_click(ids[0], campaign_id, 'https://example.com')
+        self.storage.record_email_click(ids[1], campaign_id, 'https://example.com')
+        self.storage.retry_recipient(ids[2])
+        self.storage.delete_recipient(ids[4])
+        # Re-importing an address replaces the row
+        self.storage.add_recipients(campaign_id, [{'email': 'test3@example.com'}])
+
+        stats = self.storage.get_campaign_stats(campaign_id)
+        assert stats['total'] == 4
+        assert stats['queued'] == 2
+        assert stats['sent'] == 2
+        assert stats['failed'] == 0
+        assert stats['opened_count'] == 1
+        assert stats['click_count'] == 2
+        assert stats['open_rate'] == 50.0
+
+        self.storage.delete_campaign(campaign_id)
+        assert self.storage.get_campaign_stats(campaign_id)['total'] == 0
+
+    def test_campaign_stats_backfill(self):
+        """Test that a database from before the counters gets them filled in."""
+        campaign_id = self.storage.create_campaign(
+            name="Test Campaign",
+            subject="Test Subject",
+            source_type="csv"
+        )
+        self.storage.add_recipients(
+            campaign_id, [{'email': f'test{i}@example.com'} for i in range(3)]
+        )
+        ids = [r['id'] for r in self.storage.get_recipients(campaign_id)]
+        self.storage.update_recipient_status(ids[0], 'sent')
+        self.storage.record_email_click(ids[0], campaign_id, 'https://example.com')
+        expected = self.storage.get_campaign_stats(campaign_id)
+
+        with self.storage._connect() as conn:
+            triggers = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+            ).fetchall()
+            for (name,) in triggers:
+                conn.execute(f"DROP TRIGGER {name}")
+            conn.execute("DROP TABLE campaign_stats")
+        self.storage.close()
+
+        self.storage = CampaignStorage(db_path=self.temp_db.name)
+        assert self.storage.get_campaign_stats(campaign_id) == expected
+        assert expected['sent'] == 1 and expected['click_count'] == 1
+
     def test_export_campaign_results(self):
         """Test exporting campaign results."""
         campaign_id = self.storage.create_campaign(
@@ -7,6 +7,8 @@ import tempfile
 import os
 from pathlib import Path
 
+from email_sender.render import CampaignRenderer, CompiledHTML, CompiledTemplate
+from email_sender.tracking import add_tracking_to_email
 from email_sender.utils import format_email_template, load_template_file
 
 
@@ -68,3 +70,102 @@ class TestTemplateFormatting:
         """Test loading non-existent template file."""
         with pytest.raises(FileNotFoundError):
             load_template_file("nonexistent.html")
+
+
+NEWSLETTER = (
+    "<html><body><h1>Hi {name}</h1>"
+    '<a href="https://example.com/news">News</a> '
+    "<a class='btn' href='https://example.com/u/{user_id}?a=1&b={name}'>Me</a> "
+    '<a href="mailto:help@example.com">Help</a>'
+    "<p>{{not a field}}</p></BODY></html>"
+)
+
+
+def original_render(template, data, campaign_id, recipient_id):
+    """Render the way sends did before templates were compiled."""
+    html = format_email_template(template, data)
+    return add_tracking_to_email(html, campaign_id, recipient_id)
+
+
+class TestCompiledRendering:
+    """Test compiled templates against the original rendering path."""
+
+    @pytest.mark.parametrize("template", [
+        "Hello {name}, welcome to {company}!",
+        "Dear {name!r:>12}, total {amount:.2f}",
+        "{{escaped}} {name}",
+        "Positional {0}",
+        "Unbalanced {name",
+        "Stray close name}",
+        "Empty conversion {name!}",
+        "Nested spec {amount:{width}}",
+    ])
+    def test_compiled_template_matches_format(self, template):
+        """Test that compiled templates render like format_email_template."""
+        for data in [{"name": "Jo", "company": "Acme", "amount": 3.5}, {}]:
+            expected = format_email_template(template, data)
+            assert CompiledTemplate(template).render(data) == expected
+
+    @pytest.mark.parametrize("data", [
+        {"name": "Ann", "user_id": 7},
+        {"name": "<b>Bold</b>", "user_id": 8},
+        {"name": "O'Neil", "user_id": 9},
+        {"name": "Missing user id"},
+    ])
+    def test_compiled_html_matches_tracking_pipeline(self, data):
+        """Test that tracked HTML matches format + add_tracking_to_email."""
+        compiled = CompiledHTML(NEWSLETTER, campaign_id=3)
+        assert compiled.render(data, 42) == original_render(NEWSLETTER, data, 3, 42)
+
+    @pytest.mark.parametrize("template", [
+        "<body><p>Hi {name</p></body>",
+        '<body><a href="https://example.com/{name">go</a></body>',
+        '<body>{name <a href="https://example.com/">go</a>}</body>',
+        "<body><p>{}</p></body>",
+    ])
+    def test_compiled_html_malformed_placeholders(self, template):
+        """Test that malformed placeholders render like the original path."""
+        for data in [{"name": "Ann"}, {}]:
+            compiled = CompiledHTML(template, campaign_id=2)
+            assert compiled.render(data, 7) == original_render(template, data, 2, 7)
+
+    def test_compiled_html_without_body_tag_appends_pixel(self):
+        """Test pixel placement when the template has no </body>."""
+        template = '<p>{name}</p><a href="{link}">go</a>'
+        data = {"name": "Ann", "link": "https://example.com/x y"}
+        compiled = CompiledHTML(template, campaign_id=1)
+        assert compiled.render(data, 5) == original_render(template, data, 1, 5)
+        assert CompiledHTML(template, campaign_id=None).render(data, 5) == (
+            format_email_template(template, data)
+        )
+
+    def test_campaign_renderer_reuses_attachment_parts(self):
+        """Test that attachments are encoded once per campaign."""
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+            f.write(b"%PDF-1.4 test")
+            attachment = f.name
+
+        try:
+            campaign = {
+                "id": 4,
+                "subject": "Hi {name}",
+                "body_template": "Body for {name}",
+                "html_template": NEWSLETTER,
+            }
+            renderer = CampaignRenderer(campaign, [attachment])
+            first = renderer.render(
+                {"id": 1, "email": "a@example.com",
+                 "personalization_data": {"name": "A", "user_id": 1}}
+            )
+            second = renderer.render(
+                {"id": 2, "email": "b@example.com",
+                 "personalization_data": {"name": "B", "user_id": 2}}
+            )
+        finally:
+            os.unlink(attachment)
+
+        assert first.subject == "Hi A"
+        assert second.body == "Body for B"
+        assert first.tracking_applied
+        assert "/track/open/4/2" in second.html_body
+        assert first.attachments[0] is second.attachments[0]
@@ -3,13 +3,54 @@
 import hashlib
 import logging
 import random
+import secrets
 import sqlite3
 import string
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+BASE62_ALPHABET = string.digits + string.ascii_letters
+# Counter values are scrambled within blocks of 62**6, one six-character
+# code each; the first block starts at 62**5 so existing counters carry on
+COUNTER_START = 62**5
+CODE_WIDTH = 6
+CODE_SPACE = 62**CODE_WIDTH
+FEISTEL_HALF = 62 ** (CODE_WIDTH // 2)
+FEISTEL_ROUNDS = 4
+# Keep IN (...) lists below SQLite's bound-parameter limit
+QUERY_CHUNK_SIZE = 500
+
+BulkItem = Union[str, Dict[str, object]]
+
+
+def encode_base62(value: int) -> str:
+    """Encode a non-negative integer in base62."""
+    if value == 0:
+        return BASE62_ALPHABET[0]
+    digits = []
+    while value:
+        value, remainder = divmod(value, 62)
+        digits.append(BASE62_ALPHABET[remainder])
+    return "".join(reversed(digits))
+
+
+def scramble_counter(value: int, key: bytes) -> int:
+    """Map ``value`` in ``[0, CODE_SPACE)`` to a unique value in the same range.
+
+    A keyed Feistel network over two base62 halves is a bijection, so
+    distinct counter values still give distinct codes, but without the key
+    consecutive values give unrelated codes and cannot be enumerated.
+    """
+    left, right = divmod(value, FEISTEL_HALF)
+    for round_number in range(FEISTEL_ROUNDS):
+        digest = hashlib.blake2b(
+            f"{round_number}:{right}".encode(), key=key, digest_size=8
+        ).digest()
+        left, right = right, (left + int.from_bytes(digest, "big")) % FEISTEL_HALF
+    return left * FEISTEL_HALF + right
+
 
 class URLShortener:
     """Main URL shortener class with SQLite backend."""
@@ -37,6 +78,32 @@ class URLShortener:
                     )
                 """
                 )
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS code_counter (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        next_value INTEGER NOT NULL
+                    )
+                """
+                )
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS code_key (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        secret BLOB NOT NULL
+                    )
+                """
+                )
+                cursor.execute(
+                    "INSERT OR IGNORE INTO code_key (id, secret) VALUES (1, ?)",
+                    (secrets.token_bytes(16),),
+                )
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_urls_original_url "
+                    "ON urls (original_url)"
+                )
+                cursor.execute("SELECT secret FROM code_key WHERE id = 1")
+                self._code_key = bytes(cursor.fetchone()[0])
                 conn.commit()
                 logger.info("Database initialized successfully")
         except sqlite3.Error as e:
@@ -48,6 +115,17 @@ class URLShortener:
         chars = string.ascii_letters + string.digits
         return "".join(random.choices(chars, k=length))
 
+    def code_for_counter(self, value: int) -> str:
+        """Return the generated code for counter ``value``.
+
+        The low six digits are scrambled with this database's key; higher
+        counter values add a prefix, so codes stay unique.
+        """
+        block, offset = divmod(value, CODE_SPACE)
+        code = encode_base62(scramble_counter(offset, self._code_key))
+        code = code.rjust(CODE_WIDTH, BASE62_ALPHABET[0])
+        return encode_base62(block) + code if block else code
+
     def generate_hash_code(self, url: str, length: int = 6) -> str:
         """Generate a hash-based short code from URL."""
         hash_obj = hashlib.md5(url.encode())
@@ -69,6 +147,20 @@ class URLShortener:
         except ValueError:
             return False
 
+    def refreshed_expiry(
+        self, existing_expires_at: Optional[str], expires_at: Optional[str]
+    ) -> Optional[str]:
+        """Expiry to store when a hash code is reused for the same URL.
+
+        A requested expiry replaces the stored one; without one, an already
+        expired link becomes permanent again.
+        """
+        if expires_at is not None:
+            return expires_at
+        if existing_expires_at and self.is_expired(existing_expires_at):
+            return None
+        return existing_expires_at
+
     def create_short_url(
         self,
         original_url: str,
@@ -128,19 +220,10 @@ class URLShortener:
 
                             if existing_url == original_url:
                                 # Refresh expiration when needed
-                                new_expires_at = (
-                                    expires_at
-                                    if expires_at is not None
-                                    else existing_expires_at
+                                new_expires_at = self.refreshed_expiry(
+                                    existing_expires_at, expires_at
                                 )
 
-                                if (
-                                    expires_at is None
-                                    and existing_expires_at
-                                    and self.is_expired(existing_expires_at)
-                                ):
-                                    new_expires_at = None
-
                                 if new_expires_at != existing_expires_at:
                                     cursor.execute(
                                         """
@@ -202,6 +285,299 @@ class URLShortener:
             logger.error(f"Database error creating short URL: {e}")
             raise
 
+    def create_short_urls(
+        self,
+        items: Iterable[BulkItem],
+        expires_days: Optional[int] = None,
+        use_hash: bool = False,
+    ) -> List[Tuple[str, str]]:
+        """
+        Create many shortened URLs in a single transaction.
+
+        Each item is either a URL string or a mapping with ``url`` and
+        optional ``custom_code`` and ``expires_days`` (which overrides the
+        call-wide ``expires_days``). Generated codes come from a counter
+        whose values are reserved in one block per call and scrambled with
+        a per-database key (see ``code_for_counter``), so no per-URL
+        collision probing is needed and codes cannot be enumerated.
+        Repeated URLs in the input share one code. URLs already stored
+        under a generated code reuse it; with ``use_hash`` the
+        ``generate_hash_code`` code is used and reused when it already maps
+        to the same URL, as in ``create_short_url``.
+
+        All items are validated before anything is written: either every
+        URL is created or none is.
+
+        Returns:
+            List of (short_code, full_short_url), one per input item
+        """
+        entries = self._normalize_bulk_items(items, expires_days)
+        if not entries:
+            return []
+
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                # Take the write lock up front so the counter block and the
+                # uniqueness checks cannot race with another writer
+                cursor.execute("BEGIN IMMEDIATE")
+
+                custom_codes = [code for _, code, _ in entries if code is not None]
+                taken = self._existing_codes(cursor, custom_codes)
+                if taken:
+                    raise ValueError(
+                        f"Custom code already exists: {sorted(taken)[0]}"
+                    )
+
+                codes: List[Optional[str]] = [None] * len(entries)
+                rows: List[Tuple[str, str, Optional[str], bool]] = []
+                first_position: Dict[str, int] = {}
+                duplicates: List[Tuple[int, int]] = []
+                pending: List[int] = []
+
+                for position, (url, custom_code, expires_at) in enumerate(entries):
+                    if custom_code is not None:
+                        codes[position] = custom_code
+                        rows.append((custom_code, url, expires_at, True))
+                    elif url in first_position:
+                        duplicates.append((position, first_position[url]))
+                    else:
+                        first_position[url] = position
+                        pending.append(position)
+
+                if use_hash:
+                    pending = self._assign_hash_codes(
+                        cursor, entries, pending, codes, rows, set(custom_codes)
+                    )
+                else:
+                    pending = self._reuse_existing_urls(
+                        cursor, entries, pending, codes
+                    )
+
+                reserved = {code for code in codes if code}
+                for position, code in zip(
+                    pending, self._allocate_codes(cursor, len(pending), reserved)
+                ):
+                    url, _, expires_at = entries[position]
+                    codes[position] = code
+                    rows.append((code, url, expires_at, False))
+
+                for position, first in duplicates:
+                    codes[position] = codes[first]
+
+                cursor.executemany(
+                    """
+                    INSERT INTO urls (short_code, original_url, expires_at, custom_code)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    rows,
+                )
+                conn.commit()
+                logger.info(
+                    f"Bulk created {len(rows)} short URLs for {len(entries)} items"
+                )
+
+        except sqlite3.Error as e:
+            logger.error(f"Database error creating short URLs: {e}")
+            raise
+
+        return [(code, f"http://localhost:5000/{code}") for code in codes]
+
+    def _normalize_bulk_items(
+        self, items: Iterable[BulkItem], expires_days: Optional[int]
+    ) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """Validate bulk items into (url, custom_code, expires_at) tuples."""
+        now = datetime.now()
+        entries: List[Tuple[str, Optional[str], Optional[str]]] = []
+        seen_custom: Set[str] = set()
+        for number, item in enumerate(items, start=1):
+            if isinstance(item, dict):
+                url = item.get("url")
+                custom_code = item.get("custom_code") or None
+                days = item.get("expires_days", expires_days)
+            else:
+                url, custom_code, days = item, None, expires_days
+
+            if isinstance(url, str):
+                url = url.strip()
+            if not self.validate_url(url):
+                raise ValueError(f"URL #{number}: Invalid URL format")
+            if custom_code is not None:
+                custom_code = str(custom_code)
+                if len(custom_code) < 3:
+                    raise ValueError(
+                        f"URL #{number}: Custom code must be at least 3 characters"
+                    )
+                if custom_code in seen_custom:
+                    raise ValueError(
+                        f"URL #{number}: Custom code used twice: {custom_code}"
+                    )
+                seen_custom.add(custom_code)
+            if days is not None and (
+                isinstance(days, bool) or not isinstance(days, int) or days < 0
+            ):
+                raise ValueError(
+                    f"URL #{number}: expires_days must be a non-negative integer"
+                )
+
+            expires_at = (now + timedelta(days=days)).isoformat() if days else None
+            entries.append((url, custom_code, expires_at))
+        return entries
+
+    def _existing_codes(
+        self, cursor: sqlite3.Cursor, codes: Sequence[str]
+    ) -> Set[str]:
+        """Return which of ``codes`` are already stored."""
+        existing: Set[str] = set()
+        for start in range(0, len(codes), QUERY_CHUNK_SIZE):
+            chunk = codes[start : start + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"SELECT short_code FROM urls WHERE short_code IN ({placeholders})",
+                chunk,
+            )
+            existing.update(row[0] for row in cursor.fetchall())
+        return existing
+
+    def _reuse_existing_urls(
+        self,
+        cursor: sqlite3.Cursor,
+        entries: List[Tuple[str, Optional[str], Optional[str]]],
+        pending: List[int],
+        codes: List[Optional[str]],
+    ) -> List[int]:
+        """Give pending entries the generated code their URL already has.
+
+        Returns the positions whose URL is not stored yet.
+        """
+        urls = list({entries[position][0] for position in pending})
+        existing: Dict[str, Tuple[str, Optional[str]]] = {}
+        for start in range(0, len(urls), QUERY_CHUNK_SIZE):
+            chunk = urls[start : start + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"""
+                SELECT original_url, short_code, expires_at FROM urls
+                WHERE custom_code = 0 AND original_url IN ({placeholders})
+                ORDER BY id DESC
+            """,
+                chunk,
+            )
+            # Rows come newest first, so the oldest code for a URL wins
+            for url, code, expires_at in cursor.fetchall():
+                existing[url] = (code, expires_at)
+
+        updates: List[Tuple[Optional[str], str]] = []
+        remaining: List[int] = []
+        for position in pending:
+            url, _, expires_at = entries[position]
+            if url not in existing:
+                remaining.append(position)
+                continue
+            code, existing_expires_at = existing[url]
+            new_expires_at = self.refreshed_expiry(existing_expires_at, expires_at)
+            if new_expires_at != existing_expires_at:
+                updates.append((new_expires_at, code))
+            codes[position] = code
+
+        if updates:
+            cursor.executemany(
+                "UPDATE urls SET expires_at = ? WHERE short_code = ?", updates
+            )
+        return remaining
+
+    def _assign_hash_codes(
+        self,
+        cursor: sqlite3.Cursor,
+        entries: List[Tuple[str, Optional[str], Optional[str]]],
+        pending: List[int],
+        codes: List[Optional[str]],
+        rows: List[Tuple[str, str, Optional[str], bool]],
+        reserved: Set[str],
+    ) -> List[int]:
+        """Give pending entries their hash code where it is free or reusable.
+
+        Returns the positions that still need a counter code (hash
+        collisions with a different URL).
+        """
+        hash_codes = {
+            position: self.generate_hash_code(entries[position][0])
+            for position in pending
+        }
+        existing: Dict[str, Tuple[str, Optional[str]]] = {}
+        candidates = list(set(hash_codes.values()))
+        for start in range(0, len(candidates), QUERY_CHUNK_SIZE):
+            chunk = candidates[start : start + QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(
+                f"""
+                SELECT short_code, original_url, expires_at FROM urls
+                WHERE short_code IN ({placeholders})
+            """,
+                chunk,
+            )
+            for code, url, expires_at in cursor.fetchall():
+                existing[code] = (url, expires_at)
+
+        updates: List[Tuple[Optional[str], str]] = []
+        claimed = set(reserved)
+        remaining: List[int] = []
+        for position in pending:
+            url, _, expires_at = entries[position]
+            code = hash_codes[position]
+            if code in existing:
+                existing_url, existing_expires_at = existing[code]
+                if existing_url != url:
+                    remaining.append(position)
+                    continue
+                new_expires_at = self.refreshed_expiry(existing_expires_at, expires_at)
+                if new_expires_at != existing_expires_at:
+                    updates.append((new_expires_at, code))
+                codes[position] = code
+            elif code in claimed:
+                remaining.append(position)
+            else:
+                claimed.add(code)
+                codes[position] = code
+                rows.append((code, url, expires_at, False))
+
+        if updates:
+            cursor.executemany(
+                "UPDATE urls SET expires_at = ? WHERE short_code = ?", updates
+            )
+        if remaining:
+            logger.warning(
+                "%d hash collisions with other URLs; using counter codes instead",
+                len(remaining),
+            )
+        return remaining
+
+    def _allocate_codes(
+        self, cursor: sqlite3.Cursor, count: int, reserved: Set[str]
+    ) -> List[str]:
+        """Reserve ``count`` unused counter-based codes.
+
+        Counter values are claimed in blocks by advancing ``code_counter``
+        and turned into codes with ``code_for_counter``; the rare value that
+        collides with a random or custom code is skipped.
+        """
+        codes: List[str] = []
+        while len(codes) < count:
+            needed = count - len(codes)
+            cursor.execute("SELECT next_value FROM code_counter WHERE id = 1")
+            row = cursor.fetchone()
+            start = row[0] if row else COUNTER_START
+            cursor.execute(
+                "INSERT OR REPLACE INTO code_counter (id, next_value) VALUES (1, ?)",
+                (start + needed,),
+            )
+            block = [
+                self.code_for_counter(value) for value in range(start, start + needed)
+            ]
+            taken = self._existing_codes(cursor, block) | reserved
+            codes.extend(code for code in block if code not in taken)
+        return codes
+
     def get_original_url(self, short_code: str) -> Optional[str]:
         """Get original URL by short code and increment click count."""
         try:
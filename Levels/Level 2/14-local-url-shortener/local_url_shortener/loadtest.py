@@ -0,0 +1,152 @@
+"""Redirect load test for the Flask app.
+
+Seeds a temporary database with short codes, serves the app on a local
+port with a threaded WSGI server and measures redirects/sec from several
+client threads, first with the original per-request lookup (SELECT +
+UPDATE + commit on a fresh connection) and then with ``RedirectEngine``.
+
+Usage:
+    python -m local_url_shortener.loadtest --requests 20000 --clients 8
+"""
+
+import argparse
+import http.client
+import logging
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from .core import URLShortener
+from .redirect import RedirectEngine
+from .web import create_app
+
+
+def seed_database(shortener: URLShortener, count: int) -> List[str]:
+    """Create ``count`` short URLs in one transaction and return their codes."""
+    codes = [f"lt{i:06d}" for i in range(count)]
+    with shortener.get_connection() as conn:
+        conn.executemany(
+            "INSERT INTO urls (short_code, original_url, custom_code) VALUES (?, ?, 1)",
+            [(code, f"https://example.com/page/{i}") for i, code in enumerate(codes)],
+        )
+    return codes
+
+
+def _client(
+    port: int, codes: List[str], requests: int, seed: int, errors: List[int]
+) -> None:
+    """Issue ``requests`` redirects over one keep-alive connection."""
+    rng = random.Random(seed)
+    # Skewed popularity: a few hot codes get most of the traffic
+    hot = codes[: max(1, len(codes) // 100)]
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        for _ in range(requests):
+            code = rng.choice(hot) if rng.random() < 0.8 else rng.choice(codes)
+            conn.request("GET", f"/{code}")
+            response = conn.getresponse()
+            response.read()
+            if response.status != 302:
+                errors.append(response.status)
+    finally:
+        conn.close()
+
+
+def run_load(
+    shortener: URLShortener,
+    codes: List[str],
+    requests: int,
+    clients: int,
+    engine: Optional[RedirectEngine] = None,
+) -> float:
+    """Serve the app and return redirects/sec achieved by ``clients`` threads."""
+    from werkzeug.serving import make_server
+
+    # Per-request access logging would dominate the measurement
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = create_app(shortener, redirect_engine=engine)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    per_client = max(1, requests // clients)
+    errors: List[int] = []
+    threads = [
+        threading.Thread(
+            target=_client, args=(server.server_port, codes, per_client, i, errors)
+        )
+        for i in range(clients)
+    ]
+    try:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+        server_thread.join()
+
+    if errors:
+        print(f"  {len(errors)} requests did not redirect (e.g. {errors[0]})")
+    return per_client * clients / elapsed if elapsed else float("inf")
+
+
+def total_clicks(shortener: URLShortener) -> int:
+    """Sum the click counts stored in the database."""
+    with shortener.get_connection() as conn:
+        row = conn.execute("SELECT COALESCE(SUM(click_count), 0) FROM urls").fetchone()
+    return row[0]
+
+
+def run_benchmark(requests: int, clients: int, url_count: int) -> None:
+    """Compare the original redirect path with ``RedirectEngine``."""
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    try:
+        shortener = URLShortener(db_path)
+        codes = seed_database(shortener, url_count)
+        print(
+            f"{url_count:,} URLs, {requests:,} redirects from {clients} client threads"
+        )
+
+        before = run_load(shortener, codes, requests, clients)
+        print(f"{'get_original_url':<20} {before:>10,.0f} redirects/sec")
+
+        clicks_before = total_clicks(shortener)
+        with RedirectEngine(shortener) as engine:
+            after = run_load(shortener, codes, requests, clients, engine)
+        print(f"{'RedirectEngine':<20} {after:>10,.0f} redirects/sec")
+        print(
+            f"Cache hits: {engine.cache.hits:,}, misses: {engine.cache.misses:,}; "
+            f"clicks recorded: {total_clicks(shortener) - clicks_before:,}"
+        )
+        print(f"Speed-up: {after / before:.1f}x")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db_path + suffix):
+                os.unlink(db_path + suffix)
+
+
+def main() -> None:
+    """Command line entry point for the load test."""
+    parser = argparse.ArgumentParser(description="Measure redirects/sec")
+    parser.add_argument(
+        "--requests", type=int, default=20000, help="Total redirects (default: 20000)"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=8, help="Concurrent client threads (default: 8)"
+    )
+    parser.add_argument(
+        "--urls", type=int, default=10000, help="Short URLs to seed (default: 10000)"
+    )
+    args = parser.parse_args()
+    run_benchmark(args.requests, args.clients, args.urls)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
 """Command-line interface for the URL shortener."""
 
 import argparse
+import csv
 import logging
 import sys
+from typing import Dict, List, Union
 
 from .core import URLShortener
+from .redirect import DEFAULT_CACHE_SIZE, DEFAULT_FLUSH_INTERVAL, RedirectEngine
 from .utils import generate_qr_code, setup_logging
 
 logger = logging.getLogger(__name__)
@@ -24,6 +27,7 @@ Examples:
   %(prog)s stats abc123
   %(prog)s list
   %(prog)s delete abc123
+  %(prog)s import urls.txt --output codes.csv
   %(prog)s serve --port 8080
         """,
     )
@@ -40,6 +44,23 @@ Examples:
     )
     shorten_parser.add_argument("--qr", action="store_true", help="Generate QR code")
 
+    # Import command
+    import_parser = subparsers.add_parser(
+        "import", help="Shorten many URLs from a file in one transaction"
+    )
+    import_parser.add_argument(
+        "file",
+        help="Text file with one URL per line, or CSV with a 'url' column "
+        "(optional 'custom_code' and 'expires_days' columns)",
+    )
+    import_parser.add_argument("--expires", type=int, help="Expiration in days")
+    import_parser.add_argument(
+        "--hash", action="store_true", help="Use hash-based code generation"
+    )
+    import_parser.add_argument(
+        "--output", help="Write a CSV of short_code,short_url,original_url"
+    )
+
     # Expand command
     expand_parser = subparsers.add_parser("expand", help="Get original URL")
     expand_parser.add_argument("code", help="Short code to expand")
@@ -63,6 +84,24 @@ Examples:
     serve_parser.add_argument("--host", default="localhost", help="Host to bind to")
     serve_parser.add_argument("--port", type=int, default=5000, help="Port to bind to")
     serve_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    serve_parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_CACHE_SIZE,
+        help=f"Hot short codes kept in memory (default: {DEFAULT_CACHE_SIZE})",
+    )
+    serve_parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help="Seconds between batched click-count writes "
+        f"(default: {DEFAULT_FLUSH_INTERVAL})",
+    )
+    serve_parser.add_argument(
+        "--no-redirect-cache",
+        action="store_true",
+        help="Look up every redirect in the database and count clicks immediately",
+    )
 
     return parser
 
@@ -96,6 +135,57 @@ def handle_shorten(shortener: URLShortener, args) -> None:
         sys.exit(1)
 
 
+def load_import_file(path: str) -> List[Union[str, Dict[str, object]]]:
+    """Read URLs to import from a plain text or CSV file."""
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if not path.lower().endswith(".csv"):
+            return [
+                line.strip()
+                for line in f
+                if line.strip() and not line.startswith("#")
+            ]
+
+        items: List[Union[str, Dict[str, object]]] = []
+        for number, row in enumerate(csv.DictReader(f), start=2):
+            item: Dict[str, object] = {"url": (row.get("url") or "").strip()}
+            if (row.get("custom_code") or "").strip():
+                item["custom_code"] = row["custom_code"].strip()
+            expires = (row.get("expires_days") or "").strip()
+            if expires:
+                if not expires.isdigit():
+                    raise ValueError(f"Line {number}: invalid expires_days '{expires}'")
+                item["expires_days"] = int(expires)
+            items.append(item)
+        return items
+
+
+def handle_import(shortener: URLShortener, args) -> None:
+    """Handle the import command."""
+    try:
+        items = load_import_file(args.file)
+        results = shortener.create_short_urls(
+            items, expires_days=args.expires, use_hash=args.hash
+        )
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        print(f"Unexpected error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["short_code", "short_url", "original_url"])
+            for item, (short_code, full_url) in zip(items, results):
+                url = item["url"] if isinstance(item, dict) else item
+                writer.writerow([short_code, full_url, url])
+        print(f"Wrote short codes to: {args.output}")
+
+    print(f"Imported {len(results)} URLs ({len(set(results))} short codes)")
+
+
 def handle_expand(shortener: URLShortener, args) -> None:
     """Handle the expand command."""
     original_url = shortener.get_original_url(args.code)
@@ -178,12 +268,24 @@ def handle_serve(shortener: URLShortener, args) -> None:
     try:
         from .web import create_app
 
-        app = create_app(shortener)
+        engine = None
+        if not args.no_redirect_cache:
+            engine = RedirectEngine(
+                shortener,
+                cache_size=args.cache_size,
+                flush_interval=args.flush_interval,
+            )
+        app = create_app(shortener, redirect_engine=engine)
 
         print(f"Starting server on {args.host}:{args.port}")
         print("Press Ctrl+C to stop")
 
-        app.run(host=args.host, port=args.port, debug=args.debug)
+        try:
+            app.run(host=args.host, port=args.port, debug=args.debug)
+        finally:
+            if engine is not None:
+                # Write clicks still buffered in memory
+                engine.close()
 
     except ImportError:
         print(
@@ -220,6 +322,7 @@ def main() -> None:
     # Route to appropriate handler
     handlers = {
         "shorten": handle_shorten,
+        "import": handle_import,
         "expand": handle_expand,
         "stats": handle_stats,
         "list": handle_list,
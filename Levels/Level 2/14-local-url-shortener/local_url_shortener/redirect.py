@@ -0,0 +1,316 @@
+"""High-throughput redirect path for the URL shortener.
+
+``URLShortener.get_original_url`` opens a connection, runs a SELECT and then
+an UPDATE + commit for every redirect. ``RedirectEngine`` serves the same
+lookups with:
+
+* a bounded LRU of hot short codes that honours link expiry and re-reads
+  entries after ``cache_ttl`` seconds (so deletes made elsewhere are seen),
+* a bounded pool of WAL-mode SQLite connections shared by all threads,
+* click counts buffered in memory and written in one transaction per batch,
+  either when ``flush_threshold`` clicks are pending, every
+  ``flush_interval`` seconds from a background thread, or on ``close()``.
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_FLUSH_THRESHOLD = 1000
+DEFAULT_POOL_SIZE = 8
+
+
+class HotCodeCache:
+    """Thread-safe LRU of short code -> (original URL, expiry)."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty cache holding at most ``max_size`` codes."""
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, Optional[datetime], float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, short_code: str) -> Optional[str]:
+        """Return the cached URL, or None if absent, stale or expired."""
+        with self._lock:
+            entry = self._entries.get(short_code)
+            if entry is not None:
+                original_url, expires_at, cached_at = entry
+                if self._clock() - cached_at > self.ttl or (
+                    expires_at is not None and datetime.now() > expires_at
+                ):
+                    del self._entries[short_code]
+                else:
+                    self._entries.move_to_end(short_code)
+                    self.hits += 1
+                    return original_url
+            self.misses += 1
+            return None
+
+    def put(
+        self, short_code: str, original_url: str, expires_at: Optional[datetime]
+    ) -> None:
+        """Cache a resolved code, evicting the least recently used if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[short_code] = (original_url, expires_at, self._clock())
+            self._entries.move_to_end(short_code)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, short_code: str) -> None:
+        """Drop a code, e.g. after it was deleted."""
+        with self._lock:
+            self._entries.pop(short_code, None)
+
+    def clear(self) -> None:
+        """Drop every cached code."""
+        with self._lock:
+            self._entries.clear()
+
+
+class ConnectionPool:
+    """A bounded set of long-lived WAL-mode connections, leased one at a time.
+
+    Connections open lazily, up to ``size``, and go back to the pool when a
+    lease ends, so a server that starts a thread per client keeps at most
+    ``size`` connections open however many threads it runs.
+    """
+
+    def __init__(self, db_path: str, size: int = DEFAULT_POOL_SIZE) -> None:
+        """Initialize the pool for ``db_path``; connections open lazily."""
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.db_path = db_path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def lease(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, opening one if none is idle and the pool has room."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                opened = len(self._connections) < self.size
+                if opened:
+                    conn = self._open()
+                    self._connections.append(conn)
+            if not opened:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def __len__(self) -> int:
+        return len(self._connections)
+
+    def close_all(self) -> None:
+        """Close every connection opened by this pool."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._idle = queue.LifoQueue()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing connection: {e}")
+
+
+class ClickBuffer:
+    """Accumulates click counts in memory until they are flushed."""
+
+    def __init__(self) -> None:
+        """Initialize an empty buffer."""
+        self._counts: Counter = Counter()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def add(self, short_code: str) -> int:
+        """Record one click and return the number of pending clicks."""
+        with self._lock:
+            self._counts[short_code] += 1
+            self._pending += 1
+            return self._pending
+
+    def drain(self) -> Counter:
+        """Take every pending count, leaving the buffer empty."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._pending = 0
+            return counts
+
+    def restore(self, counts: Counter) -> None:
+        """Put back counts whose flush failed."""
+        with self._lock:
+            self._counts.update(counts)
+            self._pending += sum(counts.values())
+
+
+class RedirectEngine:
+    """Resolves short codes for redirects with caching and batched clicks."""
+
+    def __init__(
+        self,
+        shortener,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+        flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        """
+        Create a redirect engine.
+
+        Args:
+            shortener: URLShortener whose database is served
+            cache_size: Maximum number of hot codes kept in memory
+            cache_ttl: Seconds before a cached code is re-read from the database
+            flush_interval: Seconds between background click flushes, or None
+                to flush only on threshold and ``close()``
+            flush_threshold: Pending clicks that trigger an immediate flush
+            pool_size: Maximum number of open database connections
+        """
+        self.shortener = shortener
+        self.cache = HotCodeCache(cache_size, cache_ttl)
+        self.pool = ConnectionPool(shortener.db_path, pool_size)
+        self.clicks = ClickBuffer()
+        self.flush_threshold = flush_threshold
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(flush_interval,),
+                name="click-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def __enter__(self) -> "RedirectEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def resolve(self, short_code: str) -> Optional[str]:
+        """Return the original URL for a redirect and count the click."""
+        original_url = self.cache.get(short_code)
+        if original_url is None:
+            original_url = self._lookup(short_code)
+            if original_url is None:
+                return None
+
+        if self.clicks.add(short_code) >= self.flush_threshold:
+            self.flush()
+        return original_url
+
+    def _lookup(self, short_code: str) -> Optional[str]:
+        """Read a code from the database and cache it if it is live."""
+        try:
+            with self.pool.lease() as conn:
+                row = conn.execute(
+                    "SELECT original_url, expires_at FROM urls WHERE short_code = ?",
+                    (short_code,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Database error retrieving URL: {e}")
+            return None
+
+        if not row:
+            return None
+        original_url, expires_at = row
+        if self.shortener.is_expired(expires_at):
+            logger.info(f"Short URL {short_code} has expired")
+            return None
+
+        expiry = None
+        if expires_at:
+            try:
+                expiry = datetime.fromisoformat(expires_at)
+            except ValueError:
+                expiry = None
+        self.cache.put(short_code, original_url, expiry)
+        return original_url
+
+    def flush(self) -> int:
+        """Write buffered click counts in a single transaction.
+
+        Returns the number of clicks written. On a database error the counts
+        are kept for the next flush.
+        """
+        with self._flush_lock:
+            counts = self.clicks.drain()
+            if not counts:
+                return 0
+            try:
+                with self.pool.lease() as conn, conn:
+                    conn.executemany(
+                        "UPDATE urls SET click_count = click_count + ? "
+                        "WHERE short_code = ?",
+                        [(count, code) for code, count in counts.items()],
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to flush click counts: {e}")
+                self.clicks.restore(counts)
+                return 0
+            total = sum(counts.values())
+            logger.debug(f"Flushed {total} clicks for {len(counts)} codes")
+            return total
+
+    def invalidate(self, short_code: str) -> None:
+        """Forget a cached code (call after deleting or changing it)."""
+        self.cache.invalidate(short_code)
+
+    def _flush_loop(self, interval: float) -> None:
+        """Background thread body: flush every ``interval`` seconds."""
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Stop the background flusher, flush pending clicks and close connections."""
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self._flusher = None
+        self.flush()
+        self.pool.close_all()
@@ -11,6 +11,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Largest number of URLs accepted by /api/shorten/batch in one request
+MAX_BATCH_SIZE = 10000
+
 
 # HTML templates
 HOME_TEMPLATE = """
@@ -180,12 +183,15 @@ HOME_TEMPLATE = """
 """
 
 
-def create_app(shortener) -> Flask:
+def create_app(shortener, redirect_engine=None) -> "Flask":
     """
     Create and configure the Flask application.
 
     Args:
         shortener: URLShortener instance
+        redirect_engine: Optional RedirectEngine used for redirects and
+            expansions instead of ``shortener.get_original_url``. Its
+            buffered clicks are flushed before statistics are shown.
 
     Returns:
         Configured Flask application
@@ -196,9 +202,20 @@ def create_app(shortener) -> Flask:
     app = Flask(__name__)
     app.config["SECRET_KEY"] = "dev-key-change-in-production"
 
+    if redirect_engine is not None:
+        resolve_url = redirect_engine.resolve
+    else:
+        resolve_url = shortener.get_original_url
+
+    def flush_clicks() -> None:
+        """Write buffered clicks so listed counts are current."""
+        if redirect_engine is not None:
+            redirect_engine.flush()
+
     @app.route("/")
     def home():
         """Home page with URL shortening form."""
+        flush_clicks()
         urls = shortener.list_all_urls()[:10]  # Show last 10 URLs
         return render_template_string(HOME_TEMPLATE, urls=urls)
 
@@ -248,7 +265,7 @@ def create_app(shortener) -> Flask:
     @app.route("/<short_code>")
     def redirect_url(short_code: str):
         """Redirect to original URL."""
-        original_url = shortener.get_original_url(short_code)
+        original_url = resolve_url(short_code)
 
         if original_url:
             logger.info(f"Redirecting {short_code} to {original_url}")
@@ -371,10 +388,67 @@ def create_app(shortener) -> Flask:
             logger.error(f"API error: {e}")
             return jsonify({"error": "Internal server error"}), 500
 
+    @app.route("/api/shorten/batch", methods=["POST"])
+    def api_shorten_batch():
+        """API endpoint for shortening many URLs in one transaction."""
+        data = request.get_json(silent=True)
+
+        if not isinstance(data, dict) or not isinstance(data.get("urls"), list):
+            return jsonify({"error": "urls must be a list"}), 400
+
+        urls = data["urls"]
+        if len(urls) > MAX_BATCH_SIZE:
+            return (
+                jsonify({"error": f"At most {MAX_BATCH_SIZE} URLs per batch"}),
+                400,
+            )
+        if not all(isinstance(item, (str, dict)) for item in urls):
+            return (
+                jsonify({"error": "Each URL must be a string or an object"}),
+                400,
+            )
+
+        expires_days = data.get("expires_days")
+        if expires_days is not None and (
+            not isinstance(expires_days, int) or expires_days < 0
+        ):
+            return (
+                jsonify({"error": "expires_days must be a non-negative integer"}),
+                400,
+            )
+
+        try:
+            results = shortener.create_short_urls(
+                urls,
+                expires_days=expires_days,
+                use_hash=bool(data.get("use_hash", False)),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            logger.error(f"API batch error: {e}")
+            return jsonify({"error": "Internal server error"}), 500
+
+        return jsonify(
+            {
+                "count": len(results),
+                "results": [
+                    {
+                        "short_code": short_code,
+                        "short_url": full_url,
+                        "original_url": (
+                            item.get("url") if isinstance(item, dict) else item
+                        ).strip(),
+                    }
+                    for item, (short_code, full_url) in zip(urls, results)
+                ],
+            }
+        )
+
     @app.route("/api/<short_code>")
     def api_expand(short_code: str):
         """API endpoint to expand short URL."""
-        original_url = shortener.get_original_url(short_code)
+        original_url = resolve_url(short_code)
 
         if original_url:
             return jsonify({"short_code": short_code, "original_url": original_url})
@@ -384,6 +458,7 @@ def create_app(shortener) -> Flask:
     @app.route("/api/<short_code>/stats")
     def api_stats(short_code: str):
         """API endpoint to get URL statistics."""
+        flush_clicks()
         stats = shortener.get_url_stats(short_code)
 
         if stats:
@@ -394,6 +469,7 @@ def create_app(shortener) -> Flask:
     @app.route("/api/urls")
     def api_list():
         """API endpoint to list all URLs."""
+        flush_clicks()
         urls = shortener.list_all_urls()
         return jsonify({"urls": urls})
 
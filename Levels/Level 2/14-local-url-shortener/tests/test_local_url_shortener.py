@@ -2,11 +2,14 @@
 
 import os
 import tempfile
+import threading
 import unittest
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 
-from local_url_shortener.core import URLShortener
+from local_url_shortener.core import URLShortener, encode_base62
+from local_url_shortener.main import load_import_file
+from local_url_shortener.redirect import HotCodeCache, RedirectEngine
 from local_url_shortener.web import create_app
 from local_url_shortener.utils import (
     validate_short_code,
@@ -279,6 +282,127 @@ class TestURLShortener(unittest.TestCase):
         self.assertEqual(len(all_urls), 1)
         self.assertEqual(all_urls[0]["original_url"], "https://permanent.com")
 
+    def test_create_short_urls_bulk(self):
+        """Bulk creation returns one code per item and dedupes repeated URLs."""
+        results = self.shortener.create_short_urls(
+            [
+                "https://a.example",
+                "https://b.example",
+                "https://a.example",
+                {"url": "https://c.example", "custom_code": "cee", "expires_days": 3},
+            ]
+        )
+
+        codes = [code for code, _ in results]
+        self.assertEqual(len(results), 4)
+        self.assertEqual(codes[0], codes[2])
+        self.assertEqual(codes[3], "cee")
+        self.assertEqual(len(codes[0]), 6)
+        self.assertEqual(len(self.shortener.list_all_urls()), 3)
+        self.assertIsNotNone(self.shortener.get_url_stats("cee")["expires_at"])
+        self.assertEqual(
+            self.shortener.get_original_url(codes[1]), "https://b.example"
+        )
+
+    def test_create_short_urls_allocates_unique_codes(self):
+        """Counter codes never repeat across calls or clash with existing codes."""
+        first = self.shortener.create_short_urls(
+            [f"https://example.com/{i}" for i in range(50)]
+        )
+        # Occupy the next counter value with a custom code
+        with self.shortener.get_connection() as conn:
+            next_value = conn.execute(
+                "SELECT next_value FROM code_counter"
+            ).fetchone()[0]
+        self.shortener.create_short_url(
+            "https://taken.example",
+            custom_code=self.shortener.code_for_counter(next_value),
+        )
+
+        second = self.shortener.create_short_urls(
+            [f"https://example.org/{i}" for i in range(50)]
+        )
+        codes = [code for code, _ in first + second]
+        self.assertEqual(len(set(codes)), 100)
+        self.assertNotIn(self.shortener.code_for_counter(next_value), codes)
+
+    def test_counter_codes_are_not_sequential(self):
+        """Consecutive counter values map to unrelated, unique codes."""
+        results = self.shortener.create_short_urls(
+            [f"https://example.com/{i}" for i in range(200)]
+        )
+        codes = [code for code, _ in results]
+        self.assertEqual(len(set(codes)), 200)
+        self.assertTrue(all(len(code) == 6 for code in codes))
+        with self.shortener.get_connection() as conn:
+            next_value = conn.execute(
+                "SELECT next_value FROM code_counter"
+            ).fetchone()[0]
+        sequential = {encode_base62(next_value - 200 + i) for i in range(200)}
+        self.assertFalse(sequential & set(codes))
+
+    def test_create_short_urls_reuses_stored_urls(self):
+        """URLs already stored under a generated code keep that code."""
+        first = self.shortener.create_short_urls(["https://a.example"])
+        second = self.shortener.create_short_urls(
+            ["https://a.example", "https://b.example"]
+        )
+
+        self.assertEqual(second[0][0], first[0][0])
+        self.assertEqual(len(self.shortener.list_all_urls()), 2)
+
+    def test_create_short_urls_rejects_bool_expiry(self):
+        """A boolean is not a number of days."""
+        with self.assertRaises(ValueError):
+            self.shortener.create_short_urls(
+                [{"url": "https://a.example", "expires_days": True}]
+            )
+
+    def test_create_short_urls_hash_reuses_existing(self):
+        """Hash mode reuses matching hash codes, like create_short_url."""
+        code, _ = self.shortener.create_short_url("https://a.example", use_hash=True)
+        results = self.shortener.create_short_urls(
+            ["https://a.example", "https://b.example"], use_hash=True
+        )
+
+        self.assertEqual(results[0][0], code)
+        self.assertEqual(
+            results[1][0], self.shortener.generate_hash_code("https://b.example")
+        )
+        self.assertEqual(len(self.shortener.list_all_urls()), 2)
+
+    def test_create_short_urls_is_atomic(self):
+        """An invalid item rejects the whole batch."""
+        self.shortener.create_short_url("https://a.example", custom_code="taken")
+
+        with self.assertRaises(ValueError) as context:
+            self.shortener.create_short_urls(["https://ok.example", "not-a-url"])
+        self.assertIn("URL #2", str(context.exception))
+
+        with self.assertRaises(ValueError):
+            self.shortener.create_short_urls(
+                ["https://ok.example", {"url": "https://b.example", "custom_code": "taken"}]
+            )
+        self.assertEqual(len(self.shortener.list_all_urls()), 1)
+
+    def test_load_import_file(self):
+        """Import files may be plain text or CSV."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            text_path = os.path.join(temp_dir, "urls.txt")
+            with open(text_path, "w") as f:
+                f.write("https://a.example\n\n# comment\nhttps://b.example\n")
+            csv_path = os.path.join(temp_dir, "urls.csv")
+            with open(csv_path, "w") as f:
+                f.write("url,custom_code,expires_days\nhttps://c.example,cee,7\n")
+
+            self.assertEqual(
+                load_import_file(text_path), ["https://a.example", "https://b.example"]
+            )
+            self.assertEqual(
+                load_import_file(csv_path),
+                [{"url": "https://c.example", "custom_code": "cee", "expires_days": 7}],
+            )
+
     def test_generate_short_code_uniqueness(self):
         """Test that generated short codes are unique."""
         codes = set()
@@ -477,6 +601,33 @@ class TestWebAPI(unittest.TestCase):
         self.assertIsNotNone(stats)
         self.assertIsNotNone(stats["expires_at"])
 
+    def test_api_shorten_batch(self):
+        """Batch endpoint shortens every URL and reports codes in order."""
+        response = self.client.post(
+            "/api/shorten/batch",
+            json={
+                "urls": ["https://a.example", {"url": "https://b.example"}],
+                "expires_days": 2,
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(data["results"][1]["original_url"], "https://b.example")
+        stats = self.shortener.get_url_stats(data["results"][0]["short_code"])
+        self.assertIsNotNone(stats["expires_at"])
+
+    def test_api_shorten_batch_rejects_invalid(self):
+        """Batch endpoint rejects malformed payloads without writing."""
+        response = self.client.post("/api/shorten/batch", json={"urls": "x"})
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            "/api/shorten/batch", json={"urls": ["https://a.example", "bad"]}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.shortener.list_all_urls(), [])
+
     def test_api_shorten_rejects_invalid_expiration(self):
         """API should reject expires_days values that cannot be parsed."""
         response = self.client.post(
@@ -489,6 +640,130 @@ class TestWebAPI(unittest.TestCase):
         self.assertIn("error", data)
 
 
+class TestRedirectEngine(unittest.TestCase):
+    """Test cases for the cached, batched redirect path."""
+
+    def setUp(self):
+        """Create a shortener and an engine without a background flusher."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix=".db")
+        self.temp_db.close()
+        self.shortener = URLShortener(self.temp_db.name)
+        self.engine = RedirectEngine(self.shortener, flush_interval=None)
+
+    def tearDown(self):
+        """Close the engine and remove the database and WAL files."""
+        self.engine.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.temp_db.name + suffix):
+                os.unlink(self.temp_db.name + suffix)
+
+    def test_resolve_buffers_clicks_until_flush(self):
+        """Clicks are counted in memory and written in one batch."""
+        short_code, _ = self.shortener.create_short_url("https://example.com")
+
+        for _ in range(3):
+            self.assertEqual(self.engine.resolve(short_code), "https://example.com")
+
+        self.assertEqual(self.shortener.get_url_stats(short_code)["click_count"], 0)
+        self.assertEqual(self.engine.flush(), 3)
+        self.assertEqual(self.shortener.get_url_stats(short_code)["click_count"], 3)
+        self.assertEqual(self.engine.cache.hits, 2)
+
+    def test_flush_threshold_and_close(self):
+        """Reaching the threshold flushes; close() writes the remainder."""
+        engine = RedirectEngine(self.shortener, flush_interval=None, flush_threshold=2)
+        short_code, _ = self.shortener.create_short_url("https://example.com")
+
+        engine.resolve(short_code)
+        engine.resolve(short_code)
+        self.assertEqual(self.shortener.get_url_stats(short_code)["click_count"], 2)
+
+        engine.resolve(short_code)
+        engine.close()
+        self.assertEqual(self.shortener.get_url_stats(short_code)["click_count"], 3)
+
+    def test_resolve_unknown_and_expired(self):
+        """Unknown and expired codes do not resolve or count clicks."""
+        self.assertIsNone(self.engine.resolve("missing"))
+
+        short_code, _ = self.shortener.create_short_url(
+            "https://example.com", expires_days=1
+        )
+        self.assertIsNotNone(self.engine.resolve(short_code))
+
+        # Expiry moves into the past: the cached entry must not be served
+        past = datetime.now() - timedelta(seconds=1)
+        self.engine.cache.put(short_code, "https://example.com", past)
+        with self.shortener.get_connection() as conn:
+            conn.execute(
+                "UPDATE urls SET expires_at = ? WHERE short_code = ?",
+                (past.isoformat(), short_code),
+            )
+        self.assertIsNone(self.engine.resolve(short_code))
+
+    def test_invalidate_after_delete(self):
+        """A deleted code stops resolving once invalidated."""
+        short_code, _ = self.shortener.create_short_url("https://example.com")
+        self.engine.resolve(short_code)
+        self.shortener.delete_url(short_code)
+
+        self.assertIsNotNone(self.engine.resolve(short_code))
+        self.engine.invalidate(short_code)
+        self.assertIsNone(self.engine.resolve(short_code))
+
+    def test_pool_bounds_connections_across_threads(self):
+        """Short-lived threads reuse pooled connections instead of opening new ones."""
+        engine = RedirectEngine(
+            self.shortener, cache_size=0, flush_interval=None, pool_size=2
+        )
+        short_code, _ = self.shortener.create_short_url("https://example.com")
+
+        threads = [
+            threading.Thread(target=engine.resolve, args=(short_code,))
+            for _ in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertLessEqual(len(engine.pool), 2)
+        engine.close()
+        self.assertEqual(len(engine.pool), 0)
+        self.assertEqual(self.shortener.get_url_stats(short_code)["click_count"], 50)
+
+    def test_hot_code_cache_lru_and_ttl(self):
+        """The cache evicts least recently used codes and stale entries."""
+        now = [0.0]
+        cache = HotCodeCache(max_size=2, ttl=10, clock=lambda: now[0])
+        cache.put("a", "https://a.example", None)
+        cache.put("b", "https://b.example", None)
+        cache.get("a")
+        cache.put("c", "https://c.example", None)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "https://a.example")
+
+        now[0] = 11.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 1)
+
+    def test_web_app_uses_engine(self):
+        """Redirects go through the engine and stats flush pending clicks."""
+        short_code, _ = self.shortener.create_short_url("https://example.com")
+        app = create_app(self.shortener, redirect_engine=self.engine)
+        app.testing = True
+        client = app.test_client()
+
+        for _ in range(2):
+            response = client.get(f"/{short_code}")
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response.headers["Location"], "https://example.com")
+
+        stats = client.get(f"/api/{short_code}/stats").get_json()
+        self.assertEqual(stats["click_count"], 2)
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests for the complete system."""
 
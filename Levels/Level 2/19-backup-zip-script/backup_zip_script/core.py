@@ -171,6 +171,9 @@ def _rotate_backups(backup_dir: Path, max_backups: int) -> None:
     """
     Rotate backup files, keeping only the most recent N backups.
 
+    A deduplicating repository in the backup directory is rotated the same
+    way, and chunks only the removed snapshots used are deleted.
+
     Args:
         backup_dir: Directory containing backup files
         max_backups: Maximum number of backups to keep
@@ -178,6 +181,12 @@ def _rotate_backups(backup_dir: Path, max_backups: int) -> None:
     if not backup_dir.exists():
         return
 
+    # Imported here because dedup builds on this module
+    from .dedup import REPOSITORY_DIR, DedupRepository
+
+    if (backup_dir / REPOSITORY_DIR).is_dir():
+        DedupRepository(backup_dir / REPOSITORY_DIR).prune(max_backups)
+
     # Find all backup ZIP files
     backup_files = list(backup_dir.glob("backup_*.zip"))
 
@@ -0,0 +1,593 @@
+"""Deduplicating backup repository for the backup ZIP script.
+
+Nightly ZIPs of a large, mostly unchanged tree write nearly the same bytes
+every time. A ``DedupRepository`` stores each distinct piece of content
+once:
+
+* files are split into variable-size chunks at content-defined
+  boundaries, found with a gear rolling hash (FastCDC-style, with
+  normalized chunking), so an insertion only changes the chunks around it
+  instead of shifting every later block,
+* chunks are stored by their SHA-256 under ``objects/``, compressed with
+  zlib when that helps; a chunk already present is not written again,
+* each snapshot is an index under ``snapshots/`` listing every file's
+  size, mtime and chunk hashes,
+* ``prune`` drops old snapshot indexes and garbage-collects chunks no
+  remaining snapshot uses; ``_rotate_backups`` calls it for a repository
+  inside the backup directory,
+* ``verify`` checks that every referenced chunk exists and, reading each
+  distinct chunk once, that its content still matches its hash.
+
+Layout::
+
+    repository/
+        config.json
+        lock                   held by snapshots and garbage collection
+        objects/ab/abcdef...   one file per chunk
+        snapshots/snapshot_<timestamp>.json
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from .core import _rotate_backups
+from .utils import map_in_pool, scan_changes
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+REPOSITORY_DIR = "repository"
+REPOSITORY_VERSION = 1
+SNAPSHOT_PREFIX = "snapshot_"
+
+MIN_CHUNK_SIZE = 32 * 1024
+AVG_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 256 * 1024
+READ_SIZE = 4 * 1024 * 1024
+COMPRESS_LEVEL = 6
+# Chunk temp files younger than this may still be in the middle of a write
+TEMP_GRACE_SECONDS = 60 * 60
+
+# Chunk object headers: content stored as is or zlib-compressed
+_RAW = b"\x00"
+_ZLIB = b"\x01"
+
+_MASK64 = (1 << 64) - 1
+# Fixed per-byte values for the gear hash; derived from SHA-256 so every
+# process and Python version computes the same boundaries
+_GEAR = tuple(
+    int.from_bytes(hashlib.sha256(b"gear" + bytes([i])).digest()[:8], "little")
+    for i in range(256)
+)
+
+
+def _top_mask(bits: int) -> int:
+    """Mask of the ``bits`` highest bits of a 64-bit hash.
+
+    The gear hash shifts left, so its high bits depend on the most bytes.
+    """
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+@dataclass(frozen=True)
+class ChunkerParams:
+    """Chunk size limits; part of the repository format."""
+
+    min_size: int = MIN_CHUNK_SIZE
+    avg_size: int = AVG_CHUNK_SIZE
+    max_size: int = MAX_CHUNK_SIZE
+
+    def __post_init__(self) -> None:
+        if not 0 < self.min_size < self.avg_size < self.max_size:
+            raise ValueError("Chunk sizes must satisfy 0 < min < avg < max")
+
+    @property
+    def masks(self) -> Tuple[int, int]:
+        """Stricter mask before the average size, looser after it."""
+        bits = (self.avg_size - self.min_size).bit_length() - 1
+        return _top_mask(bits + 1), _top_mask(max(1, bits - 1))
+
+
+def find_boundary(data: bytes, start: int, end: int, params: ChunkerParams) -> int:
+    """
+    Return the end of the chunk that begins at ``start``.
+
+    The first ``min_size`` bytes are skipped, since no cut may fall there;
+    the hash is then rolled byte by byte until its high bits are zero.
+
+    Args:
+        data: Buffer holding the chunk
+        start: Offset of the chunk
+        end: End of the available data; treated as end of stream
+        params: Chunk size limits
+
+    Returns:
+        Offset just past the chunk
+    """
+    limit = min(end, start + params.max_size)
+    first = start + params.min_size
+    if limit <= first:
+        return limit
+    mask_small, mask_large = params.masks
+    normal = min(limit, start + params.avg_size)
+    gear = _GEAR
+    h = 0
+    for i, byte in enumerate(data[first:normal], first + 1):
+        h = (h + h + gear[byte]) & _MASK64
+        if not h & mask_small:
+            return i
+    for i, byte in enumerate(data[normal:limit], normal + 1):
+        h = (h + h + gear[byte]) & _MASK64
+        if not h & mask_large:
+            return i
+    return limit
+
+
+def iter_chunks(stream: BinaryIO, params: ChunkerParams) -> Iterator[bytes]:
+    """Split a binary stream into content-defined chunks."""
+    buffer = b""
+    eof = False
+    while not eof:
+        data = stream.read(READ_SIZE)
+        eof = not data
+        buffer = buffer + data if buffer else data
+        position = 0
+        # Only cut where the data after the chunk is known, or at the end
+        while len(buffer) - position >= (1 if eof else params.max_size):
+            cut = find_boundary(buffer, position, len(buffer), params)
+            yield buffer[position:cut]
+            position = cut
+        buffer = buffer[position:]
+
+
+def _object_path(objects_dir: str, digest: str) -> str:
+    return os.path.join(objects_dir, digest[:2], digest)
+
+
+def _write_object(objects_dir: str, digest: str, chunk: bytes) -> int:
+    """Store a chunk unless present; return the bytes written (0 if present)."""
+    path = _object_path(objects_dir, digest)
+    if os.path.exists(path):
+        return 0
+    compressed = zlib.compress(chunk, COMPRESS_LEVEL)
+    payload = _ZLIB + compressed if len(compressed) < len(chunk) else _RAW + chunk
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write then rename, so a chunk file is never seen half written; two
+    # writers of the same chunk write the same bytes
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return len(payload)
+
+
+def _read_object(objects_dir: str, digest: str) -> bytes:
+    """Return a chunk's content."""
+    with open(_object_path(objects_dir, digest), "rb") as f:
+        payload = f.read()
+    if payload[:1] == _ZLIB:
+        return zlib.decompress(payload[1:])
+    return payload[1:]
+
+
+def _chunk_file(
+    task: Tuple[int, str, str, ChunkerParams]
+) -> Tuple[int, int, List[str], int, int]:
+    """Chunk one file and store its new chunks; runs in a worker process.
+
+    Returns (index, size, chunk hashes, new chunks, bytes written).
+    """
+    index, path, objects_dir, params = task
+    size = 0
+    digests: List[str] = []
+    new_chunks = 0
+    written = 0
+    with open(path, "rb") as f:
+        for chunk in iter_chunks(f, params):
+            size += len(chunk)
+            digest = hashlib.sha256(chunk).hexdigest()
+            stored = _write_object(objects_dir, digest, chunk)
+            if stored:
+                new_chunks += 1
+                written += stored
+            digests.append(digest)
+    return index, size, digests, new_chunks, written
+
+
+@dataclass
+class DedupSnapshotResult:
+    """Outcome of ``DedupRepository.create_snapshot``."""
+
+    snapshot_path: Path
+    files_total: int = 0
+    files_unchanged: int = 0
+    bytes_total: int = 0
+    bytes_read: int = 0
+    chunks_total: int = 0
+    chunks_new: int = 0
+    bytes_written: int = 0
+
+
+@dataclass
+class VerifyResult:
+    """Outcome of ``DedupRepository.verify``."""
+
+    snapshots: int = 0
+    chunks_checked: int = 0
+    missing: List[str] = field(default_factory=list)
+    corrupt: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing and not self.corrupt
+
+
+class DedupRepository:
+    """A content-addressed chunk store with per-snapshot indexes."""
+
+    def __init__(self, path: Path, params: Optional[ChunkerParams] = None) -> None:
+        """
+        Open a repository, creating it if needed.
+
+        Args:
+            path: Repository directory
+            params: Chunk sizes for a new repository; an existing one keeps
+                the sizes it was created with, so chunks keep matching
+        """
+        self.path = path
+        self.objects_dir = path / "objects"
+        self.snapshots_dir = path / "snapshots"
+        config_path = path / "config.json"
+        if config_path.exists():
+            with open(config_path, "r", encoding="utf-8") as f:
+                config = json.load(f)
+            if config.get("version") != REPOSITORY_VERSION:
+                raise ValueError(f"Unsupported repository version in {path}")
+            self.params = ChunkerParams(**config["chunker"])
+        else:
+            self.params = params or ChunkerParams()
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+            config = {
+                "version": REPOSITORY_VERSION,
+                "chunker": {
+                    "min_size": self.params.min_size,
+                    "avg_size": self.params.avg_size,
+                    "max_size": self.params.max_size,
+                },
+            }
+            with open(config_path, "w", encoding="utf-8") as f:
+                json.dump(config, f, indent=1)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        """Hold the repository's exclusive lock (where ``fcntl`` exists).
+
+        Snapshots and garbage collection both take it, so ``gc`` never
+        runs while a backup has written or reused chunks that no snapshot
+        index references yet. It is not re-entrant.
+        """
+        if fcntl is None:
+            yield
+            return
+        with open(self.path / "lock", "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def list_snapshots(self) -> List[Path]:
+        """Return snapshot indexes, oldest first."""
+        return sorted(self.snapshots_dir.glob(f"{SNAPSHOT_PREFIX}*.json"))
+
+    def load_snapshot(self, snapshot: Optional[str] = None) -> Dict:
+        """Read a snapshot index by name (default: latest)."""
+        if snapshot is None:
+            snapshots = self.list_snapshots()
+            if not snapshots:
+                raise ValueError(f"No snapshots in {self.path}")
+            snapshot_path = snapshots[-1]
+        else:
+            name = snapshot if snapshot.endswith(".json") else f"{snapshot}.json"
+            snapshot_path = self.snapshots_dir / Path(name).name
+            if not snapshot_path.exists():
+                raise ValueError(f"Snapshot {snapshot} not found in {self.path}")
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def create_snapshot(
+        self,
+        source_dir: Path,
+        exclude_patterns: Optional[List[str]] = None,
+        workers: Optional[int] = None,
+    ) -> DedupSnapshotResult:
+        """
+        Store a snapshot of ``source_dir``.
+
+        Files whose size and mtime match the latest snapshot reuse its
+        chunk list without being read. The rest are chunked in a process
+        pool, and workers write new chunks straight into the store.
+
+        Args:
+            source_dir: Directory to backup
+            exclude_patterns: List of patterns to exclude
+            workers: Chunking processes (default: CPU count)
+
+        Returns:
+            DedupSnapshotResult with file, byte and chunk counts
+
+        Raises:
+            ValueError: If source directory doesn't exist
+        """
+        if not source_dir.is_dir():
+            raise ValueError(f"Source directory {source_dir} does not exist")
+        with self._lock():
+            return self._create_snapshot(
+                source_dir, exclude_patterns, workers or os.cpu_count() or 1
+            )
+
+    def _create_snapshot(
+        self,
+        source_dir: Path,
+        exclude_patterns: Optional[List[str]],
+        workers: int,
+    ) -> DedupSnapshotResult:
+        """Store a snapshot; the caller holds the repository lock."""
+        previous: Dict[str, Dict] = {}
+        if self.list_snapshots():
+            previous = self.load_snapshot()["files"]
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        snapshot_path = self.snapshots_dir / f"{SNAPSHOT_PREFIX}{timestamp}.json"
+        result = DedupSnapshotResult(snapshot_path)
+        logger.info(f"Creating deduplicated snapshot: {snapshot_path}")
+
+        files, changed = scan_changes(source_dir, exclude_patterns, previous)
+        result.files_unchanged = len(files)
+
+        tasks = [
+            (index, str(path), str(self.objects_dir), self.params)
+            for index, (_, path, _) in enumerate(changed)
+        ]
+        for index, size, digests, new_chunks, written in map_in_pool(
+            _chunk_file, tasks, workers
+        ):
+            relative, _, stat = changed[index]
+            files[relative] = {
+                "size": size,
+                "mtime_ns": stat.st_mtime_ns,
+                "chunks": digests,
+            }
+            result.bytes_read += size
+            result.chunks_new += new_chunks
+            result.bytes_written += written
+
+        result.files_total = len(files)
+        for entry in files.values():
+            result.bytes_total += entry["size"]
+            result.chunks_total += len(entry["chunks"])
+
+        index = {
+            "version": REPOSITORY_VERSION,
+            "created": datetime.now().isoformat(),
+            "source": str(source_dir),
+            "files": dict(sorted(files.items())),
+        }
+        tmp_path = snapshot_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, snapshot_path)
+
+        logger.info(
+            f"Snapshot stored {result.chunks_new} new of {result.chunks_total} "
+            f"chunks ({result.bytes_written} bytes written)"
+        )
+        return result
+
+    def restore(self, destination: Path, snapshot: Optional[str] = None) -> int:
+        """
+        Rebuild a snapshot's files under ``destination``.
+
+        Args:
+            destination: Directory to restore into
+            snapshot: Snapshot name (default: latest)
+
+        Returns:
+            Number of files restored
+
+        Raises:
+            ValueError: If the snapshot does not exist or a chunk is damaged
+        """
+        files = self.load_snapshot(snapshot)["files"]
+        destination.mkdir(parents=True, exist_ok=True)
+        root = destination.resolve()
+        objects_dir = str(self.objects_dir)
+        for relative, entry in files.items():
+            target = (root / relative).resolve()
+            if root not in target.parents:
+                raise ValueError(f"Refusing to restore outside target: {relative}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, "wb") as f:
+                for digest in entry["chunks"]:
+                    chunk = _read_object(objects_dir, digest)
+                    if hashlib.sha256(chunk).hexdigest() != digest:
+                        raise ValueError(f"Chunk {digest} is corrupt")
+                    f.write(chunk)
+            os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+        logger.info(f"Restored {len(files)} files to {root}")
+        return len(files)
+
+    def referenced_chunks(self) -> Set[str]:
+        """Hashes of every chunk some snapshot uses."""
+        referenced: Set[str] = set()
+        for snapshot_path in self.list_snapshots():
+            with open(snapshot_path, "r", encoding="utf-8") as f:
+                for entry in json.load(f)["files"].values():
+                    referenced.update(entry["chunks"])
+        return referenced
+
+    def prune(self, max_snapshots: int) -> Tuple[int, int]:
+        """
+        Keep the newest ``max_snapshots`` snapshots and collect garbage.
+
+        Args:
+            max_snapshots: Maximum number of snapshots to keep
+
+        Returns:
+            (chunks removed, bytes freed)
+
+        Raises:
+            ValueError: If max_snapshots < 1, which would delete the newest
+                snapshot
+        """
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be at least 1")
+        with self._lock():
+            snapshots = self.list_snapshots()
+            for snapshot_path in snapshots[: max(0, len(snapshots) - max_snapshots)]:
+                logger.info(f"Removing old snapshot: {snapshot_path}")
+                snapshot_path.unlink()
+            return self._gc()
+
+    def gc(self) -> Tuple[int, int]:
+        """Delete chunks no snapshot references; return (count, bytes)."""
+        with self._lock():
+            return self._gc()
+
+    def _gc(self) -> Tuple[int, int]:
+        """Collect garbage; the caller holds the repository lock."""
+        referenced = self.referenced_chunks()
+        removed = 0
+        freed = 0
+        cutoff = time.time() - TEMP_GRACE_SECONDS
+        for chunk_dir in self.objects_dir.iterdir():
+            if not chunk_dir.is_dir():
+                continue
+            for chunk_path in chunk_dir.iterdir():
+                if chunk_path.name in referenced:
+                    continue
+                stat = chunk_path.stat()
+                # Leftovers of interrupted writes are garbage too, once they
+                # are too old to belong to a write in progress
+                if chunk_path.name.startswith(".tmp_") and stat.st_mtime > cutoff:
+                    continue
+                freed += stat.st_size
+                chunk_path.unlink()
+                removed += 1
+        if removed:
+            logger.info(f"Garbage collected {removed} chunks ({freed} bytes)")
+        return removed, freed
+
+    def verify(self, read_data: bool = True, workers: int = 4) -> VerifyResult:
+        """
+        Check the chunks every snapshot needs.
+
+        Each distinct chunk is checked once, however many files and
+        snapshots share it; files are never reassembled.
+
+        Args:
+            read_data: Hash each chunk's content; False only checks that
+                the chunk files exist
+            workers: Threads reading chunks (zlib and hashlib release the
+                GIL on large buffers)
+
+        Returns:
+            VerifyResult listing missing and corrupt chunks
+        """
+        result = VerifyResult(snapshots=len(self.list_snapshots()))
+        objects_dir = str(self.objects_dir)
+
+        def check(digest: str) -> Optional[str]:
+            path = _object_path(objects_dir, digest)
+            if not os.path.exists(path):
+                return "missing"
+            if read_data:
+                try:
+                    chunk = _read_object(objects_dir, digest)
+                except (OSError, zlib.error):
+                    return "corrupt"
+                if hashlib.sha256(chunk).hexdigest() != digest:
+                    return "corrupt"
+            return None
+
+        referenced = sorted(self.referenced_chunks())
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for digest, problem in zip(referenced, pool.map(check, referenced)):
+                result.chunks_checked += 1
+                if problem == "missing":
+                    result.missing.append(digest)
+                elif problem == "corrupt":
+                    result.corrupt.append(digest)
+        if not result.ok:
+            logger.error(
+                f"Repository check failed: {len(result.missing)} missing, "
+                f"{len(result.corrupt)} corrupt chunks"
+            )
+        return result
+
+    def disk_usage(self) -> int:
+        """Bytes used by stored chunks."""
+        return sum(
+            chunk_path.stat().st_size
+            for chunk_path in self.objects_dir.glob("*/*")
+            if chunk_path.is_file()
+        )
+
+
+def create_dedup_backup(
+    source_dir: Path,
+    backup_dir: Path,
+    exclude_patterns: Optional[List[str]] = None,
+    max_backups: int = 10,
+    workers: Optional[int] = None,
+) -> DedupSnapshotResult:
+    """
+    Back up ``source_dir`` into the repository inside ``backup_dir``.
+
+    Args:
+        source_dir: Directory to backup
+        backup_dir: Directory holding ``repository/``
+        exclude_patterns: List of patterns to exclude
+        max_backups: Maximum number of snapshots to keep
+        workers: Chunking processes (default: CPU count)
+
+    Returns:
+        DedupSnapshotResult for the new snapshot
+
+    Raises:
+        ValueError: If source directory doesn't exist or max_backups < 1
+    """
+    if max_backups < 1:
+        raise ValueError("max_backups must be at least 1")
+    if not source_dir.exists():
+        raise ValueError(f"Source directory {source_dir} does not exist")
+    if not source_dir.is_dir():
+        raise ValueError(f"Source path {source_dir} is not a directory")
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    repository = DedupRepository(backup_dir / REPOSITORY_DIR)
+    result = repository.create_snapshot(source_dir, exclude_patterns, workers)
+    # Rotation prunes old snapshots and collects their chunks
+    _rotate_backups(backup_dir, max_backups)
+    return result
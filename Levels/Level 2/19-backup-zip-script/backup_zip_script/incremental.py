@@ -0,0 +1,557 @@
+"""Incremental snapshot backups for the backup ZIP script.
+
+``create_backup_zip`` recompresses the whole tree into a new archive on
+every run. ``create_snapshot`` instead keeps a chain of snapshots, each a
+manifest plus a ZIP holding only what changed:
+
+* ``snapshot_<timestamp>.json`` lists every file in the tree with its
+  size, mtime, SHA-256 and the archive that holds its content,
+* ``snapshot_<timestamp>.zip`` holds the files that are new or changed
+  since the previous snapshot.
+
+Files whose size and mtime match the previous manifest are not read at
+all. The others are hashed and deflated in a process pool, one file per
+task, and the compressed bytes are appended to the archive by the parent
+process. Formats that are already compressed (images, video, archives)
+are stored without deflate, as is anything deflate fails to shrink.
+
+``restore_snapshot`` rebuilds any snapshot in the chain by following each
+manifest entry to the archive that holds it.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from .core import _verify_zip_integrity
+from .utils import map_in_pool, scan_changes
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+SNAPSHOT_PREFIX = "snapshot_"
+COMPRESS_LEVEL = 6
+READ_CHUNK_SIZE = 1024 * 1024
+# Compressed output larger than this is handed back via a spool file
+# rather than pickled through the pool's pipe
+SPOOL_THRESHOLD = 8 * 1024 * 1024
+
+# Extensions whose content is already compressed; deflating them again
+# costs CPU and saves nothing
+STORED_EXTENSIONS = frozenset(
+    {
+        ".7z", ".aac", ".apk", ".avi", ".avif", ".br", ".bz2", ".docx",
+        ".epub", ".flac", ".gif", ".gz", ".heic", ".jar", ".jpeg", ".jpg",
+        ".m4a", ".m4v", ".mkv", ".mov", ".mp3", ".mp4", ".odt", ".ogg",
+        ".opus", ".png", ".pptx", ".rar", ".tgz", ".webm", ".webp", ".whl",
+        ".xlsx", ".xz", ".zip", ".zst",
+    }
+)  # fmt: skip
+
+
+@dataclass
+class SnapshotResult:
+    """Outcome of ``create_snapshot``."""
+
+    manifest_path: Path
+    archive_path: Optional[Path]
+    files_total: int = 0
+    files_stored: int = 0
+    files_unchanged: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+
+
+@dataclass
+class _Compressed:
+    """A worker's result for one file."""
+
+    index: int
+    size: int
+    crc: int
+    sha256: str
+    compress_type: int
+    data: Optional[bytes] = None
+    spool_path: Optional[str] = None
+
+    @property
+    def compress_size(self) -> int:
+        if self.data is not None:
+            return len(self.data)
+        return os.path.getsize(self.spool_path)
+
+
+def should_store(path: Path) -> bool:
+    """Return True if ``path`` is a format that is already compressed."""
+    return path.suffix.lower() in STORED_EXTENSIONS
+
+
+def _compress_file(task: Tuple[int, str, bool, str]) -> _Compressed:
+    """Hash and deflate one file; runs in a worker process.
+
+    Reads the file once, feeding the hash, CRC and compressor together.
+    """
+    index, path, store, spool_dir = task
+    digest = hashlib.sha256()
+    crc = 0
+    size = 0
+    compressor = None if store else zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, -15)
+    chunks: List[bytes] = []
+    compressed_size = 0
+    spool = None
+    try:
+        with open(path, "rb") as source:
+            while True:
+                chunk = source.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                out = compressor.compress(chunk) if compressor else chunk
+                if out:
+                    compressed_size += len(out)
+                    if spool is None and compressed_size > SPOOL_THRESHOLD:
+                        spool = tempfile.NamedTemporaryFile(
+                            dir=spool_dir, delete=False
+                        )
+                        spool.writelines(chunks)
+                        chunks = []
+                    if spool is not None:
+                        spool.write(out)
+                    else:
+                        chunks.append(out)
+            if compressor:
+                out = compressor.flush()
+                compressed_size += len(out)
+                if spool is not None:
+                    spool.write(out)
+                else:
+                    chunks.append(out)
+    finally:
+        if spool is not None:
+            spool.close()
+
+    compress_type = zipfile.ZIP_STORED if store else zipfile.ZIP_DEFLATED
+    if not store and compressed_size >= size:
+        # Incompressible content: keep the original bytes instead
+        if spool is not None:
+            os.unlink(spool.name)
+            spool = None
+        return _store_file(index, path, digest.hexdigest(), crc, size, spool_dir)
+
+    result = _Compressed(index, size, crc, digest.hexdigest(), compress_type)
+    if spool is not None:
+        result.spool_path = spool.name
+    else:
+        result.data = b"".join(chunks)
+    return result
+
+
+def _store_file(
+    index: int, path: str, sha256: str, crc: int, size: int, spool_dir: str
+) -> _Compressed:
+    """Re-read a file whose deflated form was no smaller, to store it as is."""
+    result = _Compressed(index, size, crc, sha256, zipfile.ZIP_STORED)
+    if size > SPOOL_THRESHOLD:
+        fd, spool_path = tempfile.mkstemp(dir=spool_dir)
+        os.close(fd)
+        shutil.copyfile(path, spool_path)
+        result.spool_path = spool_path
+    else:
+        with open(path, "rb") as source:
+            result.data = source.read()
+    return result
+
+
+class _ArchiveWriter:
+    """Writes a ZIP archive from members that are already compressed.
+
+    ``zipfile`` can only compress as it writes, so members compressed in
+    the worker processes are laid out here instead: each local header
+    comes from the public ``ZipInfo.FileHeader`` and the central directory
+    (with ZIP64 records when needed) is written by ``close``.
+    """
+
+    def __init__(self, fp: BinaryIO) -> None:
+        self.fp = fp
+        self.members: List[zipfile.ZipInfo] = []
+
+    def add(self, zinfo: zipfile.ZipInfo, result: _Compressed) -> None:
+        """Append one member's local header and compressed data."""
+        zinfo.compress_type = result.compress_type
+        zinfo.file_size = result.size
+        zinfo.compress_size = result.compress_size
+        zinfo.CRC = result.crc
+        zinfo.flag_bits = 0
+        zinfo.header_offset = self.fp.tell()
+        zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+        self.fp.write(zinfo.FileHeader(zip64))
+        if result.data is not None:
+            self.fp.write(result.data)
+        else:
+            with open(result.spool_path, "rb") as spool:
+                shutil.copyfileobj(spool, self.fp, READ_CHUNK_SIZE)
+        self.members.append(zinfo)
+
+    @staticmethod
+    def _central_record(zinfo: zipfile.ZipInfo) -> bytes:
+        """Central directory record for a member written by ``add``."""
+        try:
+            filename = zinfo.filename.encode("ascii")
+            flag_bits = zinfo.flag_bits
+        except UnicodeEncodeError:
+            filename = zinfo.filename.encode("utf-8")
+            flag_bits = zinfo.flag_bits | 0x800
+
+        file_size, compress_size = zinfo.file_size, zinfo.compress_size
+        header_offset = zinfo.header_offset
+        zip64_fields = []
+        if max(file_size, compress_size) > zipfile.ZIP64_LIMIT:
+            zip64_fields += [file_size, compress_size]
+            file_size = compress_size = 0xFFFFFFFF
+        if header_offset > zipfile.ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = 0xFFFFFFFF
+        extra = zinfo.extra
+        version = zinfo.extract_version
+        if zip64_fields:
+            extra = (
+                struct.pack(
+                    f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields
+                )
+                + extra
+            )
+            version = max(version, 45)
+
+        year, month, day, hour, minute, second = zinfo.date_time
+        return (
+            struct.pack(
+                "<4s4B4HL2L5H2L",
+                b"PK\x01\x02",
+                max(version, zinfo.create_version),
+                zinfo.create_system,
+                version,
+                zinfo.reserved,
+                flag_bits,
+                zinfo.compress_type,
+                hour << 11 | minute << 5 | second // 2,
+                (year - 1980) << 9 | month << 5 | day,
+                zinfo.CRC,
+                compress_size,
+                file_size,
+                len(filename),
+                len(extra),
+                len(zinfo.comment),
+                0,
+                zinfo.internal_attr,
+                zinfo.external_attr,
+                header_offset,
+            )
+            + filename
+            + extra
+            + zinfo.comment
+        )
+
+    def close(self) -> None:
+        """Write the central directory and end-of-archive records."""
+        start = self.fp.tell()
+        for zinfo in self.members:
+            self.fp.write(self._central_record(zinfo))
+        size = self.fp.tell() - start
+        count = len(self.members)
+        if count >= 0xFFFF or max(start, size) > zipfile.ZIP64_LIMIT:
+            zip64_end = self.fp.tell()
+            self.fp.write(
+                struct.pack(
+                    "<4sQ2H2L4Q", b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, size, start
+                )
+            )
+            self.fp.write(struct.pack("<4sLQL", b"PK\x06\x07", 0, zip64_end, 1))
+        self.fp.write(
+            struct.pack(
+                "<4s4H2LH",
+                b"PK\x05\x06",
+                0,
+                0,
+                min(count, 0xFFFF),
+                min(count, 0xFFFF),
+                min(size, 0xFFFFFFFF),
+                min(start, 0xFFFFFFFF),
+                0,
+            )
+        )
+
+
+def list_snapshots(backup_dir: Path) -> List[Path]:
+    """Return snapshot manifests in ``backup_dir``, oldest first."""
+    if not backup_dir.exists():
+        return []
+    # Timestamps in the names sort chronologically
+    return sorted(backup_dir.glob(f"{SNAPSHOT_PREFIX}*.json"))
+
+
+def load_manifest(manifest_path: Path) -> Dict:
+    """Read a snapshot manifest."""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(f"Unsupported manifest version in {manifest_path}")
+    return manifest
+
+
+def create_snapshot(
+    source_dir: Path,
+    backup_dir: Path,
+    exclude_patterns: Optional[List[str]] = None,
+    max_snapshots: int = 10,
+    workers: Optional[int] = None,
+    full: bool = False,
+) -> SnapshotResult:
+    """
+    Create an incremental snapshot of the source directory.
+
+    Args:
+        source_dir: Directory to backup
+        backup_dir: Directory holding the snapshot chain
+        exclude_patterns: List of patterns to exclude (e.g., ['*.log'])
+        max_snapshots: Maximum number of snapshots to keep
+        workers: Compression processes (default: CPU count)
+        full: Store every file, starting a new chain
+
+    Returns:
+        SnapshotResult describing what was written
+
+    Raises:
+        ValueError: If source directory doesn't exist or max_snapshots < 1
+        OSError: If backup creation fails
+    """
+    if max_snapshots < 1:
+        raise ValueError("max_snapshots must be at least 1")
+
+    if not source_dir.exists():
+        raise ValueError(f"Source directory {source_dir} does not exist")
+
+    if not source_dir.is_dir():
+        raise ValueError(f"Source path {source_dir} is not a directory")
+
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    previous_files: Dict[str, Dict] = {}
+    parent = None
+    snapshots = list_snapshots(backup_dir)
+    if snapshots and not full:
+        parent = snapshots[-1]
+        previous_files = load_manifest(parent)["files"]
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    name = f"{SNAPSHOT_PREFIX}{timestamp}"
+    archive_path = backup_dir / f"{name}.zip"
+    manifest_path = backup_dir / f"{name}.json"
+    logger.info(f"Creating snapshot: {manifest_path}")
+
+    files, changed = scan_changes(source_dir, exclude_patterns, previous_files)
+
+    result = SnapshotResult(manifest_path, None, files_unchanged=len(files))
+    spool_dir = tempfile.mkdtemp(prefix=".spool_", dir=backup_dir)
+    try:
+        if changed:
+            _write_archive(
+                archive_path, changed, previous_files, files, result, workers, spool_dir
+            )
+
+        result.files_total = len(files)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created": datetime.now().isoformat(),
+            "source": str(source_dir),
+            "parent": parent.name if parent else None,
+            "archive": archive_path.name if result.archive_path else None,
+            "files": dict(sorted(files.items())),
+        }
+        # Write then rename, so a crash never leaves a partial manifest
+        tmp_manifest = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_manifest, manifest_path)
+    except Exception as e:
+        if archive_path.exists():
+            archive_path.unlink()
+        logger.error(f"Snapshot creation failed: {e}")
+        raise
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+    logger.info(
+        f"Snapshot created: {result.files_stored} stored, "
+        f"{result.files_unchanged} unchanged of {result.files_total} files"
+    )
+    rotate_snapshots(backup_dir, max_snapshots)
+    return result
+
+
+def _write_archive(
+    archive_path: Path,
+    changed: List[Tuple[str, Path, os.stat_result]],
+    previous_files: Dict[str, Dict],
+    files: Dict[str, Dict],
+    result: SnapshotResult,
+    workers: int,
+    spool_dir: str,
+) -> None:
+    """Compress changed files into ``archive_path`` and record them in ``files``.
+
+    Files that were only touched (same hash as before) keep pointing at the
+    archive that already holds them.
+    """
+    tasks = [
+        (index, str(path), should_store(path), spool_dir)
+        for index, (_, path, _) in enumerate(changed)
+    ]
+    with open(archive_path, "wb") as archive:
+        writer = _ArchiveWriter(archive)
+        for compressed in map_in_pool(_compress_file, tasks, workers):
+            relative, file_path, stat = changed[compressed.index]
+            result.bytes_read += compressed.size
+            entry = {
+                "size": compressed.size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": compressed.sha256,
+            }
+            previous = previous_files.get(relative)
+            if previous is not None and previous["sha256"] == compressed.sha256:
+                entry["archive"] = previous["archive"]
+                result.files_unchanged += 1
+            else:
+                zinfo = zipfile.ZipInfo.from_file(
+                    file_path, relative, strict_timestamps=False
+                )
+                writer.add(zinfo, compressed)
+                entry["archive"] = archive_path.name
+                result.files_stored += 1
+                result.bytes_written += compressed.compress_size
+            if compressed.spool_path:
+                os.unlink(compressed.spool_path)
+            files[relative] = entry
+        writer.close()
+
+    if result.files_stored == 0:
+        archive_path.unlink()
+        return
+    if not _verify_zip_integrity(archive_path):
+        raise OSError(f"Backup verification failed for {archive_path}")
+    result.archive_path = archive_path
+
+
+def restore_snapshot(
+    backup_dir: Path,
+    destination: Path,
+    snapshot: Optional[str] = None,
+    paths: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Restore a snapshot from the chain into ``destination``.
+
+    Args:
+        backup_dir: Directory holding the snapshot chain
+        destination: Directory to restore into
+        snapshot: Manifest name (with or without ``.json``); default latest
+        paths: Only restore these relative paths
+
+    Returns:
+        Number of files restored
+
+    Raises:
+        ValueError: If the snapshot does not exist or is damaged
+    """
+    if snapshot is None:
+        snapshots = list_snapshots(backup_dir)
+        if not snapshots:
+            raise ValueError(f"No snapshots in {backup_dir}")
+        manifest_path = snapshots[-1]
+    else:
+        name = snapshot if snapshot.endswith(".json") else f"{snapshot}.json"
+        manifest_path = backup_dir / Path(name).name
+        if not manifest_path.exists():
+            raise ValueError(f"Snapshot {snapshot} not found in {backup_dir}")
+
+    files = load_manifest(manifest_path)["files"]
+    if paths is not None:
+        wanted = set(paths)
+        files = {path: entry for path, entry in files.items() if path in wanted}
+
+    destination.mkdir(parents=True, exist_ok=True)
+    root = destination.resolve()
+    by_archive: Dict[str, List[str]] = {}
+    for relative, entry in files.items():
+        by_archive.setdefault(entry["archive"], []).append(relative)
+
+    restored = 0
+    for archive_name, members in sorted(by_archive.items()):
+        archive_path = backup_dir / archive_name
+        if not archive_path.exists():
+            raise ValueError(f"Snapshot chain is missing {archive_name}")
+        with zipfile.ZipFile(archive_path, "r") as zipf:
+            for relative in members:
+                target = (root / relative).resolve()
+                if root not in target.parents:
+                    raise ValueError(f"Refusing to restore outside target: {relative}")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                # ZipExtFile checks the CRC as the member is read
+                with zipf.open(relative) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, READ_CHUNK_SIZE)
+                mtime_ns = files[relative]["mtime_ns"]
+                os.utime(target, ns=(mtime_ns, mtime_ns))
+                restored += 1
+
+    logger.info(f"Restored {restored} files from {manifest_path.name} to {root}")
+    return restored
+
+
+def rotate_snapshots(backup_dir: Path, max_snapshots: int) -> None:
+    """
+    Keep the newest ``max_snapshots`` snapshots of the chain.
+
+    Older manifests are removed, and so is every archive no remaining
+    manifest refers to. An archive still holding some current file is kept
+    whole.
+
+    Args:
+        backup_dir: Directory holding the snapshot chain
+        max_snapshots: Maximum number of snapshots to keep
+
+    Raises:
+        ValueError: If max_snapshots < 1, which would delete the newest
+            snapshot
+    """
+    if max_snapshots < 1:
+        raise ValueError("max_snapshots must be at least 1")
+
+    snapshots = list_snapshots(backup_dir)
+    if len(snapshots) <= max_snapshots:
+        return
+
+    keep = snapshots[-max_snapshots:]
+    referenced = set()
+    for manifest_path in keep:
+        for entry in load_manifest(manifest_path)["files"].values():
+            referenced.add(entry["archive"])
+
+    for manifest_path in snapshots[: len(snapshots) - len(keep)]:
+        logger.info(f"Removing old snapshot: {manifest_path}")
+        manifest_path.unlink()
+    for archive_path in backup_dir.glob(f"{SNAPSHOT_PREFIX}*.zip"):
+        if archive_path.name not in referenced:
+            logger.info(f"Removing unreferenced archive: {archive_path}")
+            archive_path.unlink()
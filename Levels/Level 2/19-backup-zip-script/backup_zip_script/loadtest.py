@@ -0,0 +1,153 @@
+"""Benchmark for repeated backups of a mostly unchanged tree.
+
+Builds a synthetic source tree, then takes a series of backups, editing a
+fraction of the files between runs (an insertion part way through each
+edited file, so later bytes shift). Each round is backed up both as a
+full ZIP with ``create_backup_zip`` and as a snapshot in a
+``DedupRepository``, and the benchmark reports throughput and how much
+storage each format has used so far.
+
+Usage:
+    python -m backup_zip_script.loadtest --files 200 --file-size 262144 --rounds 5
+"""
+
+import argparse
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .core import create_backup_zip
+from .dedup import REPOSITORY_DIR, DedupRepository
+from .utils import format_size
+
+
+def build_tree(
+    source_dir: Path, files: int, file_size: int, rng: random.Random
+) -> None:
+    """Write ``files`` files of about ``file_size`` bytes of mixed content."""
+    vocabulary = [os.urandom(rng.randint(2, 8)).hex() for _ in range(2000)]
+    for i in range(files):
+        path = source_dir / f"dir{i % 10}" / f"file{i}.dat"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if i % 4 == 0:
+            # Incompressible content, like media
+            data = os.urandom(file_size)
+        else:
+            words = []
+            length = 0
+            while length < file_size:
+                word = rng.choice(vocabulary)
+                words.append(word)
+                length += len(word) + 1
+            data = " ".join(words).encode()[:file_size]
+        path.write_bytes(data)
+
+
+def mutate_tree(source_dir: Path, fraction: float, rng: random.Random) -> int:
+    """Insert a few bytes into a ``fraction`` of the files; return how many."""
+    paths = sorted(source_dir.rglob("*.dat"))
+    edited = rng.sample(paths, max(1, int(len(paths) * fraction)))
+    for path in edited:
+        data = path.read_bytes()
+        offset = rng.randrange(len(data) or 1)
+        path.write_bytes(data[:offset] + os.urandom(rng.randint(1, 64)) + data[offset:])
+    return len(edited)
+
+
+def run_benchmark(
+    files: int, file_size: int, rounds: int, fraction: float, workers: int
+) -> None:
+    """Compare full ZIPs with deduplicated snapshots over several rounds."""
+    logging.getLogger("backup_zip_script").setLevel(logging.WARNING)
+    rng = random.Random(42)
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        source_dir = tmp_dir / "source"
+        zip_dir = tmp_dir / "zips"
+        dedup_dir = tmp_dir / "dedup"
+        source_dir.mkdir()
+        build_tree(source_dir, files, file_size, rng)
+        repository = DedupRepository(dedup_dir / REPOSITORY_DIR)
+        logical = 0
+
+        print(
+            f"{files} files of {format_size(file_size)}, {rounds} rounds, "
+            f"{fraction:.0%} of files edited per round, {workers} workers"
+        )
+        print(
+            f"{'round':>5} {'zip MB/s':>9} {'dedup MB/s':>11} {'new chunks':>11} "
+            f"{'zip total':>10} {'repo total':>11} {'ratio':>7}"
+        )
+        for round_number in range(1, rounds + 1):
+            if round_number > 1:
+                mutate_tree(source_dir, fraction, rng)
+
+            start = time.perf_counter()
+            create_backup_zip(source_dir, zip_dir, max_backups=rounds)
+            zip_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = repository.create_snapshot(source_dir, workers=workers)
+            dedup_seconds = time.perf_counter() - start
+
+            logical += result.bytes_total
+            megabytes = result.bytes_total / 1e6
+            zip_total = sum(p.stat().st_size for p in zip_dir.glob("*.zip"))
+            repo_total = repository.disk_usage()
+            print(
+                f"{round_number:>5} {megabytes / zip_seconds:>9.1f} "
+                f"{megabytes / dedup_seconds:>11.1f} "
+                f"{result.chunks_new:>5}/{result.chunks_total:<5} "
+                f"{format_size(zip_total):>10} {format_size(repo_total):>11} "
+                f"{logical / repo_total:>6.1f}x"
+            )
+
+        start = time.perf_counter()
+        check = repository.verify()
+        print(
+            f"verify: {check.chunks_checked} chunks in "
+            f"{time.perf_counter() - start:.2f}s, ok={check.ok}"
+        )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Measure backup throughput and storage over repeated snapshots"
+    )
+    parser.add_argument(
+        "--files", type=int, default=200, help="Files in the tree (default: 200)"
+    )
+    parser.add_argument(
+        "--file-size",
+        type=int,
+        default=256 * 1024,
+        help="Bytes per file (default: 262144)",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="Backups to take (default: 5)"
+    )
+    parser.add_argument(
+        "--fraction",
+        type=float,
+        default=0.05,
+        help="Fraction of files edited between rounds (default: 0.05)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Chunking processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.files, args.file_size, args.rounds, args.fraction, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ import sys
 from pathlib import Path
 
 from .core import create_backup_zip
+from .dedup import REPOSITORY_DIR, DedupRepository, create_dedup_backup
+from .incremental import create_snapshot, restore_snapshot
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -27,10 +29,16 @@ def main() -> int:
 Examples:
   %(prog)s /path/to/source --backup-dir /path/to/backups
   %(prog)s . --exclude "*.log" "*.tmp" --max-backups 5 --verbose
+  %(prog)s /path/to/source --backup-dir /path/to/backups --incremental
+  %(prog)s --backup-dir /path/to/backups --restore /path/to/target
+  %(prog)s /path/to/source --backup-dir /path/to/backups --dedup
+  %(prog)s --backup-dir /path/to/backups --dedup --verify
         """,
     )
 
-    parser.add_argument("source_dir", type=Path, help="Directory to backup")
+    parser.add_argument(
+        "source_dir", type=Path, nargs="?", help="Directory to backup"
+    )
 
     parser.add_argument(
         "--backup-dir",
@@ -55,23 +63,127 @@ Examples:
         help="Maximum number of backups to keep (default: 10)",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Add a snapshot storing only files changed since the last one",
+    )
+
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="With --incremental, store every file and start a new chain",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Store snapshots in a deduplicating chunk repository "
+        "(BACKUP_DIR/repository)",
+    )
+
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="With --dedup, check every chunk in the repository and exit",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for --incremental or --dedup (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--restore",
+        type=Path,
+        metavar="TARGET_DIR",
+        help="Restore a snapshot from --backup-dir into TARGET_DIR",
+    )
+
+    parser.add_argument(
+        "--snapshot",
+        help="Snapshot to restore, e.g. snapshot_20240101_120000_000000 "
+        "(default: latest)",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
 
     args = parser.parse_args()
+    if args.restore is None and not args.verify and args.source_dir is None:
+        parser.error("source_dir is required unless --restore or --verify is given")
+    if args.verify and not args.dedup:
+        parser.error("--verify requires --dedup")
 
     # Setup logging
     setup_logging(args.verbose)
 
     try:
-        # Create absolute paths
-        source_dir = args.source_dir.resolve()
         backup_dir = args.backup_dir.resolve()
-
         logger = logging.getLogger(__name__)
+
+        if args.dedup and (args.restore is not None or args.verify):
+            repository_dir = backup_dir / REPOSITORY_DIR
+            if not repository_dir.is_dir():
+                raise ValueError(f"No repository in {backup_dir}")
+            repository = DedupRepository(repository_dir)
+            if args.verify:
+                check = repository.verify()
+                print(
+                    f"Checked {check.chunks_checked} chunks in "
+                    f"{check.snapshots} snapshots: {len(check.missing)} missing, "
+                    f"{len(check.corrupt)} corrupt"
+                )
+                return 0 if check.ok else 1
+            restored = repository.restore(args.restore.resolve(), args.snapshot)
+            print(f"Restored {restored} files to {args.restore}")
+            return 0
+
+        if args.restore is not None:
+            restored = restore_snapshot(
+                backup_dir, args.restore.resolve(), snapshot=args.snapshot
+            )
+            print(f"Restored {restored} files to {args.restore}")
+            return 0
+
+        # Create absolute paths
+        source_dir = args.source_dir.resolve()
         logger.info(f"Starting backup of {source_dir} to {backup_dir}")
 
+        if args.dedup:
+            result = create_dedup_backup(
+                source_dir=source_dir,
+                backup_dir=backup_dir,
+                exclude_patterns=args.exclude,
+                max_backups=args.max_backups,
+                workers=args.workers,
+            )
+            print(
+                f"Snapshot created successfully: {result.snapshot_path} "
+                f"({result.chunks_new} of {result.chunks_total} chunks new, "
+                f"{result.bytes_written} bytes written)"
+            )
+            return 0
+
+        if args.incremental:
+            result = create_snapshot(
+                source_dir=source_dir,
+                backup_dir=backup_dir,
+                exclude_patterns=args.exclude,
+                max_snapshots=args.max_backups,
+                workers=args.workers,
+                full=args.full,
+            )
+            print(
+                f"Snapshot created successfully: {result.manifest_path} "
+                f"({result.files_stored} files stored, "
+                f"{result.files_unchanged} unchanged)"
+            )
+            return 0
+
         # Create backup
         backup_path = create_backup_zip(
             source_dir=source_dir,
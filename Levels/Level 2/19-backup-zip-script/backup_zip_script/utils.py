@@ -1,6 +1,17 @@
 """Utility functions for the backup ZIP script."""
 
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .core import _get_files_to_backup
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Files per task sent to a worker at once; amortizes pickling overhead
+POOL_CHUNKSIZE = 8
 
 
 def ensure_directory_exists(directory: Path) -> None:
@@ -46,3 +57,65 @@ def format_size(size_bytes: int) -> str:
         if size < 1024.0 or unit == "TB":
             return f"{size:.1f} {unit}"
         size /= 1024.0
+
+
+def scan_changes(
+    source_dir: Path,
+    exclude_patterns: Optional[List[str]],
+    previous: Dict[str, Dict],
+) -> Tuple[Dict[str, Dict], List[Tuple[str, Path, os.stat_result]]]:
+    """
+    Split a tree into files unchanged since the last snapshot and the rest.
+
+    A file is unchanged when its size and mtime match its entry in
+    ``previous``; such files are never opened.
+
+    Args:
+        source_dir: Directory to scan
+        exclude_patterns: List of patterns to exclude
+        previous: Last snapshot's entries (with ``size`` and ``mtime_ns``)
+            by relative POSIX path
+
+    Returns:
+        Unchanged entries by relative path, and (relative path, path, stat)
+        for every other file
+    """
+    unchanged: Dict[str, Dict] = {}
+    changed: List[Tuple[str, Path, os.stat_result]] = []
+    for file_path in _get_files_to_backup(source_dir, exclude_patterns or []):
+        relative = file_path.relative_to(source_dir).as_posix()
+        stat = file_path.stat()
+        entry = previous.get(relative)
+        if (
+            entry is not None
+            and entry["size"] == stat.st_size
+            and entry["mtime_ns"] == stat.st_mtime_ns
+        ):
+            unchanged[relative] = entry
+        else:
+            changed.append((relative, file_path, stat))
+    return unchanged, changed
+
+
+def map_in_pool(
+    func: Callable[[T], R], tasks: Iterable[T], workers: int
+) -> Iterator[R]:
+    """
+    Apply ``func`` to each task in a process pool, yielding results in order.
+
+    Runs in the calling process when there is one worker or one task.
+
+    Args:
+        func: Picklable function run on each task
+        tasks: Picklable task arguments
+        workers: Maximum worker processes
+
+    Returns:
+        Iterator over the results, in task order
+    """
+    tasks = list(tasks)
+    if workers <= 1 or len(tasks) <= 1:
+        yield from map(func, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, tasks, chunksize=POOL_CHUNKSIZE)
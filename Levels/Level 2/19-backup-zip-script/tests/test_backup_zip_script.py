@@ -1,6 +1,8 @@
 """Tests for backup_zip_script package."""
 
+import io
 import logging
+import os
 import sys
 import zipfile
 from pathlib import Path
@@ -14,6 +16,21 @@ from backup_zip_script.core import (
     _verify_zip_integrity,
     create_backup_zip,
 )
+from backup_zip_script.dedup import (
+    REPOSITORY_DIR,
+    ChunkerParams,
+    DedupRepository,
+    create_dedup_backup,
+    iter_chunks,
+)
+from backup_zip_script import incremental
+from backup_zip_script.incremental import (
+    create_snapshot,
+    list_snapshots,
+    load_manifest,
+    restore_snapshot,
+    rotate_snapshots,
+)
 from backup_zip_script import main as cli_main
 from backup_zip_script.utils import format_size
 
@@ -323,6 +340,320 @@ class TestCLI:
         assert "cache.tmp" not in names
 
 
+class TestIncrementalSnapshots:
+    """Test incremental snapshot backups and restore."""
+
+    def _touch(self, path, seconds):
+        """Move a file's mtime so the change is visible at any resolution."""
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+    def test_first_snapshot_stores_everything(self, temp_dir, backup_dir):
+        """The first snapshot holds every file, compressed by type."""
+        (temp_dir / "notes.txt").write_text("text " * 1000)
+        (temp_dir / "photo.jpg").write_bytes(os.urandom(2000))
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "empty.txt").write_text("")
+
+        result = create_snapshot(temp_dir, backup_dir, workers=2)
+
+        assert result.files_stored == 3
+        assert result.files_total == 3
+        with zipfile.ZipFile(result.archive_path) as zipf:
+            assert zipf.testzip() is None
+            infos = {info.filename: info for info in zipf.infolist()}
+            assert infos["notes.txt"].compress_type == zipfile.ZIP_DEFLATED
+            assert infos["photo.jpg"].compress_type == zipfile.ZIP_STORED
+            assert zipf.read("sub/empty.txt") == b""
+
+    def test_only_changed_files_are_stored(self, temp_dir, backup_dir):
+        """Later snapshots store new and modified files only."""
+        (temp_dir / "same.txt").write_text("unchanged")
+        (temp_dir / "edit.txt").write_text("before")
+        (temp_dir / "touched.txt").write_text("touched")
+        first = create_snapshot(temp_dir, backup_dir, workers=1)
+
+        (temp_dir / "edit.txt").write_text("after!")
+        self._touch(temp_dir / "edit.txt", 5)
+        self._touch(temp_dir / "touched.txt", 5)
+        (temp_dir / "new.txt").write_text("new")
+        second = create_snapshot(temp_dir, backup_dir, workers=1)
+
+        assert second.files_stored == 2
+        assert second.files_unchanged == 2
+        with zipfile.ZipFile(second.archive_path) as zipf:
+            assert sorted(zipf.namelist()) == ["edit.txt", "new.txt"]
+        files = load_manifest(second.manifest_path)["files"]
+        assert files["same.txt"]["archive"] == first.archive_path.name
+        assert files["touched.txt"]["archive"] == first.archive_path.name
+
+        third = create_snapshot(temp_dir, backup_dir, workers=1)
+        assert third.archive_path is None
+        assert third.files_stored == 0
+        assert len(list_snapshots(backup_dir)) == 3
+
+    def test_restore_any_snapshot_in_chain(self, temp_dir, backup_dir, tmp_path):
+        """Restore rebuilds each snapshot, including deleted files."""
+        (temp_dir / "a.txt").write_text("version 1")
+        (temp_dir / "gone.txt").write_text("deleted later")
+        first = create_snapshot(temp_dir, backup_dir, workers=1)
+
+        (temp_dir / "a.txt").write_text("version 2")
+        self._touch(temp_dir / "a.txt", 5)
+        (temp_dir / "gone.txt").unlink()
+        create_snapshot(temp_dir, backup_dir, workers=1)
+
+        old = tmp_path / "restore_old"
+        assert restore_snapshot(backup_dir, old, first.manifest_path.stem) == 2
+        assert (old / "a.txt").read_text() == "version 1"
+        assert (old / "gone.txt").read_text() == "deleted later"
+
+        latest = tmp_path / "restore_latest"
+        assert restore_snapshot(backup_dir, latest) == 1
+        assert (latest / "a.txt").read_text() == "version 2"
+        assert not (latest / "gone.txt").exists()
+        assert (latest / "a.txt").stat().st_mtime_ns == (
+            temp_dir / "a.txt"
+        ).stat().st_mtime_ns
+
+    def test_large_output_is_spooled(
+        self, temp_dir, backup_dir, tmp_path, monkeypatch
+    ):
+        """Members larger than the spool threshold round-trip intact."""
+        monkeypatch.setattr(incremental, "SPOOL_THRESHOLD", 1024)
+        random_data = os.urandom(20000)
+        (temp_dir / "random.bin").write_bytes(random_data)
+        (temp_dir / "text.txt").write_bytes(os.urandom(10000).hex().encode())
+
+        result = create_snapshot(temp_dir, backup_dir, workers=1)
+        with zipfile.ZipFile(result.archive_path) as zipf:
+            # Incompressible data falls back to being stored
+            assert zipf.getinfo("random.bin").compress_type == zipfile.ZIP_STORED
+            assert zipf.getinfo("text.txt").compress_type == zipfile.ZIP_DEFLATED
+
+        restore_snapshot(backup_dir, tmp_path / "restored")
+        assert (tmp_path / "restored" / "random.bin").read_bytes() == random_data
+        assert not [p for p in backup_dir.iterdir() if p.name.startswith(".spool_")]
+
+    def test_rotation_keeps_referenced_archives(self, temp_dir, backup_dir, tmp_path):
+        """Rotating keeps archives that newer snapshots still point to."""
+        (temp_dir / "base.txt").write_text("base")
+        first = create_snapshot(temp_dir, backup_dir, workers=1)
+        for i in range(2):
+            (temp_dir / f"extra{i}.txt").write_text(str(i))
+            create_snapshot(temp_dir, backup_dir, workers=1)
+
+        rotate_snapshots(backup_dir, 1)
+
+        assert len(list_snapshots(backup_dir)) == 1
+        assert first.archive_path.exists()
+        assert restore_snapshot(backup_dir, tmp_path / "restored") == 3
+
+        (temp_dir / "base.txt").write_text("rewritten")
+        self._touch(temp_dir / "base.txt", 5)
+        create_snapshot(temp_dir, backup_dir, max_snapshots=1, workers=1, full=True)
+        assert not first.archive_path.exists()
+
+    def test_rotation_rejects_keeping_no_snapshots(self, temp_dir, backup_dir):
+        """Keeping zero snapshots would delete the one just written."""
+        (temp_dir / "a.txt").write_text("a")
+        with pytest.raises(ValueError):
+            create_snapshot(temp_dir, backup_dir, max_snapshots=0, workers=1)
+        assert list_snapshots(backup_dir) == []
+
+        create_snapshot(temp_dir, backup_dir, workers=1)
+        with pytest.raises(ValueError):
+            rotate_snapshots(backup_dir, 0)
+        assert len(list_snapshots(backup_dir)) == 1
+
+    def test_cli_incremental_and_restore(self, tmp_path, monkeypatch):
+        """CLI creates snapshots and restores them."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "keep.txt").write_text("keep me")
+        backup_dir = tmp_path / "backups"
+        target_dir = tmp_path / "target"
+
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "backup-zip-script",
+                str(source_dir),
+                "--backup-dir",
+                str(backup_dir),
+                "--incremental",
+                "--workers",
+                "1",
+            ],
+        )
+        assert cli_main.main() == 0
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "backup-zip-script",
+                "--backup-dir",
+                str(backup_dir),
+                "--restore",
+                str(target_dir),
+            ],
+        )
+        assert cli_main.main() == 0
+        assert (target_dir / "keep.txt").read_text() == "keep me"
+
+
+class TestDedupRepository:
+    """Test the deduplicating chunk repository."""
+
+    # Small chunks keep the pure-Python chunker quick in tests
+    PARAMS = ChunkerParams(min_size=256, avg_size=1024, max_size=4096)
+
+    def _repository(self, backup_dir):
+        return DedupRepository(backup_dir / REPOSITORY_DIR, self.PARAMS)
+
+    def test_insertion_only_changes_nearby_chunks(self):
+        """Boundaries depend on content, so an insertion does not shift them."""
+        data = os.urandom(100_000)
+        edited = data[:50_000] + b"inserted" + data[50_000:]
+
+        before = list(iter_chunks(io.BytesIO(data), self.PARAMS))
+        after = list(iter_chunks(io.BytesIO(edited), self.PARAMS))
+
+        assert b"".join(before) == data
+        assert b"".join(after) == edited
+        assert all(len(chunk) <= self.PARAMS.max_size for chunk in before)
+        assert len(set(before) - set(after)) <= 2
+
+    def test_snapshot_and_restore_round_trip(self, temp_dir, backup_dir, tmp_path):
+        """Restored files match the source, empty files included."""
+        data = os.urandom(30_000)
+        (temp_dir / "data.bin").write_bytes(data)
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "empty.txt").write_text("")
+        repository = self._repository(backup_dir)
+
+        result = repository.create_snapshot(temp_dir, workers=2)
+        assert result.files_total == 2
+        assert result.bytes_total == len(data)
+
+        assert repository.restore(tmp_path / "restored") == 2
+        assert (tmp_path / "restored" / "data.bin").read_bytes() == data
+        assert (tmp_path / "restored" / "sub" / "empty.txt").read_bytes() == b""
+
+    def test_unchanged_and_duplicate_data_is_not_stored_again(
+        self, temp_dir, backup_dir
+    ):
+        """Later snapshots skip unchanged files and store only new chunks."""
+        data = os.urandom(40_000)
+        (temp_dir / "a.bin").write_bytes(data)
+        (temp_dir / "copy.bin").write_bytes(data)
+        (temp_dir / "b.bin").write_bytes(os.urandom(40_000))
+        repository = self._repository(backup_dir)
+
+        first = repository.create_snapshot(temp_dir, workers=1)
+        # The copy's chunks are already stored by the time it is chunked
+        assert first.chunks_new < first.chunks_total
+
+        edited = data[:20_000] + b"edit" + data[20_000:]
+        (temp_dir / "a.bin").write_bytes(edited)
+        second = repository.create_snapshot(temp_dir, workers=1)
+
+        assert second.files_unchanged == 2
+        assert second.bytes_read == len(edited)
+        assert 0 < second.chunks_new <= 2
+        assert repository.disk_usage() < 2 * first.bytes_written
+
+    def test_rotation_prunes_and_collects_chunks(self, temp_dir, backup_dir, tmp_path):
+        """Rotating the backup dir drops old snapshots and their chunks."""
+        path = temp_dir / "file.bin"
+        for i in range(3):
+            path.write_bytes(os.urandom(10_000))
+            os.utime(path, ns=(0, (i + 1) * 10**9))
+            result = create_dedup_backup(
+                temp_dir, backup_dir, max_backups=1, workers=1
+            )
+
+        repository = DedupRepository(backup_dir / REPOSITORY_DIR)
+        assert repository.list_snapshots() == [result.snapshot_path]
+        assert repository.disk_usage() <= result.bytes_written
+        assert repository.verify().ok
+        repository.restore(tmp_path / "restored")
+        assert (tmp_path / "restored" / "file.bin").read_bytes() == path.read_bytes()
+
+    def test_rotation_rejects_keeping_no_snapshots(self, temp_dir, backup_dir):
+        """Keeping zero snapshots would delete the one just written."""
+        (temp_dir / "a.txt").write_text("a")
+        with pytest.raises(ValueError):
+            create_dedup_backup(temp_dir, backup_dir, max_backups=0, workers=1)
+        assert not (backup_dir / REPOSITORY_DIR).exists()
+
+        result = create_dedup_backup(temp_dir, backup_dir, workers=1)
+        repository = DedupRepository(backup_dir / REPOSITORY_DIR)
+        with pytest.raises(ValueError):
+            repository.prune(0)
+        assert repository.list_snapshots() == [result.snapshot_path]
+        assert repository.verify().ok
+
+    def test_gc_keeps_recent_temp_files(self, temp_dir, backup_dir):
+        """Only temp files older than the grace period are collected."""
+        repository = self._repository(backup_dir)
+        (temp_dir / "a.bin").write_bytes(os.urandom(1_000))
+        repository.create_snapshot(temp_dir, workers=1)
+        chunk_dir = next(repository.objects_dir.iterdir())
+        fresh = chunk_dir / ".tmp_fresh"
+        stale = chunk_dir / ".tmp_stale"
+        fresh.write_bytes(b"in progress")
+        stale.write_bytes(b"abandoned")
+        os.utime(stale, (0, 0))
+
+        assert repository.gc() == (1, len(b"abandoned"))
+        assert fresh.exists()
+        assert not stale.exists()
+
+    def test_verify_reports_missing_and_corrupt_chunks(self, temp_dir, backup_dir):
+        """Verify checks each referenced chunk once."""
+        (temp_dir / "a.bin").write_bytes(os.urandom(20_000))
+        repository = self._repository(backup_dir)
+        repository.create_snapshot(temp_dir, workers=1)
+        repository.create_snapshot(temp_dir, workers=1)
+
+        check = repository.verify()
+        assert check.ok
+        assert check.snapshots == 2
+        chunks = sorted(repository.objects_dir.glob("*/*"))
+        assert check.chunks_checked == len(chunks)
+
+        chunks[0].unlink()
+        chunks[1].write_bytes(b"\x00garbage")
+        check = repository.verify()
+        assert check.missing == [chunks[0].name]
+        assert check.corrupt == [chunks[1].name]
+        assert not repository.verify(read_data=False).ok
+
+    def test_cli_dedup_backup_verify_and_restore(self, tmp_path, monkeypatch):
+        """CLI stores, verifies and restores deduplicated snapshots."""
+        source_dir = tmp_path / "source"
+        source_dir.mkdir()
+        (source_dir / "keep.txt").write_text("keep me")
+        backup_dir = tmp_path / "backups"
+        target_dir = tmp_path / "target"
+        base = ["backup-zip-script", "--backup-dir", str(backup_dir), "--dedup"]
+
+        monkeypatch.setattr(sys, "argv", base + [str(source_dir), "--workers", "1"])
+        assert cli_main.main() == 0
+        monkeypatch.setattr(sys, "argv", base + ["--verify"])
+        assert cli_main.main() == 0
+        monkeypatch.setattr(sys, "argv", base + ["--restore", str(target_dir)])
+        assert cli_main.main() == 0
+        assert (target_dir / "keep.txt").read_text() == "keep me"
+
+        for chunk_path in (backup_dir / REPOSITORY_DIR / "objects").glob("*/*"):
+            chunk_path.unlink()
+        monkeypatch.setattr(sys, "argv", base + ["--verify"])
+        assert cli_main.main() == 1
+
+
 # Pytest fixtures
 @pytest.fixture
 def temp_dir(tmp_path):
@@ -3,9 +3,20 @@
 import datetime
 import logging
 import sqlite3
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from html.parser import HTMLParser
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+
+from .fetcher import (
+    DEFAULT_HOST_DELAY,
+    DEFAULT_PER_HOST,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    FeedFetcher,
+    FeedRequest,
+    FeedResponse,
+)
 
 try:  # pragma: no cover - executed when dependency is available
     import feedparser  # type: ignore
@@ -16,10 +27,16 @@ except ModuleNotFoundError:  # pragma: no cover - exercised via dedicated tests
     from urllib.error import URLError
     import xml.etree.ElementTree as ET
 
-    def _fallback_parse(url: str):
-        """Simple RSS parser used when feedparser is unavailable."""
+    def _fallback_parse(url):
+        """Simple RSS parser used when feedparser is unavailable.
+
+        Like ``feedparser.parse``, accepts a URL, a file path or the feed
+        document itself as bytes.
+        """
         try:
-            if url.startswith(("http://", "https://")):
+            if isinstance(url, bytes):
+                data = url
+            elif url.startswith(("http://", "https://")):
                 with urlopen(url) as response:
                     data = response.read()
             else:
@@ -92,6 +109,54 @@ def _clean_summary(summary: str) -> str:
     return text[:500]
 
 
+# Feeds whose articles and validators are written per transaction
+SAVE_BATCH_FEEDS = 50
+
+# Full-text index over articles, kept in sync by triggers. It stores no
+# text of its own (external content), only the inverted index.
+ARTICLES_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE articles_fts USING fts5(
+    title, summary,
+    content='articles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+ARTICLES_FTS_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary)
+    VALUES (NEW.id, NEW.title, NEW.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+    VALUES ('delete', OLD.id, OLD.title, OLD.summary);
+END;
+
+CREATE TRIGGER IF NOT EXISTS articles_fts_update
+AFTER UPDATE OF title, summary ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+    VALUES ('delete', OLD.id, OLD.title, OLD.summary);
+    INSERT INTO articles_fts (rowid, title, summary)
+    VALUES (NEW.id, NEW.title, NEW.summary);
+END;
+"""
+
+# Title matches count for more than summary matches in the ranking
+SEARCH_WEIGHTS = (10.0, 1.0)
+SNIPPET_TOKENS = 16
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted so FTS5 operators and punctuation in user input are
+    taken literally.
+    """
+    words = [word.replace('"', '""') for word in query.split()]
+    return " ".join(f'"{word}"*' for word in words if word.strip('"'))
+
+
 @dataclass
 class Article:
     """Represents an RSS article."""
@@ -104,6 +169,8 @@ class Article:
     feed_id: Optional[int] = None
     article_id: Optional[int] = None
     is_read: bool = False
+    # Matching excerpt, set by RSSReader.search_articles
+    snippet: Optional[str] = None
 
 
 @dataclass
@@ -115,6 +182,18 @@ class Feed:
     feed_id: Optional[int] = None
 
 
+@dataclass
+class FetchSummary:
+    """Outcome of ``RSSReader.fetch_all``."""
+
+    fetched: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    new_articles: int = 0
+    elapsed: float = 0.0
+    errors: Dict[int, str] = field(default_factory=dict)
+
+
 class RSSReader:
     """Main RSS reader class for managing feeds and articles."""
 
@@ -122,6 +201,7 @@ class RSSReader:
         """Initialize RSS reader with database."""
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
+        self._fts_enabled = False
         self._init_database()
 
     def _init_database(self) -> None:
@@ -160,12 +240,61 @@ class RSSReader:
                 """
                 )
 
+                # HTTP validators for conditional fetches; added to
+                # databases created before fetch_all existed
+                cursor.execute("PRAGMA table_info(feeds)")
+                feed_columns = {row[1] for row in cursor.fetchall()}
+                for column in ("etag", "last_modified", "last_fetched_at"):
+                    if column not in feed_columns:
+                        cursor.execute(f"ALTER TABLE feeds ADD COLUMN {column} TEXT")
+
+                # Listing indexes: get_articles filters by feed and/or unread
+                # and orders newest first, so each filter gets an index in
+                # that order; the partial indexes hold unread articles only
+                cursor.executescript(
+                    """
+                    CREATE INDEX IF NOT EXISTS idx_articles_published
+                        ON articles (published, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_articles_feed_published
+                        ON articles (feed_id, published, created_at);
+                    CREATE INDEX IF NOT EXISTS idx_articles_unread_published
+                        ON articles (published, created_at)
+                        WHERE is_read = FALSE;
+                    CREATE INDEX IF NOT EXISTS idx_articles_unread_feed_published
+                        ON articles (feed_id, published, created_at)
+                        WHERE is_read = FALSE;
+                """
+                )
+
+                self._fts_enabled = self._init_search_index(cursor)
+
                 conn.commit()
                 self.logger.info("Database initialized successfully")
         except sqlite3.Error as e:
             self.logger.error(f"Database initialization failed: {e}")
             raise
 
+    def _init_search_index(self, cursor: sqlite3.Cursor) -> bool:
+        """Create the full-text index, backfilling it for existing databases.
+
+        Returns False if this SQLite build lacks FTS5, in which case search
+        falls back to LIKE scans.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'"
+        )
+        if cursor.fetchone() is None:
+            try:
+                cursor.executescript(ARTICLES_FTS_SCHEMA)
+            except sqlite3.OperationalError as e:
+                self.logger.warning(f"Full-text search unavailable: {e}")
+                return False
+            # Index the articles saved before the index existed
+            cursor.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+            self.logger.info("Built full-text search index")
+        cursor.executescript(ARTICLES_FTS_TRIGGERS)
+        return True
+
     def add_feed(self, name: str, url: str) -> bool:
         """Add a new RSS feed."""
         try:
@@ -237,28 +366,7 @@ class RSSReader:
 
                 feed_url = result[0]
                 parsed = feedparser.parse(feed_url)
-
-                articles = []
-                for entry in parsed.entries:
-                    # Clean HTML from summary
-                    summary = getattr(entry, "summary", "")
-                    if summary:
-                        summary = _clean_summary(str(summary))
-
-                    # Parse published date
-                    published = None
-                    if hasattr(entry, "published_parsed") and entry.published_parsed:
-                        published = datetime.datetime(*entry.published_parsed[:6])
-
-                    article = Article(
-                        title=getattr(entry, "title", "No Title"),
-                        link=getattr(entry, "link", ""),
-                        summary=summary,
-                        published=published,
-                        author=getattr(entry, "author", None),
-                        feed_id=feed_id,
-                    )
-                    articles.append(article)
+                articles = self._entries_to_articles(parsed.entries, feed_id)
 
                 # Save articles to database
                 self._save_articles(articles)
@@ -271,35 +379,190 @@ class RSSReader:
             self.logger.error(f"Failed to fetch articles: {e}")
             return []
 
-    def _save_articles(self, articles: List[Article]) -> None:
-        """Save articles to database, avoiding duplicates."""
+    def _entries_to_articles(self, entries, feed_id: int) -> List[Article]:
+        """Convert parsed feed entries to articles."""
+        articles = []
+        for entry in entries:
+            # Clean HTML from summary
+            summary = getattr(entry, "summary", "")
+            if summary:
+                summary = _clean_summary(str(summary))
+
+            # Parse published date
+            published = None
+            if hasattr(entry, "published_parsed") and entry.published_parsed:
+                published = datetime.datetime(*entry.published_parsed[:6])
+
+            article = Article(
+                title=getattr(entry, "title", "No Title"),
+                link=getattr(entry, "link", ""),
+                summary=summary,
+                published=published,
+                author=getattr(entry, "author", None),
+                feed_id=feed_id,
+            )
+            articles.append(article)
+        return articles
+
+    def fetch_all(
+        self,
+        feed_ids: Optional[Iterable[int]] = None,
+        max_workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        host_delay: float = DEFAULT_HOST_DELAY,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> FetchSummary:
+        """
+        Refresh many feeds concurrently with conditional requests.
+
+        Each request sends the ETag and Last-Modified values saved from the
+        feed's previous fetch; feeds answering 304 Not Modified are skipped.
+        Downloads run on a thread pool while parsing results and saving
+        articles happen in the calling thread as each download finishes.
+
+        Args:
+            feed_ids: Feeds to refresh, or None for every feed
+            max_workers: Downloads in flight across all hosts
+            per_host: Downloads in flight to any one host
+            host_delay: Minimum seconds between requests to one host
+            timeout: Socket timeout per request
+
+        Returns:
+            FetchSummary with per-outcome counts and errors by feed ID
+        """
+        summary = FetchSummary()
+        start = time.perf_counter()
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
-                for article in articles:
-                    try:
-                        cursor.execute(
-                            """
-                            INSERT OR IGNORE INTO articles
-                            (feed_id, title, link, summary, author, published)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """,
-                            (
-                                article.feed_id,
-                                article.title,
-                                article.link,
-                                article.summary,
-                                article.author,
-                                article.published,
-                            ),
-                        )
-                    except sqlite3.Error as e:
-                        self.logger.warning(
-                            f"Failed to save article '{article.title}': {e}"
-                        )
+                cursor.execute("SELECT id, url, etag, last_modified FROM feeds")
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to load feeds: {e}")
+            return summary
+
+        wanted = set(feed_ids) if feed_ids is not None else None
+        requests = [
+            FeedRequest(row[0], row[1], row[2], row[3])
+            for row in rows
+            if wanted is None or row[0] in wanted
+        ]
+        fetcher = FeedFetcher(max_workers, per_host, host_delay, timeout)
+        # Results are written a batch of feeds per transaction
+        pending_articles: List[Article] = []
+        pending_feeds: List[FeedResponse] = []
+        for response in fetcher.fetch_many(requests):
+            feed_id = response.request.feed_id
+            if response.not_modified:
+                summary.not_modified += 1
+                pending_feeds.append(response)
+            elif response.error is not None or response.content is None:
+                summary.failed += 1
+                summary.errors[feed_id] = response.error or "Empty response"
+                self.logger.error(f"Failed to fetch feed {feed_id}: {response.error}")
+            else:
+                try:
+                    parsed = feedparser.parse(response.content)
+                    articles = self._entries_to_articles(parsed.entries, feed_id)
+                except Exception as e:
+                    summary.failed += 1
+                    summary.errors[feed_id] = str(e)
+                    self.logger.error(f"Failed to parse feed {feed_id}: {e}")
+                    continue
+                summary.fetched += 1
+                pending_articles.extend(articles)
+                pending_feeds.append(response)
+            if len(pending_feeds) >= SAVE_BATCH_FEEDS:
+                summary.new_articles += self._save_fetch_results(
+                    pending_articles, pending_feeds
+                )
+                pending_articles, pending_feeds = [], []
+        summary.new_articles += self._save_fetch_results(
+            pending_articles, pending_feeds
+        )
+
+        summary.elapsed = time.perf_counter() - start
+        self.logger.info(
+            f"Refreshed {len(requests)} feeds in {summary.elapsed:.2f}s: "
+            f"{summary.fetched} fetched, {summary.not_modified} not modified, "
+            f"{summary.failed} failed, {summary.new_articles} new articles"
+        )
+        return summary
+
+    def _save_fetch_results(
+        self, articles: List[Article], responses: List[FeedResponse]
+    ) -> int:
+        """Save articles and the feeds' HTTP validators in one transaction.
+
+        Validators are only stored together with the articles they describe,
+        so a failed write makes the next fetch download the feed again.
+        Returns the number of new articles.
+        """
+        if not responses:
+            return 0
+        fetched_at = datetime.datetime.now().isoformat()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                added = self._insert_articles(cursor, articles)
+                cursor.executemany(
+                    """
+                    UPDATE feeds
+                    SET etag = ?, last_modified = ?, last_fetched_at = ?
+                    WHERE id = ?
+                """,
+                    [
+                        (r.etag, r.last_modified, fetched_at, r.request.feed_id)
+                        for r in responses
+                    ],
+                )
                 conn.commit()
+                return added
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to save fetched feeds: {e}")
+            return 0
+
+    @staticmethod
+    def _insert_articles(cursor: sqlite3.Cursor, articles: List[Article]) -> int:
+        """Insert articles with one ``executemany``; return how many were new."""
+        if not articles:
+            return 0
+        cursor.executemany(
+            """
+            INSERT OR IGNORE INTO articles
+            (feed_id, title, link, summary, author, published)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    article.feed_id,
+                    article.title,
+                    article.link,
+                    article.summary,
+                    article.author,
+                    article.published,
+                )
+                for article in articles
+            ],
+        )
+        return cursor.rowcount
+
+    def _save_articles(self, articles: List[Article]) -> int:
+        """Save articles to database, avoiding duplicates.
+
+        All rows go in with one ``executemany`` in a single transaction.
+        Returns the number of new articles.
+        """
+        if not articles:
+            return 0
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                added = self._insert_articles(conn.cursor(), articles)
+                conn.commit()
+                return added
         except sqlite3.Error as e:
             self.logger.error(f"Failed to save articles: {e}")
+            return 0
 
     def get_articles(
         self, feed_id: Optional[int] = None, unread_only: bool = False
@@ -384,8 +647,63 @@ class RSSReader:
             self.logger.error(f"Failed to mark feed as read: {e}")
             return False
 
-    def search_articles(self, query: str) -> List[Article]:
-        """Search articles by title or summary."""
+    def search_articles(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Article]:
+        """
+        Search articles by title or summary.
+
+        Every word must match the start of a word in the title or summary.
+        Results are ranked by BM25 relevance, weighting title matches
+        above summary matches, and carry a snippet of the matching text.
+
+        Args:
+            query: Words to search for
+            limit: Maximum number of results, or None for all
+
+        Returns:
+            Matching articles, best match first
+        """
+        if not self._fts_enabled:
+            return self._search_articles_like(query, limit)
+        match = _fts_query(query)
+        if not match:
+            return []
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT a.id, a.feed_id, a.title, a.link, a.summary,
+                           a.author, a.published, a.is_read,
+                           snippet(articles_fts, -1, '[', ']', '...', ?)
+                    FROM articles_fts
+                    JOIN articles a ON a.id = articles_fts.rowid
+                    WHERE articles_fts MATCH ?
+                    ORDER BY bm25(articles_fts, ?, ?), a.published DESC
+                    LIMIT ?
+                """,
+                    (
+                        SNIPPET_TOKENS,
+                        match,
+                        *SEARCH_WEIGHTS,
+                        -1 if limit is None else limit,
+                    ),
+                )
+                articles = []
+                for row in cursor.fetchall():
+                    article = self._row_to_article(row)
+                    article.snippet = row[8]
+                    articles.append(article)
+                return articles
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to search articles: {e}")
+            return []
+
+    def _search_articles_like(
+        self, query: str, limit: Optional[int] = None
+    ) -> List[Article]:
+        """Substring search for SQLite builds without FTS5."""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -397,28 +715,25 @@ class RSSReader:
                     FROM articles a
                     WHERE a.title LIKE ? OR a.summary LIKE ?
                     ORDER BY a.published DESC
+                    LIMIT ?
                 """,
-                    (search_pattern, search_pattern),
+                    (search_pattern, search_pattern, -1 if limit is None else limit),
                 )
-
-                rows = cursor.fetchall()
-                articles = []
-                for row in rows:
-                    article = Article(
-                        title=row[2],
-                        link=row[3],
-                        summary=row[4],
-                        author=row[5],
-                        published=(
-                            datetime.datetime.fromisoformat(row[6]) if row[6] else None
-                        ),
-                        feed_id=row[1],
-                        article_id=row[0],
-                        is_read=bool(row[7]),
-                    )
-                    articles.append(article)
-
-                return articles
+                return [self._row_to_article(row) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             self.logger.error(f"Failed to search articles: {e}")
             return []
+
+    @staticmethod
+    def _row_to_article(row) -> Article:
+        """Build an Article from a row of the article listing columns."""
+        return Article(
+            title=row[2],
+            link=row[3],
+            summary=row[4],
+            author=row[5],
+            published=(datetime.datetime.fromisoformat(row[6]) if row[6] else None),
+            feed_id=row[1],
+            article_id=row[0],
+            is_read=bool(row[7]),
+        )
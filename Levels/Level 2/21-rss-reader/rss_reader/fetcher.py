@@ -0,0 +1,254 @@
+"""Concurrent, conditional feed downloads.
+
+``RSSReader.fetch_articles`` downloads one feed at a time and always
+transfers the whole document. ``FeedFetcher`` is used by
+``RSSReader.fetch_all`` to refresh many feeds at once:
+
+* downloads run on a bounded thread pool,
+* each host gets at most ``per_host`` requests in flight, started at
+  least ``host_delay`` seconds apart, so a big feed list does not hammer
+  one server,
+* requests carry the ETag and Last-Modified values from the previous
+  fetch, and a ``304 Not Modified`` reply skips parsing and saving.
+"""
+
+import gzip
+import http.client
+import logging
+import threading
+import time
+import zlib
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 2
+DEFAULT_HOST_DELAY = 0.0
+DEFAULT_TIMEOUT = 15.0
+USER_AGENT = "rss-reader/1.0 (+conditional-get)"
+
+
+@dataclass
+class FeedRequest:
+    """A feed to download, with the validators from its last fetch."""
+
+    feed_id: int
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class FeedResponse:
+    """Outcome of one download."""
+
+    request: FeedRequest
+    status: int = 0
+    content: Optional[bytes] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def not_modified(self) -> bool:
+        """True if the server answered 304 Not Modified."""
+        return self.status == 304
+
+
+def _host(url: str) -> str:
+    """Host part of a URL; local paths share one empty host."""
+    return urlsplit(url).netloc.lower()
+
+
+def _decode_body(data: bytes, encoding: Optional[str]) -> bytes:
+    """Undo gzip/deflate content encoding."""
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            return zlib.decompress(data, -zlib.MAX_WBITS)
+    return data
+
+
+def interleave_by_host(requests: Iterable[FeedRequest]) -> List[FeedRequest]:
+    """Order requests round-robin across hosts.
+
+    Workers that would otherwise queue behind one host's politeness limit
+    pick up other hosts' feeds instead.
+    """
+    by_host: Dict[str, deque] = defaultdict(deque)
+    for request in requests:
+        by_host[_host(request.url)].append(request)
+    queues = deque(by_host.values())
+    ordered = []
+    while queues:
+        pending = queues.popleft()
+        ordered.append(pending.popleft())
+        if pending:
+            queues.append(pending)
+    return ordered
+
+
+class HostThrottle:
+    """Limits concurrent requests and request spacing per host."""
+
+    def __init__(
+        self,
+        per_host: int = DEFAULT_PER_HOST,
+        host_delay: float = DEFAULT_HOST_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Create a throttle.
+
+        Args:
+            per_host: Requests allowed in flight to one host
+            host_delay: Minimum seconds between request starts to one host
+            clock: Monotonic time source
+            sleep: Function used to wait
+        """
+        if per_host < 1:
+            raise ValueError("per_host must be at least 1")
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(host)
+            if slot is None:
+                slot = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def acquire(self, host: str) -> None:
+        """Wait for a free slot and this host's next start time."""
+        self._slot(host).acquire()
+        if self.host_delay <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start.get(host, now))
+            # Reserve the start time so concurrent callers queue behind it
+            self._next_start[host] = start + self.host_delay
+        if start > now:
+            self._sleep(start - now)
+
+    def release(self, host: str) -> None:
+        """Free the slot taken by ``acquire``."""
+        self._slot(host).release()
+
+
+class FeedFetcher:
+    """Downloads feeds concurrently with conditional requests."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        host_delay: float = DEFAULT_HOST_DELAY,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        """
+        Create a fetcher.
+
+        Args:
+            max_workers: Downloads in flight across all hosts
+            per_host: Downloads in flight to any one host
+            host_delay: Minimum seconds between requests to one host
+            timeout: Socket timeout per request
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.throttle = HostThrottle(per_host, host_delay)
+
+    def fetch(self, request: FeedRequest) -> FeedResponse:
+        """Download one feed, honouring the host limits."""
+        host = _host(request.url)
+        self.throttle.acquire(host)
+        try:
+            return self._download(request)
+        finally:
+            self.throttle.release(host)
+
+    def _download(self, request: FeedRequest) -> FeedResponse:
+        if not request.url.startswith(("http://", "https://")):
+            # Local feed files have no validators to check
+            try:
+                with open(request.url, "rb") as file_obj:
+                    return FeedResponse(request, 200, file_obj.read())
+            except OSError as e:
+                return FeedResponse(request, error=str(e))
+
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"}
+        if request.etag:
+            headers["If-None-Match"] = request.etag
+        if request.last_modified:
+            headers["If-Modified-Since"] = request.last_modified
+        try:
+            with urlopen(
+                Request(request.url, headers=headers), timeout=self.timeout
+            ) as response:
+                content = _decode_body(
+                    response.read(), response.headers.get("Content-Encoding")
+                )
+                return FeedResponse(
+                    request,
+                    response.status,
+                    content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+        except HTTPError as e:
+            if e.code == 304:
+                return FeedResponse(
+                    request,
+                    304,
+                    etag=e.headers.get("ETag") or request.etag,
+                    last_modified=(
+                        e.headers.get("Last-Modified") or request.last_modified
+                    ),
+                )
+            return FeedResponse(request, e.code, error=f"HTTP {e.code}")
+        except (
+            URLError,
+            OSError,
+            ValueError,
+            EOFError,
+            zlib.error,
+            http.client.HTTPException,
+        ) as e:
+            # Malformed replies and truncated bodies fail this feed only
+            return FeedResponse(request, error=str(e) or type(e).__name__)
+
+    def fetch_many(self, requests: Iterable[FeedRequest]) -> Iterator[FeedResponse]:
+        """Download ``requests`` concurrently, yielding responses as they finish.
+
+        Responses are yielded in the calling thread, so callers can write
+        them to SQLite without sharing a connection across threads.
+        """
+        ordered = interleave_by_host(requests)
+        if not ordered:
+            return
+        workers = min(self.max_workers, len(ordered))
+        with ThreadPoolExecutor(workers, thread_name_prefix="feed-fetch") as pool:
+            futures = [pool.submit(self.fetch, request) for request in ordered]
+            for future in as_completed(futures):
+                yield future.result()
@@ -3,6 +3,12 @@
 import argparse
 import sys
 from .core import RSSReader
+from .fetcher import (
+    DEFAULT_HOST_DELAY,
+    DEFAULT_PER_HOST,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+)
 from .utils import (
     format_article_display,
     export_to_html,
@@ -51,6 +57,25 @@ def cmd_fetch(reader: RSSReader, args) -> None:
         sys.exit(1)
 
 
+def cmd_fetch_all(reader: RSSReader, args) -> None:
+    """Refresh every feed concurrently."""
+    summary = reader.fetch_all(
+        max_workers=args.workers,
+        per_host=args.per_host,
+        host_delay=args.host_delay,
+        timeout=args.timeout,
+    )
+    print(
+        f"✓ Refreshed feeds in {summary.elapsed:.1f}s: {summary.fetched} updated, "
+        f"{summary.not_modified} unchanged, {summary.failed} failed, "
+        f"{summary.new_articles} new articles"
+    )
+    for feed_id, error in sorted(summary.errors.items()):
+        print(f"  ✗ Feed {feed_id}: {error}")
+    if summary.failed and not (summary.fetched or summary.not_modified):
+        sys.exit(1)
+
+
 def cmd_list_articles(reader: RSSReader, args) -> None:
     """List articles."""
     articles = reader.get_articles(feed_id=args.feed_id, unread_only=args.unread)
@@ -87,7 +112,7 @@ def cmd_mark_read(reader: RSSReader, args) -> None:
 
 def cmd_search(reader: RSSReader, args) -> None:
     """Search articles."""
-    articles = reader.search_articles(args.query)
+    articles = reader.search_articles(args.query, limit=args.limit)
 
     if not articles:
         print(f"No articles found for: {args.query}")
@@ -162,6 +187,36 @@ def main() -> None:
     fetch_parser.add_argument("feed_id", type=int, help="ID of the feed to fetch from")
     fetch_parser.set_defaults(func=cmd_fetch)
 
+    # Fetch all feeds command
+    fetch_all_parser = subparsers.add_parser(
+        "fetch-all", help="Refresh all feeds concurrently"
+    )
+    fetch_all_parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent downloads (default: {DEFAULT_WORKERS})",
+    )
+    fetch_all_parser.add_argument(
+        "--per-host",
+        type=int,
+        default=DEFAULT_PER_HOST,
+        help=f"Concurrent downloads per host (default: {DEFAULT_PER_HOST})",
+    )
+    fetch_all_parser.add_argument(
+        "--host-delay",
+        type=float,
+        default=DEFAULT_HOST_DELAY,
+        help="Minimum seconds between requests to one host (default: 0)",
+    )
+    fetch_all_parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Request timeout in seconds (default: {DEFAULT_TIMEOUT:g})",
+    )
+    fetch_all_parser.set_defaults(func=cmd_fetch_all)
+
     # List articles command
     list_parser = subparsers.add_parser("list", help="List articles")
     list_parser.add_argument("--feed-id", type=int, help="Filter by feed ID")
@@ -184,6 +239,9 @@ def main() -> None:
     # Search command
     search_parser = subparsers.add_parser("search", help="Search articles")
     search_parser.add_argument("query", help="Search query")
+    search_parser.add_argument(
+        "--limit", type=int, help="Show at most this many results, best first"
+    )
     search_parser.set_defaults(func=cmd_search)
 
     # Export command
@@ -30,6 +30,9 @@ def format_article_display(article: Article, show_feed: bool = False) -> str:
         )
         lines.append(f"  Summary: {summary}")
 
+    if article.snippet:
+        lines.append(f"  Match: {article.snippet}")
+
     if show_feed and article.feed_id:
         lines.append(f"  Feed ID: {article.feed_id}")
 
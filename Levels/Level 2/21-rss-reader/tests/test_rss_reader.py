@@ -4,10 +4,15 @@ import unittest
 import tempfile
 import os
 import datetime
+import gzip
 from unittest.mock import patch, MagicMock
 import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 from rss_reader.core import RSSReader, Article, Feed
+from rss_reader.fetcher import FeedRequest, HostThrottle, interleave_by_host
 from rss_reader.utils import format_article_display, export_to_html, export_to_markdown
 
 
@@ -300,6 +305,299 @@ class TestRSSReader(unittest.TestCase):
         self.assertEqual(len(articles), 2)
 
 
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Feed {feed}</title>
+<item><title>Feed {feed} item 1</title><link>http://example.com/{feed}/1</link>
+<description>First</description><pubDate>Mon, 02 Jan 2023 10:00:00 GMT</pubDate></item>
+<item><title>Feed {feed} item 2</title><link>http://example.com/{feed}/2</link>
+<description>Second</description></item>
+</channel></rss>
+"""
+
+
+class _FeedServer:
+    """Local HTTP server serving /feed/<n> with ETag and Last-Modified."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests.append(
+                        (self.path, self.headers.get("If-None-Match"))
+                    )
+                    server.in_flight += 1
+                    server.max_in_flight = max(
+                        server.max_in_flight, server.in_flight
+                    )
+                try:
+                    time.sleep(server.latency)
+                    if self.path == "/garbage":
+                        # Not an HTTP status line at all
+                        self.wfile.write(b"GARBAGE\r\n\r\n")
+                        self.close_connection = True
+                        return
+                    if self.path == "/truncated-gzip":
+                        body = gzip.compress(FEED_XML.format(feed=0).encode())[:-8]
+                        self.send_response(200)
+                        self.send_header("Content-Encoding", "gzip")
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+                        return
+                    if not self.path.startswith("/feed/"):
+                        self.send_error(404)
+                        return
+                    feed = self.path.rsplit("/", 1)[1]
+                    etag = f'"v1-{feed}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+                    body = FEED_XML.format(feed=feed).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/rss+xml")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.send_header("ETag", etag)
+                    self.send_header(
+                        "Last-Modified", "Mon, 02 Jan 2023 10:00:00 GMT"
+                    )
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TestFetchAll(unittest.TestCase):
+    """Test cases for concurrent conditional fetching."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        self.reader = RSSReader(self.temp_db.name)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.unlink(self.temp_db.name)
+
+    def _add_feeds(self, server, count):
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.executemany(
+                "INSERT INTO feeds (name, url) VALUES (?, ?)",
+                [(f"Feed {i}", f"{server.url}/feed/{i}") for i in range(count)],
+            )
+
+    def test_fetch_all_saves_articles(self):
+        """Test that every feed is fetched and its articles saved once."""
+        with _FeedServer() as server:
+            self._add_feeds(server, 6)
+            summary = self.reader.fetch_all(max_workers=4)
+
+        self.assertEqual(summary.fetched, 6)
+        self.assertEqual(summary.failed, 0)
+        self.assertEqual(summary.new_articles, 12)
+        self.assertEqual(len(self.reader.get_articles()), 12)
+        titles = {a.title for a in self.reader.get_articles()}
+        self.assertIn("Feed 3 item 2", titles)
+
+    def test_fetch_all_skips_unmodified_feeds(self):
+        """Test that stored ETags are sent and 304 replies are skipped."""
+        with _FeedServer() as server:
+            self._add_feeds(server, 3)
+            self.reader.fetch_all()
+            server.requests.clear()
+            summary = self.reader.fetch_all()
+
+        self.assertEqual(summary.not_modified, 3)
+        self.assertEqual(summary.fetched, 0)
+        self.assertEqual(summary.new_articles, 0)
+        self.assertTrue(all(etag for _, etag in server.requests))
+        self.assertEqual(len(self.reader.get_articles()), 6)
+
+    def test_fetch_all_limits_per_host(self):
+        """Test that one host never sees more than per_host requests."""
+        with _FeedServer(latency=0.05) as server:
+            self._add_feeds(server, 8)
+            summary = self.reader.fetch_all(max_workers=8, per_host=2)
+
+        self.assertEqual(summary.fetched, 8)
+        self.assertEqual(server.max_in_flight, 2)
+
+    def test_fetch_all_reports_failures(self):
+        """Test that a failing feed is reported without stopping the others."""
+        with _FeedServer() as server:
+            self._add_feeds(server, 2)
+            with sqlite3.connect(self.temp_db.name) as conn:
+                conn.execute(
+                    "INSERT INTO feeds (name, url) VALUES (?, ?)",
+                    ("Broken", f"{server.url}/missing"),
+                )
+            summary = self.reader.fetch_all()
+
+        self.assertEqual(summary.fetched, 2)
+        self.assertEqual(summary.failed, 1)
+        self.assertIn("HTTP 404", list(summary.errors.values()))
+
+    def test_fetch_all_survives_malformed_responses(self):
+        """Test that a bad status line or truncated body fails only that feed."""
+        with _FeedServer() as server:
+            self._add_feeds(server, 2)
+            with sqlite3.connect(self.temp_db.name) as conn:
+                conn.executemany(
+                    "INSERT INTO feeds (name, url) VALUES (?, ?)",
+                    [
+                        ("Garbage", f"{server.url}/garbage"),
+                        ("Truncated", f"{server.url}/truncated-gzip"),
+                    ],
+                )
+            summary = self.reader.fetch_all()
+
+        self.assertEqual(summary.fetched, 2)
+        self.assertEqual(summary.failed, 2)
+        self.assertEqual(summary.new_articles, 4)
+        self.assertEqual(len(self.reader.get_articles()), 4)
+
+    def test_host_throttle_spaces_requests(self):
+        """Test that requests to one host start host_delay apart."""
+        now = [0.0]
+        waits = []
+
+        def sleep(seconds):
+            waits.append(seconds)
+
+        throttle = HostThrottle(
+            per_host=3, host_delay=0.5, clock=lambda: now[0], sleep=sleep
+        )
+        for _ in range(3):
+            throttle.acquire("example.com")
+        throttle.acquire("other.com")
+        self.assertEqual(waits, [0.5, 1.0])
+
+    def test_interleave_by_host(self):
+        """Test that requests alternate between hosts."""
+        requests = [
+            FeedRequest(1, "http://a.com/1"),
+            FeedRequest(2, "http://a.com/2"),
+            FeedRequest(3, "http://a.com/3"),
+            FeedRequest(4, "http://b.com/1"),
+        ]
+        ordered = [r.feed_id for r in interleave_by_host(requests)]
+        self.assertEqual(ordered, [1, 4, 2, 3])
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for full-text search and listing indexes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_db = tempfile.NamedTemporaryFile(delete=False)
+        self.temp_db.close()
+        self.reader = RSSReader(self.temp_db.name)
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute(
+                "INSERT INTO feeds (name, url) VALUES ('Test', 'http://example.com')"
+            )
+            conn.executemany(
+                "INSERT INTO articles (feed_id, title, link, summary) "
+                "VALUES (1, ?, ?, ?)",
+                [
+                    ("Cooking pasta", "http://example.com/1", "Python appears here"),
+                    ("Python Tutorial", "http://example.com/2", "Learn Python fast"),
+                    ("Résumé tips", "http://example.com/3", "Write a better CV"),
+                ],
+            )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        os.unlink(self.temp_db.name)
+
+    def test_search_ranks_title_matches_first(self):
+        """Test that BM25 ranking puts title matches first."""
+        articles = self.reader.search_articles("python")
+        self.assertEqual(
+            [a.title for a in articles], ["Python Tutorial", "Cooking pasta"]
+        )
+        self.assertIn("[Python]", articles[0].snippet)
+
+    def test_search_prefixes_and_diacritics(self):
+        """Test prefix matching, accent folding and limits."""
+        self.assertEqual(len(self.reader.search_articles("pyth")), 2)
+        self.assertEqual(len(self.reader.search_articles("pyth", limit=1)), 1)
+        self.assertEqual(
+            self.reader.search_articles("resume")[0].title, "Résumé tips"
+        )
+        self.assertEqual(
+            self.reader.search_articles("python fast")[0].link,
+            "http://example.com/2",
+        )
+
+    def test_search_treats_operators_literally(self):
+        """Test that FTS5 syntax in queries does not raise."""
+        for query in ['"', "NOT", "title:", "c++ AND (", "*"]:
+            self.assertIsInstance(self.reader.search_articles(query), list)
+        self.assertEqual(self.reader.search_articles("   "), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that triggers keep the index in sync with articles."""
+        with sqlite3.connect(self.temp_db.name) as conn:
+            conn.execute(
+                "UPDATE articles SET title = 'Baking bread' "
+                "WHERE link = 'http://example.com/2'"
+            )
+        self.assertEqual(len(self.reader.search_articles("tutorial")), 0)
+        self.assertEqual(len(self.reader.search_articles("bread")), 1)
+
+        self.reader.remove_feed(1)
+        self.assertEqual(self.reader.search_articles("python"), [])
+
+    def test_existing_database_is_backfilled(self):
+        """Test that opening an older database builds the index."""
+        with sqlite3.connect(self.temp_db.name) as conn:
+            for name in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER articles_fts_{name}")
+            conn.execute("DROP TABLE articles_fts")
+
+        reader = RSSReader(self.temp_db.name)
+        self.assertEqual(len(reader.search_articles("python")), 2)
+
+    def test_listing_queries_use_indexes(self):
+        """Test that article listings avoid scans and sorts."""
+        query = (
+            "EXPLAIN QUERY PLAN SELECT * FROM articles a "
+            "WHERE a.feed_id = ? AND a.is_read = FALSE "
+            "ORDER BY a.published DESC, a.created_at DESC"
+        )
+        with sqlite3.connect(self.temp_db.name) as conn:
+            plan = " ".join(row[-1] for row in conn.execute(query, (1,)))
+        self.assertIn("idx_articles_unread_feed_published", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+
 class TestArticle(unittest.TestCase):
     """Test cases for Article class."""
 
@@ -0,0 +1,369 @@
+"""Parallel, cached batch thumbnail generation.
+
+``create_thumbnail`` decodes the full-resolution source for every
+thumbnail it writes. ``run_batch``, which ``batch_create_thumbnails``
+uses, works through whole directory trees instead:
+
+* images are processed on a process pool,
+* JPEGs are decoded at a reduced scale with ``Image.draft``, just large
+  enough for the biggest requested size,
+* every requested size is rendered from that one decode, largest first,
+  and smaller sizes are resized from a larger thumbnail when it is still
+  at least twice their size,
+* a manifest in the output directory records each source's size, mtime
+  and SHA-256 hash, and sources unchanged since their thumbnails were
+  made are skipped without being decoded.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from PIL import Image
+
+from .core import (
+    SUPPORTED_FORMATS,
+    preserve_exif_orientation,
+    render_thumbnail,
+    resize_image,
+    save_thumbnail,
+)
+from .utils import create_output_filename
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".thumbnails.json"
+MANIFEST_VERSION = 1
+# Like Image.thumbnail, decode or reuse an image at least twice the
+# target size so the final LANCZOS pass still has detail to work with
+REDUCING_GAP = 2
+# Images handed to a worker at a time
+POOL_CHUNKSIZE = 4
+
+
+@dataclass(frozen=True)
+class ThumbnailOptions:
+    """How each source image is rendered."""
+
+    sizes: Tuple[Tuple[int, int], ...] = ((200, 200),)
+    maintain_aspect: bool = True
+    watermark_text: Optional[str] = None
+    border_width: int = 0
+    quality: int = 85
+
+    def __post_init__(self) -> None:
+        if not self.sizes:
+            raise ValueError("At least one size is required")
+        if any(width <= 0 or height <= 0 for width, height in self.sizes):
+            raise ValueError("Sizes must be positive")
+
+    def fingerprint(self) -> str:
+        """Hash of the options; thumbnails made with other options are stale."""
+        encoded = json.dumps(asdict(self), sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of ``run_batch``."""
+
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    thumbnails: int = 0
+    seconds: float = 0.0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def images_per_second(self) -> float:
+        """Source images handled (created or skipped) per second."""
+        handled = self.created + self.skipped
+        return handled / self.seconds if self.seconds > 0 else 0.0
+
+
+def iter_source_images(
+    input_dir: Path, recursive: bool = True, exclude: Optional[Path] = None
+) -> Iterator[Path]:
+    """Yield supported images under ``input_dir`` in a stable order.
+
+    Args:
+        input_dir: Directory to search
+        recursive: Whether to descend into subdirectories
+        exclude: Directory to leave out, such as an output directory
+            inside ``input_dir``
+    """
+    excluded = exclude.resolve() if exclude is not None else None
+    for root, dirs, files in os.walk(input_dir):
+        root_path = Path(root)
+        if recursive:
+            dirs[:] = sorted(
+                name for name in dirs if (root_path / name).resolve() != excluded
+            )
+        else:
+            dirs[:] = []
+        for name in sorted(files):
+            if Path(name).suffix.lower() in SUPPORTED_FORMATS:
+                yield root_path / name
+
+
+def thumbnail_paths(
+    relative: Path, output_dir: Path, sizes: Sequence[Tuple[int, int]]
+) -> List[Path]:
+    """Output paths for one source, mirroring its place in the input tree.
+
+    A single size keeps the ``thumb_<name>`` naming of ``create_thumbnail``
+    batches; several sizes add ``_<width>x<height>`` to each name.
+    """
+    parent = output_dir / relative.parent
+    if len(sizes) == 1:
+        return [parent / create_output_filename(relative)]
+    return [
+        parent / create_output_filename(relative, suffix=f"_{width}x{height}")
+        for width, height in sizes
+    ]
+
+
+def _fitted_size(
+    image_size: Tuple[int, int], box: Tuple[int, int]
+) -> Tuple[float, float]:
+    """Size of ``image_size`` scaled down to fit ``box``."""
+    width, height = image_size
+    scale = min(box[0] / width, box[1] / height, 1.0)
+    return width * scale, height * scale
+
+
+def render_sizes(
+    source: Path, outputs: Sequence[Path], options: ThumbnailOptions
+) -> str:
+    """
+    Decode ``source`` once and write one thumbnail per requested size.
+
+    Args:
+        source: Source image
+        outputs: Output path for each of ``options.sizes``
+        options: Rendering options
+
+    Returns:
+        SHA-256 hex digest of the source file
+
+    Raises:
+        ValueError: If an output extension is not supported
+    """
+    data = source.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    edge = max(max(size) for size in options.sizes) * REDUCING_GAP
+    with Image.open(io.BytesIO(data)) as img:
+        # JPEG decodes at 1/2, 1/4 or 1/8 scale; other formats ignore this
+        img.draft(None, (edge, edge))
+        img = preserve_exif_orientation(img)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGB")
+        img.load()
+
+        # Largest size first, so smaller ones can be resized from it
+        jobs = sorted(
+            zip(options.sizes, outputs),
+            key=lambda job: job[0][0] * job[0][1],
+            reverse=True,
+        )
+        bases = [img]
+        for size, output_path in jobs:
+            base = img
+            if options.maintain_aspect:
+                width, height = _fitted_size(img.size, size)
+                # Most recent (smallest) base still big enough, else the source
+                base = next(
+                    (
+                        candidate
+                        for candidate in reversed(bases)
+                        if candidate.width >= int(REDUCING_GAP * width)
+                        and candidate.height >= int(REDUCING_GAP * height)
+                    ),
+                    img,
+                )
+            resized = resize_image(base.copy(), size, options.maintain_aspect)
+            if options.maintain_aspect:
+                bases.append(resized)
+            # Already resized; this only adds the watermark and border
+            thumb = render_thumbnail(
+                resized,
+                size,
+                options.maintain_aspect,
+                options.watermark_text,
+                options.border_width,
+            )
+            if not save_thumbnail(thumb, output_path, options.quality):
+                raise ValueError(f"Unsupported output format: {output_path.suffix}")
+    return digest
+
+
+def _process_image(
+    task: Tuple[int, str, List[str], ThumbnailOptions]
+) -> Tuple[int, Optional[str], Optional[str]]:
+    """Render one source; runs in a worker process.
+
+    Returns (index, source digest, error message).
+    """
+    index, source, outputs, options = task
+    try:
+        digest = render_sizes(Path(source), [Path(p) for p in outputs], options)
+        return index, digest, None
+    except Exception as e:
+        return index, None, str(e)
+
+
+def _file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file, read in blocks."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict]:
+    """Read the manifest in ``output_dir``; empty if missing or unreadable."""
+    try:
+        with open(output_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("images", {})
+
+
+def _save_manifest(output_dir: Path, images: Dict[str, Dict]) -> None:
+    manifest = {"version": MANIFEST_VERSION, "images": dict(sorted(images.items()))}
+    path = output_dir / MANIFEST_NAME
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
+
+
+def _is_current(
+    entry: Dict,
+    source: Path,
+    stat: os.stat_result,
+    fingerprint: str,
+    outputs: Sequence[Path],
+) -> bool:
+    """Whether the thumbnails recorded in ``entry`` still match ``source``."""
+    if entry.get("options") != fingerprint or entry.get("size") != stat.st_size:
+        return False
+    if not all(path.exists() for path in outputs):
+        return False
+    if entry.get("mtime_ns") == stat.st_mtime_ns:
+        return True
+    # Touched or copied over with the same content
+    return _file_digest(source) == entry.get("sha256")
+
+
+def run_batch(
+    input_dir: Path,
+    output_dir: Path,
+    options: Optional[ThumbnailOptions] = None,
+    recursive: bool = True,
+    workers: Optional[int] = None,
+    force: bool = False,
+) -> BatchResult:
+    """
+    Create thumbnails for every supported image under ``input_dir``.
+
+    Args:
+        input_dir: Directory containing images
+        output_dir: Directory to save thumbnails; subdirectories mirror
+            the input tree
+        options: Sizes and rendering options
+        recursive: Whether to descend into subdirectories
+        workers: Rendering processes (default: CPU count)
+        force: Render every image even if its thumbnails are current
+
+    Returns:
+        BatchResult with counts and timing
+    """
+    options = options or ThumbnailOptions()
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    result = BatchResult()
+    if not input_dir.is_dir():
+        logger.error(f"Input directory does not exist: {input_dir}")
+        return result
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest(output_dir)
+    fingerprint = options.fingerprint()
+    manifest: Dict[str, Dict] = {}
+    pending: List[Tuple[str, os.stat_result, List[Path]]] = []
+    for source in iter_source_images(input_dir, recursive, exclude=output_dir):
+        relative = source.relative_to(input_dir)
+        key = relative.as_posix()
+        outputs = thumbnail_paths(relative, output_dir, options.sizes)
+        stat = source.stat()
+        entry = previous.get(key)
+        if (
+            not force
+            and entry is not None
+            and _is_current(entry, source, stat, fingerprint, outputs)
+        ):
+            manifest[key] = dict(entry, mtime_ns=stat.st_mtime_ns)
+            result.skipped += 1
+        else:
+            pending.append((key, stat, outputs))
+
+    tasks = [
+        (index, str(input_dir / key), [str(p) for p in outputs], options)
+        for index, (key, _, outputs) in enumerate(pending)
+    ]
+    if workers <= 1 or len(tasks) <= 1:
+        outcomes = map(_process_image, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        outcomes = pool.map(_process_image, tasks, chunksize=POOL_CHUNKSIZE)
+    try:
+        for index, digest, error in outcomes:
+            key, stat, outputs = pending[index]
+            if error is not None:
+                logger.error(f"Error creating thumbnails for {key}: {error}")
+                result.failed += 1
+                result.errors[key] = error
+                continue
+            manifest[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+                "options": fingerprint,
+            }
+            result.created += 1
+            result.thumbnails += len(outputs)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # Keep entries for sources outside this run's scope, such as
+    # subdirectories skipped by a non-recursive run
+    for key, entry in previous.items():
+        if (
+            key not in manifest
+            and key not in result.errors
+            and (input_dir / key).is_file()
+        ):
+            manifest[key] = entry
+    _save_manifest(output_dir, manifest)
+
+    result.seconds = time.perf_counter() - start
+    logger.info(
+        f"Created {result.thumbnails} thumbnails for {result.created} images "
+        f"({result.skipped} unchanged, {result.failed} failed) in "
+        f"{result.seconds:.2f}s"
+    )
+    return result
@@ -130,6 +130,69 @@ def preserve_exif_orientation(image: Image.Image) -> Image.Image:
     return image
 
 
+def render_thumbnail(
+    image: Image.Image,
+    size: Tuple[int, int],
+    maintain_aspect: bool = True,
+    watermark_text: Optional[str] = None,
+    border_width: int = 0,
+) -> Image.Image:
+    """Resize, watermark and border an oriented RGB/RGBA image.
+
+    Like ``resize_image``, this resizes ``image`` in place when keeping
+    the aspect ratio; pass a copy to render one image at several sizes.
+
+    Args:
+        image: PIL Image object
+        size: Target size as (width, height)
+        maintain_aspect: Whether to maintain aspect ratio
+        watermark_text: Optional watermark text
+        border_width: Border width in pixels
+
+    Returns:
+        Thumbnail PIL Image object
+    """
+    img = resize_image(image, size, maintain_aspect)
+
+    # Add watermark if specified
+    if watermark_text:
+        img = add_watermark(img, watermark_text)
+
+    # Add border if specified
+    if border_width > 0:
+        img = add_border(img, border_width)
+
+    return img
+
+
+def save_thumbnail(image: Image.Image, output_path: Path, quality: int = 85) -> bool:
+    """Save a thumbnail in the format given by the output extension.
+
+    Args:
+        image: PIL Image object
+        output_path: Path to save thumbnail
+        quality: JPEG/WebP quality (1-100)
+
+    Returns:
+        True if saved, False if the extension is not supported
+    """
+    suffix = output_path.suffix.lower()
+    if suffix not in SUPPORTED_FORMATS:
+        logger.error(f"Unsupported output format: {output_path.suffix}")
+        return False
+
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if suffix in (".jpg", ".jpeg"):
+        image.save(output_path, "JPEG", quality=quality, optimize=True)
+    elif suffix == ".png":
+        image.save(output_path, "PNG", optimize=True)
+    else:
+        image.save(output_path, "WEBP", quality=quality)
+    return True
+
+
 def create_thumbnail(
     input_path: Path,
     output_path: Path,
@@ -172,30 +235,10 @@ def create_thumbnail(
             if img.mode not in ("RGB", "RGBA"):
                 img = img.convert("RGB")
 
-            # Resize
-            img = resize_image(img, size, maintain_aspect)
-
-            # Add watermark if specified
-            if watermark_text:
-                img = add_watermark(img, watermark_text)
-
-            # Add border if specified
-            if border_width > 0:
-                img = add_border(img, border_width)
-
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Save with appropriate format
-            suffix = output_path.suffix.lower()
-            if suffix in (".jpg", ".jpeg"):
-                img.save(output_path, "JPEG", quality=quality, optimize=True)
-            elif suffix == ".png":
-                img.save(output_path, "PNG", optimize=True)
-            elif suffix == ".webp":
-                img.save(output_path, "WEBP", quality=quality)
-            else:
-                logger.error(f"Unsupported output format: {output_path.suffix}")
+            img = render_thumbnail(
+                img, size, maintain_aspect, watermark_text, border_width
+            )
+            if not save_thumbnail(img, output_path, quality):
                 return False
 
             logger.info(f"Created thumbnail: {output_path}")
@@ -207,31 +250,39 @@ def create_thumbnail(
 
 
 def batch_create_thumbnails(
-    input_dir: Path, output_dir: Path, size: Tuple[int, int], **kwargs
+    input_dir: Path,
+    output_dir: Path,
+    size: Tuple[int, int],
+    recursive: bool = False,
+    workers: Optional[int] = None,
+    force: bool = False,
+    **kwargs,
 ) -> int:
     """Create thumbnails for all supported images in a directory.
 
+    Images are rendered in parallel, and images whose thumbnails are
+    already up to date are skipped (see ``batch.run_batch``).
+
     Args:
         input_dir: Directory containing images
         output_dir: Directory to save thumbnails
         size: Target size as (width, height)
+        recursive: Whether to include subdirectories
+        workers: Rendering processes (default: CPU count)
+        force: Render every image even if its thumbnail is current
         **kwargs: Additional arguments for create_thumbnail
 
     Returns:
-        Number of thumbnails created successfully
+        Number of images with an up-to-date thumbnail, whether created
+        now or kept from an earlier run
     """
+    # Imported here because batch builds on this module
+    from .batch import ThumbnailOptions, run_batch
+
     if not input_dir.exists():
         logger.error(f"Input directory does not exist: {input_dir}")
         return 0
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    success_count = 0
-    for img_path in input_dir.glob("*"):
-        if img_path.suffix.lower() in SUPPORTED_FORMATS:
-            output_path = output_dir / f"thumb_{img_path.name}"
-            if create_thumbnail(img_path, output_path, size, **kwargs):
-                success_count += 1
-
-    logger.info(f"Created {success_count} thumbnails")
-    return success_count
+    options = ThumbnailOptions(sizes=(tuple(size),), **kwargs)
+    result = run_batch(input_dir, output_dir, options, recursive, workers, force)
+    return result.created + result.skipped
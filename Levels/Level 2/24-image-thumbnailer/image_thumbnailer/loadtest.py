@@ -0,0 +1,108 @@
+"""Benchmark for batch thumbnail generation.
+
+Writes a directory of synthetic JPEG photos, then reports images/sec for:
+
+* the one-at-a-time path: ``create_thumbnail`` once per image and size,
+  each call decoding the full-resolution source,
+* a cold ``run_batch``: reduced-size decode, all sizes from one decode,
+  spread over the process pool,
+* a warm ``run_batch`` over the same tree, where the manifest lets every
+  image be skipped.
+
+Usage:
+    python -m image_thumbnailer.loadtest --images 40 --width 3000 --height 2000
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from .batch import ThumbnailOptions, run_batch
+from .core import create_thumbnail
+from .utils import create_output_filename, parse_sizes
+
+
+def build_images(input_dir: Path, images: int, width: int, height: int) -> None:
+    """Write ``images`` noisy gradient JPEGs, a few per subdirectory."""
+    gradient = Image.linear_gradient("L").resize((width, height))
+    for i in range(images):
+        noise = Image.effect_noise((width, height), 40 + i % 20)
+        photo = Image.merge("RGB", (gradient, noise, gradient.rotate(180)))
+        path = input_dir / f"album{i % 5}" / f"photo{i}.jpg"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        photo.save(path, "JPEG", quality=90)
+
+
+def run_benchmark(
+    images: int, width: int, height: int, sizes: list, workers: int
+) -> None:
+    """Time the one-at-a-time path against cold and warm batches."""
+    logging.getLogger("image_thumbnailer").setLevel(logging.WARNING)
+    tmp_dir = Path(tempfile.mkdtemp())
+    try:
+        input_dir = tmp_dir / "input"
+        build_images(input_dir, images, width, height)
+        sources = sorted(input_dir.rglob("*.jpg"))
+        print(
+            f"{images} JPEGs of {width}x{height}, sizes "
+            f"{', '.join(f'{w}x{h}' for w, h in sizes)}, {workers} workers"
+        )
+
+        start = time.perf_counter()
+        for source in sources:
+            for w, h in sizes:
+                name = create_output_filename(source, suffix=f"_{w}x{h}")
+                create_thumbnail(source, tmp_dir / "single" / name, (w, h))
+        elapsed = time.perf_counter() - start
+        print(f"{'create_thumbnail per size':<28} {images / elapsed:>8.1f} images/sec")
+
+        options = ThumbnailOptions(sizes=tuple(sizes))
+        output_dir = tmp_dir / "batch"
+        for label in ("run_batch cold", "run_batch warm"):
+            result = run_batch(input_dir, output_dir, options, workers=workers)
+            print(
+                f"{label:<28} {result.images_per_second:>8.1f} images/sec "
+                f"({result.created} rendered, {result.skipped} skipped)"
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main() -> None:
+    """Command line entry point for the benchmark."""
+    parser = argparse.ArgumentParser(description="Measure thumbnail throughput")
+    parser.add_argument(
+        "--images", type=int, default=40, help="Source images (default: 40)"
+    )
+    parser.add_argument(
+        "--width", type=int, default=3000, help="Source width (default: 3000)"
+    )
+    parser.add_argument(
+        "--height", type=int, default=2000, help="Source height (default: 2000)"
+    )
+    parser.add_argument(
+        "--sizes",
+        default="150x150,400x400,800x800",
+        help="Comma-separated thumbnail sizes (default: 150x150,400x400,800x800)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Rendering processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+    sizes = parse_sizes(args.sizes)
+    if not sizes:
+        parser.error(f"Invalid sizes: {args.sizes}")
+    run_benchmark(args.images, args.width, args.height, sizes, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ import argparse
 import sys
 from pathlib import Path
 
-from . import core
-from .utils import parse_size, setup_logging, validate_directory, validate_image_path
+from . import batch, core
+from .utils import parse_sizes, setup_logging, validate_directory, validate_image_path
 
 
 def create_parser() -> argparse.ArgumentParser:
@@ -25,6 +25,9 @@ Examples:
   # Batch process directory
   python -m image_thumbnailer input_dir/ -d output_dir/ -s 300x300
 
+  # Several sizes for a whole tree, skipping images already done
+  python -m image_thumbnailer -i photos/ -d thumbs/ -s 150x150,800x800 -r
+
   # Add watermark and border
   python -m image_thumbnailer image.png -o thumb.png -w "Copyright" -b 5
         """,
@@ -56,7 +59,28 @@ Examples:
         "--size",
         type=str,
         default="200x200",
-        help="Thumbnail size in WIDTHxHEIGHT format (default: 200x200)",
+        help="Thumbnail size in WIDTHxHEIGHT format (default: 200x200); "
+        "batch mode accepts several separated by commas",
+    )
+
+    # Batch options
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Include subdirectories in batch mode",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=None,
+        help="Rendering processes in batch mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render images whose thumbnails are already up to date",
     )
 
     # Processing options
@@ -128,10 +152,11 @@ def main() -> int:
     log_level = "DEBUG" if args.verbose else args.log_level
     setup_logging(log_level)
 
-    # Parse size
-    size = parse_size(args.size)
-    if not size:
+    # Parse sizes
+    sizes = parse_sizes(args.size)
+    if not sizes:
         return 1
+    size = sizes[0]
 
     # Determine mode and validate inputs
     if args.input_path:
@@ -139,6 +164,10 @@ def main() -> int:
         if not validate_image_path(args.input_path):
             return 1
 
+        if len(sizes) > 1:
+            print("Multiple sizes require batch mode (-i)", file=sys.stderr)
+            return 1
+
         if not args.output:
             # Generate default output name
             output_path = args.input_path.parent / f"thumb_{args.input_path.name}"
@@ -179,17 +208,31 @@ def main() -> int:
             return 1
 
         # Process batch
-        count = core.batch_create_thumbnails(
+        try:
+            options = batch.ThumbnailOptions(
+                sizes=tuple(sizes),
+                maintain_aspect=not args.no_aspect,
+                watermark_text=args.watermark,
+                border_width=args.border,
+                quality=args.quality,
+            )
+        except ValueError as e:
+            print(f"Invalid options: {e}", file=sys.stderr)
+            return 1
+        result = batch.run_batch(
             input_dir=args.input_dir,
             output_dir=output_dir,
-            size=size,
-            maintain_aspect=not args.no_aspect,
-            watermark_text=args.watermark,
-            border_width=args.border,
-            quality=args.quality,
+            options=options,
+            recursive=args.recursive,
+            workers=args.workers,
+            force=args.force,
         )
 
-        print(f"Created {count} thumbnails in {output_dir}")
+        print(
+            f"Created {result.thumbnails} thumbnails in {output_dir} "
+            f"({result.created} images rendered, {result.skipped} unchanged, "
+            f"{result.failed} failed; {result.images_per_second:.1f} images/sec)"
+        )
         return 0
 
     else:
@@ -109,6 +109,24 @@ def parse_size(size_str: str) -> Optional[tuple[int, int]]:
         return None
 
 
+def parse_sizes(sizes_str: str) -> Optional[List[tuple[int, int]]]:
+    """Parse a comma-separated list of sizes like '200x200,800x600'.
+
+    Args:
+        sizes_str: One or more WIDTHxHEIGHT sizes separated by commas
+
+    Returns:
+        List of (width, height) tuples or None if any is invalid
+    """
+    sizes = []
+    for part in sizes_str.split(","):
+        size = parse_size(part.strip())
+        if size is None:
+            return None
+        sizes.append(size)
+    return sizes
+
+
 def validate_directory(path: Path, create_if_missing: bool = False) -> bool:
     """Validate that a path is a directory, optionally creating it.
 
@@ -1,12 +1,13 @@
 """Tests for image thumbnailer."""
 
+import os
 import tempfile
 from pathlib import Path
 from unittest.mock import patch
 
 from PIL import Image
 
-from image_thumbnailer import core, utils
+from image_thumbnailer import batch, core, utils
 
 
 class TestUtils:
@@ -68,6 +69,11 @@ class TestUtils:
         assert utils.parse_size("200") is None
         assert utils.parse_size("200x300x400") is None
 
+    def test_parse_sizes(self):
+        """Test parsing a comma-separated list of sizes."""
+        assert utils.parse_sizes("100x100, 400x300") == [(100, 100), (400, 300)]
+        assert utils.parse_sizes("100x100,bad") is None
+
 
 class TestCore:
     """Test core functionality."""
@@ -211,6 +217,112 @@ class TestCore:
         assert count == 0
 
 
+class TestBatch:
+    """Test the parallel, cached batch engine."""
+
+    def _make_tree(self, root):
+        """Create sources in root and a subdirectory."""
+        root.mkdir(parents=True, exist_ok=True)
+        (root / "sub").mkdir(exist_ok=True)
+        Image.new("RGB", (800, 600), color="red").save(root / "a.jpg")
+        Image.new("RGB", (600, 800), color="blue").save(root / "b.png")
+        Image.new("RGB", (400, 400), color="green").save(root / "sub" / "c.jpg")
+        (root / "notes.txt").write_text("not an image")
+
+    def _bump_mtime(self, path):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 5 * 10**9))
+
+    def test_multiple_sizes_recursive(self, tmp_path):
+        """Every size is written for every image, mirroring subdirectories."""
+        input_dir = tmp_path / "input"
+        self._make_tree(input_dir)
+        options = batch.ThumbnailOptions(sizes=((100, 100), (300, 300)))
+
+        result = batch.run_batch(input_dir, tmp_path / "out", options, workers=1)
+
+        assert (result.created, result.skipped, result.failed) == (3, 0, 0)
+        assert result.thumbnails == 6
+        with Image.open(tmp_path / "out" / "thumb_a_300x300.jpg") as thumb:
+            assert thumb.size == (300, 225)
+        with Image.open(tmp_path / "out" / "thumb_b_100x100.png") as thumb:
+            assert thumb.size == (75, 100)
+        assert (tmp_path / "out" / "sub" / "thumb_c_100x100.jpg").exists()
+
+    def test_non_recursive_and_output_inside_input(self, tmp_path):
+        """Output directories inside the input tree are not processed."""
+        input_dir = tmp_path / "input"
+        self._make_tree(input_dir)
+        output_dir = input_dir / "thumbnails"
+
+        flat = batch.run_batch(input_dir, output_dir, recursive=False, workers=1)
+        assert flat.created == 2
+
+        deep = batch.run_batch(input_dir, output_dir, recursive=True, workers=1)
+        assert (deep.created, deep.skipped) == (1, 2)
+        assert not (output_dir / "thumbnails").exists()
+
+    def test_jpeg_is_decoded_at_reduced_size(self, tmp_path):
+        """Large JPEGs are drafted down before resizing."""
+        source = tmp_path / "big.jpg"
+        Image.new("RGB", (3200, 2400), color="white").save(source)
+        seen = []
+
+        def record(image):
+            seen.append(image.size)
+            return image
+
+        options = batch.ThumbnailOptions(sizes=((100, 100), (200, 200)))
+        outputs = batch.thumbnail_paths(Path("big.jpg"), tmp_path, options.sizes)
+        with patch.object(batch, "preserve_exif_orientation", side_effect=record):
+            digest = batch.render_sizes(source, outputs, options)
+
+        assert seen == [(800, 600)]
+        assert len(digest) == 64
+        with Image.open(outputs[1]) as thumb:
+            assert thumb.size == (200, 150)
+
+    def test_manifest_skips_unchanged_sources(self, tmp_path):
+        """Only changed sources, options or missing outputs are re-rendered."""
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "out"
+        self._make_tree(input_dir)
+        batch.run_batch(input_dir, output_dir, workers=1)
+
+        again = batch.run_batch(input_dir, output_dir, workers=1)
+        assert (again.created, again.skipped) == (0, 3)
+
+        # Same content with a new mtime is recognised by its hash
+        self._bump_mtime(input_dir / "a.jpg")
+        touched = batch.run_batch(input_dir, output_dir, workers=1)
+        assert (touched.created, touched.skipped) == (0, 3)
+
+        Image.new("RGB", (800, 600), color="yellow").save(input_dir / "a.jpg")
+        self._bump_mtime(input_dir / "a.jpg")
+        (output_dir / "thumb_b.png").unlink()
+        changed = batch.run_batch(input_dir, output_dir, workers=1)
+        assert (changed.created, changed.skipped) == (2, 1)
+
+        options = batch.ThumbnailOptions(sizes=((50, 50),))
+        resized = batch.run_batch(input_dir, output_dir, options, workers=1)
+        assert resized.created == 3
+
+        forced = batch.run_batch(input_dir, output_dir, options, workers=1, force=True)
+        assert forced.created == 3
+
+    def test_failures_are_reported(self, tmp_path):
+        """A corrupt image fails without stopping the batch."""
+        input_dir = tmp_path / "input"
+        self._make_tree(input_dir)
+        (input_dir / "broken.jpg").write_bytes(b"not really a jpeg")
+
+        result = batch.run_batch(input_dir, tmp_path / "out", workers=2)
+
+        assert (result.created, result.failed) == (3, 1)
+        assert "broken.jpg" in result.errors
+        assert "broken.jpg" not in batch.load_manifest(tmp_path / "out")
+
+
 class TestCLI:
     """Test CLI functionality."""
 
@@ -242,6 +354,32 @@ class TestCLI:
                 assert result == 0
                 mock_create.assert_called_once()
 
+    def test_main_batch_multiple_sizes(self, tmp_path, capsys):
+        """Test CLI batch mode with several sizes and recursion."""
+        input_dir = tmp_path / "input"
+        (input_dir / "sub").mkdir(parents=True)
+        Image.new("RGB", (300, 300), color="red").save(input_dir / "sub" / "a.jpg")
+
+        argv = [
+            "image_thumbnailer",
+            "-i",
+            str(input_dir),
+            "-d",
+            str(tmp_path / "out"),
+            "-s",
+            "50x50,100x100",
+            "-r",
+            "-j",
+            "1",
+        ]
+        with patch("sys.argv", argv):
+            from image_thumbnailer.main import main
+
+            assert main() == 0
+        assert (tmp_path / "out" / "sub" / "thumb_a_50x50.jpg").exists()
+        assert (tmp_path / "out" / "sub" / "thumb_a_100x100.jpg").exists()
+        assert "Created 2 thumbnails" in capsys.readouterr().out
+
     def test_main_invalid_size(self):
         """Test CLI with invalid size."""
         with patch("sys.argv", ["image_thumbnailer", "test.jpg", "-s", "invalid"]):
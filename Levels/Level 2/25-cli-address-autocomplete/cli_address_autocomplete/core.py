@@ -2,33 +2,66 @@
 
 import csv
 import logging
-from collections import defaultdict
-from typing import List, Dict, Set
+import os
+from typing import List, Optional, Set
+
+from .index import AddressIndex, AddressList, TrigramMap, clean
 
 
 class AddressAutocomplete:
     """Address autocomplete using trigram index for fast fuzzy matching."""
 
-    def __init__(self, dataset_path: str):
+    def __init__(self, dataset_path: str, index_path: Optional[str] = None):
+        """Load ``index_path`` if it matches the dataset, else build (and save) it."""
         self.dataset_path = dataset_path
-        self.index: Dict[str, Set[str]] = defaultdict(set)
-        self.addresses: List[str] = []
-        self._build_index()
+        self.index_path = index_path
+        self._index = self._load_or_build_index()
+        self.addresses = AddressList(self._index, rows=True)
+        self.index = TrigramMap(self._index)
 
-    def _build_index(self):
+    def _load_or_build_index(self) -> AddressIndex:
+        """Map a saved index that matches the dataset, or build a new one."""
+        try:
+            stat = os.stat(self.dataset_path)
+        except FileNotFoundError:
+            logging.error(f"Dataset file not found: {self.dataset_path}")
+            raise
+        source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+        if self.index_path and os.path.exists(self.index_path):
+            try:
+                index = AddressIndex.load(self.index_path)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable index {self.index_path}: {e}")
+            else:
+                if index.source == source:
+                    logging.info(f"Loaded index from {self.index_path}")
+                    return index
+                index.close()
+                logging.info(f"Index {self.index_path} is stale, rebuilding")
+
+        index = self._build_index(source)
+        if self.index_path:
+            try:
+                index.save(self.index_path)
+            except OSError as e:
+                logging.warning(f"Could not save index to {self.index_path}: {e}")
+        return index
+
+    def _build_index(self, source: Optional[dict] = None) -> AddressIndex:
         """Build trigram index from address dataset."""
         try:
+            rows = []
             with open(self.dataset_path, 'r', encoding='utf-8') as f:
                 reader = csv.reader(f)
                 for row in reader:
                     if row:
                         address = row[0].strip()
                         if address:
-                            self.addresses.append(address)
-                            trigrams = self._get_trigrams(address.lower())
-                            for trigram in trigrams:
-                                self.index[trigram].add(address)
-            logging.info(f"Built index with {len(self.addresses)} addresses and {len(self.index)} trigrams")
+                            rows.append(address)
+            index = AddressIndex.build(rows, source)
+            logging.info(f"Built index with {len(rows)} addresses and {len(TrigramMap(index))} trigrams")
+            return index
         except FileNotFoundError:
             logging.error(f"Dataset file not found: {self.dataset_path}")
             raise
@@ -38,16 +71,17 @@ class AddressAutocomplete:
 
     def _get_trigrams(self, text: str) -> Set[str]:
         """Generate trigrams from text."""
-        trigrams = set()
-        text = text.replace(',', '').replace(' ', '')  # remove punctuation for simplicity
-        for i in range(len(text) - 2):
-            trigrams.add(text[i:i+3])
-        return trigrams
+        text = clean(text)  # remove punctuation for simplicity
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def close(self):
+        """Release the memory-mapped index file, if any."""
+        self._index.close()
 
     def search(self, query: str, limit: int = 10, page: int = 1) -> List[str]:
         """Search for addresses matching the query."""
         normalized_query = query.strip().lower()
-        cleaned_query = normalized_query.replace(',', '').replace(' ', '')
+        cleaned_query = clean(normalized_query)
 
         if not cleaned_query:
             return []
@@ -55,35 +89,21 @@ class AddressAutocomplete:
         if len(cleaned_query) == 1:
             return []
 
+        # Pagination
+        start = (page - 1) * limit
+        end = start + limit
+        if start < 0 or end <= start:
+            return []
+
         if len(cleaned_query) < 3:
-            matches = [addr for addr in self.addresses if normalized_query in addr.lower()]
-            start = (page - 1) * limit
-            end = start + limit
-            return matches[start:end]
+            # Substring matches in dataset order, from the bigram postings
+            return self._index.substring_rows(normalized_query, start, limit)
 
         query_trigrams = self._get_trigrams(normalized_query)
         if not query_trigrams:
             return []
 
-        # Find candidates: addresses that share at least one trigram
-        candidates = set()
-        for trigram in query_trigrams:
-            candidates.update(self.index.get(trigram, set()))
-
-        # Score candidates by number of matching trigrams
-        scored = []
-        for addr in candidates:
-            addr_trigrams = self._get_trigrams(addr.lower())
-            score = len(query_trigrams & addr_trigrams)
-            if score > 0:
-                scored.append((score, addr))
-
-        # Sort by score descending, then by address
-        scored.sort(key=lambda x: (-x[0], x[1]))
-
-        # Pagination
-        start = (page - 1) * limit
-        end = start + limit
-        results = [addr for _, addr in scored[start:end]]
-
-        return results
+        # Score by number of matching trigrams, best first, then by address
+        # (ids are in address order); only the first ``end`` are ranked
+        ranked = self._index.top_trigram_matches(query_trigrams, end)
+        return [self._index.address(address_id) for _, address_id in ranked[start:end]]
@@ -0,0 +1,343 @@
+"""Compact, memory-mappable address index.
+
+Addresses get integer ids in sorted order, so ranking ties broken by id
+are broken alphabetically. The index holds:
+
+* the distinct address strings as one UTF-8 blob with an offsets array,
+* the number of distinct trigrams of each address,
+* a sorted posting array of ids for each trigram of the cleaned,
+  lowercased addresses,
+* the id of every dataset row, in file order,
+* a sorted posting array of row positions for each bigram of the
+  lowercased rows, for queries too short to have trigrams.
+
+Every part is a flat array, so ``save`` writes them to one file and
+``load`` maps that file back without parsing or rebuilding anything.
+"""
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+MAGIC = b'ADDRIDX1'
+FORMAT_VERSION = 1
+# Sections start on 8-byte boundaries so they can be cast in place
+ALIGNMENT = 8
+MAX_TRIGRAM_COUNT = 0xFFFF
+
+# Typecode of each section
+SECTIONS = {
+    'text_offsets': 'Q',
+    'text': 'B',
+    'trigram_counts': 'H',
+    'trigram_keys': 'Q',
+    'trigram_offsets': 'Q',
+    'trigram_postings': 'I',
+    'rows': 'I',
+    'bigram_keys': 'Q',
+    'bigram_offsets': 'Q',
+    'bigram_postings': 'I',
+}
+
+
+def clean(text: str) -> str:
+    """Drop the characters trigram matching ignores."""
+    return text.replace(',', '').replace(' ', '')
+
+
+def gram_key(gram: str) -> int:
+    """Pack a bigram or trigram into one integer, 21 bits per code point."""
+    key = 0
+    for char in gram:
+        key = (key << 21) | ord(char)
+    return key
+
+
+def _key_gram(key: int, length: int) -> str:
+    return ''.join(
+        chr((key >> (21 * shift)) & 0x1FFFFF) for shift in reversed(range(length))
+    )
+
+
+def _flatten(grams: Dict[int, array]) -> Tuple[array, array, array]:
+    """Turn per-gram posting arrays into keys, offsets and postings."""
+    keys = array('Q', sorted(grams))
+    offsets = array('Q', [0])
+    postings = array('I')
+    for key in keys:
+        postings.extend(grams[key])
+        offsets.append(len(postings))
+    return keys, offsets, postings
+
+
+class AddressList(Sequence):
+    """Read-only list of strings decoded from the index on access."""
+
+    def __init__(self, index: 'AddressIndex', rows: bool = False):
+        self._index = index
+        self._rows = index.arrays['rows'] if rows else None
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        return self._index.size
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError('address index out of range')
+        if self._rows is not None:
+            position = self._rows[position]
+        return self._index.address(position)
+
+
+class TrigramMap(Mapping):
+    """Read-only trigram -> posting array view of the index."""
+
+    def __init__(self, index: 'AddressIndex'):
+        self._index = index
+
+    def __getitem__(self, trigram: str) -> Sequence:
+        postings = self._index.postings('trigram', trigram)
+        if not postings:
+            raise KeyError(trigram)
+        return postings
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self._index.arrays['trigram_keys']:
+            yield _key_gram(key, 3)
+
+    def __len__(self) -> int:
+        return len(self._index.arrays['trigram_keys'])
+
+
+class AddressIndex:
+    """Trigram and bigram posting arrays over integer address ids."""
+
+    def __init__(self, arrays: Dict[str, Sequence], source: Optional[Dict] = None):
+        self.arrays = arrays
+        self.source = source or {}
+        self.size = len(arrays['text_offsets']) - 1
+        self._mmap: Optional[mmap.mmap] = None
+
+    @classmethod
+    def build(
+        cls, rows: Iterable[str], source: Optional[Dict] = None
+    ) -> 'AddressIndex':
+        """Index addresses given in dataset order (duplicates allowed)."""
+        rows = list(rows)
+        distinct = sorted(set(rows))
+        ids = {address: i for i, address in enumerate(distinct)}
+
+        text_offsets = array('Q', [0])
+        text = bytearray()
+        counts = array('H')
+        trigram_grams: Dict[int, array] = defaultdict(lambda: array('I'))
+        for address_id, address in enumerate(distinct):
+            text += address.encode('utf-8')
+            text_offsets.append(len(text))
+            cleaned = clean(address.lower())
+            grams = {cleaned[i:i + 3] for i in range(len(cleaned) - 2)}
+            counts.append(min(len(grams), MAX_TRIGRAM_COUNT))
+            for gram in grams:
+                # Ids are visited in order, so each posting array is sorted
+                trigram_grams[gram_key(gram)].append(address_id)
+
+        row_ids = array('I')
+        bigram_grams: Dict[int, array] = defaultdict(lambda: array('I'))
+        for position, address in enumerate(rows):
+            row_ids.append(ids[address])
+            lowered = address.lower()
+            for gram in {lowered[i:i + 2] for i in range(len(lowered) - 1)}:
+                bigram_grams[gram_key(gram)].append(position)
+
+        trigram_keys, trigram_offsets, trigram_postings = _flatten(trigram_grams)
+        bigram_keys, bigram_offsets, bigram_postings = _flatten(bigram_grams)
+        arrays = {
+            'text_offsets': text_offsets,
+            'text': array('B', text),
+            'trigram_counts': counts,
+            'trigram_keys': trigram_keys,
+            'trigram_offsets': trigram_offsets,
+            'trigram_postings': trigram_postings,
+            'rows': row_ids,
+            'bigram_keys': bigram_keys,
+            'bigram_offsets': bigram_offsets,
+            'bigram_postings': bigram_postings,
+        }
+        return cls(arrays, source)
+
+    def save(self, path: str) -> None:
+        """Write the index to ``path`` in the memory-mappable format."""
+        sections = {}
+        offset = 0
+        for name, typecode in SECTIONS.items():
+            length = len(self.arrays[name]) * array(typecode).itemsize
+            sections[name] = [offset, length]
+            offset += length + (-length % ALIGNMENT)
+        header = json.dumps({
+            'version': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'itemsizes': {code: array(code).itemsize for code in 'BHIQ'},
+            'source': self.source,
+            'sections': sections,
+        }).encode('utf-8')
+        header += b' ' * (-(len(MAGIC) + 8 + len(header)) % ALIGNMENT)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            for name in SECTIONS:
+                data = memoryview(self.arrays[name]).cast('B')
+                f.write(data)
+                f.write(b'\0' * (-len(data) % ALIGNMENT))
+        # Replace atomically so a reader never maps a half-written file
+        os.replace(tmp_path, path)
+        logging.info(f"Saved address index to {path}")
+
+    @classmethod
+    def load(cls, path: str) -> 'AddressIndex':
+        """Map an index written by ``save``.
+
+        Raises:
+            ValueError: If the file is not a compatible index
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mapped[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"Not an address index: {path}")
+            start = len(MAGIC) + 8
+            body = start + int.from_bytes(mapped[len(MAGIC):start], 'little')
+            header = json.loads(mapped[start:body].decode('utf-8'))
+            itemsizes = {code: array(code).itemsize for code in 'BHIQ'}
+            if (
+                header.get('version') != FORMAT_VERSION
+                or header.get('byteorder') != sys.byteorder
+                or header.get('itemsizes') != itemsizes
+            ):
+                raise ValueError(f"Incompatible address index: {path}")
+            view = memoryview(mapped)
+            arrays = {}
+            for name, typecode in SECTIONS.items():
+                offset, length = header['sections'][name]
+                start = body + offset
+                arrays[name] = view[start:start + length].cast(typecode)
+        except Exception:
+            mapped.close()
+            raise
+        index = cls(arrays, header.get('source'))
+        index._mmap = mapped
+        return index
+
+    def close(self) -> None:
+        """Release the mapped file, if any."""
+        if self._mmap is None:
+            return
+        for name, data in self.arrays.items():
+            if isinstance(data, memoryview):
+                data.release()
+        self.arrays = {}
+        self._mmap.close()
+        self._mmap = None
+
+    def address(self, address_id: int) -> str:
+        """Address string for an id."""
+        offsets = self.arrays['text_offsets']
+        start, end = offsets[address_id], offsets[address_id + 1]
+        return bytes(self.arrays['text'][start:end]).decode('utf-8')
+
+    def postings(self, kind: str, gram: str) -> Sequence:
+        """Sorted posting array of a ``'trigram'`` or ``'bigram'``; may be empty."""
+        keys = self.arrays[f'{kind}_keys']
+        key = gram_key(gram)
+        i = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            return ()
+        offsets = self.arrays[f'{kind}_offsets']
+        return self.arrays[f'{kind}_postings'][offsets[i]:offsets[i + 1]]
+
+    def top_trigram_matches(
+        self, grams: Iterable[str], count: int
+    ) -> List[Tuple[int, int]]:
+        """Return up to ``count`` (score, id) pairs, best first.
+
+        The score is the number of ``grams`` an address contains; ties go
+        to the lower id. Posting arrays are read shortest first. After
+        ``i`` of ``m`` arrays every id scoring ``m - i + 1`` or more has
+        been seen, since it is missing from at most ``i - 1`` arrays, so
+        scanning stops once ``count`` ids reach that score. Each new id is
+        scored by searching the longer arrays, stopping early once it has
+        matched all of its own trigrams.
+        """
+        lists = [self.postings('trigram', gram) for gram in grams]
+        lists = sorted((postings for postings in lists if postings), key=len)
+        if count <= 0 or not lists:
+            return []
+        counts = self.arrays['trigram_counts']
+        total = len(lists)
+        scores: Dict[int, int] = {}
+        # histogram[s] is the number of scored ids with score s
+        histogram = [0] * (total + 1)
+        for i, postings in enumerate(lists):
+            later = lists[i + 1:]
+            cursors = [0] * len(later)
+            for address_id in postings:
+                if address_id in scores:
+                    continue
+                score = 1
+                ceiling = counts[address_id]
+                for j, other in enumerate(later):
+                    if score >= ceiling:
+                        break
+                    position = bisect_left(other, address_id, cursors[j])
+                    cursors[j] = position
+                    if position < len(other) and other[position] == address_id:
+                        score += 1
+                scores[address_id] = score
+                histogram[score] += 1
+            threshold = total - i
+            if sum(histogram[threshold:]) >= count:
+                break
+        else:
+            threshold = 1
+        ranked = heapq.nsmallest(
+            count,
+            (
+                (-score, address_id)
+                for address_id, score in scores.items()
+                if score >= threshold
+            ),
+        )
+        return [(-negated, address_id) for negated, address_id in ranked]
+
+    def substring_rows(self, text: str, skip: int, count: int) -> List[str]:
+        """Rows containing ``text`` (two or more characters), in file order."""
+        results: List[str] = []
+        if count <= 0:
+            return results
+        rows = self.arrays['rows']
+        for position in self.postings('bigram', text[:2]):
+            address = self.address(rows[position])
+            if text not in address.lower():
+                continue
+            if skip:
+                skip -= 1
+                continue
+            results.append(address)
+            if len(results) == count:
+                break
+        return results
@@ -0,0 +1,110 @@
+"""Benchmark for index startup and query throughput.
+
+Writes a synthetic address CSV, then reports how long it takes to build
+the index from the CSV, save it and map it back, and how many queries
+per second the trigram and short (two character) paths answer.
+
+Usage:
+    python -m cli_address_autocomplete.loadtest --addresses 200000 --queries 2000
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from .core import AddressAutocomplete
+
+STREETS = [
+    "Main St", "Oak Ave", "Pine Rd", "Elm St", "Maple Dr", "Cedar Ln",
+    "Birch Blvd", "Walnut Way", "Lake Shore Dr", "Hillcrest Rd", "Park Pl",
+    "Sunset Blvd", "River Rd", "Church St", "Mill Ln", "Station Rd",
+]
+CITIES = [
+    "Anytown", "Somewhere", "Elsewhere", "Springfield", "Riverside",
+    "Fairview", "Greenville", "Madison", "Georgetown", "Clinton",
+]
+STATES = ["CA", "NY", "TX", "WA", "IL", "OH", "GA", "NC", "MI", "PA"]
+
+
+def write_dataset(path: str, addresses: int, rng: random.Random) -> None:
+    """Write ``addresses`` random addresses, one per row."""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        for _ in range(addresses):
+            writer.writerow([
+                f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, "
+                f"{rng.choice(CITIES)}, {rng.choice(STATES)} {rng.randint(10000, 99999)}"
+            ])
+
+
+def make_queries(ac: AddressAutocomplete, queries: int, rng: random.Random) -> list:
+    """Take substrings of random addresses, some with a typo."""
+    result = []
+    for _ in range(queries):
+        address = ac.addresses[rng.randrange(len(ac.addresses))]
+        start = rng.randrange(max(1, len(address) - 8))
+        query = address[start:start + rng.randint(4, 14)]
+        if rng.random() < 0.3 and len(query) > 4:
+            i = rng.randrange(len(query))
+            query = query[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + query[i + 1:]
+        result.append(query)
+    return result
+
+
+def time_queries(ac: AddressAutocomplete, queries: list, limit: int) -> float:
+    """Return queries per second."""
+    start = time.perf_counter()
+    for query in queries:
+        ac.search(query, limit=limit)
+    return len(queries) / (time.perf_counter() - start)
+
+
+def run_benchmark(addresses: int, queries: int, limit: int) -> None:
+    """Time index startup and queries on a synthetic dataset."""
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = random.Random(7)
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        dataset = os.path.join(tmp_dir, 'addresses.csv')
+        index_path = os.path.join(tmp_dir, 'addresses.idx')
+        write_dataset(dataset, addresses, rng)
+
+        start = time.perf_counter()
+        AddressAutocomplete(dataset).close()
+        build_seconds = time.perf_counter() - start
+
+        AddressAutocomplete(dataset, index_path).close()
+
+        start = time.perf_counter()
+        ac = AddressAutocomplete(dataset, index_path)
+        load_seconds = time.perf_counter() - start
+
+        print(f"{addresses} addresses, index file {os.path.getsize(index_path) / 1e6:.1f} MB")
+        print(f"{'build from CSV':<22} {build_seconds * 1000:>10.1f} ms")
+        print(f"{'map saved index':<22} {load_seconds * 1000:>10.1f} ms")
+
+        trigram_queries = make_queries(ac, queries, rng)
+        short_queries = [query[:2] for query in trigram_queries if len(query.strip()) >= 2]
+        print(f"{'trigram queries':<22} {time_queries(ac, trigram_queries, limit):>10.0f} /s")
+        print(f"{'two-character queries':<22} {time_queries(ac, short_queries, limit):>10.0f} /s")
+        ac.close()
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure autocomplete startup and query speed")
+    parser.add_argument("--addresses", type=int, default=200000, help="Addresses in the dataset")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per path")
+    parser.add_argument("--limit", type=int, default=10, help="Results per query")
+    args = parser.parse_args()
+    run_benchmark(args.addresses, args.queries, args.limit)
+
+
+if __name__ == "__main__":
+    main()
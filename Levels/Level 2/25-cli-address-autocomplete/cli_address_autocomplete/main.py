@@ -14,14 +14,16 @@ def main():
     parser.add_argument("--limit", type=int, default=10, help="Maximum number of results")
     parser.add_argument("--page", type=int, default=1, help="Page number for pagination")
     parser.add_argument("--dataset", default="sample_addresses.csv", help="Path to address dataset CSV")
+    parser.add_argument("--index", help="Saved index file; built from the dataset when missing or out of date")
 
     args = parser.parse_args()
 
     try:
-        autocomplete = AddressAutocomplete(args.dataset)
+        autocomplete = AddressAutocomplete(args.dataset, index_path=args.index)
         results = autocomplete.search(args.query, limit=args.limit, page=args.page)
         for addr in results:
             print(addr)
+        autocomplete.close()
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
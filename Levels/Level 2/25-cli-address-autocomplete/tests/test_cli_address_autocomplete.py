@@ -70,6 +70,53 @@ class TestAddressAutocomplete:
         results = ac.search("A")
         assert results == []  # since trigrams need 3 chars
 
+    def test_index_uses_integer_ids(self, sample_dataset):
+        ac = AddressAutocomplete(sample_dataset)
+        # Ids follow sorted address order
+        assert list(ac.index["mai"]) == [0]
+        assert ac.addresses[0] == "123 Main St, Anytown, USA"
+
+    def test_ranking_and_ties(self, sample_dataset):
+        ac = AddressAutocomplete(sample_dataset)
+        results = ac.search("Elm St Anytown")
+        assert results[0] == "321 Elm St, Anytown, USA"
+        # Equal scores are ordered alphabetically
+        assert ac.search("USA", limit=5) == sorted(ac.search("USA", limit=5))
+
+    def test_short_query_keeps_dataset_order_and_duplicates(self, tmp_path):
+        dataset = tmp_path / "dupes.csv"
+        dataset.write_text('"b Oak Ave"\n"a Oak Ave"\n"b Oak Ave"\n"Pine Rd"\n')
+        ac = AddressAutocomplete(str(dataset))
+        assert ac.search("oa") == ["b Oak Ave", "a Oak Ave", "b Oak Ave"]
+        assert ac.search("oa", limit=1, page=3) == ["b Oak Ave"]
+        # Trigram results list each address once
+        assert ac.search("Oak Ave") == ["a Oak Ave", "b Oak Ave"]
+
+    def test_saved_index_is_mapped_and_rebuilt_when_stale(self, sample_dataset, tmp_path):
+        index_path = str(tmp_path / "addresses.idx")
+        built = AddressAutocomplete(sample_dataset, index_path=index_path)
+        expected = built.search("Maple")
+
+        loaded = AddressAutocomplete(sample_dataset, index_path=index_path)
+        assert loaded._index._mmap is not None
+        assert loaded.search("Maple") == expected
+        assert list(loaded.addresses) == list(built.addresses)
+        loaded.close()
+
+        with open(sample_dataset, "a", newline="") as f:
+            csv.writer(f).writerow(["987 Maple Dr, Newtown, USA"])
+        rebuilt = AddressAutocomplete(sample_dataset, index_path=index_path)
+        assert rebuilt._index._mmap is None
+        assert "987 Maple Dr, Newtown, USA" in rebuilt.search("Maple")
+        assert len(AddressAutocomplete(sample_dataset, index_path=index_path).addresses) == 6
+
+    def test_corrupt_index_is_rebuilt(self, sample_dataset, tmp_path):
+        index_path = tmp_path / "addresses.idx"
+        index_path.write_bytes(b"not an index")
+        ac = AddressAutocomplete(sample_dataset, index_path=str(index_path))
+        assert "123 Main St, Anytown, USA" in ac.search("Main St")
+        assert index_path.read_bytes().startswith(b"ADDRIDX1")
+
 
 class TestUtils:
     def test_normalize_address(self):
@@ -1,18 +1,33 @@
+import heapq
 import importlib
+import itertools
 import json
 import logging
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 from .utils import CronSchedule
 
+DEFAULT_MAX_WORKERS = 4
+
+# What to do when a task comes due while its previous run is still going:
+# 'skip' drops the new run, 'queue' runs it once the current run ends
+# (several due runs collapse into one), 'allow' runs both at once
+OVERLAP_POLICIES = ('skip', 'queue', 'allow')
+
 
 class Task:
     """Represents a scheduled task with cron expression and execution details."""
 
     def __init__(self, id: str, cron_expr: str, task_type: str, command: str,
-                 module: str = None, function: str = None, retries: int = 3):
+                 module: str = None, function: str = None, retries: int = 3,
+                 overlap: str = 'skip'):
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy '{overlap}'")
         self.id = id
         self.cron_expr = cron_expr
         self.task_type = task_type  # 'shell' or 'python'
@@ -20,6 +35,7 @@ class Task:
         self.module = module
         self.function = function
         self.retries = retries
+        self.overlap = overlap
         self._cron_schedule = CronSchedule(cron_expr, base_time=datetime.now())
 
     def get_next_run(self) -> datetime:
@@ -62,12 +78,28 @@ class Task:
 
 
 class Scheduler:
-    """Manages a collection of scheduled tasks."""
+    """Manages a collection of scheduled tasks.
+
+    ``_next_runs`` maps each task to its next run time. The run loop keeps
+    a heap of (run time, sequence, task) entries over it; an entry whose
+    time no longer matches ``_next_runs`` (the task was removed or
+    rescheduled) is dropped when it reaches the top. Due tasks run on a
+    pool of ``max_workers`` threads, so a slow task does not hold up the
+    others, and each task's ``overlap`` policy decides what happens when
+    it comes due while still running.
+    """
 
-    def __init__(self, storage_file: str = 'tasks.json'):
+    def __init__(self, storage_file: str = 'tasks.json', max_workers: int = DEFAULT_MAX_WORKERS):
         self.storage_file = storage_file
+        self.max_workers = max_workers
         self.tasks = []
         self._next_runs = {}
+        self._heap: List[Tuple[datetime, int, Task]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._running: Dict[Task, int] = {}
+        self._queued: Set[Task] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
         self.load_tasks()
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -93,7 +125,8 @@ class Scheduler:
             'command': t.command,
             'module': t.module,
             'function': t.function,
-            'retries': t.retries
+            'retries': t.retries,
+            'overlap': t.overlap
         } for t in self.tasks]
         with open(self.storage_file, 'w') as f:
             json.dump(data, f, indent=4)
@@ -104,6 +137,15 @@ class Scheduler:
         self.save_tasks()
         logging.info(f"Added task {task.id}")
 
+    def add_tasks(self, tasks: Iterable[Task]) -> None:
+        """Add several tasks, saving the storage file once."""
+        count = 0
+        for task in tasks:
+            self._register_task(task)
+            count += 1
+        self.save_tasks()
+        logging.info(f"Added {count} tasks")
+
     def remove_task(self, task_id: str) -> bool:
         """Remove a task by ID."""
         for i, task in enumerate(self.tasks):
@@ -123,30 +165,99 @@ class Scheduler:
     def run(self) -> None:
         """Run the scheduler loop."""
         logging.info("Scheduler started")
+        self._rebuild_heap()
         try:
             while True:
                 now = datetime.now()
-                if not self._next_runs:
-                    time.sleep(60)  # No tasks, sleep for 1 minute
-                    continue
+                self.run_pending(now)
 
-                due_tasks = [task for task, run_at in self._next_runs.items() if run_at <= now]
-
-                if due_tasks:
-                    for task in due_tasks:
-                        task.execute()
-                        self._next_runs[task] = task.get_next_run()
+                next_time = self._peek_next_run()
+                if next_time is None:
+                    time.sleep(60)  # No tasks, sleep for 1 minute
                     continue
 
-                next_time = min(self._next_runs.values())
                 sleep_time = max((next_time - now).total_seconds(), 0)
                 time.sleep(min(sleep_time, 60))  # Max sleep 1 minute to allow for interruptions
         except KeyboardInterrupt:
             logging.info("Scheduler stopped by user")
         except Exception as e:
             logging.error(f"Scheduler error: {e}")
+        finally:
+            self.shutdown()
+
+    def run_pending(self, now: datetime) -> int:
+        """Start every task due at ``now``; return how many were started or queued."""
+        started = 0
+        while self._heap and self._heap[0][0] <= now:
+            run_at, _, task = heapq.heappop(self._heap)
+            if self._next_runs.get(task) != run_at:
+                continue  # Removed or rescheduled since this entry was pushed
+            self._schedule(task, task.get_next_run())
+            if self._submit(task):
+                started += 1
+        return started
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool, by default after running tasks finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def _submit(self, task: Task) -> bool:
+        """Hand a due task to the pool, applying its overlap policy."""
+        with self._lock:
+            if self._running.get(task) and task.overlap != 'allow':
+                if task.overlap == 'queue':
+                    self._queued.add(task)
+                    logging.info(f"Task {task.id} still running, queued next run")
+                    return True
+                logging.warning(f"Task {task.id} still running, skipped this run")
+                return False
+            self._running[task] = self._running.get(task, 0) + 1
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix='task'
+            )
+        self._executor.submit(self._execute, task)
+        return True
+
+    def _execute(self, task: Task) -> None:
+        """Run a task in a worker, then any run queued behind it."""
+        while True:
+            try:
+                task.execute()
+            except Exception as e:
+                logging.error(f"Task {task.id} raised: {e}")
+            with self._lock:
+                if task in self._queued:
+                    self._queued.discard(task)
+                    continue
+                self._running[task] -= 1
+                if not self._running[task]:
+                    del self._running[task]
+                return
+
+    def _schedule(self, task: Task, run_at: datetime) -> None:
+        self._next_runs[task] = run_at
+        heapq.heappush(self._heap, (run_at, next(self._sequence), task))
+
+    def _peek_next_run(self) -> Optional[datetime]:
+        """Earliest live run time, discarding stale heap entries."""
+        while self._heap:
+            run_at, _, task = self._heap[0]
+            if self._next_runs.get(task) == run_at:
+                return run_at
+            heapq.heappop(self._heap)
+        return None
+
+    def _rebuild_heap(self) -> None:
+        """Rebuild the heap from ``_next_runs``."""
+        self._heap = [
+            (run_at, next(self._sequence), task) for task, run_at in self._next_runs.items()
+        ]
+        heapq.heapify(self._heap)
 
     def _register_task(self, task: Task) -> None:
         """Track a task's upcoming run without altering other schedules."""
         self.tasks.append(task)
-        self._next_runs[task] = task.get_next_run()
+        self._schedule(task, task.get_next_run())
@@ -0,0 +1,124 @@
+"""Benchmark scheduling a large number of cron tasks.
+
+Creates many tasks with a mix of cron expressions, then reports:
+
+* how fast next run times are computed by jumping field by field,
+  against testing minute by minute on a sample,
+* how long registering every task takes,
+* the cost of an hour of simulated run loop, dispatching due tasks from
+  the heap to the worker pool, against scanning every task at each
+  wake-up.
+
+Usage:
+    python -m task_scheduler.loadtest --tasks 100000
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from .core import DEFAULT_MAX_WORKERS, Scheduler, Task
+from .utils import CronSchedule
+
+
+def noop() -> None:
+    """Task body used by the benchmark."""
+
+
+def random_cron(rng: random.Random) -> str:
+    """A cron expression from a mix of common shapes."""
+    shape = rng.random()
+    minute = rng.randint(0, 59)
+    hour = rng.randint(0, 23)
+    if shape < 0.4:
+        return f"{minute} * * * *"
+    if shape < 0.6:
+        return f"*/{rng.choice([5, 10, 15, 30])} * * * *"
+    if shape < 0.8:
+        return f"{minute} {hour} * * *"
+    if shape < 0.9:
+        return f"{minute} {hour} * * {rng.randint(1, 5)}"
+    if shape < 0.97:
+        return f"{minute} {hour} {rng.randint(1, 28)} * *"
+    return f"{minute} {hour} 1 {rng.randint(1, 12)} *"
+
+
+def scan_next(schedule: CronSchedule, reference: datetime) -> datetime:
+    """Next run time found by testing every minute, for comparison."""
+    candidate = reference.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while not schedule._matches(candidate):
+        candidate += timedelta(minutes=1)
+    return candidate
+
+
+def run_benchmark(tasks: int, sample: int, workers: int) -> None:
+    """Time task creation, next-run computation and the run loop."""
+    rng = random.Random(11)
+    expressions = [random_cron(rng) for _ in range(tasks)]
+
+    start = time.perf_counter()
+    created = [
+        Task(f"task{i}", expr, 'python', '', module=__name__, function='noop')
+        for i, expr in enumerate(expressions)
+    ]
+    print(f"{'create tasks':<34} {time.perf_counter() - start:>8.2f} s  ({tasks} tasks)")
+
+    reference = datetime.now()
+    schedules = [CronSchedule(expr, base_time=reference) for expr in expressions[:sample]]
+    start = time.perf_counter()
+    for schedule in schedules:
+        schedule.next_after(reference)
+    jump = (time.perf_counter() - start) / len(schedules)
+    start = time.perf_counter()
+    for schedule in schedules:
+        scan_next(schedule, reference)
+    scan = (time.perf_counter() - start) / len(schedules)
+    print(f"{'next run, field jumping':<34} {jump * 1e6:>8.1f} us/task")
+    print(f"{'next run, minute scan (sample)':<34} {scan * 1e6:>8.1f} us/task")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scheduler = Scheduler(os.path.join(tmp_dir, 'tasks.json'), max_workers=workers)
+        logging.getLogger().setLevel(logging.WARNING)
+        start = time.perf_counter()
+        scheduler.add_tasks(created)
+        print(f"{'register and save':<34} {time.perf_counter() - start:>8.2f} s")
+
+        # One wake-up per minute for an hour of simulated time
+        ticks = [reference + timedelta(minutes=m) for m in range(1, 61)]
+
+        start = time.perf_counter()
+        for now in ticks:
+            [task for task, run_at in scheduler._next_runs.items() if run_at <= now]
+        print(f"{'scan all tasks per wake-up':<34} {(time.perf_counter() - start) / len(ticks) * 1000:>8.2f} ms/wake-up")
+
+        scheduler._rebuild_heap()
+        dispatched = 0
+        start = time.perf_counter()
+        for now in ticks:
+            dispatched += scheduler.run_pending(now)
+        dispatch_seconds = time.perf_counter() - start
+        scheduler.shutdown()
+        total_seconds = time.perf_counter() - start
+        print(
+            f"{'heap dispatch, 1 simulated hour':<34} {dispatch_seconds:>8.2f} s  "
+            f"({dispatched} runs, {dispatched / dispatch_seconds:.0f} dispatches/s)"
+        )
+        print(f"{'including pool execution':<34} {total_seconds:>8.2f} s  ({workers} workers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the task scheduler")
+    parser.add_argument('--tasks', type=int, default=100000, help='Tasks to schedule (default: 100000)')
+    parser.add_argument('--sample', type=int, default=200, help='Tasks timed with the minute scan (default: 200)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'Worker threads (default: {DEFAULT_MAX_WORKERS})')
+    args = parser.parse_args()
+    run_benchmark(args.tasks, args.sample, args.workers)
+
+
+if __name__ == '__main__':
+    main()
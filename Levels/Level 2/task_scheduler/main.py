@@ -3,7 +3,7 @@
 
 import argparse
 import sys
-from .core import Scheduler, Task
+from .core import DEFAULT_MAX_WORKERS, OVERLAP_POLICIES, Scheduler, Task
 
 
 def main():
@@ -19,6 +19,8 @@ def main():
     add_parser.add_argument('--module', help='Python module (for python type)')
     add_parser.add_argument('--function', help='Python function (for python type)')
     add_parser.add_argument('--retries', type=int, default=3, help='Number of retries')
+    add_parser.add_argument('--overlap', choices=OVERLAP_POLICIES, default='skip',
+                            help='What to do if the task is due while still running (default: skip)')
 
     # Remove task
     remove_parser = subparsers.add_parser('remove', help='Remove a task')
@@ -29,6 +31,8 @@ def main():
 
     # Run scheduler
     run_parser = subparsers.add_parser('run', help='Run the scheduler')
+    run_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS,
+                            help=f'Tasks that may run at once (default: {DEFAULT_MAX_WORKERS})')
 
     args = parser.parse_args()
 
@@ -36,7 +40,7 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    scheduler = Scheduler()
+    scheduler = Scheduler(max_workers=getattr(args, 'workers', DEFAULT_MAX_WORKERS))
 
     if args.command == 'add':
         if args.type == 'python' and (not args.module or not args.function):
@@ -49,7 +53,8 @@ def main():
             command=args.command,
             module=args.module,
             function=args.function,
-            retries=args.retries
+            retries=args.retries,
+            overlap=args.overlap
         )
         scheduler.add_task(task)
         print(f"Task {args.id} added successfully")
@@ -68,7 +73,7 @@ def main():
         else:
             print("Scheduled tasks:")
             for task in tasks:
-                print(f"- ID: {task.id}, Cron: {task.cron_expr}, Type: {task.task_type}, Command: {task.command}")
+                print(f"- ID: {task.id}, Cron: {task.cron_expr}, Type: {task.task_type}, Command: {task.command}, Overlap: {task.overlap}")
 
     elif args.command == 'run':
         try:
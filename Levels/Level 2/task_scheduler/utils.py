@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import calendar
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Set
+from typing import List, Optional, Sequence, Set
+
+# Date and weekday combinations repeat every 28 years (between 1901 and
+# 2099), so an expression with no run time in that span never runs
+SEARCH_YEARS = 28
 
 
 class CronExpressionError(ValueError):
@@ -28,19 +34,67 @@ class CronSchedule:
         self.days = _parse_cron_field(fields[2], 1, 31)
         self.months = _parse_cron_field(fields[3], 1, 12)
         self.weekdays = _parse_weekday_field(fields[4])
+        self._sorted_minutes = sorted(self.minutes)
+        self._sorted_hours = sorted(self.hours)
+        self._sorted_days = sorted(self.days)
+        self._sorted_months = sorted(self.months)
         self._last_run = self.base_time or datetime.now()
 
     def get_next(self) -> datetime:
         """Return the next run time strictly after the previous reference."""
-        candidate = _increment_minute(self._last_run)
-
-        for _ in range(60 * 24 * 366):  # Search up to one year ahead.
-            if self._matches(candidate):
-                self._last_run = candidate
-                return candidate
-            candidate += timedelta(minutes=1)
+        candidate = self.next_after(self._last_run)
+        self._last_run = candidate
+        return candidate
+
+    def next_after(self, reference: datetime) -> datetime:
+        """Return the first matching minute strictly after ``reference``.
+
+        Rather than testing every minute, each field that does not match
+        jumps straight to its next allowed value (month, then day, hour and
+        minute), resetting the smaller fields.
+        """
+        candidate = _increment_minute(reference)
+        last_year = candidate.year + SEARCH_YEARS
+
+        while candidate.year <= last_year:
+            year, month = candidate.year, candidate.month
+            if month not in self.months:
+                next_month = _next_value(self._sorted_months, month)
+                if next_month is None:
+                    candidate = datetime(year + 1, self._sorted_months[0], 1)
+                else:
+                    candidate = datetime(year, next_month, 1)
+                continue
+
+            if candidate.day not in self.days or candidate.weekday() not in self.weekdays:
+                next_day = _next_value(self._sorted_days, candidate.day + 1)
+                if next_day is None or next_day > calendar.monthrange(year, month)[1]:
+                    candidate = _first_of_next_month(candidate)
+                else:
+                    candidate = datetime(year, month, next_day)
+                continue
+
+            if candidate.hour not in self.hours:
+                next_hour = _next_value(self._sorted_hours, candidate.hour)
+                if next_hour is None:
+                    candidate = _start_of_day(candidate) + timedelta(days=1)
+                else:
+                    candidate = candidate.replace(hour=next_hour, minute=0)
+                continue
+
+            if candidate.minute not in self.minutes:
+                next_minute = _next_value(self._sorted_minutes, candidate.minute)
+                if next_minute is None:
+                    candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                else:
+                    candidate = candidate.replace(minute=next_minute)
+                continue
+
+            return candidate
 
-        raise CronExpressionError("Cron expression did not yield a run time within a year")
+        raise CronExpressionError(
+            f"Cron expression did not yield a run time within {SEARCH_YEARS} years"
+        )
 
     def _matches(self, moment: datetime) -> bool:
         python_weekday = moment.weekday()
@@ -53,6 +107,22 @@ class CronSchedule:
         )
 
 
+def _next_value(values: Sequence[int], current: int) -> Optional[int]:
+    """Smallest value in sorted ``values`` that is at least ``current``."""
+    index = bisect_left(values, current)
+    return values[index] if index < len(values) else None
+
+
+def _start_of_day(moment: datetime) -> datetime:
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _first_of_next_month(moment: datetime) -> datetime:
+    if moment.month == 12:
+        return datetime(moment.year + 1, 1, 1)
+    return datetime(moment.year, moment.month + 1, 1)
+
+
 def _increment_minute(reference: datetime) -> datetime:
     """Advance to the next minute boundary strictly after the reference."""
     return reference.replace(second=0, microsecond=0) + timedelta(minutes=1)
@@ -1,8 +1,10 @@
+import threading
+
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime, timedelta
 from task_scheduler.core import Task, Scheduler
-from task_scheduler.utils import CronExpressionError
+from task_scheduler.utils import CronExpressionError, CronSchedule
 
 
 def test_task_creation():
@@ -135,3 +137,106 @@ def test_scheduler_does_not_advance_future_tasks(mock_run, tmp_path):
     assert mock_run.call_count >= 1
     future_task.get_next_run.assert_not_called()
     assert scheduler._next_runs[future_task] == future_next_time
+
+
+def _scan_next(schedule, reference):
+    candidate = reference.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while not schedule._matches(candidate):
+        candidate += timedelta(minutes=1)
+    return candidate
+
+
+@pytest.mark.parametrize('expr', [
+    '* * * * *', '*/7 3-5 * * *', '0 0 1 1 *', '30 12 15 * 1',
+    '5,55 23 31 * *', '0 9 * * 1-5', '15 */6 29 2 *', '0 0 13 * 5',
+])
+def test_cron_field_jumping_matches_minute_scan(expr):
+    schedule = CronSchedule(expr)
+    reference = datetime(2023, 12, 31, 23, 59, 30)
+    for _ in range(5):
+        expected = _scan_next(schedule, reference)
+        assert schedule.next_after(reference) == expected
+        reference = expected
+
+
+def test_cron_next_run_beyond_a_year_and_impossible_dates():
+    # A Monday Feb 29 is years away; the old minute scan gave up after one year
+    schedule = CronSchedule('0 0 29 2 1', base_time=datetime(2024, 3, 1))
+    assert schedule.get_next() == datetime(2044, 2, 29)
+    with pytest.raises(CronExpressionError):
+        CronSchedule('0 0 30 2 *').get_next()
+
+
+def test_run_pending_uses_heap_and_skips_removed_tasks(tmp_path):
+    scheduler = Scheduler(storage_file=str(tmp_path / 'tasks.json'), max_workers=2)
+    ran = []
+    tasks = [Task(name, '* * * * *', 'shell', name) for name in ('a', 'b', 'c')]
+    for task in tasks:
+        task.execute = lambda task=task: ran.append(task.id)
+    scheduler.add_tasks(tasks)
+    assert scheduler.remove_task('b')
+
+    now = datetime.now()
+    scheduler._next_runs[tasks[0]] = now - timedelta(minutes=1)
+    scheduler._next_runs[tasks[2]] = now + timedelta(hours=1)
+    scheduler._rebuild_heap()
+
+    assert scheduler.run_pending(now) == 1
+    scheduler.shutdown()
+    assert ran == ['a']
+    assert scheduler._next_runs[tasks[0]] > now - timedelta(minutes=1)
+    assert scheduler._peek_next_run() == min(scheduler._next_runs.values())
+
+
+def _blocking_task(task_id, overlap, release, counter):
+    task = Task(task_id, '* * * * *', 'shell', task_id, overlap=overlap)
+
+    def execute():
+        counter.append(task_id)
+        release.wait(5)
+    task.execute = execute
+    return task
+
+
+@pytest.mark.parametrize('overlap, expected_runs', [('skip', 1), ('queue', 2), ('allow', 3)])
+def test_overlap_policies(tmp_path, overlap, expected_runs):
+    scheduler = Scheduler(storage_file=str(tmp_path / 'tasks.json'), max_workers=4)
+    release = threading.Event()
+    runs = []
+    task = _blocking_task('slow', overlap, release, runs)
+    scheduler.add_task(task)
+
+    for _ in range(3):
+        scheduler._submit(task)
+    release.set()
+    scheduler.shutdown()
+
+    assert len(runs) == expected_runs
+    assert not scheduler._running
+
+
+def test_slow_task_does_not_delay_others(tmp_path):
+    scheduler = Scheduler(storage_file=str(tmp_path / 'tasks.json'), max_workers=2)
+    release = threading.Event()
+    runs = []
+    slow = _blocking_task('slow', 'skip', release, runs)
+    fast = Task('fast', '* * * * *', 'shell', 'fast')
+    fast_done = threading.Event()
+    fast.execute = fast_done.set
+    scheduler.add_tasks([slow, fast])
+
+    scheduler._submit(slow)
+    scheduler._submit(fast)
+    assert fast_done.wait(2)
+    release.set()
+    scheduler.shutdown()
+
+
+def test_overlap_policy_is_saved(tmp_path):
+    storage_file = str(tmp_path / 'tasks.json')
+    Scheduler(storage_file=storage_file).add_task(
+        Task('q', '* * * * *', 'shell', 'echo q', overlap='queue')
+    )
+    assert Scheduler(storage_file=storage_file).tasks[0].overlap == 'queue'
+    with pytest.raises(ValueError):
+        Task('bad', '* * * * *', 'shell', 'echo', overlap='sometimes')